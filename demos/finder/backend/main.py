@@ -94,18 +94,19 @@ async def search_models(request: SearchRequest):
 
     for provider_name in LLMProvider:
         try:
-            provider_class = AnyLLM.get_provider_class(provider_name)
+            # Read the static metadata first so unconfigured providers are never imported
+            metadata = AnyLLM.get_provider_metadata_for(provider_name)
 
             # Skip providers that don't support list_models
-            if not provider_class.SUPPORTS_LIST_MODELS:
+            if not metadata.list_models:
                 continue
 
-            # Skip providers with missing packages
-            if provider_class.MISSING_PACKAGES_ERROR is not None:
+            # Skip providers without API keys configured
+            if not os.getenv(metadata.env_key):
                 continue
 
-            # Skip providers without API keys configured
-            if not os.getenv(provider_class.ENV_API_KEY_NAME):
+            # Skip providers with missing packages
+            if AnyLLM.get_provider_class(provider_name).MISSING_PACKAGES_ERROR is not None:
                 continue
 
             try:
@@ -160,18 +161,21 @@ async def get_all_models():
         providers_to_process = []
         for provider_name in LLMProvider:
             try:
-                provider_class = AnyLLM.get_provider_class(provider_name)
+                # Read the static metadata first so unconfigured providers are never imported
+                metadata = AnyLLM.get_provider_metadata_for(provider_name)
 
                 # Skip providers that don't support list_models
-                if not provider_class.SUPPORTS_LIST_MODELS:
+                if not metadata.list_models:
                     continue
 
-                # Skip providers with missing packages
-                if provider_class.MISSING_PACKAGES_ERROR is not None:
+                # Skip providers without API keys configured
+                if not os.getenv(metadata.env_key):
                     continue
 
-                # Skip providers without API keys configured
-                if not os.getenv(provider_class.ENV_API_KEY_NAME):
+                provider_class = AnyLLM.get_provider_class(provider_name)
+
+                # Skip providers with missing packages
+                if provider_class.MISSING_PACKAGES_ERROR is not None:
                     continue
 
                 providers_to_process.append((provider_name, provider_class))
@@ -0,0 +1,106 @@
+"""Benchmark the conversion of Anthropic stream events to OpenAI chunks.
+
+Replays a recorded event sequence (one text block of `--tokens` deltas followed by a tool call)
+through the per-stream `_AnthropicStreamConverter` and through the previous per-event conversion,
+which stringified every event to build an id and validated a dict for every chunk:
+
+    python scripts/benchmark_anthropic_stream.py --tokens 5000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from anthropic.types import RawMessageStreamEvent
+from pydantic import TypeAdapter
+
+from any_llm.providers.anthropic.utils import _AnthropicStreamConverter
+from any_llm.types.completion import ChatCompletionChunk
+
+
+def _recorded_events(tokens: int) -> list[Any]:
+    raw_events: list[dict[str, Any]] = [
+        {
+            "type": "message_start",
+            "message": {
+                "id": "msg_benchmark",
+                "type": "message",
+                "role": "assistant",
+                "model": "claude-benchmark",
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": 100, "output_tokens": 1},
+            },
+        },
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        *(
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": f"token{i} "}}
+            for i in range(tokens)
+        ),
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "content_block_start",
+            "index": 1,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": "search", "input": {}},
+        },
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "{}"}},
+        {"type": "content_block_stop", "index": 1},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": tokens}},
+        {"type": "message_stop"},
+    ]
+    adapter: TypeAdapter[Any] = TypeAdapter(RawMessageStreamEvent)
+    return [adapter.validate_python(event) for event in raw_events]
+
+
+def _legacy_convert(event: Any, model_id: str) -> ChatCompletionChunk:
+    delta: dict[str, Any] = {}
+    if event.type == "content_block_delta" and event.delta.type == "text_delta":
+        delta = {"content": event.delta.text}
+    elif event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+        delta = {"tool_calls": [{"index": 0, "function": {"arguments": event.delta.partial_json}}]}
+    elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+        function = {"name": event.content_block.name, "arguments": ""}
+        delta = {"tool_calls": [{"index": 0, "id": event.content_block.id, "type": "function", "function": function}]}
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": f"chatcmpl-{hash(str(event))}",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": model_id,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None, "logprobs": None}],
+            "usage": None,
+        }
+    )
+
+
+def _legacy_stream(events: list[Any]) -> int:
+    return sum(1 for event in events if _legacy_convert(event, "claude-benchmark") is not None)
+
+
+def _converter_stream(events: list[Any]) -> int:
+    converter = _AnthropicStreamConverter("claude-benchmark")
+    return sum(1 for event in events if converter.convert(event) is not None)
+
+
+def _events_per_second(run: Callable[[list[Any]], int], events: list[Any]) -> float:
+    start = time.perf_counter()
+    run(events)
+    return len(events) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=5000)
+    args = parser.parse_args()
+
+    events = _recorded_events(args.tokens)
+    print(f"{'conversion':<22}{'events/sec':>12}")
+    for name, run in {"per-event (legacy)": _legacy_stream, "stream converter": _converter_stream}.items():
+        print(f"{name:<22}{_events_per_second(run, events):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark stream chunk conversion for OpenAI-compatible providers.
+
+Pushes a canned stream of SDK chunks through `BaseOpenAIProvider._convert_completion_response_async`
+and reports chunks/sec for the current conversion and for the previous
+`model_dump` / normalize / `model_validate` round-trip:
+
+    python scripts/benchmark_openai_chunks.py --chunks 10000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk as OpenAIChatCompletionChunk
+
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.providers.openai.utils import _normalize_openai_dict_response
+from any_llm.types.completion import ChatCompletionChunk
+
+
+class _ValidatingProvider(OpenaiProvider):
+    @staticmethod
+    def _convert_completion_chunk_response(response: Any, **kwargs: Any) -> ChatCompletionChunk:
+        normalized_chunk = _normalize_openai_dict_response(response.model_dump())
+        normalized_chunk["object"] = "chat.completion.chunk"
+        return ChatCompletionChunk.model_validate(normalized_chunk)
+
+
+def _canned_chunks(count: int) -> list[OpenAIChatCompletionChunk]:
+    return [
+        OpenAIChatCompletionChunk.construct(
+            id="chatcmpl-benchmark",
+            object="chat.completion.chunk",
+            created=1700000000,
+            model="gpt-4o",
+            choices=[{"index": 0, "delta": {"content": f"token{i} "}, "finish_reason": None}],
+        )
+        for i in range(count)
+    ]
+
+
+async def _stream(chunks: list[OpenAIChatCompletionChunk]) -> AsyncIterator[OpenAIChatCompletionChunk]:
+    for chunk in chunks:
+        yield chunk
+
+
+async def _chunks_per_second(provider: OpenaiProvider, chunks: list[OpenAIChatCompletionChunk]) -> float:
+    start = time.perf_counter()
+    converted = provider._convert_completion_response_async(_stream(chunks))  # type: ignore[arg-type]
+    assert not isinstance(converted, ChatCompletionChunk)
+    count = 0
+    async for _ in converted:  # type: ignore[union-attr]
+        count += 1
+    elapsed = time.perf_counter() - start
+    assert count == len(chunks)
+    return count / elapsed
+
+
+async def _run(count: int) -> None:
+    providers = {
+        "model_validate": _ValidatingProvider(api_key="benchmark"),
+        "in place": OpenaiProvider(api_key="benchmark"),
+    }
+    print(f"{'conversion':<18}{'chunks/sec':>12}")
+    for name, provider in providers.items():
+        # Fresh chunks for every run, since the in-place conversion mutates them.
+        chunks = _canned_chunks(count)
+        print(f"{name:<18}{await _chunks_per_second(provider, chunks):>12,.0f}")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=10_000)
+    args = parser.parse_args()
+    asyncio.run(_run(args.chunks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Benchmark prepared completions against `acompletion` for the OpenAI, Anthropic and Gemini converters.
+
+Sends `--calls` streaming requests sharing a static prefix (a system prompt, `--examples`
+few-shot exchanges and `--tools` tools) followed by one new user message, through
+`AnyLLM.acompletion` and through a `PreparedCompletion`. The provider clients are replaced by
+stubs, so only the per-call request building is measured:
+
+    python scripts/benchmark_prepared_completion.py --calls 2000 --examples 20 --tools 10
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from any_llm import AnyLLM, LLMProvider
+
+MODELS = {
+    LLMProvider.OPENAI: "gpt-4.1-mini",
+    LLMProvider.ANTHROPIC: "claude-sonnet-4-5",
+    LLMProvider.GEMINI: "gemini-2.5-flash",
+}
+
+
+async def _stub_send(*args: Any, **kwargs: Any) -> None:
+    return None
+
+
+def _stubbed_provider(provider: LLMProvider) -> AnyLLM:
+    llm = AnyLLM.create(provider, api_key="benchmark")
+    client: Any = getattr(llm, "client")  # noqa: B009
+    if provider == LLMProvider.OPENAI:
+        client.chat.completions.create = _stub_send
+    elif provider == LLMProvider.GEMINI:
+        client.aio.models.generate_content_stream = _stub_send
+    # Anthropic streams are only sent once iterated.
+    return llm
+
+
+def _static_prefix(examples: int) -> list[dict[str, Any]]:
+    messages: list[dict[str, Any]] = [{"role": "system", "content": "You triage support tickets. " * 200}]
+    for i in range(examples):
+        messages.append({"role": "user", "content": f"Example ticket {i}: the export fails with a timeout."})
+        messages.append({"role": "assistant", "content": f"Category: bug. Priority: P{i % 4}."})
+    return messages
+
+
+def _tools(count: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": f"route_to_team_{i}",
+                "description": f"Route the ticket to team {i}.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "priority": {"type": "string", "enum": ["P0", "P1", "P2", "P3"]},
+                        "summary": {"type": "string", "description": "One sentence summary."},
+                    },
+                    "required": ["priority", "summary"],
+                },
+            },
+        }
+        for i in range(count)
+    ]
+
+
+async def _calls_per_second(send: Callable[[int], Awaitable[Any]], calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        await send(i)
+    return calls / (time.perf_counter() - start)
+
+
+async def _run(calls: int, examples: int, tools: int) -> None:
+    prefix = _static_prefix(examples)
+    tool_definitions = _tools(tools)
+
+    print(f"{'provider':<12}{'acompletion/sec':>18}{'prepared/sec':>16}{'speedup':>10}")
+    for provider, model in MODELS.items():
+        llm = _stubbed_provider(provider)
+        static_kwargs: dict[str, Any] = {"tools": tool_definitions, "max_tokens": 512, "stream": True}
+        prepared = llm.prepare_completion(model, prefix, **static_kwargs)
+
+        def _new_message(i: int) -> list[dict[str, Any]]:
+            return [{"role": "user", "content": f"Ticket {i}: I can't log in since this morning."}]
+
+        async def _full(i: int, llm: AnyLLM = llm, model: str = model, kwargs: dict[str, Any] = static_kwargs) -> Any:
+            return await llm.acompletion(model=model, messages=[*prefix, *_new_message(i)], **kwargs)
+
+        async def _prepared(i: int, prepared: Any = prepared) -> Any:
+            return await prepared.acompletion(_new_message(i))
+
+        full_rate = await _calls_per_second(_full, calls)
+        prepared_rate = await _calls_per_second(_prepared, calls)
+        print(f"{provider.value:<12}{full_rate:>18,.0f}{prepared_rate:>16,.0f}{prepared_rate / full_rate:>9.1f}x")
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--examples", type=int, default=20)
+    parser.add_argument("--tools", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(_run(args.calls, args.examples, args.tools))
+
+
+if __name__ == "__main__":
+    main()
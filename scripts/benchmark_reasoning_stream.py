@@ -0,0 +1,103 @@
+"""Benchmark the extraction of `<think>` reasoning from streamed content.
+
+Replays streams of `--tokens` small deltas, as HuggingFace, SambaNova, MiniMax or Portkey
+models stream them, through the `ReasoningTagScanner` used by `process_streaming_reasoning_chunks`
+and through the previous buffer scan, which searched the whole buffer for every tag name and
+every tag prefix on every delta:
+
+- `reasoning`: a `<think>` block of `--tokens` deltas followed by a short answer.
+- `split tags`: the same, with the tags split across deltas.
+- `markup`: a short `<think>` block followed by an XML answer of `--tokens` deltas.
+
+The characters of content and reasoning each implementation emits are printed next to its speed:
+
+    python scripts/benchmark_reasoning_stream.py --tokens 50000
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from any_llm.utils.reasoning import ReasoningTagScanner, find_reasoning_tag, is_partial_reasoning_tag
+
+
+def _recorded_streams(tokens: int) -> dict[str, list[str]]:
+    reasoning = [f" step{i}" for i in range(tokens)]
+    answer = [f" word{i}" for i in range(100)]
+    return {
+        "reasoning": ["<think>", *reasoning, "</think>", *answer],
+        "split tags": ["<th", "ink>", *reasoning, "</th", "ink>", *answer],
+        "markup": ["<think>", *reasoning[:100], "</think>", "<answer>", *(f"<w>{i}</w>" for i in range(tokens))],
+    }
+
+
+def _legacy_scan(deltas: list[str]) -> tuple[int, int]:
+    buffer = ""
+    current_tag = None
+    reasoning_buffer = ""
+    content_length = reasoning_length = 0
+    for delta in deltas:
+        buffer += delta
+        while buffer:
+            if current_tag is None:
+                tag_info = find_reasoning_tag(buffer, opening=True)
+                if tag_info:
+                    tag_start, tag_name = tag_info
+                    content_length += tag_start
+                    buffer = buffer[tag_start + len(tag_name) + 2 :]
+                    current_tag = tag_name
+                elif is_partial_reasoning_tag(buffer, opening=True):
+                    break
+                else:
+                    content_length += len(buffer)
+                    buffer = ""
+            else:
+                tag_close = f"</{current_tag}>"
+                tag_end = buffer.find(tag_close)
+                if tag_end != -1:
+                    reasoning_length += len(reasoning_buffer) + tag_end
+                    reasoning_buffer = ""
+                    buffer = buffer[tag_end + len(tag_close) :]
+                    current_tag = None
+                elif is_partial_reasoning_tag(buffer, opening=False):
+                    reasoning_buffer += buffer
+                    buffer = ""
+                    break
+                else:
+                    reasoning_buffer += buffer
+                    buffer = ""
+    return content_length, reasoning_length
+
+
+def _scanner_scan(deltas: list[str]) -> tuple[int, int]:
+    scanner = ReasoningTagScanner()
+    content_length = reasoning_length = 0
+    for delta in deltas:
+        content, reasoning = scanner.feed(delta)
+        content_length += len(content)
+        reasoning_length += len(reasoning)
+    content, reasoning = scanner.flush()
+    return content_length + len(content), reasoning_length + len(reasoning)
+
+
+def _deltas_per_second(run: Callable[[list[str]], tuple[int, int]], deltas: list[str]) -> tuple[float, tuple[int, int]]:
+    start = time.perf_counter()
+    lengths = run(deltas)
+    return len(deltas) / (time.perf_counter() - start), lengths
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(f"{'stream':<12}{'scan':<22}{'deltas/sec':>14}{'content':>12}{'reasoning':>12}")
+    for stream, deltas in _recorded_streams(args.tokens).items():
+        for name, run in {"buffer scan (legacy)": _legacy_scan, "tag scanner": _scanner_scan}.items():
+            rate, (content_length, reasoning_length) = _deltas_per_second(run, deltas)
+            print(f"{stream:<12}{name:<22}{rate:>14,.0f}{content_length:>12,}{reasoning_length:>12,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Microbenchmark of the per-chunk overhead of the synchronous streaming API.
+
+Compares `any_llm.utils.aio.async_iter_to_sync_iter` with the previous implementation, which
+created a thread and a new event loop (`asyncio.run`) for every chunk when called from inside
+a running loop (Jupyter, Streamlit, sync handlers running under an async server):
+
+    python scripts/benchmark_sync_bridge.py --chunks 2000
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import time
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+from typing import Any, TypeVar
+
+from any_llm.utils.aio import async_iter_to_sync_iter
+
+T = TypeVar("T")
+
+
+def _legacy_run_async_in_sync(coro: Coroutine[Any, Any, T]) -> T:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        try:
+            return asyncio.get_event_loop().run_until_complete(coro)
+        except RuntimeError:
+            return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def _legacy_async_iter_to_sync_iter(async_iter: AsyncIterator[T]) -> Iterator[T]:
+    while True:
+        try:
+            yield _legacy_run_async_in_sync(async_iter.__anext__())  # type: ignore[arg-type]
+        except StopAsyncIteration:
+            break
+
+
+async def _stream(chunks: int) -> AsyncIterator[int]:
+    for i in range(chunks):
+        yield i
+
+
+def _per_chunk_us(bridge: Callable[[AsyncIterator[int]], Iterator[int]], chunks: int) -> float:
+    start = time.perf_counter()
+    consumed = sum(1 for _ in bridge(_stream(chunks)))
+    elapsed = time.perf_counter() - start
+    assert consumed == chunks
+    return elapsed / chunks * 1e6
+
+
+def main() -> None:
+    """Run the benchmark and print the per-chunk overhead of both bridges."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000)
+    args = parser.parse_args()
+
+    bridges = {"legacy": _legacy_async_iter_to_sync_iter, "background loop": async_iter_to_sync_iter}
+
+    print(f"{'context':<16}{'bridge':<18}{'us/chunk':>10}")
+    for name, bridge in bridges.items():
+        print(f"{'no loop':<16}{name:<18}{_per_chunk_us(bridge, args.chunks):>10.1f}")
+
+    async def inside_running_loop() -> None:
+        for name, bridge in bridges.items():
+            print(f"{'running loop':<16}{name:<18}{_per_chunk_us(bridge, args.chunks):>10.1f}")
+
+    asyncio.run(inside_running_loop())
+
+
+if __name__ == "__main__":
+    main()
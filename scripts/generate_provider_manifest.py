@@ -0,0 +1,46 @@
+"""Generate the static provider metadata manifest.
+
+The manifest lets `AnyLLM.get_all_provider_metadata()` answer capability queries without importing
+every provider SDK. Run this script whenever a provider is added or one of its class-level flags changes:
+
+    python scripts/generate_provider_manifest.py
+
+`tests/unit/test_provider_manifest.py` fails when the manifest is out of date.
+"""
+
+from pathlib import Path
+
+from any_llm import AnyLLM
+from any_llm.constants import LLMProvider
+
+MANIFEST_PATH = Path(__file__).parent.parent / "src" / "any_llm" / "providers" / "manifest.py"
+
+HEADER = """# This file is generated by scripts/generate_provider_manifest.py. Do not edit it by hand.
+from typing import Any
+
+PROVIDER_MANIFEST: dict[str, dict[str, Any]] = {
+"""
+
+
+def render_manifest() -> str:
+    """Render the manifest module from the provider classes."""
+    lines = [HEADER]
+    for provider in sorted(LLMProvider, key=lambda p: p.value):
+        metadata = AnyLLM.get_provider_class(provider).get_provider_metadata()
+        lines.append(f'    "{provider.value}": {{\n')
+        for field, value in metadata.model_dump().items():
+            rendered = f'"{value}"' if isinstance(value, str) else repr(value)
+            lines.append(f'        "{field}": {rendered},\n')
+        lines.append("    },\n")
+    lines.append("}\n")
+    return "".join(lines)
+
+
+def main() -> None:
+    """Write the manifest module."""
+    MANIFEST_PATH.write_text(render_manifest())
+    print(f"Wrote {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
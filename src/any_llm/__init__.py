@@ -1,7 +1,22 @@
 from importlib.metadata import PackageNotFoundError, version
 
 from any_llm.any_llm import AnyLLM
-from any_llm.api import acompletion, aembedding, alist_models, aresponses, completion, embedding, list_models, responses
+from any_llm.api import (
+    acompletion,
+    aembedding,
+    aembedding_many,
+    alist_models,
+    aresponses,
+    arun_agent,
+    awarmup,
+    completion,
+    embedding,
+    embedding_many,
+    list_models,
+    responses,
+    run_agent,
+    warmup,
+)
 from any_llm.constants import LLMProvider
 from any_llm.exceptions import (
     AnyLLMError,
@@ -39,10 +54,16 @@ __all__ = [
     "UnsupportedProviderError",
     "acompletion",
     "aembedding",
+    "aembedding_many",
     "alist_models",
     "aresponses",
+    "arun_agent",
+    "awarmup",
     "completion",
     "embedding",
+    "embedding_many",
     "list_models",
     "responses",
+    "run_agent",
+    "warmup",
 ]
@@ -0,0 +1,281 @@
+"""Run the tool calls of a model until it answers.
+
+[AnyLLM.arun_tools][any_llm.any_llm.AnyLLM.arun_tools] sends a completion request with callables as
+tools, runs the tool calls of the response, appends their results to the conversation and sends it
+again, until the model answers without calling a tool:
+
+```python
+from any_llm import AnyLLM
+
+llm = AnyLLM.create("openai")
+result = await llm.arun_tools(
+    model="gpt-4.1-mini",
+    messages=[{"role": "user", "content": "What's the weather in Paris and in Rome?"}],
+    tools=[get_weather],
+    tool_timeout=10,
+)
+print(result.content)
+for step in result.steps:
+    print(step.completion_seconds, step.tools_seconds, step.prompt_tokens, step.completion_tokens)
+```
+
+The tool calls of one response run concurrently: coroutine functions on the event loop, other
+callables in a thread pool of `max_tool_workers` threads. Arguments are parsed once per call, and
+the results are appended in the order of the calls, as providers expect. A tool raising an error,
+timing out or called with invalid arguments doesn't stop the loop: the error is sent to the model as
+the tool's result, so it can recover.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+from any_llm.tools import ToolSet
+from any_llm.types.completion import ChatCompletion, ChatCompletionMessage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from concurrent.futures import Executor
+
+    from openai.types.chat import ChatCompletionMessageToolCallUnion
+
+    from any_llm.any_llm import AnyLLM
+
+DEFAULT_MAX_STEPS = 10
+"""Number of completion requests after which `arun_tools` stops, even if the model still calls tools."""
+
+DEFAULT_TOOL_WORKERS = 8
+"""Number of threads running the synchronous tools of one `arun_tools` call."""
+
+
+@dataclass
+class ToolResult:
+    """The result of one tool call."""
+
+    tool_call_id: str
+    name: str
+    content: str
+    """The result sent to the model: the tool's output as text, or a description of the error."""
+    arguments: dict[str, Any] | None = None
+    """The parsed arguments, or None if they aren't a valid JSON object."""
+    output: Any = None
+    """The value returned by the tool."""
+    error: Exception | None = None
+    """The error raised by the tool, or while calling it (unknown tool, invalid arguments, timeout)."""
+    seconds: float = 0.0
+
+    def to_message(self) -> dict[str, Any]:
+        """Return the tool message sending this result to the model."""
+        return {"role": "tool", "tool_call_id": self.tool_call_id, "name": self.name, "content": self.content}
+
+
+@dataclass
+class AgentStep:
+    """One completion request of `arun_tools` and the tool calls of its response."""
+
+    response: ChatCompletion
+    tool_results: list[ToolResult] = field(default_factory=list)
+    completion_seconds: float = 0.0
+    """Latency of the completion request."""
+    tools_seconds: float = 0.0
+    """Time spent running the tool calls, concurrently."""
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Prompt tokens of the request, 0 if the provider doesn't report usage."""
+        return self.response.usage.prompt_tokens if self.response.usage else 0
+
+    @property
+    def completion_tokens(self) -> int:
+        """Completion tokens of the response, 0 if the provider doesn't report usage."""
+        return self.response.usage.completion_tokens if self.response.usage else 0
+
+    @property
+    def total_seconds(self) -> float:
+        """Latency of the step, request and tool calls."""
+        return self.completion_seconds + self.tools_seconds
+
+
+@dataclass
+class AgentResult:
+    """The conversation and statistics of an `arun_tools` call."""
+
+    messages: list[dict[str, Any] | ChatCompletionMessage]
+    """The messages sent, followed by the assistant messages and tool results of every step."""
+    steps: list[AgentStep]
+    finished: bool
+    """Whether the model answered without calling tools. False if the step limit was reached first."""
+
+    @property
+    def response(self) -> ChatCompletion:
+        """The last response of the model."""
+        return self.steps[-1].response
+
+    @property
+    def content(self) -> str | None:
+        """The content of the last response of the model."""
+        return self.response.choices[0].message.content
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Prompt tokens of every step."""
+        return sum(step.prompt_tokens for step in self.steps)
+
+    @property
+    def completion_tokens(self) -> int:
+        """Completion tokens of every step."""
+        return sum(step.completion_tokens for step in self.steps)
+
+    @property
+    def total_seconds(self) -> float:
+        """Latency of every step."""
+        return sum(step.total_seconds for step in self.steps)
+
+
+async def arun_tools(
+    llm: AnyLLM,
+    model: str,
+    messages: Sequence[dict[str, Any] | ChatCompletionMessage],
+    tools: ToolSet | Sequence[dict[str, Any] | Callable[..., Any]],
+    *,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    tool_timeout: float | Mapping[str, float] | None = None,
+    max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+    **kwargs: Any,
+) -> AgentResult:
+    """Run the tool calls of `llm`'s responses until it answers.
+
+    See [AnyLLM.arun_tools][any_llm.any_llm.AnyLLM.arun_tools]
+    """
+    if kwargs.get("stream"):
+        msg = "arun_tools doesn't support stream=True"
+        raise ValueError(msg)
+    toolset = tools if isinstance(tools, ToolSet) else ToolSet(tools)
+    conversation = list(messages)
+    steps: list[AgentStep] = []
+    executor: ThreadPoolExecutor | None = None
+    try:
+        for _ in range(max_steps):
+            start = time.perf_counter()
+            response = await llm.acompletion(model=model, messages=conversation, tools=toolset, **kwargs)
+            assert isinstance(response, ChatCompletion)
+            step = AgentStep(response=response, completion_seconds=time.perf_counter() - start)
+            steps.append(step)
+            message = response.choices[0].message
+            conversation.append(message)
+            if not message.tool_calls:
+                return AgentResult(messages=conversation, steps=steps, finished=True)
+
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_tool_workers, thread_name_prefix="any-llm-tool")
+            start = time.perf_counter()
+            step.tool_results = await aexecute_tool_calls(
+                message.tool_calls, toolset.functions, tool_timeout=tool_timeout, executor=executor
+            )
+            step.tools_seconds = time.perf_counter() - start
+            conversation.extend(result.to_message() for result in step.tool_results)
+    finally:
+        if executor is not None:
+            # Don't wait for the threads of timed out tools.
+            executor.shutdown(wait=False, cancel_futures=True)
+    return AgentResult(messages=conversation, steps=steps, finished=False)
+
+
+async def aexecute_tool_calls(
+    tool_calls: Sequence[ChatCompletionMessageToolCallUnion],
+    functions: Mapping[str, Callable[..., Any]],
+    *,
+    tool_timeout: float | Mapping[str, float] | None = None,
+    executor: Executor | None = None,
+) -> list[ToolResult]:
+    """Run `tool_calls` concurrently and return their results in the same order.
+
+    Args:
+        tool_calls: The tool calls of a response, e.g. `response.choices[0].message.tool_calls`.
+        functions: The callables of the tools, by name, e.g. [ToolSet.functions][any_llm.tools.ToolSet].
+        tool_timeout: Seconds after which a tool call is abandoned, for every tool or by tool name.
+            A synchronous tool can't be interrupted: its thread keeps running after the timeout.
+        executor: The executor running the synchronous tools. Defaults to the event loop's default executor.
+
+    Returns:
+        The result of each call. Errors are returned in the results instead of being raised.
+
+    """
+    return list(
+        await asyncio.gather(*(_aexecute_tool_call(call, functions, tool_timeout, executor) for call in tool_calls))
+    )
+
+
+async def _aexecute_tool_call(
+    tool_call: ChatCompletionMessageToolCallUnion,
+    functions: Mapping[str, Callable[..., Any]],
+    tool_timeout: float | Mapping[str, float] | None,
+    executor: Executor | None,
+) -> ToolResult:
+    function = getattr(tool_call, "function", None)
+    if function is None:
+        name = getattr(getattr(tool_call, "custom", None), "name", tool_call.type)
+        return _error_result(tool_call.id, name, None, ValueError("Only function tools can be called"))
+    name = function.name
+    tool = functions.get(name)
+    if tool is None:
+        return _error_result(tool_call.id, name, None, ValueError(f"Unknown tool {name!r}"))
+    try:
+        arguments = json.loads(function.arguments or "{}")
+    except ValueError as e:
+        return _error_result(tool_call.id, name, None, ValueError(f"Invalid JSON arguments: {e}"))
+    if not isinstance(arguments, dict):
+        return _error_result(tool_call.id, name, None, ValueError("Arguments must be a JSON object"))
+
+    timeout = tool_timeout.get(name) if isinstance(tool_timeout, Mapping) else tool_timeout
+    start = time.perf_counter()
+    try:
+        if inspect.iscoroutinefunction(tool):
+            awaitable = tool(**arguments)
+        else:
+            awaitable = asyncio.get_running_loop().run_in_executor(executor, functools.partial(tool, **arguments))
+        output = await asyncio.wait_for(awaitable, timeout)
+    except TimeoutError:
+        error = TimeoutError(f"Tool {name!r} timed out after {timeout} seconds")
+        return _error_result(tool_call.id, name, arguments, error, time.perf_counter() - start)
+    except Exception as e:
+        return _error_result(tool_call.id, name, arguments, e, time.perf_counter() - start)
+    return ToolResult(
+        tool_call_id=tool_call.id,
+        name=name,
+        content=_tool_output_to_text(output),
+        arguments=arguments,
+        output=output,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def _error_result(
+    tool_call_id: str, name: str, arguments: dict[str, Any] | None, error: Exception, seconds: float = 0.0
+) -> ToolResult:
+    return ToolResult(
+        tool_call_id=tool_call_id,
+        name=name,
+        content=f"Error: {type(error).__name__}: {error}",
+        arguments=arguments,
+        error=error,
+        seconds=seconds,
+    )
+
+
+def _tool_output_to_text(output: Any) -> str:
+    if isinstance(output, str):
+        return output
+    if isinstance(output, BaseModel):
+        return output.model_dump_json()
+    return json.dumps(output, default=str)
@@ -1,31 +1,55 @@
 # Inspired by https://github.com/andrewyng/aisuite/tree/main/aisuite
 from __future__ import annotations
 
+import asyncio
 import importlib
+import inspect
+import json
 import os
+import time
 import warnings
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, ClassVar
 
+import httpx
+from pydantic import BaseModel
+
+from any_llm.agent import DEFAULT_MAX_STEPS, DEFAULT_TOOL_WORKERS, arun_tools
 from any_llm.constants import INSIDE_NOTEBOOK, LLMProvider
 from any_llm.exceptions import MissingApiKeyError, UnsupportedProviderError
+from any_llm.providers.manifest import PROVIDER_MANIFEST
+from any_llm.rate_limit import (
+    estimate_completion_tokens,
+    estimate_embedding_tokens,
+    get_default_rate_limiter,
+    observe_response_headers,
+)
 from any_llm.tools import prepare_tools
+from any_llm.transport import TransportConfig, get_default_transport
+from any_llm.types.batch import BatchResult
 from any_llm.types.completion import ChatCompletion, ChatCompletionMessage, CompletionParams, ReasoningEffort
-from any_llm.types.provider import PlatformKey, ProviderMetadata
+from any_llm.types.provider import PlatformKey, ProviderMetadata, WarmupResult
 from any_llm.types.responses import Response, ResponseInputParam, ResponsesParams, ResponseStreamEvent
 from any_llm.utils.aio import async_iter_to_sync_iter, run_async_in_sync
 from any_llm.utils.decorators import BATCH_API_EXPERIMENTAL_MESSAGE, experimental
+from any_llm.utils.embeddings import DEFAULT_EMBEDDING_CONCURRENCY, aembed_in_batches
 from any_llm.utils.exception_handler import handle_exceptions
+from any_llm.utils.structured_output import astream_structured_output
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncIterator, Callable, Iterator, Sequence
-
-    from pydantic import BaseModel
-
+    from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
+
+    from any_llm.agent import AgentResult
+    from any_llm.batch import LocalBatchExecutor
+    from any_llm.cache import CompletionCache
+    from any_llm.prepared import PreparedCompletion
+    from any_llm.rate_limit import RateLimiter
+    from any_llm.tools import ToolSet
     from any_llm.types.batch import Batch
     from any_llm.types.completion import (
         ChatCompletionChunk,
         CreateEmbeddingResponse,
+        EmbeddingBatch,
     )
     from any_llm.types.model import Model
 
@@ -88,15 +112,86 @@ class AnyLLM(ABC):
     For example, in `gemini` provider, this could include `google.genai.types.Tool`.
     """
 
+    EMBEDDING_MAX_BATCH_SIZE: int = 100
+    """Maximum number of inputs the provider accepts in one embedding request.
+
+    The default is a best effort for providers without a documented limit, e.g. self-hosted servers, or
+    providers whose `_aembedding` already sends one request per input (SageMaker).
+    """
+
+    EMBEDDING_MAX_BATCH_TOKENS: int | None = None
+    """Maximum number of input tokens the provider accepts in one embedding request, if limited."""
+
+    LAZY_CLIENT_ATTRIBUTES: ClassVar[tuple[str, ...]] = ()
+    """Dotted paths of SDK client attributes that import their modules on first access, e.g. `"chat.completions"`.
+
+    They are accessed by `awarmup`, so the first request doesn't pay for the imports.
+    """
+
     ANY_LLM_KEY: str = "ANY_LLM_KEY"
 
+    cache: CompletionCache | None = None
+    """Response cache used by `acompletion` and `aembedding`, see [any_llm.cache][any_llm.cache]. Disabled by default."""
+
+    rate_limiter: RateLimiter | None = None
+    """Rate limiter used by `acompletion` and `aembedding`, see [any_llm.rate_limit][any_llm.rate_limit].
+
+    Defaults to the limiter set with `any_llm.rate_limit.set_default_rate_limiter`, if any.
+    """
+
+    transport: TransportConfig | None = None
+    """HTTP connection settings of the provider's SDK client, see [any_llm.transport][any_llm.transport].
+
+    Set with the `transport` argument of `AnyLLM.create`. Defaults to the settings set with
+    `any_llm.transport.set_default_transport`, if any.
+    """
+
+    local_batches: LocalBatchExecutor | None = None
+    """Executor running the batches of providers without a native Batch API, see [any_llm.batch][any_llm.batch].
+
+    Created on first use, storing batches in `~/.cache/any-llm/batches`.
+    """
+
     def __init__(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
         self._verify_no_missing_packages()
+        if isinstance(kwargs.get("transport"), TransportConfig):
+            # Other `transport` values are arguments of the SDK client (e.g. an httpx transport for Ollama).
+            self.transport = kwargs.pop("transport")
         self._init_client(
             api_key=self._verify_and_set_api_key(api_key),
             api_base=api_base,
             **kwargs,
         )
+        self._observe_rate_limit_headers()
+
+    def _observe_rate_limit_headers(self) -> None:
+        """Let the rate limiter read the headers of every response of an httpx based SDK client."""
+        http_client = getattr(getattr(self, "client", None), "_client", None)
+        if isinstance(http_client, httpx.AsyncClient):
+            hooks = http_client.event_hooks["response"]
+            if observe_response_headers not in hooks:
+                hooks.append(observe_response_headers)
+
+    def _add_http_client(
+        self,
+        client_kwargs: dict[str, Any],
+        argument: str,
+        base_url: str | None = None,
+        client_class: type[Any] | None = None,
+    ) -> None:
+        """Add an HTTP client built from the provider's transport settings to the SDK client arguments.
+
+        Nothing is added without transport settings, or if the `argument` client is already given.
+        `client_class` is the SDK's default client class, if it has one.
+        """
+        transport = self._transport_config()
+        if transport is None or client_kwargs.get(argument) is not None:
+            return
+        http_client_kwargs = {"client_class": client_class} if client_class is not None else {}
+        client_kwargs[argument] = transport.async_client(base_url or self.PROVIDER_NAME, **http_client_kwargs)
+
+    def _transport_config(self) -> TransportConfig | None:
+        return self.transport or get_default_transport()
 
     def _verify_no_missing_packages(self) -> None:
         if self.MISSING_PACKAGES_ERROR is not None:
@@ -123,7 +218,9 @@ class AnyLLM(ABC):
             provider: The provider name (e.g., 'openai', 'anthropic')
             api_key: API key for the provider
             api_base: Base URL for the provider API
-            **kwargs: Additional provider-specific arguments
+            **kwargs: Additional provider-specific arguments. A `transport` given as a
+                [TransportConfig][any_llm.transport.TransportConfig] configures the HTTP client of the
+                provider SDK; other `transport` values are passed to the SDK client.
 
         Returns:
             Provider instance for the specified provider
@@ -214,19 +311,37 @@ class AnyLLM(ABC):
         """Get a list of supported provider keys."""
         return [provider.value for provider in LLMProvider]
 
+    @classmethod
+    def get_provider_metadata_for(cls, provider_key: str | LLMProvider) -> ProviderMetadata:
+        """Get the metadata of a provider without importing its module or SDK.
+
+        The metadata is read from a static manifest generated from the provider classes,
+        so capability queries stay cheap even when the provider packages are heavy.
+
+        Args:
+            provider_key: The provider key (e.g., 'anthropic', 'openai')
+
+        Returns:
+            The provider metadata
+
+        """
+        provider_key = LLMProvider.from_string(provider_key).value
+        return ProviderMetadata(**PROVIDER_MANIFEST[provider_key])
+
     @classmethod
     def get_all_provider_metadata(cls) -> list[ProviderMetadata]:
         """Get metadata for all supported providers.
 
+        Provider modules are not imported, see
+        [AnyLLM.get_provider_metadata_for][any_llm.any_llm.AnyLLM.get_provider_metadata_for].
+
         Returns:
             List of dictionaries containing provider metadata
 
         """
         providers: list[ProviderMetadata] = []
         for provider_key in cls.get_supported_providers():
-            provider_class = cls.get_provider_class(provider_key)
-            metadata = provider_class.get_provider_metadata()
-            providers.append(metadata)
+            providers.append(cls.get_provider_metadata_for(provider_key))
 
         # Sort providers by name
         providers.sort(key=lambda x: x.name)
@@ -341,6 +456,80 @@ class AnyLLM(ABC):
         msg = "Subclasses must implement this method"
         raise NotImplementedError(msg)
 
+    async def aclose(self) -> None:
+        """Close the underlying SDK client and release its connection pool.
+
+        Providers whose client exposes neither `aclose` nor `close` are left untouched.
+        """
+        client = getattr(self, "client", None)
+        if client is None:
+            return
+        for method_name in ("aclose", "close"):
+            close = getattr(client, method_name, None)
+            if callable(close):
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+                return
+
+    def warmup(self, connections: int = 1, **kwargs: Any) -> WarmupResult:
+        """Warm up the provider synchronously.
+
+        See [AnyLLM.awarmup][any_llm.any_llm.AnyLLM.awarmup]
+        """
+        allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        return run_async_in_sync(self.awarmup(connections), allow_running_loop=allow_running_loop)
+
+    async def awarmup(self, connections: int = 1) -> WarmupResult:
+        """Prepare the provider for its first request.
+
+        Imports the modules the SDK client loads on first use, then opens `connections` connections
+        to the provider's API by sending as many concurrent models-list requests, which are
+        authenticated but don't use any tokens. The connections stay in the client's pool until they
+        are idle for longer than its keep-alive expiry: use a
+        [TransportConfig][any_llm.transport.TransportConfig] with a longer `keepalive_expiry` to keep
+        them open until the first request. Providers without a Models API are only preloaded.
+
+        Errors don't interrupt the warm-up: the first one is returned in the result.
+
+        Args:
+            connections: Number of connections to open.
+
+        Returns:
+            The timings of the warm-up.
+
+        """
+        result = WarmupResult(provider=self.PROVIDER_NAME)
+        start = time.perf_counter()
+        try:
+            self._preload()
+        except Exception as e:
+            result.error = e
+        result.preload_seconds = time.perf_counter() - start
+        if connections < 1 or not self.SUPPORTS_LIST_MODELS or result.error is not None:
+            return result
+
+        async def _open_connection() -> Exception | None:
+            try:
+                await self.alist_models()
+            except Exception as e:
+                return e
+            return None
+
+        start = time.perf_counter()
+        errors = await asyncio.gather(*(_open_connection() for _ in range(connections)))
+        result.connect_seconds = time.perf_counter() - start
+        result.connections = errors.count(None)
+        result.error = next((error for error in errors if error is not None), None)
+        return result
+
+    def _preload(self) -> None:
+        """Access the `LAZY_CLIENT_ATTRIBUTES` of the SDK client."""
+        for path in self.LAZY_CLIENT_ATTRIBUTES:
+            target = getattr(self, "client", None)
+            for name in path.split("."):
+                target = getattr(target, name)
+
     def completion(
         self,
         **kwargs: Any,
@@ -394,7 +583,8 @@ class AnyLLM(ABC):
             temperature: Controls randomness in the response (0.0 to 2.0)
             top_p: Controls diversity via nucleus sampling (0.0 to 1.0)
             max_tokens: Maximum number of tokens to generate
-            response_format: Format specification for the response
+            response_format: Format specification for the response. With `stream=True` and a pydantic model,
+                chunks carry the object parsed so far in `delta.parsed`.
             stream: Whether to stream the response
             n: Number of completions to generate
             stop: Stop sequences for generation
@@ -410,11 +600,14 @@ class AnyLLM(ABC):
             max_completion_tokens: Maximum number of tokens for the completion
             reasoning_effort: Reasoning effort level for models that support it. "auto" will map to each provider's default.
             **kwargs: Additional provider-specific arguments that will be passed to the provider's API call.
+                `cache` is reserved: pass a [CompletionCache][any_llm.cache.CompletionCache] to use it for this call
+                instead of `self.cache`, or `False` to bypass the cache.
 
         Returns:
             The completion response from the provider
 
         """
+        cache = self._resolve_cache(kwargs.pop("cache", None))
         prepared_tools = None
         if tools:
             prepared_tools = prepare_tools(tools, built_in_tools=self.BUILT_IN_TOOLS)
@@ -452,7 +645,155 @@ class AnyLLM(ABC):
             reasoning_effort=reasoning_effort,
         )
 
-        return await self._acompletion(params, **kwargs)
+        if cache is not None:
+            response = await cache.acompletion(
+                self.PROVIDER_NAME, params, kwargs, lambda: self._arate_limited_completion(params, kwargs)
+            )
+        else:
+            response = await self._arate_limited_completion(params, kwargs)
+        return _parse_structured_stream(response, response_format)
+
+    async def _arate_limited_completion(
+        self, params: CompletionParams, kwargs: dict[str, Any]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        rate_limiter = self.rate_limiter or get_default_rate_limiter()
+        if rate_limiter is None:
+            return await self._acompletion(params, **kwargs)
+        return await rate_limiter.acall(
+            self.PROVIDER_NAME,
+            params.model_id,
+            estimate_completion_tokens(params),
+            # Providers may convert `params` in place: every attempt gets its own copy.
+            lambda: self._acompletion(params.model_copy(deep=True), **kwargs),
+        )
+
+    def _resolve_cache(self, cache: CompletionCache | bool | None) -> CompletionCache | None:
+        """Return the cache to use for a call given its `cache` argument."""
+        if cache is False:
+            if self.cache is not None:
+                self.cache.stats.bypasses += 1
+            return None
+        if cache is None or cache is True:
+            return self.cache
+        return cache
+
+    def prepare_completion(
+        self,
+        model: str,
+        messages: Sequence[dict[str, Any] | ChatCompletionMessage] = (),
+        **kwargs: Any,
+    ) -> PreparedCompletion:
+        """Convert the static part of a completion request once, to send it many times.
+
+        Args:
+            model: Model identifier for the chosen provider.
+            messages: Messages shared by every request, e.g. the system prompt and few-shot examples.
+            **kwargs: Any other argument of [AnyLLM.acompletion][any_llm.any_llm.AnyLLM.acompletion]
+                shared by every request (`tools`, `response_format`, `temperature`, ...).
+
+        Returns:
+            A [PreparedCompletion][any_llm.prepared.PreparedCompletion], called with the messages
+            to append to `messages` and any per-call overrides.
+
+        """
+        from any_llm.prepared import PreparedCompletion
+
+        return PreparedCompletion(self, model, messages, **kwargs)
+
+    def run_tools(
+        self,
+        model: str,
+        messages: Sequence[dict[str, Any] | ChatCompletionMessage],
+        tools: ToolSet | Sequence[dict[str, Any] | Callable[..., Any]],
+        **kwargs: Any,
+    ) -> AgentResult:
+        """Run the tool calls of the model until it answers, synchronously.
+
+        See [AnyLLM.arun_tools][any_llm.any_llm.AnyLLM.arun_tools]
+        """
+        allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        return run_async_in_sync(
+            self.arun_tools(model, messages, tools, **kwargs), allow_running_loop=allow_running_loop
+        )
+
+    async def arun_tools(
+        self,
+        model: str,
+        messages: Sequence[dict[str, Any] | ChatCompletionMessage],
+        tools: ToolSet | Sequence[dict[str, Any] | Callable[..., Any]],
+        *,
+        max_steps: int = DEFAULT_MAX_STEPS,
+        tool_timeout: float | Mapping[str, float] | None = None,
+        max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+        **kwargs: Any,
+    ) -> AgentResult:
+        """Send a completion request, run the tool calls of the response and repeat until the model answers.
+
+        The tool calls of each response run concurrently, see [any_llm.agent][any_llm.agent]. Their
+        results are appended to the conversation in the order of the calls, and sent to the model
+        with the next request.
+
+        Args:
+            model: Model identifier for the chosen provider.
+            messages: The conversation to start from. It isn't modified: the result holds the new messages.
+            tools: The tools the model can call: callables, run when the model calls them, or a
+                [ToolSet][any_llm.tools.ToolSet]. Tools without a callable (OpenAI tool dicts) are
+                sent to the model, but calling them returns an error.
+            max_steps: Maximum number of completion requests. When the model still calls tools in the
+                last response, their results are appended and the result is marked as not finished.
+            tool_timeout: Seconds after which a tool call is abandoned and an error is sent to the
+                model instead, for every tool or by tool name.
+            max_tool_workers: Number of threads running the synchronous tools.
+            **kwargs: Any other argument of [AnyLLM.acompletion][any_llm.any_llm.AnyLLM.acompletion],
+                except `stream`.
+
+        Returns:
+            The conversation, the last response and the latency and token counts of each step.
+
+        """
+        return await arun_tools(
+            self,
+            model,
+            messages,
+            tools,
+            max_steps=max_steps,
+            tool_timeout=tool_timeout,
+            max_tool_workers=max_tool_workers,
+            **kwargs,
+        )
+
+    def _prepare_completion_request(self, params: CompletionParams, **kwargs: Any) -> Any:
+        """Convert `params` to the request `_acompletion_prepared` sends.
+
+        Providers returning None (the default) send prepared completions through `_acompletion`.
+        """
+        return None
+
+    async def _acompletion_prepared(
+        self, request: Any, params: CompletionParams, messages: list[dict[str, Any]]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        """Send a request built by `_prepare_completion_request`, with `messages` appended to it.
+
+        `request` and `params` are shared between calls and must not be modified.
+        """
+        msg = "Providers implementing _prepare_completion_request must implement _acompletion_prepared"
+        raise NotImplementedError(msg)
+
+    @handle_exceptions(wrap_streaming=True)
+    async def _arate_limited_prepared_completion(
+        self, request: Any, params: CompletionParams, messages: list[dict[str, Any]], estimated_tokens: int
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        rate_limiter = self.rate_limiter or get_default_rate_limiter()
+        if rate_limiter is None:
+            response = await self._acompletion_prepared(request, params, messages)
+        else:
+            response = await rate_limiter.acall(
+                self.PROVIDER_NAME,
+                params.model_id,
+                estimated_tokens,
+                lambda: self._acompletion_prepared(request, params, messages),
+            )
+        return _parse_structured_stream(response, params.response_format)
 
     async def _acompletion(
         self, params: CompletionParams, **kwargs: Any
@@ -563,7 +904,25 @@ class AnyLLM(ABC):
 
     @handle_exceptions()
     async def aembedding(self, model: str, inputs: str | list[str], **kwargs: Any) -> CreateEmbeddingResponse:
-        return await self._aembedding(model, inputs, **kwargs)
+        cache = self._resolve_cache(kwargs.pop("cache", None))
+        if cache is not None:
+            return await cache.aembedding(
+                self.PROVIDER_NAME, model, inputs, kwargs, lambda: self._arate_limited_embedding(model, inputs, kwargs)
+            )
+        return await self._arate_limited_embedding(model, inputs, kwargs)
+
+    async def _arate_limited_embedding(
+        self, model: str, inputs: str | list[str], kwargs: dict[str, Any]
+    ) -> CreateEmbeddingResponse:
+        rate_limiter = self.rate_limiter or get_default_rate_limiter()
+        if rate_limiter is None:
+            return await self._aembedding(model, inputs, **kwargs)
+        return await rate_limiter.acall(
+            self.PROVIDER_NAME,
+            model,
+            estimate_embedding_tokens(inputs),
+            lambda: self._aembedding(model, inputs, **kwargs),
+        )
 
     async def _aembedding(self, model: str, inputs: str | list[str], **kwargs: Any) -> CreateEmbeddingResponse:
         if not self.SUPPORTS_EMBEDDING:
@@ -572,6 +931,77 @@ class AnyLLM(ABC):
         msg = "Subclasses must implement _aembedding method"
         raise NotImplementedError(msg)
 
+    def embedding_many(
+        self,
+        model: str,
+        inputs: Iterable[str],
+        *,
+        batch_size: int | None = None,
+        max_batch_tokens: int | None = None,
+        max_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+        as_numpy: bool = False,
+        **kwargs: Any,
+    ) -> Iterator[EmbeddingBatch]:
+        """Embed a large number of inputs in batches synchronously.
+
+        See [AnyLLM.aembedding_many][any_llm.any_llm.AnyLLM.aembedding_many]
+        """
+        allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        return async_iter_to_sync_iter(
+            self.aembedding_many(
+                model,
+                inputs,
+                batch_size=batch_size,
+                max_batch_tokens=max_batch_tokens,
+                max_concurrency=max_concurrency,
+                as_numpy=as_numpy,
+                **kwargs,
+            ),
+            allow_running_loop=allow_running_loop,
+        )
+
+    async def aembedding_many(
+        self,
+        model: str,
+        inputs: Iterable[str] | AsyncIterable[str],
+        *,
+        batch_size: int | None = None,
+        max_batch_tokens: int | None = None,
+        max_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+        as_numpy: bool = False,
+        **kwargs: Any,
+    ) -> AsyncIterator[EmbeddingBatch]:
+        """Embed a large number of inputs in batches, running several requests concurrently.
+
+        The inputs are split into batches that respect the provider's request limits
+        (`EMBEDDING_MAX_BATCH_SIZE` and `EMBEDDING_MAX_BATCH_TOKENS`), and the batches are
+        yielded in input order as soon as they are ready.
+
+        Args:
+            model: Model identifier for the chosen provider (e.g., 'text-embedding-3-small').
+            inputs: The texts to embed, as an iterable or an async iterable.
+            batch_size: Maximum number of inputs per request. Defaults to the provider limit.
+            max_batch_tokens: Approximate maximum number of tokens per request. Defaults to the provider limit.
+            max_concurrency: Maximum number of requests in flight.
+            as_numpy: Return each batch as a contiguous float32 NumPy matrix instead of lists of floats.
+                Requires `numpy`, see `any_llm.utils.embeddings.stack_embeddings` to build a single matrix.
+            **kwargs: Additional provider-specific arguments passed to every embedding request.
+
+        Yields:
+            One `EmbeddingBatch` per request, in input order.
+
+        """
+        batches = aembed_in_batches(
+            lambda texts: self.aembedding(model, texts, **kwargs),
+            inputs,
+            max_batch_size=min(batch_size or self.EMBEDDING_MAX_BATCH_SIZE, self.EMBEDDING_MAX_BATCH_SIZE),
+            max_batch_tokens=max_batch_tokens or self.EMBEDDING_MAX_BATCH_TOKENS,
+            max_concurrency=max_concurrency,
+            as_numpy=as_numpy,
+        )
+        async for batch in batches:
+            yield batch
+
     def list_models(self, **kwargs: Any) -> Sequence[Model]:
         allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
         return run_async_in_sync(self.alist_models(**kwargs), allow_running_loop=allow_running_loop)
@@ -587,6 +1017,73 @@ class AnyLLM(ABC):
         msg = "Subclasses must implement _alist_models method"
         raise NotImplementedError(msg)
 
+    @experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
+    def iter_batch_results(self, batch_id: str, **kwargs: Any) -> Iterator[BatchResult]:
+        """Wait for a batch and iterate over its results synchronously.
+
+        See [AnyLLM.aiter_batch_results][any_llm.any_llm.AnyLLM.aiter_batch_results]
+        """
+        allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        return async_iter_to_sync_iter(
+            self.aiter_batch_results(batch_id, **kwargs), allow_running_loop=allow_running_loop
+        )
+
+    @experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
+    async def aiter_batch_results(
+        self,
+        batch_id: str,
+        *,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 60.0,
+        max_wait: float | None = None,
+        include_errors: bool = True,
+    ) -> AsyncIterator[BatchResult]:
+        """Wait for a batch to finish, then stream its results.
+
+        The batch is polled with an exponential backoff (see [await_batch][any_llm.batch.await_batch]),
+        then its output file is downloaded and parsed line by line. Response bodies are only
+        validated into a `ChatCompletion` when `BatchResult.completion` is accessed.
+
+        Args:
+            batch_id: The ID of the batch.
+            poll_interval: Initial delay between two polls, in seconds.
+            max_poll_interval: Maximum delay between two polls, in seconds.
+            max_wait: Maximum time to wait for the batch, in seconds. Wait indefinitely by default.
+            include_errors: Also yield the failed requests of the error file, after the output file.
+
+        Yields:
+            One `BatchResult` per request, in the order of the result files.
+
+        """
+        from any_llm.batch import await_batch, raise_for_failed_batch
+
+        batch = await await_batch(
+            self, batch_id, poll_interval=poll_interval, max_poll_interval=max_poll_interval, max_wait=max_wait
+        )
+        raise_for_failed_batch(batch, self.PROVIDER_NAME)
+        file_ids = [batch.output_file_id, batch.error_file_id if include_errors else None]
+        for file_id in file_ids:
+            if file_id is None:
+                continue
+            async for line in self._aiter_batch_file(file_id):
+                yield BatchResult.from_line(json.loads(line))
+
+    async def _aiter_batch_file(self, file_id: str) -> AsyncIterator[str]:
+        """Yield the lines of a batch output or error file."""
+        if not self.SUPPORTS_BATCH:
+            async for line in self._local_batch_executor().aiter_file(file_id):
+                yield line
+            return
+        msg = "Subclasses must implement _aiter_batch_file method"
+        raise NotImplementedError(msg)
+
+    def _local_batch_executor(self) -> LocalBatchExecutor:
+        if self.local_batches is None:
+            from any_llm.batch import LocalBatchExecutor
+
+            self.local_batches = LocalBatchExecutor(self)
+        return self.local_batches
+
     @experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
     def create_batch(self, **kwargs: Any) -> Batch:
         """Create a batch synchronously.
@@ -618,6 +1115,9 @@ class AnyLLM(ABC):
         Returns:
             The created batch object
 
+        Providers without a native Batch API (`SUPPORTS_BATCH` is False) run the batch locally,
+        see [any_llm.batch][any_llm.batch].
+
         """
         return await self._acreate_batch(
             input_file_path=input_file_path,
@@ -636,8 +1136,9 @@ class AnyLLM(ABC):
         **kwargs: Any,
     ) -> Batch:
         if not self.SUPPORTS_BATCH:
-            msg = "Provider doesn't support batch completions."
-            raise NotImplementedError(msg)
+            return await self._local_batch_executor().acreate(
+                input_file_path, endpoint, completion_window=completion_window, metadata=metadata, **kwargs
+            )
         msg = "Subclasses must implement _acreate_batch method"
         raise NotImplementedError(msg)
 
@@ -667,8 +1168,7 @@ class AnyLLM(ABC):
 
     async def _aretrieve_batch(self, batch_id: str, **kwargs: Any) -> Batch:
         if not self.SUPPORTS_BATCH:
-            msg = "Provider doesn't support batch completions."
-            raise NotImplementedError(msg)
+            return await self._local_batch_executor().aretrieve(batch_id)
         msg = "Subclasses must implement _aretrieve_batch method"
         raise NotImplementedError(msg)
 
@@ -698,8 +1198,7 @@ class AnyLLM(ABC):
 
     async def _acancel_batch(self, batch_id: str, **kwargs: Any) -> Batch:
         if not self.SUPPORTS_BATCH:
-            msg = "Provider doesn't support batch completions."
-            raise NotImplementedError(msg)
+            return await self._local_batch_executor().acancel(batch_id)
         msg = "Subclasses must implement _acancel_batch method"
         raise NotImplementedError(msg)
 
@@ -747,7 +1246,18 @@ class AnyLLM(ABC):
         **kwargs: Any,
     ) -> Sequence[Batch]:
         if not self.SUPPORTS_BATCH:
-            msg = "Provider doesn't support batch completions."
-            raise NotImplementedError(msg)
+            return await self._local_batch_executor().alist(after=after, limit=limit)
         msg = "Subclasses must implement _alist_batches method"
         raise NotImplementedError(msg)
+
+
+def _parse_structured_stream(
+    response: ChatCompletion | AsyncIterator[ChatCompletionChunk],
+    response_format: dict[str, Any] | type[BaseModel] | None,
+) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+    """Parse the content of a stream requested with a pydantic `response_format` into `delta.parsed`."""
+    if isinstance(response, ChatCompletion) or not (
+        isinstance(response_format, type) and issubclass(response_format, BaseModel)
+    ):
+        return response
+    return astream_structured_output(response, response_format)
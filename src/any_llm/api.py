@@ -1,21 +1,54 @@
-from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+import asyncio
+import time
+import warnings
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Mapping, Sequence
 from typing import Any
 
 from pydantic import BaseModel
 
 from any_llm import AnyLLM
-from any_llm.constants import LLMProvider
-from any_llm.types.batch import Batch
+from any_llm.agent import DEFAULT_MAX_STEPS, DEFAULT_TOOL_WORKERS, AgentResult
+from any_llm.constants import INSIDE_NOTEBOOK, LLMProvider
+from any_llm.tools import ToolSet
+from any_llm.transport import TransportConfig, get_default_transport
+from any_llm.types.batch import Batch, BatchResult
 from any_llm.types.completion import (
     ChatCompletion,
     ChatCompletionChunk,
     ChatCompletionMessage,
     CreateEmbeddingResponse,
+    EmbeddingBatch,
     ReasoningEffort,
 )
 from any_llm.types.model import Model
+from any_llm.types.provider import WarmupResult
 from any_llm.types.responses import Response, ResponseInputParam, ResponseStreamEvent
+from any_llm.utils.aio import run_async_in_sync
 from any_llm.utils.decorators import BATCH_API_EXPERIMENTAL_MESSAGE, experimental
+from any_llm.utils.embeddings import DEFAULT_EMBEDDING_CONCURRENCY
+from any_llm.utils.provider_registry import ProviderLease, ProviderRegistry
+
+provider_registry = ProviderRegistry()
+"""Process-wide cache of providers shared by the async functions in this module.
+
+Reusing a provider keeps its SDK client (and HTTP connection pool) alive between calls.
+Use `provider_registry.configure(...)` to tune or disable it, or set `ANY_LLM_PROVIDER_CACHE=0`.
+"""
+
+
+def _acquire_cached_provider(
+    provider_key: LLMProvider,
+    api_key: str | None,
+    api_base: str | None,
+    client_args: dict[str, Any] | None,
+) -> ProviderLease:
+    return provider_registry.acquire(
+        provider_key.value,
+        api_key,
+        api_base,
+        client_args,
+        lambda: AnyLLM.create(provider_key, api_key=api_key, api_base=api_base, **client_args or {}),
+    )
 
 
 def completion(
@@ -62,7 +95,8 @@ def completion(
         temperature: Controls randomness in the response (0.0 to 2.0)
         top_p: Controls diversity via nucleus sampling (0.0 to 1.0)
         max_tokens: Maximum number of tokens to generate
-        response_format: Format specification for the response
+        response_format: Format specification for the response. With `stream=True` and a pydantic model,
+            chunks carry the object parsed so far in `delta.parsed`.
         stream: Whether to stream the response
         n: Number of completions to generate
         stop: Stop sequences for generation
@@ -169,7 +203,8 @@ async def acompletion(
         temperature: Controls randomness in the response (0.0 to 2.0)
         top_p: Controls diversity via nucleus sampling (0.0 to 1.0)
         max_tokens: Maximum number of tokens to generate
-        response_format: Format specification for the response
+        response_format: Format specification for the response. With `stream=True` and a pydantic model,
+            chunks carry the object parsed so far in `delta.parsed`.
         stream: Whether to stream the response
         n: Number of completions to generate
         stop: Stop sequences for generation
@@ -199,37 +234,33 @@ async def acompletion(
         provider_key = LLMProvider.from_string(provider)
         model_id = model
 
-    llm = AnyLLM.create(
-        provider_key,
-        api_key=api_key,
-        api_base=api_base,
-        **client_args or {},
-    )
-    return await llm.acompletion(
-        model=model_id,
-        messages=messages,
-        tools=tools,
-        tool_choice=tool_choice,
-        temperature=temperature,
-        top_p=top_p,
-        max_tokens=max_tokens,
-        response_format=response_format,
-        stream=stream,
-        n=n,
-        stop=stop,
-        presence_penalty=presence_penalty,
-        frequency_penalty=frequency_penalty,
-        seed=seed,
-        user=user,
-        parallel_tool_calls=parallel_tool_calls,
-        logprobs=logprobs,
-        top_logprobs=top_logprobs,
-        logit_bias=logit_bias,
-        stream_options=stream_options,
-        max_completion_tokens=max_completion_tokens,
-        reasoning_effort=reasoning_effort,
-        **kwargs,
-    )
+    with _acquire_cached_provider(provider_key, api_key, api_base, client_args) as lease:
+        response = await lease.provider.acompletion(
+            model=model_id,
+            messages=messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            temperature=temperature,
+            top_p=top_p,
+            max_tokens=max_tokens,
+            response_format=response_format,
+            stream=stream,
+            n=n,
+            stop=stop,
+            presence_penalty=presence_penalty,
+            frequency_penalty=frequency_penalty,
+            seed=seed,
+            user=user,
+            parallel_tool_calls=parallel_tool_calls,
+            logprobs=logprobs,
+            top_logprobs=top_logprobs,
+            logit_bias=logit_bias,
+            stream_options=stream_options,
+            max_completion_tokens=max_completion_tokens,
+            reasoning_effort=reasoning_effort,
+            **kwargs,
+        )
+        return lease.hold(response)
 
 
 def responses(
@@ -382,28 +413,24 @@ async def aresponses(
         provider_key = LLMProvider.from_string(provider)
         model_id = model
 
-    llm = AnyLLM.create(
-        provider_key,
-        api_key=api_key,
-        api_base=api_base,
-        **client_args or {},
-    )
-    return await llm.aresponses(
-        model=model_id,
-        input_data=input_data,
-        tools=tools,
-        tool_choice=tool_choice,
-        max_output_tokens=max_output_tokens,
-        temperature=temperature,
-        top_p=top_p,
-        stream=stream,
-        instructions=instructions,
-        max_tool_calls=max_tool_calls,
-        parallel_tool_calls=parallel_tool_calls,
-        reasoning=reasoning,
-        text=text,
-        **kwargs,
-    )
+    with _acquire_cached_provider(provider_key, api_key, api_base, client_args) as lease:
+        response = await lease.provider.aresponses(
+            model=model_id,
+            input_data=input_data,
+            tools=tools,
+            tool_choice=tool_choice,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+            top_p=top_p,
+            stream=stream,
+            instructions=instructions,
+            max_tool_calls=max_tool_calls,
+            parallel_tool_calls=parallel_tool_calls,
+            reasoning=reasoning,
+            text=text,
+            **kwargs,
+        )
+        return lease.hold(response)
 
 
 def embedding(
@@ -475,8 +502,122 @@ async def aembedding(
         provider_key = LLMProvider.from_string(provider)
         model_name = model
 
+    with _acquire_cached_provider(provider_key, api_key, api_base, client_args) as lease:
+        return await lease.provider.aembedding(model_name, inputs, **kwargs)
+
+
+def embedding_many(
+    model: str,
+    inputs: Iterable[str],
+    *,
+    provider: str | LLMProvider | None = None,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    batch_size: int | None = None,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+    as_numpy: bool = False,
+    **kwargs: Any,
+) -> Iterator[EmbeddingBatch]:
+    """Embed a large number of inputs in batches.
+
+    See [aembedding_many][any_llm.api.aembedding_many]
+
+    Args:
+        model: Model identifier. **Recommended**: Use with separate `provider` parameter (e.g., model='text-embedding-3-small', provider='openai').
+            **Alternative**: Combined format 'provider:model' (e.g., 'openai:text-embedding-3-small').
+        inputs: The texts to embed
+        provider: **Recommended**: Provider name to use for the request (e.g., 'openai', 'mistral').
+            When provided, the model parameter should contain only the model name.
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+        client_args: Additional provider-specific arguments that will be passed to the provider's client instantiation.
+        batch_size: Maximum number of inputs per request. Defaults to the provider limit.
+        max_batch_tokens: Approximate maximum number of tokens per request. Defaults to the provider limit.
+        max_concurrency: Maximum number of requests in flight.
+        as_numpy: Return each batch as a contiguous float32 NumPy matrix instead of lists of floats.
+        **kwargs: Additional provider-specific arguments that will be passed to every embedding request.
+
+    Returns:
+        An iterator of `EmbeddingBatch`, in input order
+
+    """
+    if provider is None:
+        provider_key, model_name = AnyLLM.split_model_provider(model)
+    else:
+        provider_key = LLMProvider.from_string(provider)
+        model_name = model
+
     llm = AnyLLM.create(provider_key, api_key=api_key, api_base=api_base, **client_args or {})
-    return await llm._aembedding(model_name, inputs, **kwargs)
+    return llm.embedding_many(
+        model_name,
+        inputs,
+        batch_size=batch_size,
+        max_batch_tokens=max_batch_tokens,
+        max_concurrency=max_concurrency,
+        as_numpy=as_numpy,
+        **kwargs,
+    )
+
+
+async def aembedding_many(
+    model: str,
+    inputs: Iterable[str] | AsyncIterable[str],
+    *,
+    provider: str | LLMProvider | None = None,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    batch_size: int | None = None,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+    as_numpy: bool = False,
+    **kwargs: Any,
+) -> AsyncIterator[EmbeddingBatch]:
+    """Embed a large number of inputs in batches, running several requests concurrently.
+
+    The inputs are split into batches that respect the provider's request limits and the
+    batches are yielded in input order as soon as they are ready, so corpora that don't
+    fit in memory can be streamed through.
+
+    Args:
+        model: Model identifier. **Recommended**: Use with separate `provider` parameter (e.g., model='text-embedding-3-small', provider='openai').
+            **Alternative**: Combined format 'provider:model' (e.g., 'openai:text-embedding-3-small').
+        inputs: The texts to embed, as an iterable or an async iterable
+        provider: **Recommended**: Provider name to use for the request (e.g., 'openai', 'mistral').
+            When provided, the model parameter should contain only the model name.
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+        client_args: Additional provider-specific arguments that will be passed to the provider's client instantiation.
+        batch_size: Maximum number of inputs per request. Defaults to the provider limit.
+        max_batch_tokens: Approximate maximum number of tokens per request. Defaults to the provider limit.
+        max_concurrency: Maximum number of requests in flight.
+        as_numpy: Return each batch as a contiguous float32 NumPy matrix instead of lists of floats.
+            Requires `numpy`, see `any_llm.utils.embeddings.stack_embeddings` to build a single matrix.
+        **kwargs: Additional provider-specific arguments that will be passed to every embedding request.
+
+    Yields:
+        One `EmbeddingBatch` per request, in input order
+
+    """
+    if provider is None:
+        provider_key, model_name = AnyLLM.split_model_provider(model)
+    else:
+        provider_key = LLMProvider.from_string(provider)
+        model_name = model
+
+    with _acquire_cached_provider(provider_key, api_key, api_base, client_args) as lease:
+        async for batch in lease.provider.aembedding_many(
+            model_name,
+            inputs,
+            batch_size=batch_size,
+            max_batch_tokens=max_batch_tokens,
+            max_concurrency=max_concurrency,
+            as_numpy=as_numpy,
+            **kwargs,
+        ):
+            yield batch
 
 
 def list_models(
@@ -499,8 +640,172 @@ async def alist_models(
     **kwargs: Any,
 ) -> Sequence[Model]:
     """List available models for a provider asynchronously."""
-    llm = AnyLLM.create(LLMProvider.from_string(provider), api_key=api_key, api_base=api_base, **client_args or {})
-    return await llm.alist_models(**kwargs)
+    with _acquire_cached_provider(LLMProvider.from_string(provider), api_key, api_base, client_args) as lease:
+        return await lease.provider.alist_models(**kwargs)
+
+
+def warmup(
+    providers: Iterable[str | LLMProvider],
+    *,
+    connections: int = 1,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+) -> list[WarmupResult]:
+    """Warm up providers synchronously.
+
+    The sync functions of this module create a new provider for each call: they only reuse the
+    connections opened here if the providers share their connection pools, see
+    [TransportConfig][any_llm.transport.TransportConfig].
+
+    See [awarmup][any_llm.api.awarmup]
+    """
+    transport = (client_args or {}).get("transport")
+    if not isinstance(transport, TransportConfig):
+        transport = get_default_transport()
+    if transport is None or not transport.share_connections:
+        warnings.warn(
+            "warmup() has no effect on the sync API without a TransportConfig sharing connections: "
+            "pass one in `client_args['transport']` or call `set_default_transport`.",
+            stacklevel=2,
+        )
+    return run_async_in_sync(
+        awarmup(providers, connections=connections, api_key=api_key, api_base=api_base, client_args=client_args),
+        allow_running_loop=INSIDE_NOTEBOOK,
+    )
+
+
+async def awarmup(
+    providers: Iterable[str | LLMProvider],
+    *,
+    connections: int = 1,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+) -> list[WarmupResult]:
+    """Warm up providers before their first request, e.g. when a serverless worker starts.
+
+    Each provider is created and cached for the async functions of this module called on the same
+    event loop with the same `api_key`, `api_base` and `client_args`. It is then warmed up with
+    [AnyLLM.awarmup][any_llm.any_llm.AnyLLM.awarmup]. The providers are warmed up concurrently.
+
+    Args:
+        providers: The providers to warm up.
+        connections: Number of connections to open to each provider.
+        api_key: API key for the providers. Defaults to each provider's environment variable.
+        api_base: Base URL for the providers' API.
+        client_args: Additional provider-specific arguments that will be passed to the providers' client instantiation.
+
+    Returns:
+        The timings of each provider's warm-up, in the order of `providers`. Errors, such as a missing
+        API key, are returned in the results instead of being raised.
+
+    """
+
+    async def _warmup(provider: str | LLMProvider) -> WarmupResult:
+        start = time.perf_counter()
+        try:
+            provider_key = LLMProvider.from_string(provider)
+            lease = _acquire_cached_provider(provider_key, api_key, api_base, client_args)
+        except Exception as e:
+            return WarmupResult(provider=str(provider), create_seconds=time.perf_counter() - start, error=e)
+        create_seconds = time.perf_counter() - start
+        with lease:
+            result = await lease.provider.awarmup(connections)
+        result.create_seconds = create_seconds
+        return result
+
+    return list(await asyncio.gather(*(_warmup(provider) for provider in providers)))
+
+
+def run_agent(
+    model: str,
+    messages: Sequence[dict[str, Any] | ChatCompletionMessage],
+    tools: ToolSet | Sequence[dict[str, Any] | Callable[..., Any]],
+    *,
+    provider: str | LLMProvider | None = None,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    tool_timeout: float | Mapping[str, float] | None = None,
+    max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> AgentResult:
+    """Run the tool calls of the model until it answers, synchronously.
+
+    See [arun_agent][any_llm.api.arun_agent]
+    """
+    if provider is None:
+        provider_key, model_id = AnyLLM.split_model_provider(model)
+    else:
+        provider_key = LLMProvider.from_string(provider)
+        model_id = model
+
+    llm = AnyLLM.create(provider_key, api_key=api_key, api_base=api_base, **client_args or {})
+    return llm.run_tools(
+        model_id,
+        messages,
+        tools,
+        max_steps=max_steps,
+        tool_timeout=tool_timeout,
+        max_tool_workers=max_tool_workers,
+        **kwargs,
+    )
+
+
+async def arun_agent(
+    model: str,
+    messages: Sequence[dict[str, Any] | ChatCompletionMessage],
+    tools: ToolSet | Sequence[dict[str, Any] | Callable[..., Any]],
+    *,
+    provider: str | LLMProvider | None = None,
+    max_steps: int = DEFAULT_MAX_STEPS,
+    tool_timeout: float | Mapping[str, float] | None = None,
+    max_tool_workers: int = DEFAULT_TOOL_WORKERS,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> AgentResult:
+    """Send a completion request, run the tool calls of the response and repeat until the model answers.
+
+    Args:
+        model: Model identifier. **Recommended**: Use with separate `provider` parameter (e.g., model='gpt-4', provider='openai').
+            **Alternative**: Combined format 'provider:model' (e.g., 'openai:gpt-4').
+        messages: The conversation to start from. It isn't modified: the result holds the new messages.
+        tools: The tools the model can call: callables, run when the model calls them, or a
+            [ToolSet][any_llm.tools.ToolSet].
+        provider: **Recommended**: Provider name to use for the request (e.g., 'openai', 'mistral').
+        max_steps: Maximum number of completion requests.
+        tool_timeout: Seconds after which a tool call is abandoned, for every tool or by tool name.
+        max_tool_workers: Number of threads running the synchronous tools.
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+        client_args: Additional provider-specific arguments that will be passed to the provider's client instantiation.
+        **kwargs: Any other argument of [acompletion][any_llm.api.acompletion], except `stream`.
+
+    Returns:
+        The conversation, the last response and the latency and token counts of each step,
+        see [AnyLLM.arun_tools][any_llm.any_llm.AnyLLM.arun_tools].
+
+    """
+    if provider is None:
+        provider_key, model_id = AnyLLM.split_model_provider(model)
+    else:
+        provider_key = LLMProvider.from_string(provider)
+        model_id = model
+
+    with _acquire_cached_provider(provider_key, api_key, api_base, client_args) as lease:
+        return await lease.provider.arun_tools(
+            model_id,
+            messages,
+            tools,
+            max_steps=max_steps,
+            tool_timeout=tool_timeout,
+            max_tool_workers=max_tool_workers,
+            **kwargs,
+        )
 
 
 @experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
@@ -753,3 +1058,60 @@ async def alist_batches(
     """
     llm = AnyLLM.create(LLMProvider.from_string(provider), api_key=api_key, api_base=api_base, **client_args or {})
     return await llm.alist_batches(after=after, limit=limit, **kwargs)
+
+
+@experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
+def iter_batch_results(
+    provider: str | LLMProvider,
+    batch_id: str,
+    *,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> Iterator[BatchResult]:
+    """Wait for a batch to finish, then iterate over its results.
+
+    Args:
+        provider: Provider name to use for the request (e.g., 'openai', 'mistral')
+        batch_id: The ID of the batch
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+        client_args: Additional provider-specific arguments for client instantiation
+        **kwargs: Polling options, see [AnyLLM.aiter_batch_results][any_llm.any_llm.AnyLLM.aiter_batch_results]
+
+    Returns:
+        An iterator of the results, one per request
+
+    """
+    llm = AnyLLM.create(LLMProvider.from_string(provider), api_key=api_key, api_base=api_base, **client_args or {})
+    return llm.iter_batch_results(batch_id, **kwargs)
+
+
+@experimental(BATCH_API_EXPERIMENTAL_MESSAGE)
+async def aiter_batch_results(
+    provider: str | LLMProvider,
+    batch_id: str,
+    *,
+    api_key: str | None = None,
+    api_base: str | None = None,
+    client_args: dict[str, Any] | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[BatchResult]:
+    """Wait for a batch to finish, then stream its results asynchronously.
+
+    Args:
+        provider: Provider name to use for the request (e.g., 'openai', 'mistral')
+        batch_id: The ID of the batch
+        api_key: API key for the provider
+        api_base: Base URL for the provider API
+        client_args: Additional provider-specific arguments for client instantiation
+        **kwargs: Polling options, see [AnyLLM.aiter_batch_results][any_llm.any_llm.AnyLLM.aiter_batch_results]
+
+    Yields:
+        The results, one per request
+
+    """
+    llm = AnyLLM.create(LLMProvider.from_string(provider), api_key=api_key, api_base=api_base, **client_args or {})
+    async for result in llm.aiter_batch_results(batch_id, **kwargs):
+        yield result
@@ -0,0 +1,760 @@
+"""Batch API helpers: building input files, waiting for results, and local batch execution.
+
+## Building input files
+
+A [BatchFileWriter][any_llm.batch.BatchFileWriter] writes requests produced one at a time (e.g. by
+a generator) to JSONL input files, validating each line and starting a new file whenever one
+reaches the Batch API limits, so that each file can be sent as its own batch:
+
+```python
+from any_llm.batch import write_batch_files
+
+paths = write_batch_files(
+    ({"model": "gpt-4.1-mini", "messages": [{"role": "user", "content": ticket}]} for ticket in tickets),
+    directory="batches",
+)
+batches = [await llm.acreate_batch(input_file_path=str(path), endpoint="/v1/chat/completions") for path in paths]
+async for result in llm.aiter_batch_results(batches[0].id):
+    print(result.custom_id, result.completion.choices[0].message.content)
+```
+
+[AnyLLM.aiter_batch_results][any_llm.any_llm.AnyLLM.aiter_batch_results] waits for the batch with
+[await_batch][any_llm.batch.await_batch], then streams its output file line by line.
+
+## Local batches
+
+[AnyLLM.acreate_batch][any_llm.any_llm.AnyLLM.acreate_batch] and the other batch methods of a
+provider whose `SUPPORTS_BATCH` is False run the batch on this machine with a
+[LocalBatchExecutor][any_llm.batch.LocalBatchExecutor]. The input is the same JSONL file as for
+the OpenAI Batch API, and results are written to the same output and error JSONL formats:
+
+```python
+from any_llm import AnyLLM
+
+llm = AnyLLM.create("anthropic")
+batch = await llm.acreate_batch(input_file_path="requests.jsonl", endpoint="/v1/chat/completions")
+batch = await llm.aretrieve_batch(batch.id)
+print(batch.status, batch.request_counts, batch.output_file_id)
+```
+
+The input file is read line by line and requests run concurrently, up to `max_concurrency` at
+a time, through the provider's [rate limiter][any_llm.rate_limit] if it has one. A request failing
+with a rate limit or transient error (timeout, connection error, 5xx) is sent again with an
+exponential back-off, up to `MAX_REQUEST_RETRIES` times, before it is recorded as failed. Each
+result is appended to the output (or error) file as soon as it is received. Progress is
+checkpointed on disk, so a batch interrupted by a crash resumes where it stopped on the next
+`aretrieve_batch`. A cancelled batch resumes with
+[LocalBatchExecutor.aresume][any_llm.batch.LocalBatchExecutor.aresume].
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Self, TextIO, cast
+
+from openai.types.batch import Errors
+from openai.types.batch_error import BatchError
+
+from any_llm.exceptions import AnyLLMError, ProviderError, RateLimitError
+from any_llm.logging import logger
+from any_llm.types.batch import Batch, BatchRequestCounts
+from any_llm.utils.exception_handler import convert_exception
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable, Sequence
+    from types import TracebackType
+
+    from pydantic import BaseModel
+
+    from any_llm.any_llm import AnyLLM
+    from any_llm.types.completion import ChatCompletion
+
+DEFAULT_BATCH_DIRECTORY = Path.home() / ".cache" / "any-llm" / "batches"
+DEFAULT_BATCH_CONCURRENCY = 16
+DEFAULT_LIST_LIMIT = 20
+CHECKPOINT_INTERVAL = 1.0
+"""Seconds between two saves of the progress of a running batch."""
+
+MAX_BATCH_REQUESTS = 50_000
+"""Maximum number of requests in one input file of the OpenAI Batch API."""
+
+MAX_BATCH_FILE_BYTES = 200 * 1024 * 1024
+"""Maximum size of one input file of the OpenAI Batch API."""
+
+MAX_REQUEST_RETRIES = 5
+"""Times a request of a local batch failing with a rate limit or transient error is sent again before it fails."""
+
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 60.0
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_MAX_POLL_INTERVAL = 60.0
+
+LOCAL_BATCH_ID_PREFIX = "batch_local_"
+SUPPORTED_ENDPOINTS = ("/v1/chat/completions", "/v1/embeddings")
+
+_TRANSIENT_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, 529})
+_STATE_FILE_NAME = "batch.json"
+_READ_SIZE = 1024 * 1024
+_ACTIVE_STATUSES = frozenset({"validating", "in_progress", "finalizing"})
+_FINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+_REQUIRED_BODY_FIELDS = {
+    "/v1/chat/completions": ("model", "messages"),
+    "/v1/embeddings": ("model", "input"),
+    "/v1/completions": ("model", "prompt"),
+    "/v1/responses": ("model", "input"),
+}
+
+
+def validate_batch_request(body: Any, endpoint: str) -> None:
+    """Check that `body` is a valid request body for `endpoint`, raising a ValueError otherwise."""
+    if endpoint not in _REQUIRED_BODY_FIELDS:
+        msg = f"Unsupported batch endpoint: {endpoint}"
+        raise ValueError(msg)
+    if not isinstance(body, dict):
+        msg = f"A batch request body must be a JSON object, got {type(body).__name__}"
+        raise ValueError(msg)
+    missing = [name for name in _REQUIRED_BODY_FIELDS[endpoint] if not body.get(name)]
+    if missing:
+        msg = f"A {endpoint} batch request requires {', '.join(missing)}"
+        raise ValueError(msg)
+    if body.get("stream"):
+        msg = "Streaming requests can't be batched"
+        raise ValueError(msg)
+
+
+class BatchFileWriter:
+    """Write batch requests to JSONL input files, sharded to respect the Batch API limits.
+
+    Files are named `<name>-0000.jsonl`, `<name>-0001.jsonl`, ... in `directory`. A new file is
+    started when the current one holds `max_requests` requests or would exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        endpoint: str = "/v1/chat/completions",
+        *,
+        name: str = "batch",
+        max_requests: int = MAX_BATCH_REQUESTS,
+        max_bytes: int = MAX_BATCH_FILE_BYTES,
+    ) -> None:
+        """Create a writer. No file is created before the first request is added.
+
+        Args:
+            directory: Directory the input files are written to.
+            endpoint: Endpoint of every request, e.g. `/v1/chat/completions` or `/v1/embeddings`.
+            name: Prefix of the file names.
+            max_requests: Maximum number of requests per file.
+            max_bytes: Maximum size of a file, in bytes.
+
+        """
+        if endpoint not in _REQUIRED_BODY_FIELDS:
+            msg = f"Unsupported batch endpoint: {endpoint}"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.endpoint = endpoint
+        self.name = name
+        self.max_requests = max_requests
+        self.max_bytes = max_bytes
+        self.paths: list[Path] = []
+        """The files written so far."""
+        self._file: BinaryIO | None = None
+        self._file_requests = 0
+        self._file_bytes = 0
+        self._custom_ids: set[str] = set()
+
+    def add(self, body: dict[str, Any], custom_id: str | None = None) -> str:
+        """Validate a request and append it to the current file.
+
+        Args:
+            body: The request body, e.g. the arguments of a chat completion.
+            custom_id: Unique id of the request in the results. Defaults to `request-<n>`.
+
+        Returns:
+            The `custom_id` of the request.
+
+        """
+        if custom_id is None:
+            custom_id = f"request-{len(self._custom_ids)}"
+        if custom_id in self._custom_ids:
+            msg = f"Duplicate batch request custom_id: {custom_id}"
+            raise ValueError(msg)
+        validate_batch_request(body, self.endpoint)
+        try:
+            request = {"custom_id": custom_id, "method": "POST", "url": self.endpoint, "body": body}
+            line = json.dumps(request, separators=(",", ":")).encode() + b"\n"
+        except (TypeError, ValueError) as e:
+            msg = f"Batch request {custom_id} is not JSON serializable: {e}"
+            raise ValueError(msg) from e
+        if len(line) > self.max_bytes:
+            msg = f"Batch request {custom_id} is larger than the {self.max_bytes} bytes file limit"
+            raise ValueError(msg)
+
+        if (
+            self._file is None
+            or self._file_requests >= self.max_requests
+            or self._file_bytes + len(line) > self.max_bytes
+        ):
+            self._start_file()
+        assert self._file is not None
+        self._file.write(line)
+        self._file_requests += 1
+        self._file_bytes += len(line)
+        self._custom_ids.add(custom_id)
+        return custom_id
+
+    def close(self) -> list[Path]:
+        """Close the current file and return the paths of all the files written."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self.paths
+
+    def __enter__(self) -> Self:
+        """Return the writer."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the current file."""
+        self.close()
+
+    def _start_file(self) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{self.name}-{len(self.paths):04d}.jsonl"
+        self._file = path.open("wb")
+        self.paths.append(path)
+        self._file_requests = self._file_bytes = 0
+
+
+def write_batch_files(
+    requests: Iterable[dict[str, Any] | tuple[str, dict[str, Any]]],
+    directory: str | Path,
+    endpoint: str = "/v1/chat/completions",
+    **kwargs: Any,
+) -> list[Path]:
+    """Write requests to batch input files, see [BatchFileWriter][any_llm.batch.BatchFileWriter].
+
+    Args:
+        requests: Request bodies, or `(custom_id, body)` tuples. Consumed lazily.
+        directory: Directory the input files are written to.
+        endpoint: Endpoint of every request.
+        **kwargs: `name`, `max_requests` and `max_bytes` of the writer.
+
+    Returns:
+        The paths of the files written, one batch each.
+
+    """
+    with BatchFileWriter(directory, endpoint, **kwargs) as writer:
+        for request in requests:
+            if isinstance(request, tuple):
+                custom_id, body = request
+                writer.add(body, custom_id)
+            else:
+                writer.add(request)
+    return writer.paths
+
+
+async def await_batch(
+    llm: AnyLLM,
+    batch_id: str,
+    *,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    max_poll_interval: float = DEFAULT_MAX_POLL_INTERVAL,
+    max_wait: float | None = None,
+) -> Batch:
+    """Poll a batch until it is completed, failed, expired or cancelled.
+
+    The delay between two polls starts at `poll_interval` and doubles up to `max_poll_interval`.
+
+    Args:
+        llm: Provider the batch was created with.
+        batch_id: The ID of the batch.
+        poll_interval: Initial delay between two polls, in seconds.
+        max_poll_interval: Maximum delay between two polls, in seconds.
+        max_wait: Maximum time to wait, in seconds. Wait indefinitely by default.
+
+    Returns:
+        The batch in its final status.
+
+    Raises:
+        TimeoutError: If the batch is still running after `max_wait` seconds.
+
+    """
+    deadline = None if max_wait is None else time.monotonic() + max_wait
+    delay = poll_interval
+    while True:
+        batch = await llm.aretrieve_batch(batch_id)
+        if batch.status in _FINAL_STATUSES:
+            return batch
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                msg = f"Batch {batch_id} is still {batch.status} after {max_wait} seconds"
+                raise TimeoutError(msg)
+            delay = min(delay, remaining)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, max_poll_interval)
+
+
+def raise_for_failed_batch(batch: Batch, provider_name: str) -> None:
+    """Raise a ProviderError if the batch failed as a whole (e.g. its input file was invalid)."""
+    if batch.status != "failed":
+        return
+    errors = [error.message or error.code or "" for error in (batch.errors.data or [])] if batch.errors else []
+    msg = f"Batch {batch.id} failed" + (f": {'; '.join(errors)}" if errors else "")
+    raise ProviderError(msg, provider_name=provider_name)
+
+
+async def aiter_file_lines(path: str | Path) -> AsyncIterator[str]:
+    """Yield the non-empty lines of a local file, reading it in a worker thread."""
+    async for _, line in _aiter_numbered_lines(path):
+        if line.strip():
+            yield line
+
+
+async def _aiter_numbered_lines(path: str | Path) -> AsyncIterator[tuple[int, str]]:
+    file = await asyncio.to_thread(Path(path).open, encoding="utf-8")
+    index = 0
+    with file:
+        while lines := await asyncio.to_thread(file.readlines, _READ_SIZE):
+            for line in lines:
+                yield index, line
+                index += 1
+
+
+@dataclass
+class _LocalBatchRun:
+    batch: Batch
+    provider: str
+    max_concurrency: int
+    request_kwargs: dict[str, Any]
+    directory: Path
+    task: asyncio.Task[None] | None = None
+    last_checkpoint: float = field(default_factory=time.monotonic)
+    save_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+@dataclass
+class _ResultFiles:
+    output: TextIO
+    errors: TextIO
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    """Serializes the writes, which run in worker threads."""
+
+
+class LocalBatchExecutor:
+    """Run batches of requests through a provider's completion or embedding API.
+
+    Batches are stored in a directory of `directory` named after their id: `batch.json` holds
+    the [Batch][any_llm.types.batch.Batch] and its progress, `output.jsonl` and `errors.jsonl`
+    the results, in the format of the OpenAI Batch API.
+    """
+
+    def __init__(
+        self,
+        provider: AnyLLM,
+        directory: str | Path | None = None,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> None:
+        """Create an executor for `provider`.
+
+        Args:
+            provider: Provider sending the requests.
+            directory: Directory the batches are stored in. Defaults to `~/.cache/any-llm/batches`.
+            max_concurrency: Default maximum number of requests of a batch in flight.
+
+        """
+        self.provider = provider
+        self.directory = Path(directory) if directory is not None else DEFAULT_BATCH_DIRECTORY
+        self.max_concurrency = max_concurrency
+        self._runs: dict[str, _LocalBatchRun] = {}
+
+    async def acreate(
+        self,
+        input_file_path: str,
+        endpoint: str,
+        completion_window: str = "24h",
+        metadata: dict[str, str] | None = None,
+        max_concurrency: int | None = None,
+        **kwargs: Any,
+    ) -> Batch:
+        """Start running a batch in the background.
+
+        Args:
+            input_file_path: Path to a JSONL file of requests in the OpenAI Batch API format.
+            endpoint: `/v1/chat/completions` or `/v1/embeddings`.
+            completion_window: Recorded on the batch: local batches run until they are done.
+            metadata: Optional custom metadata for the batch.
+            max_concurrency: Maximum number of requests in flight. Defaults to the executor's.
+            **kwargs: Arguments added to the body of every request.
+
+        Returns:
+            The created batch, in the `validating` status.
+
+        """
+        if endpoint not in SUPPORTED_ENDPOINTS:
+            msg = f"Local batches support the {', '.join(SUPPORTED_ENDPOINTS)} endpoints, got {endpoint}"
+            raise ValueError(msg)
+        input_path = await asyncio.to_thread(Path(input_file_path).resolve)
+        if not await asyncio.to_thread(input_path.is_file):
+            msg = f"Batch input file not found: {input_file_path}"
+            raise FileNotFoundError(msg)
+
+        batch_id = f"{LOCAL_BATCH_ID_PREFIX}{uuid.uuid4().hex}"
+        directory = self.directory / batch_id
+        batch = Batch(
+            id=batch_id,
+            object="batch",
+            endpoint=endpoint,
+            input_file_id=str(input_path),
+            completion_window=completion_window,
+            status="validating",
+            created_at=int(time.time()),
+            metadata=metadata,
+            output_file_id=str(directory / "output.jsonl"),
+            error_file_id=str(directory / "errors.jsonl"),
+            request_counts=BatchRequestCounts(total=0, completed=0, failed=0),
+        )
+        run = _LocalBatchRun(
+            batch=batch,
+            provider=self.provider.PROVIDER_NAME,
+            max_concurrency=max_concurrency or self.max_concurrency,
+            request_kwargs=kwargs,
+            directory=directory,
+        )
+        await asyncio.to_thread(directory.mkdir, parents=True, exist_ok=True)
+        await self._asave(run)
+        self._start(run)
+        return batch.model_copy(deep=True)
+
+    async def aretrieve(self, batch_id: str) -> Batch:
+        """Return the batch, resuming it if it was interrupted (e.g. by a crash)."""
+        run = await self._aget_run(batch_id)
+        if run.batch.status in _ACTIVE_STATUSES and not _is_running(run):
+            logger.info("Resuming interrupted batch %s", batch_id)
+            self._start(run)
+        return run.batch.model_copy(deep=True)
+
+    async def acancel(self, batch_id: str) -> Batch:
+        """Stop running the batch. The results received so far are kept."""
+        run = await self._aget_run(batch_id)
+        if run.batch.status in _FINAL_STATUSES:
+            return run.batch.model_copy(deep=True)
+
+        run.batch.status = "cancelling"
+        run.batch.cancelling_at = int(time.time())
+        await self._asave(run)
+        if run.task is not None and not run.task.done():
+            run.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await run.task
+        run.batch.status = "cancelled"
+        run.batch.cancelled_at = int(time.time())
+        await self._asave(run)
+        return run.batch.model_copy(deep=True)
+
+    async def aresume(self, batch_id: str) -> Batch:
+        """Run the requests of a cancelled, failed or interrupted batch that have no result yet."""
+        run = await self._aget_run(batch_id)
+        if run.batch.status != "completed" and not _is_running(run):
+            run.batch.status = "in_progress"
+            run.batch.cancelling_at = run.batch.cancelled_at = run.batch.failed_at = None
+            run.batch.errors = None
+            await self._asave(run)
+            self._start(run)
+        return run.batch.model_copy(deep=True)
+
+    async def alist(self, after: str | None = None, limit: int | None = None) -> Sequence[Batch]:
+        """List the provider's batches, most recent first."""
+        batches = sorted(await asyncio.to_thread(self._load_batches), key=lambda b: b.created_at, reverse=True)
+        if after is not None:
+            ids = [batch.id for batch in batches]
+            batches = batches[ids.index(after) + 1 :] if after in ids else []
+        return batches[: limit or DEFAULT_LIST_LIMIT]
+
+    async def wait(self, batch_id: str) -> Batch:
+        """Wait for a running batch to stop, and return it."""
+        run = await self._aget_run(batch_id)
+        if run.task is not None:
+            with contextlib.suppress(asyncio.CancelledError):
+                await asyncio.shield(run.task)
+        return run.batch.model_copy(deep=True)
+
+    async def aiter_file(self, file_id: str) -> AsyncIterator[str]:
+        """Yield the lines of the output or error file of a local batch, whose id is its path."""
+        async for line in aiter_file_lines(file_id):
+            yield line
+
+    def _start(self, run: _LocalBatchRun) -> None:
+        self._runs[run.batch.id] = run
+        run.task = asyncio.create_task(self._run(run))
+
+    async def _run(self, run: _LocalBatchRun) -> None:
+        batch = run.batch
+        input_path = Path(batch.input_file_id)
+        try:
+            total = await asyncio.to_thread(_count_requests, input_path)
+            done = await asyncio.to_thread(
+                _load_progress, Path(str(batch.output_file_id)), Path(str(batch.error_file_id))
+            )
+            completed = sum(1 for success in done.values() if success)
+            batch.request_counts = BatchRequestCounts(total=total, completed=completed, failed=len(done) - completed)
+            batch.status = "in_progress"
+            batch.in_progress_at = batch.in_progress_at or int(time.time())
+            await self._asave(run)
+
+            await self._execute(run, input_path, done)
+
+            # Results are written as they arrive: there is nothing left to finalize.
+            batch.finalizing_at = batch.completed_at = int(time.time())
+            batch.status = "completed"
+            await self._asave(run)
+        except asyncio.CancelledError:
+            await self._asave(run)
+            raise
+        except Exception as e:
+            logger.warning("Batch %s failed: %s", batch.id, e)
+            batch.status = "failed"
+            batch.failed_at = int(time.time())
+            batch.errors = Errors(data=[BatchError(code=type(e).__name__, message=str(e))], object="list")
+            await self._asave(run)
+
+    async def _execute(self, run: _LocalBatchRun, input_path: Path, done: dict[str, bool]) -> None:
+        semaphore = asyncio.Semaphore(run.max_concurrency)
+        stack, output, errors = await asyncio.to_thread(
+            _open_result_files, Path(str(run.batch.output_file_id)), Path(str(run.batch.error_file_id))
+        )
+        files = _ResultFiles(output, errors)
+        with stack:
+            async with asyncio.TaskGroup() as group:
+                async for index, line in _aiter_numbered_lines(input_path):
+                    if not line.strip():
+                        continue
+                    try:
+                        request = json.loads(line)
+                        custom_id = str(request.get("custom_id") or f"request-{index}")
+                    except (json.JSONDecodeError, AttributeError) as e:
+                        request, custom_id = None, f"request-{index}"
+                        error: Exception | None = ValueError(f"Invalid request on line {index + 1}: {e}")
+                    else:
+                        error = None
+                    if custom_id in done:
+                        continue
+                    if error is not None:
+                        await self._arecord(run, custom_id, None, error, files)
+                        continue
+                    await semaphore.acquire()
+                    group.create_task(self._execute_request(run, custom_id, request, semaphore, files))
+
+    async def _execute_request(
+        self,
+        run: _LocalBatchRun,
+        custom_id: str,
+        request: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        files: _ResultFiles,
+    ) -> None:
+        try:
+            try:
+                response = await self._send_with_retries(run, request)
+            except Exception as e:
+                await self._arecord(run, custom_id, None, e, files)
+            else:
+                await self._arecord(run, custom_id, response, None, files)
+        finally:
+            semaphore.release()
+
+    async def _send_with_retries(self, run: _LocalBatchRun, request: dict[str, Any]) -> BaseModel:
+        attempt = 0
+        while True:
+            try:
+                return await self._send(run, request)
+            except Exception as e:
+                if attempt >= MAX_REQUEST_RETRIES or not _is_transient(e, run.provider):
+                    raise
+                attempt += 1
+                delay = _backoff_delay(attempt)
+                logger.info("Request of batch %s failed, sending it again in %.1fs: %s", run.batch.id, delay, e)
+                await asyncio.sleep(delay)
+
+    async def _send(self, run: _LocalBatchRun, request: dict[str, Any]) -> BaseModel:
+        endpoint = run.batch.endpoint
+        if request.get("url", endpoint) != endpoint:
+            msg = f"Request url {request['url']} doesn't match the batch endpoint {endpoint}"
+            raise ValueError(msg)
+        body = {**run.request_kwargs, **request["body"]}
+        validate_batch_request(body, endpoint)
+        if endpoint == "/v1/embeddings":
+            return await self.provider.aembedding(body.pop("model"), body.pop("input"), **body)
+        return cast("ChatCompletion", await self.provider.acompletion(**body))
+
+    async def _arecord(
+        self,
+        run: _LocalBatchRun,
+        custom_id: str,
+        response: BaseModel | None,
+        error: Exception | None,
+        files: _ResultFiles,
+    ) -> None:
+        record: dict[str, Any] = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": custom_id}
+        if error is None and response is not None:
+            record["response"] = {"status_code": 200, "request_id": None, "body": response.model_dump(mode="json")}
+            record["error"] = None
+            file = files.output
+            run.batch.request_counts.completed += 1  # type: ignore[union-attr]
+        else:
+            record["response"] = None
+            record["error"] = {"code": type(error).__name__, "message": str(error)}
+            file = files.errors
+            run.batch.request_counts.failed += 1  # type: ignore[union-attr]
+        async with files.lock:
+            await asyncio.to_thread(_append_line, file, json.dumps(record))
+
+        now = time.monotonic()
+        if now - run.last_checkpoint >= CHECKPOINT_INTERVAL:
+            run.last_checkpoint = now
+            await self._asave(run)
+
+    async def _aget_run(self, batch_id: str) -> _LocalBatchRun:
+        run = self._runs.get(batch_id)
+        if run is None:
+            run = await asyncio.to_thread(self._load, self.directory / batch_id)
+            if run is None or run.provider != self.provider.PROVIDER_NAME:
+                msg = f"Local batch not found: {batch_id}"
+                raise ValueError(msg)
+            self._runs[batch_id] = run
+        return run
+
+    async def _asave(self, run: _LocalBatchRun) -> None:
+        state = {
+            "provider": run.provider,
+            "max_concurrency": run.max_concurrency,
+            "request_kwargs": run.request_kwargs,
+            "batch": run.batch.model_dump(mode="json"),
+        }
+        # Serialized on the loop, so that the thread writes a consistent snapshot.
+        await asyncio.to_thread(_write_state, run.directory / _STATE_FILE_NAME, json.dumps(state), run.save_lock)
+
+    def _load(self, directory: Path) -> _LocalBatchRun | None:
+        try:
+            state = json.loads((directory / _STATE_FILE_NAME).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return _LocalBatchRun(
+            batch=Batch.model_validate(state["batch"]),
+            provider=state["provider"],
+            max_concurrency=state["max_concurrency"],
+            request_kwargs=state["request_kwargs"],
+            directory=directory,
+        )
+
+    def _load_batches(self) -> list[Batch]:
+        if not self.directory.is_dir():
+            return []
+        batches = []
+        for directory in self.directory.iterdir():
+            run = self._runs.get(directory.name) or self._load(directory)
+            if run is not None and run.provider == self.provider.PROVIDER_NAME:
+                batches.append(run.batch.model_copy(deep=True))
+        return batches
+
+
+def _is_running(run: _LocalBatchRun) -> bool:
+    return run.task is not None and not run.task.done()
+
+
+def _is_transient(error: Exception, provider_name: str) -> bool:
+    """Whether a request failing with `error` may succeed if it is sent again."""
+    original = error
+    if isinstance(error, AnyLLMError) and error.original_exception is not None:
+        original = error.original_exception
+    status_code = getattr(original, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(original, "response", None), "status_code", None)
+    if isinstance(status_code, int):
+        return status_code in _TRANSIENT_STATUS_CODES
+    if isinstance(original, TimeoutError | ConnectionError):
+        return True
+    # SDK errors without a response, e.g. `APIConnectionError` or `APITimeoutError`.
+    name = type(original).__name__.lower()
+    return (
+        "timeout" in name or "connection" in name or isinstance(convert_exception(error, provider_name), RateLimitError)
+    )
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential back-off with full jitter."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))  # noqa: S311
+
+
+def _open_result_files(output_path: Path, error_path: Path) -> tuple[ExitStack, TextIO, TextIO]:
+    with ExitStack() as stack:
+        output = stack.enter_context(output_path.open("a", encoding="utf-8"))
+        errors = stack.enter_context(error_path.open("a", encoding="utf-8"))
+        return stack.pop_all(), output, errors
+
+
+def _append_line(file: TextIO, line: str) -> None:
+    file.write(line + "\n")
+    file.flush()
+
+
+def _write_state(path: Path, state: str, lock: threading.Lock) -> None:
+    temporary_path = path.with_suffix(".tmp")
+    with lock:
+        temporary_path.write_text(state, encoding="utf-8")
+        os.replace(temporary_path, path)
+
+
+def _count_requests(input_path: Path) -> int:
+    with input_path.open(encoding="utf-8") as requests:
+        return sum(1 for line in requests if line.strip())
+
+
+def _load_progress(output_path: Path, error_path: Path) -> dict[str, bool]:
+    """Return whether each request with a result succeeded, dropping results cut short by a crash."""
+    done: dict[str, bool] = {}
+    for path, success in ((output_path, True), (error_path, False)):
+        if not path.exists():
+            continue
+        _truncate_partial_line(path)
+        with path.open(encoding="utf-8") as results:
+            for line in results:
+                done[json.loads(line)["custom_id"]] = success
+    return done
+
+
+def _truncate_partial_line(path: Path) -> None:
+    with path.open("rb+") as file:
+        size = file.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        position = size
+        while position > 0:
+            step = min(4096, position)
+            file.seek(position - step)
+            chunk = file.read(step)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = position - step + newline + 1
+                break
+            position -= step
+        if position != size:
+            file.truncate(position)
@@ -0,0 +1,457 @@
+"""Opt-in caching of completion and embedding responses.
+
+Evaluation and regression jobs tend to send the same deterministic requests (`temperature=0`
+or a fixed `seed`) over and over. A [CompletionCache][any_llm.cache.CompletionCache] set on a
+provider (or passed per call) answers repeated requests without a provider round-trip:
+
+```python
+from any_llm import AnyLLM
+from any_llm.cache import CompletionCache, SQLiteCacheBackend
+
+llm = AnyLLM.create("openai")
+llm.cache = CompletionCache(SQLiteCacheBackend("responses.sqlite"), ttl=24 * 3600)
+
+response = await llm.acompletion(model="gpt-4.1-mini", messages=messages, temperature=0)
+fresh = await llm.acompletion(model="gpt-4.1-mini", messages=messages, temperature=0, cache=False)
+print(llm.cache.stats)
+```
+
+Every request is cached as is, whether or not it is deterministic: only enable the cache for
+requests whose responses you want to reuse.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+
+from pydantic import BaseModel
+
+from any_llm.logging import logger
+from any_llm.types.completion import ChatCompletion, ChatCompletionChunk, CreateEmbeddingResponse
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable
+
+    from any_llm.types.completion import CompletionParams
+
+T = TypeVar("T")
+
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+_CACHE_FORMAT_VERSION = 1
+
+
+class CacheBackend(ABC):
+    """Storage for cached responses, keyed by hex digests.
+
+    Backends only store bytes and expiry times. Backends whose methods do blocking I/O set
+    `BLOCKING = True` and are called from a worker thread.
+    """
+
+    BLOCKING: ClassVar[bool] = True
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under `key`, or None if it is missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, expires_at: float | None = None) -> None:
+        """Store `value` under `key` until the `time.time()` timestamp `expires_at` (forever if None)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove `key` if it is stored."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every stored value."""
+
+    def close(self) -> None:  # noqa: B027
+        """Release the resources held by the backend."""
+
+
+def _is_expired(expires_at: float | None) -> bool:
+    return expires_at is not None and expires_at <= time.time()
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache bounded by the total size of the stored values."""
+
+    BLOCKING = False
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES) -> None:
+        """Create an empty cache holding at most `max_bytes` of values."""
+        if max_bytes < 1:
+            msg = "max_bytes must be at least 1"
+            raise ValueError(msg)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the stored values."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Return the number of stored values."""
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under `key`, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if _is_expired(expires_at):
+                self._pop_locked(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expires_at: float | None = None) -> None:
+        """Store `value` under `key` until `expires_at`."""
+        with self._lock:
+            self._pop_locked(key)
+            if len(value) > self.max_bytes:
+                return
+            self._entries[key] = (value, expires_at)
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                self._pop_locked(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if it is stored."""
+        with self._lock:
+            self._pop_locked(key)
+
+    def clear(self) -> None:
+        """Remove every stored value."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache stored in a single SQLite database file, shareable between processes."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Open (and create if needed) the cache database at `path`."""
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS any_llm_cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under `key`, or None if it is missing or expired."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM any_llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if _is_expired(row[1]):
+                self._connection.execute("DELETE FROM any_llm_cache WHERE key = ?", (key,))
+                return None
+            return bytes(row[0])
+
+    def set(self, key: str, value: bytes, expires_at: float | None = None) -> None:
+        """Store `value` under `key` until `expires_at`."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO any_llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if it is stored."""
+        with self._lock:
+            self._connection.execute("DELETE FROM any_llm_cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """Remove every stored value."""
+        with self._lock:
+            self._connection.execute("DELETE FROM any_llm_cache")
+
+    def purge_expired(self) -> None:
+        """Remove the expired values, which are otherwise only removed when they are read."""
+        with self._lock:
+            self._connection.execute("DELETE FROM any_llm_cache WHERE expires_at <= ?", (time.time(),))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class DiskCacheBackend(CacheBackend):
+    """Cache stored as one file per value, sharded into `directory/ab/cd/<key>` subdirectories.
+
+    Files are written atomically, so several processes can share the directory.
+    """
+
+    _HEADER = struct.Struct("<d")
+    _NO_EXPIRY = -1.0
+
+    def __init__(self, directory: str | os.PathLike[str], shard_depth: int = 2) -> None:
+        """Store values under `directory`, nested `shard_depth` levels deep."""
+        if shard_depth < 0:
+            msg = "shard_depth must not be negative"
+            raise ValueError(msg)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.shard_depth = shard_depth
+
+    def _path(self, key: str) -> Path:
+        shards = [key[2 * i : 2 * i + 2] for i in range(self.shard_depth)]
+        return self.directory.joinpath(*shards, key)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the value stored under `key`, or None if it is missing or expired."""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        (expires_at,) = self._HEADER.unpack_from(data)
+        if expires_at != self._NO_EXPIRY and _is_expired(expires_at):
+            path.unlink(missing_ok=True)
+            return None
+        return data[self._HEADER.size :]
+
+    def set(self, key: str, value: bytes, expires_at: float | None = None) -> None:
+        """Store `value` under `key` until `expires_at`."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = self._HEADER.pack(self._NO_EXPIRY if expires_at is None else expires_at)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(header)
+                f.write(value)
+            Path(tmp_name).replace(path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def delete(self, key: str) -> None:
+        """Remove `key` if it is stored."""
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove every stored value."""
+        for child in self.directory.iterdir():
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
+
+
+@dataclass
+class CacheStats:
+    """Counters of a [CompletionCache][any_llm.cache.CompletionCache]."""
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    """Calls made with `cache=False`, or whose arguments can't be hashed."""
+    errors: int = 0
+    """Backend failures. The call is then answered by the provider."""
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of the cache lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, type) and issubclass(value, BaseModel):
+        return value.model_json_schema()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    msg = f"Object of type {type(value).__name__} can't be part of a cache key"
+    raise TypeError(msg)
+
+
+def _digest(payload: dict[str, Any]) -> str:
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CompletionCache:
+    """Cache of completion and embedding responses on top of a [CacheBackend][any_llm.cache.CacheBackend].
+
+    Set it as the `cache` attribute of a provider to cache all of its `acompletion` / `aembedding`
+    calls, or pass it per call with `cache=...`. `cache=False` bypasses the cache for one call.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None, *, ttl: float | None = None, namespace: str = "") -> None:
+        """Create a response cache.
+
+        Args:
+            backend: Where responses are stored. Defaults to a [MemoryCacheBackend][any_llm.cache.MemoryCacheBackend].
+            ttl: Number of seconds responses stay valid. None keeps them until they are evicted.
+            namespace: Part of every key, e.g. to separate providers served from different `api_base`s.
+
+        """
+        self.backend = backend if backend is not None else MemoryCacheBackend()
+        self.ttl = ttl
+        self.namespace = namespace
+        self.stats = CacheStats()
+
+    def completion_key(self, provider: str, params: CompletionParams, kwargs: dict[str, Any]) -> str:
+        """Canonical hash of a completion request."""
+        return _digest(
+            {
+                "version": _CACHE_FORMAT_VERSION,
+                "namespace": self.namespace,
+                "kind": "completion",
+                "provider": provider,
+                "params": params.model_dump(exclude_none=True),
+                "kwargs": kwargs,
+            }
+        )
+
+    def embedding_key(self, provider: str, model: str, inputs: str | list[str], kwargs: dict[str, Any]) -> str:
+        """Canonical hash of an embedding request."""
+        return _digest(
+            {
+                "version": _CACHE_FORMAT_VERSION,
+                "namespace": self.namespace,
+                "kind": "embedding",
+                "provider": provider,
+                "model": model,
+                "inputs": inputs,
+                "kwargs": kwargs,
+            }
+        )
+
+    async def acompletion(
+        self,
+        provider: str,
+        params: CompletionParams,
+        kwargs: dict[str, Any],
+        call: Callable[[], Awaitable[ChatCompletion | AsyncIterator[ChatCompletionChunk]]],
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        """Return the cached response of a completion request, or make it with `call` and cache it.
+
+        Streaming responses are cached once they have been fully consumed, and replayed as a
+        `ChatCompletionChunk` async iterator.
+        """
+        key = self._key(self.completion_key, provider, params, kwargs)
+        if key is None:
+            return await call()
+
+        cached = await self._aget(key)
+        if cached is not None:
+            if cached["type"] == "stream":
+                return self._replay_stream(cached["chunks"])
+            return ChatCompletion.model_validate(cached["response"])
+
+        response = await call()
+        if isinstance(response, ChatCompletion):
+            await self._aset(key, {"type": "completion", "response": response.model_dump(mode="json")})
+            return response
+        return self._record_stream(key, response)
+
+    async def aembedding(
+        self,
+        provider: str,
+        model: str,
+        inputs: str | list[str],
+        kwargs: dict[str, Any],
+        call: Callable[[], Awaitable[CreateEmbeddingResponse]],
+    ) -> CreateEmbeddingResponse:
+        """Return the cached response of an embedding request, or make it with `call` and cache it."""
+        key = self._key(self.embedding_key, provider, model, inputs, kwargs)
+        if key is None:
+            return await call()
+
+        cached = await self._aget(key)
+        if cached is not None:
+            return CreateEmbeddingResponse.model_validate(cached["response"])
+
+        response = await call()
+        await self._aset(key, {"type": "embedding", "response": response.model_dump(mode="json")})
+        return response
+
+    async def aclear(self) -> None:
+        """Remove every cached response and reset the statistics."""
+        await self._run(self.backend.clear)
+        self.stats = CacheStats()
+
+    def _key(self, make_key: Callable[..., str], *args: Any) -> str | None:
+        try:
+            return make_key(*args)
+        except (TypeError, ValueError) as e:
+            logger.debug("Not caching request: %s", e)
+            self.stats.bypasses += 1
+            return None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self.backend.BLOCKING:
+            return await asyncio.to_thread(func, *args)
+        return func(*args)
+
+    async def _aget(self, key: str) -> dict[str, Any] | None:
+        try:
+            value = await self._run(self.backend.get, key)
+            cached = None if value is None else json.loads(value)
+        except Exception as e:
+            logger.warning("Failed to read from the response cache: %s", e)
+            self.stats.errors += 1
+            cached = None
+        if cached is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return cached
+
+    async def _aset(self, key: str, entry: dict[str, Any]) -> None:
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        try:
+            await self._run(self.backend.set, key, json.dumps(entry).encode(), expires_at)
+        except Exception as e:
+            logger.warning("Failed to write to the response cache: %s", e)
+            self.stats.errors += 1
+
+    async def _record_stream(
+        self, key: str, stream: AsyncIterator[ChatCompletionChunk]
+    ) -> AsyncIterator[ChatCompletionChunk]:
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        # Only reached when the stream was fully consumed without errors.
+        await self._aset(key, {"type": "stream", "chunks": chunks})
+
+    @staticmethod
+    async def _replay_stream(chunks: list[dict[str, Any]]) -> AsyncIterator[ChatCompletionChunk]:
+        for chunk in chunks:
+            yield ChatCompletionChunk.model_validate(chunk)
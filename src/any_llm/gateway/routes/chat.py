@@ -27,6 +27,7 @@ from any_llm.gateway.routes.utils import (
     validate_user_credit,
 )
 from any_llm.types.completion import ChatCompletion, ChatCompletionChunk, CompletionUsage
+from any_llm.utils.streaming import StreamAccumulator
 
 router = APIRouter(prefix="/v1/chat", tags=["chat"])
 
@@ -409,12 +410,9 @@ async def chat_completions(
         if request.stream:
 
             async def generate() -> AsyncIterator[str]:
-                prompt_tokens = 0
-                completion_tokens = 0
-                total_tokens = 0
+                accumulator = StreamAccumulator()
                 cached_tokens = 0
                 cached_tokens_seen = False
-                saw_finish_reason = False
 
                 try:
                     stream: AsyncIterator[ChatCompletionChunk] = await acompletion(**completion_kwargs)  # type: ignore[assignment]
@@ -423,27 +421,22 @@ async def chat_completions(
                             chunk.usage = _maybe_attach_cost_to_usage(chunk.usage, model_pricing)
 
                         logger.info("Chunk: %s", chunk)
+                        accumulator.add(chunk)
                         if chunk.usage:
-                            # Prompt tokens should be constant, take first non-zero value
-                            if chunk.usage.prompt_tokens and not prompt_tokens:
-                                prompt_tokens = chunk.usage.prompt_tokens
-                            if chunk.usage.completion_tokens:
-                                completion_tokens = max(completion_tokens, chunk.usage.completion_tokens)
-                            if chunk.usage.total_tokens:
-                                total_tokens = max(total_tokens, chunk.usage.total_tokens)
                             cached_tokens_value = _get_cached_prompt_tokens(chunk.usage)
                             if cached_tokens_value is not None:
                                 cached_tokens_seen = True
                                 cached_tokens = max(cached_tokens, cached_tokens_value or 0)
 
-                        if chunk.choices and any(choice.finish_reason for choice in chunk.choices):
-                            saw_finish_reason = True
-
                         yield f"data: {chunk.model_dump_json()}\n\n"
-                        if saw_finish_reason:
+                        if accumulator.saw_finish_reason:
                             break
                     yield "data: [DONE]\n\n"
 
+                    prompt_tokens = accumulator.prompt_tokens
+                    completion_tokens = accumulator.completion_tokens
+                    total_tokens = accumulator.total_tokens
+
                     # Log aggregated usage
                     if prompt_tokens or completion_tokens or total_tokens or cached_tokens_seen:
                         usage_data = CompletionUsage(
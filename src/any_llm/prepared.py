@@ -0,0 +1,168 @@
+"""Prepared completion requests.
+
+High-volume workloads often send requests sharing a large static prefix (system prompt, few-shot
+examples, tools, response format) followed by a few messages that change on every call. A
+[PreparedCompletion][any_llm.prepared.PreparedCompletion] converts the static part to the
+provider's native request once, so that each call only converts the messages it appends:
+
+```python
+from any_llm import AnyLLM
+
+llm = AnyLLM.create("anthropic")
+classify = llm.prepare_completion(
+    model="claude-sonnet-4-5",
+    messages=[{"role": "system", "content": SYSTEM_PROMPT}],
+    tools=[route_ticket],
+    max_tokens=256,
+)
+
+response = await classify.acompletion([{"role": "user", "content": ticket}])
+stream = await classify.acompletion([{"role": "user", "content": ticket}], stream=True)
+```
+
+Per-call overrides are converted once per distinct set of values and reused afterwards. Providers
+without a native fast path, and calls answered by a [CompletionCache][any_llm.cache.CompletionCache],
+go through [AnyLLM.acompletion][any_llm.any_llm.AnyLLM.acompletion] with the full message list.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from any_llm.constants import INSIDE_NOTEBOOK
+from any_llm.rate_limit import estimate_completion_tokens, estimate_messages_tokens
+from any_llm.tools import prepare_tools
+from any_llm.types.completion import ChatCompletion, ChatCompletionMessage, CompletionParams
+from any_llm.utils.aio import async_iter_to_sync_iter, run_async_in_sync
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+
+    from any_llm.any_llm import AnyLLM
+    from any_llm.types.completion import ChatCompletionChunk
+
+MAX_PREPARED_VARIANTS = 64
+"""Number of distinct sets of per-call overrides whose converted request is kept."""
+
+_COMPLETION_PARAMS = frozenset(CompletionParams.model_fields) - {"model_id", "messages", "tools"}
+
+
+@dataclass
+class _PreparedVariant:
+    params: CompletionParams
+    request: Any
+    estimated_tokens: int
+
+
+class PreparedCompletion:
+    """A completion request whose static part is converted to the provider's request format once.
+
+    Created by [AnyLLM.prepare_completion][any_llm.any_llm.AnyLLM.prepare_completion]. The prefix
+    messages, tools and other arguments are shared between calls and must not be modified.
+    """
+
+    def __init__(
+        self,
+        provider: AnyLLM,
+        model: str,
+        messages: Sequence[dict[str, Any] | ChatCompletionMessage] = (),
+        **kwargs: Any,
+    ) -> None:
+        """Convert the static part of the request, raising any error it causes right away."""
+        self.provider = provider
+        self.model = model
+        self.messages = _dump_messages(messages)
+        tools = kwargs.pop("tools", None)
+        self.tools = prepare_tools(tools, built_in_tools=provider.BUILT_IN_TOOLS) if tools else None
+        self.kwargs = kwargs
+        self._variants: dict[tuple[tuple[str, Any], ...], _PreparedVariant] = {}
+        self._lock = threading.Lock()
+        self._variant({})
+
+    def completion(
+        self, messages: Sequence[dict[str, Any] | ChatCompletionMessage] = (), **overrides: Any
+    ) -> ChatCompletion | Iterator[ChatCompletionChunk]:
+        """Create a chat completion synchronously.
+
+        See [PreparedCompletion.acompletion][any_llm.prepared.PreparedCompletion.acompletion]
+        """
+        allow_running_loop = overrides.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        response = run_async_in_sync(self.acompletion(messages, **overrides), allow_running_loop=allow_running_loop)
+        if isinstance(response, ChatCompletion):
+            return response
+
+        return async_iter_to_sync_iter(response)
+
+    async def acompletion(
+        self, messages: Sequence[dict[str, Any] | ChatCompletionMessage] = (), **overrides: Any
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        """Create a chat completion from the prepared request.
+
+        Args:
+            messages: Messages to append to the prepared ones.
+            **overrides: Arguments of [AnyLLM.acompletion][any_llm.any_llm.AnyLLM.acompletion]
+                replacing the prepared ones for this call (`stream`, `temperature`, ...).
+
+        Returns:
+            The completion response from the provider
+
+        """
+        kwargs = {**self.kwargs, **overrides} if overrides else self.kwargs
+        variant = None
+        if self.provider._resolve_cache(kwargs.get("cache")) is None:
+            variant = self._variant(overrides)
+        if variant is None or variant.request is None:
+            return await self.provider.acompletion(
+                model=self.model, messages=[*self.messages, *messages], tools=self.tools, **kwargs
+            )
+
+        suffix = _dump_messages(messages)
+        if not self.messages and not suffix:
+            msg = "The `messages` list cannot be empty."
+            raise ValueError(msg)
+        return await self.provider._arate_limited_prepared_completion(
+            variant.request, variant.params, suffix, variant.estimated_tokens + estimate_messages_tokens(suffix)
+        )
+
+    def _variant(self, overrides: dict[str, Any]) -> _PreparedVariant:
+        key = tuple(sorted(overrides.items()))
+        try:
+            variant = self._variants.get(key)
+        except TypeError:
+            # Unhashable overrides (e.g. a `response_format` dict) are converted on every call.
+            return self._prepare(overrides)
+        if variant is None:
+            variant = self._prepare(overrides)
+            with self._lock:
+                if len(self._variants) >= MAX_PREPARED_VARIANTS:
+                    del self._variants[next(iter(self._variants))]
+                self._variants[key] = variant
+        return variant
+
+    def _prepare(self, overrides: dict[str, Any]) -> _PreparedVariant:
+        kwargs = {**self.kwargs, **overrides}
+        kwargs.pop("cache", None)
+        completion_kwargs = {name: kwargs.pop(name) for name in _COMPLETION_PARAMS & kwargs.keys()}
+        # The prefix may be empty when every message is sent per call: validate the other arguments.
+        params = CompletionParams(
+            model_id=self.model,
+            messages=self.messages or [{"role": "user", "content": ""}],
+            tools=self.tools,
+            **completion_kwargs,
+        )
+        params.messages = self.messages
+        estimated_tokens = estimate_completion_tokens(params)
+        request = self.provider._prepare_completion_request(params, **kwargs)
+        return _PreparedVariant(params, request, estimated_tokens)
+
+
+def _dump_messages(messages: Sequence[dict[str, Any] | ChatCompletionMessage]) -> list[dict[str, Any]]:
+    return [
+        # Dump the message but exclude the extra field that we extend from OpenAI Spec
+        message.model_dump(exclude_none=True, exclude={"reasoning"})
+        if isinstance(message, ChatCompletionMessage)
+        else message
+        for message in messages
+    ]
@@ -6,13 +6,16 @@ from any_llm.any_llm import AnyLLM
 
 MISSING_PACKAGES_ERROR = None
 try:
-    from anthropic import AsyncAnthropic
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
 
     from .utils import (
+        _AnthropicStreamConverter,
+        _append_messages_for_anthropic,
         _convert_models_list,
         _convert_params,
         _convert_response,
         _create_openai_chunk_from_anthropic_chunk,
+        _response_tool_name,
     )
 except ImportError as e:
     MISSING_PACKAGES_ERROR = e
@@ -53,6 +56,7 @@ class AnthropicProvider(AnyLLM):
     client: AsyncAnthropic
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "http_client", api_base, DefaultAsyncHttpxClient)
         self.client = AsyncAnthropic(
             api_key=api_key,
             base_url=api_base,
@@ -65,9 +69,9 @@ class AnthropicProvider(AnyLLM):
         return _convert_params(params, **kwargs)
 
     @staticmethod
-    def _convert_completion_response(response: Message) -> ChatCompletion:
+    def _convert_completion_response(response: Message, response_tool: str | None = None) -> ChatCompletion:
         """Convert Anthropic Message to OpenAI ChatCompletion format."""
-        return _convert_response(response)
+        return _convert_response(response, response_tool)
 
     @staticmethod
     def _convert_completion_chunk_response(response: Any, **kwargs: Any) -> ChatCompletionChunk:
@@ -92,28 +96,42 @@ class AnthropicProvider(AnyLLM):
         """Convert Anthropic models list to OpenAI format."""
         return _convert_models_list(response)
 
-    async def _stream_completion_async(self, **kwargs: Any) -> AsyncIterator[ChatCompletionChunk]:
+    async def _stream_completion_async(
+        self, response_tool: str | None = None, **kwargs: Any
+    ) -> AsyncIterator[ChatCompletionChunk]:
         """Handle streaming completion - extracted to avoid generator issues."""
+        converter = _AnthropicStreamConverter(kwargs.get("model", "unknown"), response_tool)
         async with self.client.messages.stream(
             **kwargs,
         ) as anthropic_stream:
             async for event in anthropic_stream:
-                yield self._convert_completion_chunk_response(event, model_id=kwargs.get("model", "unknown"))
+                chunk = converter.convert(event)
+                if chunk is not None:
+                    yield chunk
 
     async def _acompletion(
         self,
         params: CompletionParams,
         **kwargs: Any,
     ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        return await self._acompletion_prepared(self._prepare_completion_request(params, **kwargs), params, [])
+
+    def _prepare_completion_request(self, params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         kwargs["provider_name"] = self.PROVIDER_NAME
-        converted_kwargs = self._convert_completion_params(params, **kwargs)
+        return self._convert_completion_params(params, **kwargs)
+
+    async def _acompletion_prepared(
+        self, request: dict[str, Any], params: CompletionParams, messages: list[dict[str, Any]]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        converted_kwargs = _append_messages_for_anthropic(request, messages) if messages else request.copy()
+        response_tool = _response_tool_name(request, params)
 
         if converted_kwargs.pop("stream", False):
-            return self._stream_completion_async(**converted_kwargs)
+            return self._stream_completion_async(response_tool, **converted_kwargs)
 
         message = await self.client.messages.create(**converted_kwargs)
 
-        return self._convert_completion_response(message)
+        return self._convert_completion_response(message, response_tool)
 
     async def _alist_models(self, **kwargs: Any) -> Sequence[Model]:
         models_list = await self.client.models.list(**kwargs)
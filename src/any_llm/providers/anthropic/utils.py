@@ -1,4 +1,6 @@
 import json
+import time
+import uuid
 from typing import TYPE_CHECKING, Any, cast
 
 from anthropic.types import (
@@ -6,9 +8,12 @@ from anthropic.types import (
     ContentBlockStartEvent,
     ContentBlockStopEvent,
     Message,
+    MessageDeltaEvent,
+    MessageStartEvent,
     MessageStopEvent,
 )
 from anthropic.types.model_info import ModelInfo as AnthropicModelInfo
+from pydantic import BaseModel
 
 from any_llm.exceptions import UnsupportedParameterError
 from any_llm.logging import logger
@@ -19,12 +24,17 @@ from any_llm.types.completion import (
     ChatCompletionMessageFunctionToolCall,
     ChatCompletionMessageToolCall,
     Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+    ChunkChoice,
     CompletionParams,
     CompletionUsage,
     Function,
     Reasoning,
 )
 from any_llm.types.model import Model
+from any_llm.utils.models import construct_model
 
 if TYPE_CHECKING:
     from openai.types.chat.chat_completion_message_custom_tool_call import (
@@ -40,6 +50,7 @@ if TYPE_CHECKING:
 
 DEFAULT_MAX_TOKENS = 8192
 REASONING_EFFORT_TO_THINKING_BUDGETS = {"minimal": 1024, "low": 2048, "medium": 8192, "high": 24576}
+FINISH_REASON_MAP = {"end_turn": "stop", "max_tokens": "length", "tool_use": "tool_calls"}
 
 
 def _is_tool_call(message: dict[str, Any]) -> bool:
@@ -47,6 +58,16 @@ def _is_tool_call(message: dict[str, Any]) -> bool:
     return message["role"] == "assistant" and message.get("tool_calls") is not None
 
 
+def _is_tool_result(message: dict[str, Any]) -> bool:
+    """Check if the message is a converted message holding tool results."""
+    return (
+        message["role"] == "user"
+        and isinstance(message["content"], list)
+        and bool(message["content"])
+        and message["content"][0].get("type") == "tool_result"
+    )
+
+
 def _convert_images_for_anthropic(content: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert images from OpenAI format to Anthropic format.
     - Parse the "content" field block by block
@@ -117,13 +138,7 @@ def _convert_messages_for_anthropic(messages: list[dict[str, Any]]) -> tuple[str
 
                 # Check if the previous message is already a user message with tool_results
                 # If so, merge this tool_result into it
-                if (
-                    filtered_messages
-                    and filtered_messages[-1]["role"] == "user"
-                    and isinstance(filtered_messages[-1]["content"], list)
-                    and filtered_messages[-1]["content"]
-                    and filtered_messages[-1]["content"][0].get("type") == "tool_result"
-                ):
+                if filtered_messages and _is_tool_result(filtered_messages[-1]):
                     filtered_messages[-1]["content"].append(tool_result)
                     continue
 
@@ -140,84 +155,173 @@ def _convert_messages_for_anthropic(messages: list[dict[str, Any]]) -> tuple[str
     return system_message, filtered_messages
 
 
-def _create_openai_chunk_from_anthropic_chunk(chunk: Any, model_id: str) -> ChatCompletionChunk:
-    """Convert Anthropic streaming chunk to OpenAI ChatCompletionChunk format."""
-    chunk_dict = {
-        "id": f"chatcmpl-{hash(str(chunk))}",
-        "object": "chat.completion.chunk",
-        "created": 0,
-        "model": model_id,
-        "choices": [],
-        "usage": None,
-    }
-
-    delta: dict[str, Any] = {}
-    finish_reason = None
-
-    if isinstance(chunk, ContentBlockStartEvent):
-        if chunk.content_block.type == "text":
-            delta = {"content": ""}
-        elif chunk.content_block.type == "tool_use":
-            delta = {
-                "tool_calls": [
-                    {
-                        "index": 0,
-                        "id": chunk.content_block.id,
-                        "type": "function",
-                        "function": {"name": chunk.content_block.name, "arguments": ""},
-                    }
-                ]
-            }
-        elif chunk.content_block.type == "thinking":
-            delta = {"reasoning": {"content": ""}}
-
-    elif isinstance(chunk, ContentBlockDeltaEvent):
-        if chunk.delta.type == "text_delta":
-            delta = {"content": chunk.delta.text}
-        elif chunk.delta.type == "input_json_delta":
-            delta = {
-                "tool_calls": [
-                    {
-                        "index": 0,
-                        "function": {"arguments": chunk.delta.partial_json},
-                    }
-                ]
-            }
-        elif chunk.delta.type == "thinking_delta":
-            delta = {"reasoning": {"content": chunk.delta.thinking}}
-
-    elif isinstance(chunk, ContentBlockStopEvent):
-        if hasattr(chunk, "content_block") and chunk.content_block.type == "tool_use":
-            finish_reason = "tool_calls"
-        else:
-            finish_reason = None
+def _append_messages_for_anthropic(request: dict[str, Any], messages: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return a copy of a converted request with `messages` converted and appended.
 
-    elif isinstance(chunk, MessageStopEvent):
-        finish_reason = "stop"
-        if hasattr(chunk, "message") and chunk.message.usage:
-            chunk_dict["usage"] = {
-                "prompt_tokens": chunk.message.usage.input_tokens,
-                "completion_tokens": chunk.message.usage.output_tokens,
-                "total_tokens": chunk.message.usage.input_tokens + chunk.message.usage.output_tokens,
-            }
+    `request` isn't modified, so that a prepared request can be shared between calls.
+    """
+    system_message, new_messages = _convert_messages_for_anthropic(messages)
+    result = request.copy()
+    if system_message:
+        result["system"] = f"{request['system']}\n{system_message}" if request.get("system") else system_message
+    previous = request["messages"]
+    if previous and new_messages and _is_tool_result(previous[-1]) and _is_tool_result(new_messages[0]):
+        # Consecutive tool results go in a single user message.
+        merged = {**previous[-1], "content": [*previous[-1]["content"], *new_messages[0]["content"]]}
+        result["messages"] = [*previous[:-1], merged, *new_messages[1:]]
+    else:
+        result["messages"] = [*previous, *new_messages]
+    return result
+
+
+class _AnthropicStreamConverter:
+    """Convert the events of one Anthropic message stream to OpenAI `ChatCompletionChunk`s.
+
+    Carries the state single events don't have: the message id (shared by every chunk of the stream),
+    the mapping from Anthropic content block index to OpenAI tool call index, the stop reason and the usage.
+    The input of the `response_tool` call, forced to get a structured output, is streamed as content.
+    """
 
-    choice = {
-        "index": 0,
-        "delta": delta,
-        "finish_reason": finish_reason,
-        "logprobs": None,
-    }
+    def __init__(self, model_id: str, response_tool: str | None = None) -> None:
+        self.model_id = model_id
+        self.response_tool = response_tool
+        self.id = f"chatcmpl-{uuid.uuid4().hex}"
+        self.created = int(time.time())
+        self.stop_reason: str | None = None
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self._tool_call_indexes: dict[int, int] = {}
+        self._response_blocks: set[int] = set()
+
+    def chunk(
+        self,
+        delta: ChoiceDelta | None = None,
+        finish_reason: str | None = None,
+        usage: CompletionUsage | None = None,
+    ) -> ChatCompletionChunk:
+        choice = construct_model(
+            ChunkChoice,
+            index=0,
+            delta=delta if delta is not None else construct_model(ChoiceDelta),
+            finish_reason=finish_reason,
+            logprobs=None,
+        )
+        return construct_model(
+            ChatCompletionChunk,
+            id=self.id,
+            object="chat.completion.chunk",
+            created=self.created,
+            model=self.model_id,
+            choices=[choice],
+            usage=usage,
+        )
 
-    chunk_dict["choices"] = [choice]
+    def convert(self, event: Any) -> ChatCompletionChunk | None:
+        """Convert one stream event, or return None for events that carry nothing for the client."""
+        if isinstance(event, ContentBlockDeltaEvent):
+            return self._convert_block_delta(event)
+
+        if isinstance(event, ContentBlockStartEvent):
+            return self._convert_block_start(event)
+
+        if isinstance(event, ContentBlockStopEvent):
+            if event.index in self._response_blocks:
+                return None
+            block = getattr(event, "content_block", None)
+            if event.index in self._tool_call_indexes or getattr(block, "type", None) == "tool_use":
+                return self.chunk(finish_reason="tool_calls")
+            return None
+
+        if isinstance(event, MessageStartEvent):
+            self.id = event.message.id
+            self.input_tokens = event.message.usage.input_tokens
+            self.output_tokens = event.message.usage.output_tokens
+            return self.chunk(construct_model(ChoiceDelta, role="assistant"))
+
+        if isinstance(event, MessageDeltaEvent):
+            self.stop_reason = event.delta.stop_reason
+            self.output_tokens = event.usage.output_tokens
+            if event.usage.input_tokens is not None:
+                self.input_tokens = event.usage.input_tokens
+            return None
+
+        if isinstance(event, MessageStopEvent):
+            message = getattr(event, "message", None)
+            if message is not None:
+                self.stop_reason = message.stop_reason or self.stop_reason
+                self.input_tokens = message.usage.input_tokens
+                self.output_tokens = message.usage.output_tokens
+            usage = CompletionUsage(
+                prompt_tokens=self.input_tokens,
+                completion_tokens=self.output_tokens,
+                total_tokens=self.input_tokens + self.output_tokens,
+            )
+            stop_reason = self.stop_reason or "end_turn"
+            if self._response_blocks and stop_reason == "tool_use":
+                stop_reason = "end_turn"
+            return self.chunk(finish_reason=FINISH_REASON_MAP.get(stop_reason, "stop"), usage=usage)
+
+        return None
+
+    def _convert_block_start(self, event: ContentBlockStartEvent) -> ChatCompletionChunk | None:
+        block = event.content_block
+        if block.type == "text":
+            return self.chunk(construct_model(ChoiceDelta, content=""))
+        if block.type == "tool_use" and block.name == self.response_tool:
+            self._response_blocks.add(event.index)
+            return self.chunk(construct_model(ChoiceDelta, content=""))
+        if block.type == "tool_use":
+            tool_call_index = len(self._tool_call_indexes)
+            self._tool_call_indexes[event.index] = tool_call_index
+            tool_call = ChoiceDeltaToolCall(
+                index=tool_call_index,
+                id=block.id,
+                type="function",
+                function=ChoiceDeltaToolCallFunction(name=block.name, arguments=""),
+            )
+            return self.chunk(construct_model(ChoiceDelta, tool_calls=[tool_call]))
+        if block.type == "thinking":
+            return self.chunk(construct_model(ChoiceDelta, reasoning=Reasoning(content="")))
+        return None
+
+    def _convert_block_delta(self, event: ContentBlockDeltaEvent) -> ChatCompletionChunk | None:
+        delta = event.delta
+        if delta.type == "text_delta":
+            return self.chunk(construct_model(ChoiceDelta, content=delta.text))
+        if delta.type == "input_json_delta" and event.index in self._response_blocks:
+            return self.chunk(construct_model(ChoiceDelta, content=delta.partial_json))
+        if delta.type == "input_json_delta":
+            tool_call = ChoiceDeltaToolCall(
+                index=self._tool_call_indexes.get(event.index, 0),
+                function=ChoiceDeltaToolCallFunction(arguments=delta.partial_json),
+            )
+            return self.chunk(construct_model(ChoiceDelta, tool_calls=[tool_call]))
+        if delta.type == "thinking_delta":
+            return self.chunk(
+                construct_model(ChoiceDelta, reasoning=construct_model(Reasoning, content=delta.thinking))
+            )
+        return None
+
+
+def _create_openai_chunk_from_anthropic_chunk(chunk: Any, model_id: str) -> ChatCompletionChunk:
+    """Convert a single Anthropic streaming event to OpenAI ChatCompletionChunk format.
+
+    Streams should use one `_AnthropicStreamConverter` for all their events instead, so that chunks share
+    the message id and tool calls get their own index.
+    """
+    converter = _AnthropicStreamConverter(model_id)
+    return converter.convert(chunk) or converter.chunk()
 
-    return ChatCompletionChunk.model_validate(chunk_dict)
 
+def _convert_response(response: Message, response_tool: str | None = None) -> ChatCompletion:
+    """Convert Anthropic Message to OpenAI ChatCompletion format.
 
-def _convert_response(response: Message) -> ChatCompletion:
-    """Convert Anthropic Message to OpenAI ChatCompletion format."""
+    The input of the `response_tool` call, forced to get a structured output, is returned as the content.
+    """
     finish_reason_raw = response.stop_reason or "end_turn"
-    finish_reason_map = {"end_turn": "stop", "max_tokens": "length", "tool_use": "tool_calls"}
-    finish_reason = finish_reason_map.get(finish_reason_raw, "stop")
+    if response_tool is not None and finish_reason_raw == "tool_use":
+        finish_reason_raw = "end_turn"
+    finish_reason = FINISH_REASON_MAP.get(finish_reason_raw, "stop")
 
     content_parts: list[str] = []
     tool_calls: list[ChatCompletionMessageFunctionToolCall | ChatCompletionMessageToolCall] = []
@@ -225,6 +329,8 @@ def _convert_response(response: Message) -> ChatCompletion:
     for content_block in response.content:
         if content_block.type == "text":
             content_parts.append(content_block.text)
+        elif content_block.type == "tool_use" and content_block.name == response_tool:
+            content_parts.append(json.dumps(content_block.input))
         elif content_block.type == "tool_use":
             tool_calls.append(
                 ChatCompletionMessageFunctionToolCall(
@@ -328,18 +434,50 @@ def _convert_tool_choice(params: CompletionParams) -> dict[str, Any]:
     return {"type": tool_choice, "disable_parallel_tool_use": not parallel_tool_calls}
 
 
-def _convert_params(params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
-    """Convert CompletionParams to kwargs for Anthropic API."""
-    provider_name: str = kwargs.pop("provider_name")
-    result_kwargs: dict[str, Any] = kwargs.copy()
+def _convert_response_format(response_format: type[BaseModel] | dict[str, Any], provider_name: str) -> dict[str, Any]:
+    """Convert a pydantic model or `json_schema` response format to the tool Anthropic is forced to call.
 
-    if params.response_format:
+    Anthropic has no structured output mode: the input of the tool call is the structured output.
+    """
+    if isinstance(response_format, type) and issubclass(response_format, BaseModel):
+        name = response_format.__name__
+        schema = response_format.model_json_schema()
+    elif response_format.get("type") == "json_schema" and "schema" in response_format.get("json_schema", {}):
+        name = response_format["json_schema"].get("name", "json_response")
+        schema = response_format["json_schema"]["schema"]
+    else:
         msg = "response_format"
         raise UnsupportedParameterError(
             msg,
             provider_name,
-            "Check the following links:\n- https://docs.anthropic.com/en/docs/test-and-evaluate/strengthen-guardrails/increase-consistency\n- https://docs.anthropic.com/en/docs/agents-and-tools/tool-use/overview#json-mode",
+            "Only pydantic models and `json_schema` response formats are supported. Check the following links:\n- https://docs.anthropic.com/en/docs/test-and-evaluate/strengthen-guardrails/increase-consistency\n- https://docs.anthropic.com/en/docs/agents-and-tools/tool-use/overview#json-mode",
         )
+    return {"name": name, "description": f"Respond with a {name} object.", "input_schema": schema}
+
+
+def _response_tool_name(request: dict[str, Any], params: CompletionParams) -> str | None:
+    """Return the name of the tool forced to get the structured output of `request`, if any."""
+    if not params.response_format:
+        return None
+    return cast("str", request["tool_choice"]["name"])
+
+
+def _convert_params(params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
+    """Convert CompletionParams to kwargs for Anthropic API."""
+    provider_name: str = kwargs.pop("provider_name")
+    result_kwargs: dict[str, Any] = kwargs.copy()
+
+    response_tool: dict[str, Any] | None = None
+    if params.response_format:
+        if params.tools:
+            msg = "tools with response_format"
+            raise UnsupportedParameterError(msg, provider_name)
+        if params.reasoning_effort not in (None, "none", "auto"):
+            # The response format is a forced tool call, which Anthropic rejects with extended thinking.
+            msg = "reasoning_effort with response_format"
+            raise UnsupportedParameterError(msg, provider_name)
+        response_tool = _convert_response_format(params.response_format, provider_name)
+
     if params.max_tokens is None:
         logger.warning(f"max_tokens is required for Anthropic, setting to {DEFAULT_MAX_TOKENS}")
         params.max_tokens = DEFAULT_MAX_TOKENS
@@ -371,6 +509,9 @@ def _convert_params(params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         )
     )
     result_kwargs["model"] = params.model_id
+    if response_tool is not None:
+        result_kwargs["tools"] = [response_tool]
+        result_kwargs["tool_choice"] = {"type": "tool", "name": response_tool["name"]}
 
     system_message, filtered_messages = _convert_messages_for_anthropic(params.messages)
     if system_message:
@@ -44,6 +44,9 @@ class AzureProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = False
     SUPPORTS_BATCH = False
 
+    # The lowest limit of the embedding models served by Azure AI Inference (Cohere).
+    EMBEDDING_MAX_BATCH_SIZE = 96
+
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
     chat_client: aio.ChatCompletionsClient
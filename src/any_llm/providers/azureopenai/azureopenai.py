@@ -1,7 +1,7 @@
 import os
 from typing import Any
 
-from openai import AsyncAzureOpenAI
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
 
 from any_llm.exceptions import MissingApiKeyError
 from any_llm.providers.openai.base import BaseOpenAIProvider
@@ -37,6 +37,7 @@ class AzureopenaiProvider(BaseOpenAIProvider):
         if not azure_endpoint:
             raise MissingApiKeyError(self.PROVIDER_NAME, "AZURE_OPENAI_ENDPOINT")
 
+        self._add_http_client(kwargs, "http_client", azure_endpoint, DefaultAsyncHttpxClient)
         self.client = AsyncAzureOpenAI(
             api_key=api_key,
             azure_endpoint=azure_endpoint,
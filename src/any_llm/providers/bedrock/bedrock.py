@@ -3,7 +3,9 @@ import asyncio
 import functools
 import json
 import os
-from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+import time
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from any_llm.any_llm import AnyLLM
@@ -11,16 +13,23 @@ from any_llm.exceptions import MissingApiKeyError
 from any_llm.logging import logger
 from any_llm.types.completion import ChatCompletion, ChatCompletionChunk, CompletionParams, CreateEmbeddingResponse
 from any_llm.types.model import Model
+from any_llm.utils.aio import iterate_in_thread
 
 MISSING_PACKAGES_ERROR = None
 try:
     import boto3
+    from botocore.exceptions import ClientError
 
     from .utils import (
+        _backoff_delay,
         _convert_params,
         _convert_response,
         _create_openai_chunk_from_aws_chunk,
         _create_openai_embedding_response_from_aws,
+        _embedding_request_batches,
+        _embedding_request_body,
+        _is_throttling_error,
+        _parse_embedding_response,
     )
 except ImportError as e:
     MISSING_PACKAGES_ERROR = e
@@ -45,6 +54,15 @@ class BedrockProvider(AnyLLM):
 
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
+    # One `invoke_model` call of the Cohere models; the Titan models are called once per input.
+    EMBEDDING_MAX_BATCH_SIZE = 96
+
+    EMBEDDING_MAX_CONCURRENCY = 8
+    """Default number of concurrent `invoke_model` calls per embedding request (`max_concurrency` kwarg)."""
+
+    EMBEDDING_MAX_RETRIES = 5
+    """Number of times a throttled `invoke_model` call is retried with exponential backoff."""
+
     @staticmethod
     def _convert_completion_params(params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         """Convert CompletionParams to kwargs for AWS API."""
@@ -109,25 +127,12 @@ class BedrockProvider(AnyLLM):
         params: CompletionParams,
         **kwargs: Any,
     ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
-        logger.warning("AWS Bedrock client does not support async. Calls made with this method will be blocking.")
-
-        loop = asyncio.get_event_loop()
-
-        # create partial function of sync call
-        call_sync_partial: Callable[[], ChatCompletion | Iterator[ChatCompletionChunk]] = functools.partial(
-            self._completion, params, **kwargs
-        )
-
-        result = await loop.run_in_executor(None, call_sync_partial)
+        result = await asyncio.to_thread(self._completion, params, **kwargs)
 
         if isinstance(result, ChatCompletion):
             return result
 
-        async def _stream() -> AsyncIterator[ChatCompletionChunk]:
-            for chunk in result:
-                yield chunk
-
-        return _stream()
+        return iterate_in_thread(result)
 
     def _completion(
         self,
@@ -160,16 +165,7 @@ class BedrockProvider(AnyLLM):
         inputs: str | list[str],
         **kwargs: Any,
     ) -> CreateEmbeddingResponse:
-        logger.warning("AWS Bedrock client does not support async. Calls made with this method will be blocking.")
-
-        loop = asyncio.get_event_loop()
-
-        # create partial function of sync call
-        call_sync_partial: Callable[[], CreateEmbeddingResponse] = functools.partial(
-            self._embedding, model, inputs, **kwargs
-        )
-
-        return await loop.run_in_executor(None, call_sync_partial)
+        return await asyncio.to_thread(self._embedding, model, inputs, **kwargs)
 
     def _embedding(
         self,
@@ -178,34 +174,55 @@ class BedrockProvider(AnyLLM):
         **kwargs: Any,
     ) -> CreateEmbeddingResponse:
         input_texts = [inputs] if isinstance(inputs, str) else inputs
+        max_concurrency = kwargs.pop("max_concurrency", self.EMBEDDING_MAX_CONCURRENCY)
+
+        batches = _embedding_request_batches(model, input_texts)
+        embed_batch = functools.partial(self._embed_batch, model, kwargs)
+        if len(batches) <= 1 or max_concurrency <= 1:
+            results = [embed_batch(batch) for batch in batches]
+        else:
+            executor = ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(batches)), thread_name_prefix="any-llm-bedrock-embedding"
+            )
+            try:
+                results = list(executor.map(embed_batch, batches))
+            finally:
+                executor.shutdown(cancel_futures=True)
 
-        embedding_data = []
+        embedding_data: list[dict[str, Any]] = []
         total_tokens = 0
-
-        for index, text in enumerate(input_texts):
-            request_body = {"inputText": text}
-
-            if "dimensions" in kwargs:
-                request_body["dimensions"] = kwargs["dimensions"]
-            if "normalize" in kwargs:
-                request_body["normalize"] = kwargs["normalize"]
-
-            response = self.client.invoke_model(modelId=model, body=json.dumps(request_body))
-
-            response_body = json.loads(response["body"].read())
-
-            embedding_data.append({"embedding": response_body["embedding"], "index": index})
-
-            total_tokens += response_body.get("inputTextTokenCount", 0)
+        for embeddings, tokens in results:
+            for embedding in embeddings:
+                embedding_data.append({"embedding": embedding, "index": len(embedding_data)})
+            total_tokens += tokens
 
         response_data = {"embedding_data": embedding_data, "model": model, "total_tokens": total_tokens}
         return self._convert_embedding_response(response_data)
 
+    def _embed_batch(self, model: str, kwargs: dict[str, Any], texts: list[str]) -> tuple[list[list[float]], int]:
+        body = json.dumps(_embedding_request_body(model, texts, kwargs))
+        attempt = 0
+        while True:
+            try:
+                response = self.client.invoke_model(modelId=model, body=body)
+            except ClientError as e:
+                if attempt >= self.EMBEDDING_MAX_RETRIES or not _is_throttling_error(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                logger.debug("Bedrock embedding request throttled, retrying in %.2fs", delay)
+                time.sleep(delay)
+                attempt += 1
+            else:
+                return _parse_embedding_response(model, response)
+
     async def _alist_models(self, **kwargs: Any) -> Sequence[Model]:
+        response = await asyncio.to_thread(self._list_foundation_models, **kwargs)
+        return self._convert_list_models_response(response)
+
+    def _list_foundation_models(self, **kwargs: Any) -> Any:
         client = boto3.client(
             "bedrock",
             endpoint_url=self.api_base,
             **self.kwargs,
         )
-        response = client.list_foundation_models(**kwargs)
-        return self._convert_list_models_response(response)
+        return client.list_foundation_models(**kwargs)
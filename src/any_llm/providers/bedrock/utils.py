@@ -1,4 +1,5 @@
 import json
+import random
 from time import time
 from typing import Any, Literal, cast
 
@@ -26,6 +27,16 @@ INFERENCE_PARAMETERS = ["maxTokens", "temperature", "topP", "stopSequences"]
 
 REASONING_EFFORT_TO_THINKING_BUDGETS = {"minimal": 1024, "low": 2048, "medium": 8192, "high": 24576}
 
+COHERE_EMBED_MAX_TEXTS = 96
+"""Maximum number of texts in a single Cohere embed request on Bedrock."""
+
+THROTTLING_ERROR_CODES = frozenset(
+    ["ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException", "ModelNotReadyException"]
+)
+
+BACKOFF_BASE_DELAY = 0.5
+BACKOFF_MAX_DELAY = 20.0
+
 
 def _convert_params(params: CompletionParams, kwargs: dict[str, Any]) -> dict[str, Any]:
     """Convert CompletionParams to kwargs for AWS API."""
@@ -419,3 +430,57 @@ def _create_openai_embedding_response_from_aws(
         object="list",
         usage=usage,
     )
+
+
+def _supports_batch_embedding_input(model: str) -> bool:
+    """Whether the embedding model accepts several texts in one `invoke_model` body.
+
+    Cohere embed models take a `texts` list, Amazon Titan models only take a single `inputText`.
+    """
+    return "cohere.embed" in model
+
+
+def _embedding_request_batches(model: str, texts: list[str]) -> list[list[str]]:
+    """Group `texts` into the inputs of the `invoke_model` calls needed to embed them."""
+    if _supports_batch_embedding_input(model):
+        return [texts[i : i + COHERE_EMBED_MAX_TEXTS] for i in range(0, len(texts), COHERE_EMBED_MAX_TEXTS)]
+    return [[text] for text in texts]
+
+
+def _embedding_request_body(model: str, texts: list[str], kwargs: dict[str, Any]) -> dict[str, Any]:
+    if _supports_batch_embedding_input(model):
+        body: dict[str, Any] = {"texts": texts, "input_type": kwargs.get("input_type", "search_document")}
+        if "truncate" in kwargs:
+            body["truncate"] = kwargs["truncate"]
+        return body
+
+    body = {"inputText": texts[0]}
+    if "dimensions" in kwargs:
+        body["dimensions"] = kwargs["dimensions"]
+    if "normalize" in kwargs:
+        body["normalize"] = kwargs["normalize"]
+    return body
+
+
+def _parse_embedding_response(model: str, response: dict[str, Any]) -> tuple[list[list[float]], int]:
+    """Return the embeddings and the input token count of an `invoke_model` embedding response."""
+    response_body = json.loads(response["body"].read())
+    if not _supports_batch_embedding_input(model):
+        return [response_body["embedding"]], response_body.get("inputTextTokenCount", 0)
+
+    embeddings = response_body["embeddings"]
+    if isinstance(embeddings, dict):
+        # Returned when `embedding_types` is set.
+        embeddings = embeddings["float"]
+    headers = response.get("ResponseMetadata", {}).get("HTTPHeaders", {})
+    return embeddings, int(headers.get("x-amzn-bedrock-input-token-count", 0))
+
+
+def _is_throttling_error(error: Any) -> bool:
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in THROTTLING_ERROR_CODES
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter for the given (0-based) retry attempt."""
+    return random.uniform(0, min(BACKOFF_MAX_DELAY, BACKOFF_BASE_DELAY * 2**attempt))  # noqa: S311
@@ -84,6 +84,7 @@ class CerebrasProvider(AnyLLM):
         return _convert_models_list(response)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "http_client", api_base, cerebras.DefaultAsyncHttpxClient)
         self.client = cerebras.AsyncCerebras(api_key=api_key, **kwargs)
 
     async def _stream_completion_async(
@@ -91,6 +91,7 @@ class CohereProvider(AnyLLM):
         return _convert_models_list(response)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "httpx_client", api_base)
         self.client = cohere.AsyncClientV2(api_key=api_key, **kwargs)
 
     async def _stream_completion_async(
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
+import io
+import time
 from typing import TYPE_CHECKING, Any, ClassVar, cast
 
 from pydantic import BaseModel
 
 from any_llm.any_llm import AnyLLM
 from any_llm.exceptions import UnsupportedParameterError
+from any_llm.logging import logger
 from any_llm.types.completion import (
     ChatCompletion,
     ChatCompletionChunk,
@@ -25,6 +29,7 @@ try:
     from google.genai import types
 
     from .utils import (
+        ImagePartCache,
         _convert_messages,
         _convert_models_list,
         _convert_response_to_response_dict,
@@ -32,6 +37,9 @@ try:
         _convert_tool_spec,
         _create_openai_chunk_from_google_chunk,
         _create_openai_embedding_response_from_google,
+        _image_url_digest,
+        _iter_image_urls,
+        _parse_data_url,
     )
 except ImportError as e:
     MISSING_PACKAGES_ERROR = e
@@ -55,6 +63,12 @@ if TYPE_CHECKING:
 
 REASONING_EFFORT_TO_THINKING_BUDGETS = {"minimal": 256, "low": 1024, "medium": 8192, "high": 24576}
 
+MAX_UPLOADED_IMAGES = 10_000
+UPLOADED_FILE_TTL = 48 * 3600.0
+"""Lifetime of the files uploaded to the Files API."""
+UPLOADED_FILE_EXPIRY_MARGIN = 3600.0
+"""Uploaded files are uploaded again this many seconds before they expire."""
+
 
 class GoogleProvider(AnyLLM):
     """Base Google Provider class with common functionality for Gemini and Vertex AI."""
@@ -69,23 +83,46 @@ class GoogleProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = True
     SUPPORTS_BATCH = False
 
+    EMBEDDING_MAX_BATCH_SIZE = 100
+
     BUILT_IN_TOOLS: ClassVar[list[Any] | None] = [types.Tool]
 
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
     client: genai.Client
 
+    image_upload_threshold: int | None = None
+    """Upload base64 images of at least this many bytes to the Files API once, and refer to them by URI.
+
+    Later turns of a conversation then send a short URI instead of the whole image. Uploaded files
+    are reused until shortly before they expire. Only supported by the Gemini Developer API.
+    """
+
+    _uploaded_image_parts: ImagePartCache | None = None
+
+    def _add_http_options(self, client_kwargs: dict[str, Any]) -> None:
+        """Add the HTTP client built from the transport settings to the `http_options` of the client."""
+        http_client: dict[str, Any] = {}
+        self._add_http_client(http_client, "httpx_async_client")
+        if not http_client:
+            return
+        http_options = client_kwargs.get("http_options")
+        if http_options is None:
+            client_kwargs["http_options"] = types.HttpOptions(**http_client)
+        elif isinstance(http_options, dict):
+            client_kwargs["http_options"] = {**http_client, **http_options}
+        elif http_options.httpx_async_client is None:
+            client_kwargs["http_options"] = http_options.model_copy(update=http_client)
+
     @staticmethod
     def _convert_completion_params(params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         """Convert CompletionParams to kwargs for Google API."""
         provider_name = kwargs.pop("provider_name")
+        image_parts = kwargs.pop("image_parts", None)
 
         if params.parallel_tool_calls is not None:
             error_message = "parallel_tool_calls"
             raise UnsupportedParameterError(error_message, provider_name)
-        if params.stream and params.response_format is not None:
-            error_message = "stream and response_format"
-            raise UnsupportedParameterError(error_message, provider_name)
 
         if params.frequency_penalty is not None:
             kwargs["frequency_penalty"] = params.frequency_penalty
@@ -121,7 +158,7 @@ class GoogleProvider(AnyLLM):
             kwargs["response_mime_type"] = "application/json"
             kwargs["response_schema"] = response_format
 
-        formatted_messages, system_instruction = _convert_messages(params.messages)
+        formatted_messages, system_instruction = _convert_messages(params.messages, image_parts)
         if system_instruction:
             kwargs["system_instruction"] = system_instruction
 
@@ -246,8 +283,25 @@ class GoogleProvider(AnyLLM):
         params: CompletionParams,
         **kwargs: Any,
     ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        kwargs["image_parts"] = await self._aupload_images(params.messages)
+        return await self._acompletion_prepared(self._prepare_completion_request(params, **kwargs), params, [])
+
+    def _prepare_completion_request(self, params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         kwargs["provider_name"] = self.PROVIDER_NAME
-        converted_kwargs = self._convert_completion_params(params, **kwargs)
+        return self._convert_completion_params(params, **kwargs)
+
+    async def _acompletion_prepared(
+        self, request: dict[str, Any], params: CompletionParams, messages: list[dict[str, Any]]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        converted_kwargs = request
+        if messages:
+            contents, system_instruction = _convert_messages(messages, await self._aupload_images(messages))
+            converted_kwargs = {**request, "contents": [*request["contents"], *contents]}
+            if system_instruction:
+                config = request["config"]
+                if config.system_instruction:
+                    system_instruction = f"{config.system_instruction}\n{system_instruction}"
+                converted_kwargs["config"] = config.model_copy(update={"system_instruction": system_instruction})
 
         if params.stream:
             response_stream = await self.client.aio.models.generate_content_stream(**converted_kwargs)
@@ -266,6 +320,63 @@ class GoogleProvider(AnyLLM):
         response_dict = _convert_response_to_response_dict(response)
         return self._convert_completion_response((response_dict, params.model_id))
 
+    async def _aupload_images(self, messages: list[dict[str, Any]]) -> dict[str, types.Part]:
+        """Return the parts of the images of `messages` to send by URI, uploading the new ones.
+
+        See `image_upload_threshold`.
+        """
+        threshold = self.image_upload_threshold
+        if threshold is None:
+            return {}
+        if self.client.vertexai:
+            msg = "image_upload_threshold"
+            raise UnsupportedParameterError(msg, self.PROVIDER_NAME, "The Files API is only available for Gemini.")
+        if self._uploaded_image_parts is None:
+            self._uploaded_image_parts = ImagePartCache(max_size=MAX_UPLOADED_IMAGES)
+
+        image_parts: dict[str, types.Part] = {}
+        pending: dict[bytes, str] = {}
+        for url in _iter_image_urls(messages):
+            # Base64 encodes 3 bytes in 4 characters: skip small images without decoding them.
+            if not url.startswith("data:") or len(url) * 3 // 4 < threshold or url in image_parts:
+                continue
+            digest = _image_url_digest(url)
+            part = self._uploaded_image_parts.get(digest)
+            if part is not None:
+                image_parts[url] = part
+            else:
+                pending.setdefault(digest, url)
+
+        parts = await asyncio.gather(*(self._aupload_image(digest, url) for digest, url in pending.items()))
+        for url, uploaded_part in zip(pending.values(), parts, strict=True):
+            if uploaded_part is not None:
+                image_parts[url] = uploaded_part
+        return image_parts
+
+    async def _aupload_image(self, digest: bytes, url: str) -> types.Part | None:
+        parsed = _parse_data_url(url)
+        if parsed is None:
+            return None
+        mime_type, image_bytes = parsed
+        try:
+            file = await self.client.aio.files.upload(
+                file=io.BytesIO(image_bytes), config=types.UploadFileConfig(mime_type=mime_type)
+            )
+        except Exception as e:
+            logger.warning("Failed to upload an image to the Files API, sending it inline: %s", e)
+            return None
+        if not file.uri:
+            return None
+
+        part = types.Part.from_uri(file_uri=file.uri, mime_type=file.mime_type or mime_type)
+        expires_at = file.expiration_time.timestamp() if file.expiration_time else time.time() + UPLOADED_FILE_TTL
+        if self._uploaded_image_parts is not None:
+            self._uploaded_image_parts.put(digest, part, 1, expires_at - UPLOADED_FILE_EXPIRY_MARGIN)
+        return part
+
     async def _alist_models(self, **kwargs: Any) -> Sequence[Model]:
         models_list = await self.client.aio.models.list(**kwargs)
         return self._convert_list_models_response(models_list)
+
+    async def aclose(self) -> None:
+        await self.client.aio.aclose()
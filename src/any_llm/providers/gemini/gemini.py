@@ -24,4 +24,5 @@ class GeminiProvider(GoogleProvider):
         return api_key
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_options(kwargs)
         self.client = genai.Client(api_key=api_key, **kwargs)
@@ -1,5 +1,9 @@
 import base64
+import hashlib
 import json
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
 from time import time
 from typing import Any, Literal
 
@@ -76,73 +80,173 @@ def _convert_tool_choice(tool_choice: str) -> types.ToolConfig:
     return types.ToolConfig(function_calling_config=types.FunctionCallingConfig(mode=tool_choice_to_mode[tool_choice]))
 
 
-def _convert_messages(messages: list[dict[str, Any]]) -> tuple[list[types.Content], str | None]:
-    """Convert messages to Google GenAI format."""
-    formatted_messages = []
-    system_instruction = None
+DEFAULT_IMAGE_PART_CACHE_BYTES = 256 * 1024 * 1024
 
-    def _create_inline_part(image_bytes: bytes, mime_type: str) -> types.Part:
-        part_cls = types.Part
-        if hasattr(part_cls, "from_bytes"):
-            return part_cls.from_bytes(data=image_bytes, mime_type=mime_type)
-        if hasattr(part_cls, "from_data"):
-            return part_cls.from_data(data=image_bytes, mime_type=mime_type)
-        if hasattr(part_cls, "from_inline_data"):
-            return part_cls.from_inline_data(data=image_bytes, mime_type=mime_type)
 
-        inline_data_cls = getattr(types, "InlineData", None) or getattr(types, "Blob", None)
-        if inline_data_cls:
-            inline_data = inline_data_cls(data=image_bytes, mime_type=mime_type)
-            return part_cls(inline_data=inline_data)
+class ImagePartCache:
+    """Bounded LRU cache of image parts, keyed by the SHA-256 digest of the image's data URL.
 
-        raise ValueError("Image parts are not supported by the installed google-genai package")
+    Multi-turn conversations send the same images on every turn: with the cache, each base64 data
+    URL is decoded once rather than once per request. Cached parts are shared between requests
+    and must not be modified.
+    """
 
-    def _parse_data_url(data_url: str) -> tuple[str, bytes] | None:
-        if not data_url.startswith("data:"):
-            return None
+    def __init__(self, max_size: int = DEFAULT_IMAGE_PART_CACHE_BYTES) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_size: Bound on the sum of the sizes of the entries, in the unit passed to `put`
+                (bytes of decoded images for the default cache).
+
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[bytes, tuple[types.Part, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, digest: bytes) -> types.Part | None:
+        """Return the part cached for `digest`, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            part, size, expires_at = entry
+            if expires_at is not None and expires_at <= time():
+                del self._entries[digest]
+                self.size -= size
+                return None
+            self._entries.move_to_end(digest)
+            return part
+
+    def put(self, digest: bytes, part: types.Part, size: int, expires_at: float | None = None) -> None:
+        """Cache `part` until `expires_at` (a `time.time()` value), evicting the least recently used parts."""
+        if size > self.max_size:
+            return
+        with self._lock:
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[digest] = (part, size, expires_at)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size, _) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+image_part_cache = ImagePartCache()
+"""Image parts decoded from data URLs, shared by every Gemini and Vertex AI provider."""
+
+
+def _image_url_digest(url: str) -> bytes:
+    return hashlib.sha256(url.encode()).digest()
+
+
+def _create_inline_part(image_bytes: bytes, mime_type: str) -> types.Part:
+    part_cls = types.Part
+    if hasattr(part_cls, "from_bytes"):
+        return part_cls.from_bytes(data=image_bytes, mime_type=mime_type)
+    if hasattr(part_cls, "from_data"):
+        return part_cls.from_data(data=image_bytes, mime_type=mime_type)
+    if hasattr(part_cls, "from_inline_data"):
+        return part_cls.from_inline_data(data=image_bytes, mime_type=mime_type)
+
+    inline_data_cls = getattr(types, "InlineData", None) or getattr(types, "Blob", None)
+    if inline_data_cls:
+        inline_data = inline_data_cls(data=image_bytes, mime_type=mime_type)
+        return part_cls(inline_data=inline_data)
+
+    raise ValueError("Image parts are not supported by the installed google-genai package")
+
+
+def _parse_data_url(data_url: str) -> tuple[str, bytes] | None:
+    if not data_url.startswith("data:"):
+        return None
 
-        header, base64_payload = data_url.split(",", 1) if "," in data_url else ("", "")
-        if not header or ";base64" not in header:
-            return None
+    header, base64_payload = data_url.split(",", 1) if "," in data_url else ("", "")
+    if not header or ";base64" not in header:
+        return None
 
-        mime_type = header[5:].split(";", 1)[0]
-        if not mime_type.startswith("image/"):
-            return None
+    mime_type = header[5:].split(";", 1)[0]
+    if not mime_type.startswith("image/"):
+        return None
 
-        payload = "".join(base64_payload.split())
-        if not payload:
-            return None
+    payload = "".join(base64_payload.split())
+    if not payload:
+        return None
 
-        try:
-            image_bytes = base64.b64decode(payload, validate=True)
-        except Exception:
-            return None
+    try:
+        image_bytes = base64.b64decode(payload, validate=True)
+    except Exception:
+        return None
+
+    if not image_bytes:
+        return None
+
+    return mime_type, image_bytes
 
-        if not image_bytes:
-            return None
 
-        return mime_type, image_bytes
+def _build_image_part(url: str, image_parts: Mapping[str, types.Part] | None = None) -> types.Part | None:
+    if image_parts and (part := image_parts.get(url)) is not None:
+        return part
 
-    def _build_image_part(url: str) -> types.Part | None:
-        parsed = _parse_data_url(url)
-        if parsed:
+    if url.startswith("data:"):
+        digest = _image_url_digest(url)
+        part = image_part_cache.get(digest)
+        if part is None:
+            parsed = _parse_data_url(url)
+            if not parsed:
+                return None
             mime_type, image_bytes = parsed
-            return _create_inline_part(image_bytes, mime_type)
+            part = _create_inline_part(image_bytes, mime_type)
+            image_part_cache.put(digest, part, len(image_bytes))
+        return part
 
-        if url.startswith("http://") or url.startswith("https://"):
-            part_factory = getattr(types.Part, "from_uri", None) or getattr(types.Part, "from_url", None)
-            if part_factory:
+    if url.startswith("http://") or url.startswith("https://"):
+        part_factory = getattr(types.Part, "from_uri", None) or getattr(types.Part, "from_url", None)
+        if part_factory:
+            try:
+                return part_factory(uri=url)
+            except TypeError:
                 try:
-                    return part_factory(uri=url)
+                    return part_factory(url)
                 except TypeError:
                     try:
-                        return part_factory(url)
+                        return part_factory(url=url)
                     except TypeError:
-                        try:
-                            return part_factory(url=url)
-                        except TypeError:
-                            return None
-        return None
+                        return None
+    return None
+
+
+def _iter_image_urls(messages: list[dict[str, Any]]) -> Iterator[str]:
+    """Yield the URL of every image of the user messages."""
+    for message in messages:
+        if message["role"] != "user" or isinstance(message["content"], str):
+            continue
+        for content in message["content"]:
+            if content.get("type") == "image_url" and isinstance(image_url := content.get("image_url"), dict):
+                url = image_url.get("url")
+                if isinstance(url, str) and url:
+                    yield url
+
+
+def _convert_messages(
+    messages: list[dict[str, Any]], image_parts: Mapping[str, types.Part] | None = None
+) -> tuple[list[types.Content], str | None]:
+    """Convert messages to Google GenAI format.
+
+    `image_parts` maps image URLs to parts resolved ahead of time, e.g. uploaded to the Files API.
+    Other base64 images are decoded through the shared `image_part_cache`.
+    """
+    formatted_messages = []
+    system_instruction = None
 
     for message in messages:
         if message["role"] == "system":
@@ -165,7 +269,7 @@ def _convert_messages(messages: list[dict[str, Any]]) -> tuple[list[types.Conten
                         else:
                             url = ""
                         if isinstance(url, str) and url:
-                            image_part = _build_image_part(url)
+                            image_part = _build_image_part(url, image_parts)
                             if image_part:
                                 parts.append(image_part)
                             else:
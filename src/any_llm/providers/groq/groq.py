@@ -14,7 +14,7 @@ if TYPE_CHECKING:
 
 MISSING_PACKAGES_ERROR = None
 try:
-    from groq import AsyncGroq
+    from groq import AsyncGroq, DefaultAsyncHttpxClient
 
     from .utils import (
         _convert_models_list,
@@ -52,6 +52,8 @@ class GroqProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = True
     SUPPORTS_BATCH = False
 
+    LAZY_CLIENT_ATTRIBUTES = ("chat.completions", "models")
+
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
     client: AsyncGroq
@@ -96,6 +98,7 @@ class GroqProvider(AnyLLM):
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
         self.api_key = api_key
         self.kwargs = kwargs
+        self._add_http_client(kwargs, "http_client", api_base, DefaultAsyncHttpxClient)
         self.client = AsyncGroq(api_key=api_key, **kwargs)
 
     async def _stream_async_completion(
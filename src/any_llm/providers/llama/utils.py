@@ -6,9 +6,13 @@ def _patch_json_schema(schema: dict[str, Any]) -> dict[str, Any]:
     # Llama requires that the 'union_specified' has a parameter type specified
     # so we need to patch the schema to include the type of the parameter
     # if any of the function call parameter properties have 'oneOf' set, make sure the property has type set. If not, set it to string. This is a quirk with Llama API currently.
-    props = schema["function"]["parameters"]["properties"]
-    for prop in props:
-        if "oneOf" in props[prop] and "type" not in props[prop]:
-            props[prop]["type"] = "string"
-
-    return schema
+    # The schema may be shared with the tool cache: patch a copy.
+    parameters = schema["function"]["parameters"]
+    props = parameters["properties"]
+    if not any("oneOf" in prop and "type" not in prop for prop in props.values()):
+        return schema
+    patched = {
+        name: {**prop, "type": "string"} if "oneOf" in prop and "type" not in prop else prop
+        for name, prop in props.items()
+    }
+    return {**schema, "function": {**schema["function"], "parameters": {**parameters, "properties": patched}}}
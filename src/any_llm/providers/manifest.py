@@ -0,0 +1,560 @@
+# This file is generated by scripts/generate_provider_manifest.py. Do not edit it by hand.
+from typing import Any
+
+PROVIDER_MANIFEST: dict[str, dict[str, Any]] = {
+    "anthropic": {
+        "name": "anthropic",
+        "env_key": "ANTHROPIC_API_KEY",
+        "doc_url": "https://docs.anthropic.com/en/home",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "AnthropicProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "azure": {
+        "name": "azure",
+        "env_key": "AZURE_API_KEY",
+        "doc_url": "https://azure.microsoft.com/en-us/products/ai-services/openai-service",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "AzureProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "azureopenai": {
+        "name": "azureopenai",
+        "env_key": "AZURE_OPENAI_API_KEY",
+        "doc_url": "https://learn.microsoft.com/en-us/azure/ai-foundry/",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": True,
+        "responses": True,
+        "image": True,
+        "pdf": False,
+        "class_name": "AzureopenaiProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "bedrock": {
+        "name": "bedrock",
+        "env_key": "AWS_BEARER_TOKEN_BEDROCK",
+        "doc_url": "https://aws.amazon.com/bedrock/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "BedrockProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "cerebras": {
+        "name": "cerebras",
+        "env_key": "CEREBRAS_API_KEY",
+        "doc_url": "https://docs.cerebras.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "CerebrasProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "cohere": {
+        "name": "cohere",
+        "env_key": "COHERE_API_KEY",
+        "doc_url": "https://cohere.com/api",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "CohereProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "databricks": {
+        "name": "databricks",
+        "env_key": "DATABRICKS_TOKEN",
+        "doc_url": "https://docs.databricks.com/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "DatabricksProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "deepseek": {
+        "name": "deepseek",
+        "env_key": "DEEPSEEK_API_KEY",
+        "doc_url": "https://platform.deepseek.com/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "DeepseekProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "fireworks": {
+        "name": "fireworks",
+        "env_key": "FIREWORKS_API_KEY",
+        "doc_url": "https://fireworks.ai/api",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": True,
+        "image": True,
+        "pdf": False,
+        "class_name": "FireworksProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "gateway": {
+        "name": "gateway",
+        "env_key": "GATEWAY_API_KEY",
+        "doc_url": "https://github.com/mozilla-ai/any-llm",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": True,
+        "image": True,
+        "pdf": True,
+        "class_name": "GatewayProvider",
+        "list_models": True,
+        "batch_completion": True,
+    },
+    "gemini": {
+        "name": "gemini",
+        "env_key": "GEMINI_API_KEY/GOOGLE_API_KEY",
+        "doc_url": "https://ai.google.dev/gemini-api/docs",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "GeminiProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "groq": {
+        "name": "groq",
+        "env_key": "GROQ_API_KEY",
+        "doc_url": "https://groq.com/api",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": True,
+        "image": False,
+        "pdf": False,
+        "class_name": "GroqProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "huggingface": {
+        "name": "huggingface",
+        "env_key": "HF_TOKEN",
+        "doc_url": "https://huggingface.co/docs/huggingface_hub/package_reference/inference_client",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "HuggingfaceProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "inception": {
+        "name": "inception",
+        "env_key": "INCEPTION_API_KEY",
+        "doc_url": "https://inceptionlabs.ai/",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "InceptionProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "llama": {
+        "name": "llama",
+        "env_key": "LLAMA_API_KEY",
+        "doc_url": "https://www.llama.com/products/llama-api/",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "LlamaProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "llamacpp": {
+        "name": "llamacpp",
+        "env_key": "None",
+        "doc_url": "https://github.com/ggml-org/llama.cpp",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "LlamacppProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "llamafile": {
+        "name": "llamafile",
+        "env_key": "None",
+        "doc_url": "https://github.com/Mozilla-Ocho/llamafile",
+        "streaming": False,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "LlamafileProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "lmstudio": {
+        "name": "lmstudio",
+        "env_key": "LM_STUDIO_API_KEY",
+        "doc_url": "https://lmstudio.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": True,
+        "class_name": "LmstudioProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "minimax": {
+        "name": "minimax",
+        "env_key": "MINIMAX_API_KEY",
+        "doc_url": "https://www.minimax.io/platform_overview",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "MinimaxProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "mistral": {
+        "name": "mistral",
+        "env_key": "MISTRAL_API_KEY",
+        "doc_url": "https://docs.mistral.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "MistralProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "moonshot": {
+        "name": "moonshot",
+        "env_key": "MOONSHOT_API_KEY",
+        "doc_url": "https://platform.moonshot.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "MoonshotProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "nebius": {
+        "name": "nebius",
+        "env_key": "NEBIUS_API_KEY",
+        "doc_url": "https://studio.nebius.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "NebiusProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "ollama": {
+        "name": "ollama",
+        "env_key": "None",
+        "doc_url": "https://github.com/ollama/ollama",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": True,
+        "class_name": "OllamaProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "openai": {
+        "name": "openai",
+        "env_key": "OPENAI_API_KEY",
+        "doc_url": "https://platform.openai.com/docs/api-reference",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": True,
+        "responses": True,
+        "image": True,
+        "pdf": True,
+        "class_name": "OpenaiProvider",
+        "list_models": True,
+        "batch_completion": True,
+    },
+    "openrouter": {
+        "name": "openrouter",
+        "env_key": "OPENROUTER_API_KEY",
+        "doc_url": "https://openrouter.ai/docs",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": True,
+        "class_name": "OpenrouterProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "perplexity": {
+        "name": "perplexity",
+        "env_key": "PERPLEXITY_API_KEY",
+        "doc_url": "https://docs.perplexity.ai/",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "PerplexityProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "platform": {
+        "name": "platform",
+        "env_key": "ANY_LLM_KEY",
+        "doc_url": "https://github.com/mozilla-ai/any-llm",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": True,
+        "image": True,
+        "pdf": True,
+        "class_name": "PlatformProvider",
+        "list_models": True,
+        "batch_completion": True,
+    },
+    "portkey": {
+        "name": "portkey",
+        "env_key": "PORTKEY_API_KEY",
+        "doc_url": "https://portkey.ai/docs",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": True,
+        "pdf": True,
+        "class_name": "PortkeyProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "sagemaker": {
+        "name": "sagemaker",
+        "env_key": "AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY",
+        "doc_url": "https://aws.amazon.com/sagemaker/",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": True,
+        "class_name": "SagemakerProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "sambanova": {
+        "name": "sambanova",
+        "env_key": "SAMBANOVA_API_KEY",
+        "doc_url": "https://sambanova.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "SambanovaProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "together": {
+        "name": "together",
+        "env_key": "TOGETHER_API_KEY",
+        "doc_url": "https://together.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "TogetherProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "vertexai": {
+        "name": "vertexai",
+        "env_key": "",
+        "doc_url": "https://cloud.google.com/vertex-ai/docs",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "VertexaiProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "vllm": {
+        "name": "vllm",
+        "env_key": "VLLM_API_KEY",
+        "doc_url": "https://docs.vllm.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": True,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "VllmProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "voyage": {
+        "name": "voyage",
+        "env_key": "VOYAGE_API_KEY",
+        "doc_url": "https://docs.voyageai.com/",
+        "streaming": False,
+        "reasoning": False,
+        "completion": False,
+        "embedding": True,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "VoyageProvider",
+        "list_models": False,
+        "batch_completion": False,
+    },
+    "watsonx": {
+        "name": "watsonx",
+        "env_key": "WATSONX_API_KEY",
+        "doc_url": "https://www.ibm.com/watsonx",
+        "streaming": True,
+        "reasoning": False,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": True,
+        "pdf": False,
+        "class_name": "WatsonxProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "xai": {
+        "name": "xai",
+        "env_key": "XAI_API_KEY",
+        "doc_url": "https://x.ai/",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "XaiProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+    "zai": {
+        "name": "zai",
+        "env_key": "ZAI_API_KEY",
+        "doc_url": "https://docs.z.ai/guides/develop/python/introduction",
+        "streaming": True,
+        "reasoning": True,
+        "completion": True,
+        "embedding": False,
+        "responses": False,
+        "image": False,
+        "pdf": False,
+        "class_name": "ZaiProvider",
+        "list_models": True,
+        "batch_completion": False,
+    },
+}
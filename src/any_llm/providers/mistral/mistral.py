@@ -49,6 +49,11 @@ class MistralProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = True
     SUPPORTS_BATCH = False
 
+    EMBEDDING_MAX_BATCH_SIZE = 512
+    EMBEDDING_MAX_BATCH_TOKENS = 16_384
+
+    LAZY_CLIENT_ATTRIBUTES = ("chat", "embeddings", "models")
+
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
     client: Mistral
@@ -104,6 +109,7 @@ class MistralProvider(AnyLLM):
         return _convert_models_list(response)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "async_client", api_base)
         self.client = Mistral(
             api_key=api_key,
             server_url=api_base,
@@ -97,6 +97,10 @@ class OllamaProvider(AnyLLM):
         return _convert_models_list(response)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        # The Ollama client passes its arguments to the `httpx.AsyncClient` it creates.
+        transport = self._transport_config()
+        if transport is not None and "transport" not in kwargs:
+            kwargs = {**transport.client_kwargs(api_base or self.PROVIDER_NAME), **kwargs}
         self.client = AsyncClient(host=api_base, **kwargs)
 
     def _verify_and_set_api_key(self, api_key: str | None = None) -> str | None:
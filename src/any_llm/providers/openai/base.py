@@ -1,18 +1,19 @@
 import asyncio
 from collections.abc import AsyncIterator, Sequence
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Literal, cast
 
-from openai import AsyncOpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai._streaming import AsyncStream
 from openai._types import NOT_GIVEN, Omit
+from openai.lib._parsing import type_to_response_format_param
 from openai.types.chat.chat_completion import ChatCompletion as OpenAIChatCompletion
 from openai.types.chat.chat_completion_chunk import ChatCompletionChunk as OpenAIChatCompletionChunk
+from pydantic import BaseModel
 
 from any_llm.any_llm import AnyLLM
 from any_llm.logging import logger
-from any_llm.providers.openai.utils import _convert_chat_completion, _normalize_openai_dict_response
+from any_llm.providers.openai.utils import _convert_chat_completion, _convert_chat_completion_chunk
 from any_llm.types.batch import Batch
 from any_llm.types.completion import (
     ChatCompletion,
@@ -44,6 +45,11 @@ class BaseOpenAIProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = True
     SUPPORTS_BATCH = False
 
+    EMBEDDING_MAX_BATCH_SIZE = 2048
+    EMBEDDING_MAX_BATCH_TOKENS = 300_000
+
+    LAZY_CLIENT_ATTRIBUTES = ("chat.completions", "embeddings", "models")
+
     PACKAGES_INSTALLED = True
 
     _DEFAULT_REASONING_EFFORT: ReasoningEffort | None = None
@@ -78,11 +84,7 @@ class BaseOpenAIProvider(AnyLLM):
                     type(response.created),
                 )
                 response.created = int(response.created)
-            normalized_chunk = _normalize_openai_dict_response(response.model_dump())
-            # Some APIs (i.e. Perplexity) return `chat.completion` without the chunk
-            # We can hardcode it as openai expects a literal
-            normalized_chunk["object"] = "chat.completion.chunk"
-            return ChatCompletionChunk.model_validate(normalized_chunk)
+            return _convert_chat_completion_chunk(response)
         # If it's already our ChatCompletionChunk type, return it
         if isinstance(response, ChatCompletionChunk):
             return response
@@ -116,6 +118,7 @@ class BaseOpenAIProvider(AnyLLM):
         return [Model.model_validate(item) if not isinstance(item, Model) else item for item in response]
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "http_client", api_base or self.API_BASE, DefaultAsyncHttpxClient)
         self.client = AsyncOpenAI(
             base_url=api_base or self.API_BASE,
             api_key=api_key,
@@ -135,32 +138,49 @@ class BaseOpenAIProvider(AnyLLM):
 
         return chunk_iterator()
 
-    async def _acompletion(
-        self, params: CompletionParams, **kwargs: Any
-    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+    def _build_completion_request(self, params: CompletionParams, **kwargs: Any) -> dict[str, Any]:
         if params.reasoning_effort == "auto":
             params.reasoning_effort = self._DEFAULT_REASONING_EFFORT
 
         completion_kwargs = self._convert_completion_params(params, **kwargs)
 
         if params.response_format:
-            if params.stream:
-                msg = "stream is not supported for response_format"
-                raise ValueError(msg)
-            completion_kwargs.pop("stream", None)
+            if not params.stream:
+                completion_kwargs.pop("stream", None)
+            elif isinstance(params.response_format, type) and issubclass(params.response_format, BaseModel):
+                # `parse` doesn't stream: send the JSON schema `parse` would send.
+                completion_kwargs["response_format"] = type_to_response_format_param(params.response_format)
+        return completion_kwargs
+
+    def _prepare_completion_request(self, params: CompletionParams, **kwargs: Any) -> dict[str, Any] | None:
+        if type(self)._acompletion is not BaseOpenAIProvider._acompletion:
+            # Subclasses customizing _acompletion don't get the fast path.
+            return None
+        return self._build_completion_request(params, **kwargs)
+
+    async def _acompletion_prepared(
+        self, request: dict[str, Any], params: CompletionParams, messages: list[dict[str, Any]]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        all_messages = [*params.messages, *messages] if messages else params.messages
+        if params.response_format and not params.stream:
             response = await self.client.chat.completions.parse(
                 model=params.model_id,
-                messages=cast("Any", params.messages),
-                **completion_kwargs,
+                messages=cast("Any", all_messages),
+                **request,
             )
         else:
             response = await self.client.chat.completions.create(
                 model=params.model_id,
-                messages=cast("Any", params.messages),
-                **completion_kwargs,
+                messages=cast("Any", all_messages),
+                **request,
             )
         return self._convert_completion_response_async(response)
 
+    async def _acompletion(
+        self, params: CompletionParams, **kwargs: Any
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        return await self._acompletion_prepared(self._build_completion_request(params, **kwargs), params, [])
+
     async def _aresponses(
         self, params: ResponsesParams, **kwargs: Any
     ) -> Response | AsyncIterator[ResponseStreamEvent]:
@@ -209,19 +229,18 @@ class BaseOpenAIProvider(AnyLLM):
     ) -> Batch:
         """Create a batch job using the OpenAI Batch API.
 
-        This method automatically uploads the file before creating the batch.
+        This method automatically uploads the file before creating the batch. The file is
+        streamed from disk in chunks rather than loaded in memory.
         """
         if not self.SUPPORTS_BATCH:
-            message = f"{self.PROVIDER_NAME} does not support batch completions."
-            raise NotImplementedError(message)
+            return await super()._acreate_batch(
+                input_file_path, endpoint, completion_window=completion_window, metadata=metadata, **kwargs
+            )
 
         file_path = Path(input_file_path)
-        file_content = await asyncio.to_thread(file_path.read_bytes)
-
-        file_obj = BytesIO(file_content)
-        file_obj.name = file_path.name
-
-        uploaded_file = await self.client.files.create(file=file_obj, purpose="batch")
+        file_obj = await asyncio.to_thread(file_path.open, "rb")
+        with file_obj:
+            uploaded_file = await self.client.files.create(file=(file_path.name, file_obj), purpose="batch")
 
         valid_endpoint = cast(
             "Literal['/v1/chat/completions', '/v1/embeddings', '/v1/completions']",
@@ -237,19 +256,29 @@ class BaseOpenAIProvider(AnyLLM):
             **kwargs,
         )
 
+    async def _aiter_batch_file(self, file_id: str) -> AsyncIterator[str]:
+        """Stream the lines of a batch output or error file from the OpenAI Files API."""
+        if not self.SUPPORTS_BATCH:
+            async for line in super()._aiter_batch_file(file_id):
+                yield line
+            return
+
+        async with self.client.files.with_streaming_response.content(file_id) as response:
+            async for line in response.iter_lines():
+                if line.strip():
+                    yield line
+
     async def _aretrieve_batch(self, batch_id: str, **kwargs: Any) -> Batch:
         """Retrieve a batch job using the OpenAI Batch API."""
         if not self.SUPPORTS_BATCH:
-            message = f"{self.PROVIDER_NAME} does not support batch completions."
-            raise NotImplementedError(message)
+            return await super()._aretrieve_batch(batch_id, **kwargs)
 
         return await self.client.batches.retrieve(batch_id, **kwargs)
 
     async def _acancel_batch(self, batch_id: str, **kwargs: Any) -> Batch:
         """Cancel a batch job using the OpenAI Batch API."""
         if not self.SUPPORTS_BATCH:
-            message = f"{self.PROVIDER_NAME} does not support batch completions."
-            raise NotImplementedError(message)
+            return await super()._acancel_batch(batch_id, **kwargs)
 
         return await self.client.batches.cancel(batch_id, **kwargs)
 
@@ -261,8 +290,7 @@ class BaseOpenAIProvider(AnyLLM):
     ) -> Sequence[Batch]:
         """List batch jobs using the OpenAI Batch API."""
         if not self.SUPPORTS_BATCH:
-            message = f"{self.PROVIDER_NAME} does not support batch completions."
-            raise NotImplementedError(message)
+            return await super()._alist_batches(after=after, limit=limit, **kwargs)
 
         after_param: str | Omit = after if after is not None else Omit()
         limit_param: int | Omit = limit if limit is not None else Omit()
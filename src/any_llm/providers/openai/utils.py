@@ -3,10 +3,16 @@
 from typing import Any
 
 from openai.types.chat.chat_completion import ChatCompletion as OpenAIChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk as OpenAIChatCompletionChunk
+from openai.types.chat.chat_completion_chunk import Choice as OpenAIChunkChoice
+from openai.types.chat.chat_completion_chunk import ChoiceDelta as OpenAIChoiceDelta
 
 from any_llm.constants import REASONING_FIELD_NAMES
 from any_llm.logging import logger
-from any_llm.types.completion import ChatCompletion
+from any_llm.types.completion import ChatCompletion, ChatCompletionChunk, ChoiceDelta, ChunkChoice
+from any_llm.utils.models import retype_model
+
+_REASONING_KEYS = frozenset([*REASONING_FIELD_NAMES, "reasoning"])
 
 
 def _normalize_reasoning_on_message(message_dict: dict[str, Any]) -> None:
@@ -67,3 +73,41 @@ def _convert_chat_completion(response: OpenAIChatCompletion) -> ChatCompletion:
         response.created = int(response.created)
     normalized = _normalize_openai_dict_response(response.model_dump())
     return ChatCompletion.model_validate(normalized)
+
+
+def _needs_reasoning_normalization(extra: dict[str, Any] | None) -> bool:
+    """Whether a message or delta carries a provider-specific reasoning field."""
+    if not extra:
+        return False
+    return any(extra.get(key) is not None for key in _REASONING_KEYS)
+
+
+def _can_retype_chunk(chunk: OpenAIChatCompletionChunk) -> bool:
+    """Whether every choice of `chunk` is structurally compatible with our chunk types."""
+    for choice in chunk.choices:
+        if type(choice) is not OpenAIChunkChoice or type(choice.delta) is not OpenAIChoiceDelta:
+            return False
+        if _needs_reasoning_normalization(choice.delta.model_extra):
+            return False
+    return True
+
+
+def _convert_chat_completion_chunk(chunk: OpenAIChatCompletionChunk) -> ChatCompletionChunk:
+    """Convert an OpenAI SDK chunk to our `ChatCompletionChunk`.
+
+    Our chunk types only add the optional `reasoning` field to the SDK ones, so the SDK chunk is
+    converted in place, keeping its nested objects. The `model_dump` / normalize / `model_validate`
+    round-trip only runs for chunks that carry a provider-specific reasoning field.
+    """
+    # Some APIs (i.e. Perplexity) return `chat.completion` without the chunk
+    # We can hardcode it as openai expects a literal
+    if type(chunk) is not OpenAIChatCompletionChunk or not _can_retype_chunk(chunk):
+        normalized_chunk = _normalize_openai_dict_response(chunk.model_dump())
+        normalized_chunk["object"] = "chat.completion.chunk"
+        return ChatCompletionChunk.model_validate(normalized_chunk)
+
+    for choice in chunk.choices:
+        retype_model(choice.delta, ChoiceDelta)
+        retype_model(choice, ChunkChoice)
+    chunk.object = "chat.completion.chunk"
+    return retype_model(chunk, ChatCompletionChunk)
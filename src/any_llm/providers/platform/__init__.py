@@ -1,4 +1,12 @@
+from .key_cache import provider_key_cache
 from .platform import PlatformProvider
+from .usage_shipper import UsageEventShipper, usage_event_shipper
 from .utils import post_completion_usage_event
 
-__all__ = ["PlatformProvider", "post_completion_usage_event"]
+__all__ = [
+    "PlatformProvider",
+    "UsageEventShipper",
+    "post_completion_usage_event",
+    "provider_key_cache",
+    "usage_event_shipper",
+]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from any_llm.logging import logger
+
+if TYPE_CHECKING:
+    from any_llm_platform_client import AnyLLMPlatformClient
+    from any_llm_platform_client.client import DecryptedProviderKey
+
+DEFAULT_PROVIDER_KEY_TTL = 300.0
+
+
+@dataclass
+class _CachedKey:
+    value: DecryptedProviderKey
+    expires_at: float
+
+
+class ProviderKeyCache:
+    """Process-wide cache of decrypted provider keys, keyed by `(any_llm_key, provider)`.
+
+    Entries expire after `ttl` seconds. Concurrent async lookups of the same key share a single
+    request to the platform, and `refresh_in_background` replaces a key (e.g. after an
+    authentication error) without blocking the caller.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_PROVIDER_KEY_TTL) -> None:
+        self.ttl = ttl
+        self._entries: dict[tuple[str, str], _CachedKey] = {}
+        self._inflight: dict[tuple[str, str], asyncio.Task[DecryptedProviderKey]] = {}
+        self._background_tasks: set[asyncio.Task[DecryptedProviderKey]] = set()
+        self._lock = threading.Lock()
+
+    def get(self, any_llm_key: str, provider: str) -> DecryptedProviderKey | None:
+        """Return the cached key, or None if it is missing or expired. Never blocks on the network."""
+        with self._lock:
+            entry = self._entries.get((any_llm_key, provider))
+            if entry is None:
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[(any_llm_key, provider)]
+                return None
+            return entry.value
+
+    def set(self, any_llm_key: str, provider: str, value: DecryptedProviderKey) -> None:
+        with self._lock:
+            self._entries[(any_llm_key, provider)] = _CachedKey(value, time.monotonic() + self.ttl)
+
+    def invalidate(self, any_llm_key: str | None = None, provider: str | None = None) -> None:
+        """Drop cached keys matching `any_llm_key` and/or `provider`, or every key if neither is given."""
+        with self._lock:
+            for key in list(self._entries):
+                if (any_llm_key is None or key[0] == any_llm_key) and (provider is None or key[1] == provider):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        self.invalidate()
+
+    def fetch(self, platform_client: AnyLLMPlatformClient, any_llm_key: str, provider: str) -> DecryptedProviderKey:
+        """Return the cached key, fetching it with a blocking request on a miss."""
+        cached = self.get(any_llm_key, provider)
+        if cached is not None:
+            return cached
+        value = platform_client.get_decrypted_provider_key(any_llm_key=any_llm_key, provider=provider)
+        self.set(any_llm_key, provider, value)
+        return value
+
+    async def aget(
+        self, platform_client: AnyLLMPlatformClient, any_llm_key: str, provider: str, *, force: bool = False
+    ) -> DecryptedProviderKey:
+        """Return the cached key, fetching it on a miss (or when `force` is set).
+
+        Concurrent lookups of the same key on the same event loop wait for a single request.
+        """
+        if not force:
+            cached = self.get(any_llm_key, provider)
+            if cached is not None:
+                return cached
+
+        key = (any_llm_key, provider)
+        task = self._inflight.get(key)
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._afetch(platform_client, any_llm_key, provider))
+            self._inflight[key] = task
+        # Shield the shared request from the cancellation of any one of its waiters.
+        return await asyncio.shield(task)
+
+    async def _afetch(
+        self, platform_client: AnyLLMPlatformClient, any_llm_key: str, provider: str
+    ) -> DecryptedProviderKey:
+        key = (any_llm_key, provider)
+        try:
+            value = await platform_client.aget_decrypted_provider_key(any_llm_key=any_llm_key, provider=provider)
+            self.set(any_llm_key, provider, value)
+            return value
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def refresh_in_background(
+        self, platform_client: AnyLLMPlatformClient, any_llm_key: str, provider: str
+    ) -> asyncio.Task[DecryptedProviderKey]:
+        """Fetch a fresh key without waiting for it. Must be called from a running event loop."""
+        self.invalidate(any_llm_key, provider)
+        task = asyncio.create_task(self.aget(platform_client, any_llm_key, provider, force=True))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_refresh_done)
+        return task
+
+    def _background_refresh_done(self, task: asyncio.Task[DecryptedProviderKey]) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Failed to refresh provider key: %s", task.exception())
+
+
+provider_key_cache = ProviderKeyCache()
+"""Provider keys shared by every [PlatformProvider][any_llm.providers.platform.PlatformProvider]."""
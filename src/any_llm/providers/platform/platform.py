@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import statistics
+import asyncio
+import functools
 import time
+from collections import Counter
 from typing import TYPE_CHECKING, Any, cast
 
 from any_llm_platform_client import AnyLLMPlatformClient
@@ -9,19 +11,28 @@ from httpx import AsyncClient
 
 from any_llm.any_llm import AnyLLM
 from any_llm.constants import LLMProvider
+from any_llm.exceptions import AuthenticationError
 from any_llm.logging import logger
+from any_llm.transport import TransportConfig
 from any_llm.types.completion import (
     ChatCompletion,
     ChatCompletionChunk,
     CompletionParams,
     CreateEmbeddingResponse,
 )
+from any_llm.utils.exception_handler import convert_exception
+from any_llm.utils.provider_registry import ProviderLease
+from any_llm.utils.streaming import StreamAccumulator
 
+from .key_cache import provider_key_cache
+from .usage_shipper import UsageEventShipper, usage_event_shipper
 from .utils import post_completion_usage_event
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Sequence
 
+    from any_llm_platform_client.client import DecryptedProviderKey
+
     from any_llm.types.model import Model
 
 
@@ -41,6 +52,9 @@ class PlatformProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = True
     SUPPORTS_BATCH = True
 
+    usage_shipper: UsageEventShipper | None = usage_event_shipper
+    """Posts usage events in the background. Set to None to post them before returning each completion."""
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -54,14 +68,24 @@ class PlatformProvider(AnyLLM):
         self.kwargs = kwargs
         self.provider_key_id: str | None = None
         self.project_id: str | None = None
+        self._provider_leases: Counter[AnyLLM] = Counter()
+        self._closing: set[asyncio.Task[None]] = set()
 
         self._init_client(api_key=api_key, api_base=api_base, **kwargs)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
-        self.client = AsyncClient(**kwargs)
-        # Initialize the platform client for authentication and usage tracking
         from .utils import ANY_LLM_PLATFORM_API_URL
 
+        # A `TransportConfig` stays in `self.kwargs`, for the SDK client of the wrapped provider.
+        if isinstance(kwargs.get("transport"), TransportConfig):
+            self.transport = kwargs.pop("transport")
+        transport_config = self._transport_config()
+        if transport_config is not None:
+            self.client = transport_config.async_client(ANY_LLM_PLATFORM_API_URL, **kwargs)
+        else:
+            self.client = AsyncClient(**kwargs)
+        # Initialize the platform client for authentication and usage tracking
+
         self.platform_client = AnyLLMPlatformClient(any_llm_platform_url=ANY_LLM_PLATFORM_API_URL)
 
     @staticmethod
@@ -93,6 +117,7 @@ class PlatformProvider(AnyLLM):
         params: CompletionParams,
         **kwargs: Any,
     ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        await self._aensure_provider()
         start_time = time.perf_counter()
 
         # List of providers that don't support stream_options and automatically return token usage.
@@ -107,27 +132,40 @@ class PlatformProvider(AnyLLM):
             LLMProvider.TOGETHER,
         }
 
-        if params.stream:
-            if self.provider.PROVIDER_NAME in providers_without_stream_options:
-                if params.stream_options is not None:
-                    logger.warning(
-                        f"stream_options was set but {self.provider.PROVIDER_NAME} does not support it. "
-                        "The parameter will be ignored for this request."
-                    )
-                params_copy = params.model_copy()
-                params_copy.stream_options = None
-                completion = await self.provider._acompletion(params=params_copy, **kwargs)
-            else:
-                if params.stream_options is None:
+        # A provider replaced by a key rotation is only closed once the requests using it are done.
+        lease = self._lease_provider()
+        provider = lease.provider
+        try:
+            if params.stream:
+                if provider.PROVIDER_NAME in providers_without_stream_options:
+                    if params.stream_options is not None:
+                        logger.warning(
+                            f"stream_options was set but {provider.PROVIDER_NAME} does not support it. "
+                            "The parameter will be ignored for this request."
+                        )
                     params_copy = params.model_copy()
-                    params_copy.stream_options = {"include_usage": True}
-                    completion = await self.provider._acompletion(params=params_copy, **kwargs)
+                    params_copy.stream_options = None
+                    completion = await provider._acompletion(params=params_copy, **kwargs)
                 else:
-                    completion = await self.provider._acompletion(params=params, **kwargs)
-        else:
-            completion = await self.provider._acompletion(params=params, **kwargs)
+                    if params.stream_options is None:
+                        params_copy = params.model_copy()
+                        params_copy.stream_options = {"include_usage": True}
+                        completion = await provider._acompletion(params=params_copy, **kwargs)
+                    else:
+                        completion = await provider._acompletion(params=params, **kwargs)
+            else:
+                completion = await provider._acompletion(params=params, **kwargs)
+        except BaseException as e:
+            lease.release()
+            if isinstance(e, Exception) and isinstance(
+                convert_exception(e, provider.PROVIDER_NAME), AuthenticationError
+            ):
+                # The provider key may have been rotated: fetch the new one for the next requests.
+                self._refresh_provider_key()
+            raise
 
         if not params.stream:
+            lease.release()
             end_time = time.perf_counter()
             total_duration_ms = (end_time - start_time) * 1000
 
@@ -135,109 +173,74 @@ class PlatformProvider(AnyLLM):
                 platform_client=self.platform_client,
                 client=self.client,
                 any_llm_key=self.any_llm_key,  # type: ignore[arg-type]
-                provider=self.provider.PROVIDER_NAME,
+                provider=provider.PROVIDER_NAME,
                 completion=cast("ChatCompletion", completion),
                 provider_key_id=self.provider_key_id,  # type: ignore[arg-type]
                 client_name=self.client_name,
                 total_duration_ms=total_duration_ms,
+                shipper=self.usage_shipper,
             )
             return completion
 
         # For streaming, wrap the iterator to collect usage info
-        return self._stream_with_usage_tracking(cast("AsyncIterator[ChatCompletionChunk]", completion), start_time)
+        stream = self._stream_with_usage_tracking(
+            cast("AsyncIterator[ChatCompletionChunk]", completion), start_time, provider
+        )
+        return lease.hold(stream)
 
     async def _stream_with_usage_tracking(
-        self, stream: AsyncIterator[ChatCompletionChunk], start_time: float
+        self, stream: AsyncIterator[ChatCompletionChunk], start_time: float, provider: AnyLLM
     ) -> AsyncIterator[ChatCompletionChunk]:
         """Wrap the stream to track usage after completion."""
-        chunks: list[ChatCompletionChunk] = []
-        time_to_first_token_ms: float | None = None
-        time_to_last_content_token_ms: float | None = None
-        chunk_latencies: list[float] = []
-        previous_chunk_time: float | None = None
+        # Only running totals are kept, so long streams don't hold on to their chunks.
+        accumulator = StreamAccumulator(start_time)
 
         async for chunk in stream:
-            current_time = time.perf_counter()
-
-            # Capture time to first token (first chunk with content)
-            if time_to_first_token_ms is None and chunk.choices and chunk.choices[0].delta.content:
-                time_to_first_token_ms = (current_time - start_time) * 1000
-
-            # Track inter-chunk latency
-            if previous_chunk_time is not None:
-                inter_chunk_latency = (current_time - previous_chunk_time) * 1000
-                chunk_latencies.append(inter_chunk_latency)
-            previous_chunk_time = current_time
-
-            chunks.append(chunk)
-
-            # Count tokens as we stream and track last content token time
-            if chunk.choices and chunk.choices[0].delta.content:
-                time_to_last_content_token_ms = (current_time - start_time) * 1000
-
+            accumulator.add(chunk)
             yield chunk
 
-        # After stream completes, reconstruct completion for usage tracking
-        if chunks:
-            end_time = time.perf_counter()
-            total_duration_ms = (end_time - start_time) * 1000
-
-            # Use time_to_last_content_token_ms if available, otherwise use total_duration_ms
-            time_to_last_token_ms = time_to_last_content_token_ms or total_duration_ms
-
-            # Calculate tokens per second based on actual output tokens from usage
-            tokens_per_second: float | None = None
-            chunks_received = len(chunks)
-            avg_chunk_size: float | None = None
-            inter_chunk_latency_variance_ms: float | None = None
-
-            # Combine chunks into a single ChatCompletion-like object (do this once)
-            final_completion = self._combine_chunks(chunks)
-
-            # Get actual token count from usage data
-            last_chunk = chunks[-1]
-
-            # Try to get token count from last chunk's usage data, fallback to combined completion
-            actual_output_tokens: int | None = None
-            if last_chunk.usage and last_chunk.usage.completion_tokens:
-                actual_output_tokens = last_chunk.usage.completion_tokens
-            elif final_completion.usage and final_completion.usage.completion_tokens:
-                actual_output_tokens = final_completion.usage.completion_tokens
-
-            # Calculate metrics if we have token count
-            if actual_output_tokens is not None and actual_output_tokens > 0:
-                if time_to_last_token_ms > 0:
-                    tokens_per_second = (actual_output_tokens * 1000) / time_to_last_token_ms
-
-                # Calculate average chunk size
-                if chunks_received > 0:
-                    avg_chunk_size = actual_output_tokens / chunks_received
-
-            # Calculate inter-chunk latency variance
-            if len(chunk_latencies) > 1:
-                inter_chunk_latency_variance_ms = statistics.variance(chunk_latencies)
-            await post_completion_usage_event(
-                platform_client=self.platform_client,
-                client=self.client,
-                any_llm_key=self.any_llm_key,  # type: ignore [arg-type]
-                provider=self.provider.PROVIDER_NAME,
-                completion=final_completion,
-                provider_key_id=self.provider_key_id,  # type: ignore[arg-type]
-                client_name=self.client_name,
-                time_to_first_token_ms=time_to_first_token_ms,
-                time_to_last_token_ms=time_to_last_token_ms,
-                total_duration_ms=total_duration_ms,
-                tokens_per_second=tokens_per_second,
-                chunks_received=chunks_received,
-                avg_chunk_size=avg_chunk_size,
-                inter_chunk_latency_variance_ms=inter_chunk_latency_variance_ms,
-            )
-
-    def _combine_chunks(self, chunks: list[ChatCompletionChunk]) -> ChatCompletion:
-        """Combine streaming chunks into a ChatCompletion for usage tracking."""
-        # Get the last chunk which typically has the full usage info
-        last_chunk = chunks[-1]
+        last_chunk = accumulator.last_chunk
+        if last_chunk is None:
+            return
+
+        total_duration_ms = accumulator.elapsed_ms()
+
+        # Use time_to_last_content_token_ms if available, otherwise use total_duration_ms
+        time_to_last_token_ms = accumulator.time_to_last_content_token_ms or total_duration_ms
+
+        tokens_per_second: float | None = None
+        avg_chunk_size: float | None = None
+        chunks_received = accumulator.chunks_received
+
+        final_completion = self._completion_from_last_chunk(last_chunk)
+
+        # Calculate metrics if we have the actual output token count from usage data
+        actual_output_tokens = last_chunk.usage.completion_tokens if last_chunk.usage else None
+        if actual_output_tokens:
+            if time_to_last_token_ms > 0:
+                tokens_per_second = (actual_output_tokens * 1000) / time_to_last_token_ms
+            avg_chunk_size = actual_output_tokens / chunks_received
+
+        await post_completion_usage_event(
+            platform_client=self.platform_client,
+            client=self.client,
+            any_llm_key=self.any_llm_key,  # type: ignore [arg-type]
+            provider=provider.PROVIDER_NAME,
+            completion=final_completion,
+            provider_key_id=self.provider_key_id,  # type: ignore[arg-type]
+            client_name=self.client_name,
+            time_to_first_token_ms=accumulator.time_to_first_token_ms,
+            time_to_last_token_ms=time_to_last_token_ms,
+            total_duration_ms=total_duration_ms,
+            tokens_per_second=tokens_per_second,
+            chunks_received=chunks_received,
+            avg_chunk_size=avg_chunk_size,
+            inter_chunk_latency_variance_ms=accumulator.inter_chunk_latency_variance_ms,
+            shipper=self.usage_shipper,
+        )
 
+    def _completion_from_last_chunk(self, last_chunk: ChatCompletionChunk) -> ChatCompletion:
+        """Build a ChatCompletion carrying the usage of the last streaming chunk for usage tracking."""
         if not last_chunk.usage:
             msg = (
                 "The last chunk of your streaming response does not contain usage data. "
@@ -246,28 +249,28 @@ class PlatformProvider(AnyLLM):
             )
             logger.warning(msg)
 
-            return ChatCompletion(
-                id=last_chunk.id,
-                model=last_chunk.model,
-                created=last_chunk.created,
-                object="chat.completion",
-                usage=None,  # Set to None instead of zeros to distinguish from actual zero tokens
-                choices=[],
-            )
-
         # Create a minimal ChatCompletion object with the data needed for usage tracking
-        # We only need id, model, created, usage, and object type
+        # We only need id, model, created, usage, and object type.
+        # usage stays None without usage data, to distinguish it from actual zero tokens.
         return ChatCompletion(
             id=last_chunk.id,
             model=last_chunk.model,
             created=last_chunk.created,
             object="chat.completion",
-            usage=last_chunk.usage if hasattr(last_chunk, "usage") and last_chunk.usage else None,
+            usage=last_chunk.usage or None,
             choices=[],
         )
 
+    async def aclose(self) -> None:
+        await self.client.aclose()
+        if hasattr(self, "_provider"):
+            await self._provider.aclose()
+
     @property
     def provider(self) -> AnyLLM:
+        if not hasattr(self, "_provider"):
+            # Used before the key was fetched asynchronously: fall back to a blocking fetch.
+            self._use_provider_key(self._key_cache_fetch())
         return self._provider
 
     @provider.setter
@@ -275,9 +278,87 @@ class PlatformProvider(AnyLLM):
         if self.any_llm_key is None:
             msg = "any_llm_key is required for platform provider"
             raise ValueError(msg)
-        provider_key_result = self.platform_client.get_decrypted_provider_key(
-            any_llm_key=self.any_llm_key, provider=provider_class.PROVIDER_NAME
+        self._provider_class = provider_class
+        if hasattr(self, "_provider"):
+            self._retire_provider(self._provider)
+            del self._provider
+        cached = provider_key_cache.get(self.any_llm_key, provider_class.PROVIDER_NAME)
+        if cached is not None:
+            self._use_provider_key(cached)
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._use_provider_key(self._key_cache_fetch())
+        # Inside an event loop, the key is fetched without blocking by the first request.
+
+    def _key_cache_fetch(self) -> DecryptedProviderKey:
+        return provider_key_cache.fetch(
+            self.platform_client,
+            self.any_llm_key,  # type: ignore[arg-type]
+            self._provider_class.PROVIDER_NAME,
         )
-        self.provider_key_id = str(provider_key_result.provider_key_id)
-        self.project_id = str(provider_key_result.project_id)
-        self._provider = provider_class(api_key=provider_key_result.api_key, api_base=self.api_base, **self.kwargs)
+
+    async def _aensure_provider(self) -> None:
+        if hasattr(self, "_provider"):
+            return
+        provider_key = await provider_key_cache.aget(
+            self.platform_client,
+            self.any_llm_key,  # type: ignore[arg-type]
+            self._provider_class.PROVIDER_NAME,
+        )
+        if not hasattr(self, "_provider"):
+            self._use_provider_key(provider_key)
+
+    def _use_provider_key(self, provider_key: DecryptedProviderKey) -> None:
+        self.provider_key_id = str(provider_key.provider_key_id)
+        self.project_id = str(provider_key.project_id)
+        self._provider_api_key = provider_key.api_key
+        replaced = getattr(self, "_provider", None)
+        self._provider = self._provider_class(api_key=provider_key.api_key, api_base=self.api_base, **self.kwargs)
+        if replaced is not None:
+            self._retire_provider(replaced)
+
+    def _lease_provider(self) -> ProviderLease:
+        provider = self.provider
+        self._provider_leases[provider] += 1
+        return ProviderLease(provider, functools.partial(self._release_provider, provider))
+
+    def _release_provider(self, provider: AnyLLM) -> None:
+        self._provider_leases[provider] -= 1
+        if self._provider_leases[provider] > 0:
+            return
+        del self._provider_leases[provider]
+        if provider is not getattr(self, "_provider", None):
+            self._close_provider(provider)
+
+    def _retire_provider(self, provider: AnyLLM) -> None:
+        """Close a replaced provider now, or when the last request using it is done."""
+        if provider not in self._provider_leases:
+            self._close_provider(provider)
+
+    def _close_provider(self, provider: AnyLLM) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Outside an event loop, its connections can't be in use by a running one.
+            return
+        task = loop.create_task(provider.aclose())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _refresh_provider_key(self) -> None:
+        task = provider_key_cache.refresh_in_background(
+            self.platform_client,
+            self.any_llm_key,  # type: ignore[arg-type]
+            self._provider_class.PROVIDER_NAME,
+        )
+
+        def use_refreshed_key(task: asyncio.Task[DecryptedProviderKey]) -> None:
+            if task.cancelled() or task.exception() is not None:
+                return
+            provider_key = task.result()
+            if provider_key.api_key != self._provider_api_key:
+                self._use_provider_key(provider_key)
+
+        task.add_done_callback(use_refreshed_key)
@@ -0,0 +1,366 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import contextlib
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from any_llm.logging import logger
+
+from .utils import post_usage_event_payload
+
+if TYPE_CHECKING:
+    from any_llm_platform_client import AnyLLMPlatformClient
+
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_RETRIES = 5
+BACKOFF_BASE_DELAY = 0.5
+BACKOFF_MAX_DELAY = 30.0
+SHUTDOWN_TIMEOUT = 5.0
+
+_RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class _UsageEvent:
+    any_llm_key: str
+    payload: dict[str, Any]
+    attempts: int = 0
+    sent: bool = False
+
+
+@dataclass
+class UsageShipperStats:
+    """Counters of a [UsageEventShipper][any_llm.providers.platform.usage_shipper.UsageEventShipper]."""
+
+    submitted: int = 0
+    sent: int = 0
+    retried: int = 0
+    dropped: int = 0
+    spilled: int = 0
+    replayed: int = 0
+
+
+@dataclass
+class _ShipperLoopState:
+    loop: asyncio.AbstractEventLoop
+    wakeup: asyncio.Event
+    worker: asyncio.Task[None]
+    client: httpx.AsyncClient = field(default_factory=httpx.AsyncClient)
+
+
+class UsageEventShipper:
+    """Post platform usage events in the background, off the completion's critical path.
+
+    Events are queued in memory and posted concurrently in batches of up to `batch_size`, as soon as
+    a batch is full or `flush_interval` seconds after the first queued event. Failed posts are
+    retried with exponential back-off up to `max_retries` times, and events the platform rejects are
+    dropped. Events that can't be delivered, or that don't fit in the queue, are appended to a JSON Lines file in `spill_directory` (named after
+    a hash of the ANY_LLM_KEY, which is never written to disk) and replayed once the platform is
+    reachable again, or dropped if no directory is configured.
+
+    Call `flush()` to wait for queued events to be posted, and `aclose()` / `close()` on shutdown.
+    The process-wide shipper used by [PlatformProvider][any_llm.providers.platform.PlatformProvider]
+    is closed at interpreter exit.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        spill_directory: str | Path | None = None,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.spill_directory = Path(spill_directory) if spill_directory is not None else None
+        self.stats = UsageShipperStats()
+        self._events: deque[_UsageEvent] = deque()
+        self._lock = threading.Lock()
+        self._platform_clients: dict[str, AnyLLMPlatformClient] = {}
+        self._state: _ShipperLoopState | None = None
+        self._exit_client: httpx.AsyncClient | None = None
+        self._sending = 0
+        self._consecutive_failures = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._events) + self._sending
+
+    def submit(self, platform_client: AnyLLMPlatformClient, any_llm_key: str, payload: dict[str, Any]) -> None:
+        """Queue a usage event without waiting for it to be posted."""
+        event = _UsageEvent(any_llm_key, payload)
+        with self._lock:
+            self._platform_clients[any_llm_key] = platform_client
+            self.stats.submitted += 1
+            queue_full = len(self._events) >= self.max_queue_size
+            if not queue_full:
+                self._events.append(event)
+        if queue_full:
+            self._spill_or_drop([event], reason="the usage event queue is full")
+            return
+        self._wake()
+
+    async def flush(self) -> None:
+        """Post every queued event, retrying (and eventually spilling or dropping) failures."""
+        state = self._state
+        if state is not None and not state.loop.is_closed() and state.loop is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self.flush(), state.loop))
+            return
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                with self._lock:
+                    sending = self._sending
+                if not sending:
+                    return
+                # The worker is posting a batch: wait for it.
+                await asyncio.sleep(0.01)
+                continue
+            await self._send_batch(batch)
+
+    async def aclose(self) -> None:
+        """Flush the queue, then stop the background worker and its HTTP client."""
+        await self.flush()
+        state, self._state = self._state, None
+        if state is None:
+            return
+        state.worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await state.worker
+        await state.client.aclose()
+
+    def close(self, timeout: float = SHUTDOWN_TIMEOUT) -> None:
+        """Synchronously flush and stop the shipper, spilling what can't be posted within `timeout`.
+
+        Events left by an event loop that has finished (e.g. once `asyncio.run` returned) are posted
+        from a temporary event loop.
+        """
+        state = self._state
+        if state is not None and state.loop.is_running() and not _on_loop(state.loop):
+            future = asyncio.run_coroutine_threadsafe(self.aclose(), state.loop)
+            try:
+                future.result(timeout)
+            except Exception as e:
+                future.cancel()
+                logger.warning("Failed to flush usage events on shutdown: %s", e)
+        elif self._events and not _in_running_loop():
+            # The loop the events were posted from is gone, e.g. `asyncio.run` returned: its worker and
+            # HTTP client died with it. Post the leftovers from a temporary loop.
+            self._state = None
+            try:
+                asyncio.run(asyncio.wait_for(self._aflush_leftovers(), timeout))
+            except TimeoutError:
+                logger.warning("Timed out flushing usage events on shutdown")
+            except Exception as e:
+                logger.warning("Failed to flush usage events on shutdown: %s", e)
+        with self._lock:
+            pending = list(self._events)
+            self._events.clear()
+        if pending:
+            self._spill_or_drop(pending, reason="the shipper was closed")
+
+    async def _aflush_leftovers(self) -> None:
+        async with httpx.AsyncClient() as client:
+            self._exit_client = client
+            try:
+                await self.flush()
+            finally:
+                self._exit_client = None
+
+    def _wake(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        state = self._state
+        if state is None or state.loop.is_closed() or state.worker.done():
+            if loop is None:
+                # No loop to post from: events wait for the next submit() or close().
+                return
+            wakeup = asyncio.Event()
+            worker = loop.create_task(self._run(wakeup))
+            state = self._state = _ShipperLoopState(loop=loop, wakeup=wakeup, worker=worker)
+        if loop is state.loop:
+            state.wakeup.set()
+        else:
+            state.loop.call_soon_threadsafe(state.wakeup.set)
+
+    async def _run(self, wakeup: asyncio.Event) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await wakeup.wait()
+            # Give the batch some time to fill up.
+            deadline = loop.time() + self.flush_interval
+            while len(self._events) < self.batch_size and (remaining := deadline - loop.time()) > 0:
+                wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(wakeup.wait(), remaining)
+            wakeup.clear()
+            batch = self._take_batch()
+            if batch:
+                await self._send_batch(batch)
+            if self._events:
+                wakeup.set()
+
+    def _take_batch(self) -> list[_UsageEvent]:
+        with self._lock:
+            batch = [self._events.popleft() for _ in range(min(self.batch_size, len(self._events)))]
+            self._sending += len(batch)
+            return batch
+
+    async def _send_batch(self, batch: list[_UsageEvent]) -> None:
+        try:
+            results = await asyncio.gather(*(self._send(event) for event in batch), return_exceptions=True)
+        except asyncio.CancelledError:
+            # E.g. a flush timing out on shutdown: queue the events again, to be spilled by close().
+            self._requeue([event for event in batch if not event.sent])
+            self.stats.sent += sum(event.sent for event in batch)
+            raise
+        finally:
+            with self._lock:
+                self._sending -= len(batch)
+
+        failed: list[_UsageEvent] = []
+        delivered_keys: set[str] = set()
+        for event, result in zip(batch, results, strict=True):
+            if result is None:
+                self.stats.sent += 1
+                delivered_keys.add(event.any_llm_key)
+                continue
+            if not isinstance(result, Exception):
+                raise result
+            event.attempts += 1
+            if not _is_retryable(result):
+                # The platform rejected the event itself: sending it again won't help.
+                logger.warning("Usage event %s was rejected: %s", event.payload.get("id"), result)
+                self.stats.dropped += 1
+            elif event.attempts > self.max_retries:
+                logger.warning("Failed to post usage event %s: %s", event.payload.get("id"), result)
+                self._spill_or_drop([event], reason=str(result))
+            else:
+                failed.append(event)
+
+        if failed:
+            self._consecutive_failures += 1
+            self.stats.retried += len(failed)
+            self._requeue(failed)
+            # Back off before the failed events are retried.
+            await asyncio.sleep(_backoff_delay(self._consecutive_failures))
+        elif delivered_keys:
+            self._consecutive_failures = 0
+            self._replay_spilled(delivered_keys)
+
+    def _requeue(self, events: list[_UsageEvent]) -> None:
+        """Queue `events` again ahead of the newer ones, spilling the oldest events past `max_queue_size`."""
+        with self._lock:
+            self._events.extendleft(reversed(events))
+            overflow = [self._events.popleft() for _ in range(max(0, len(self._events) - self.max_queue_size))]
+        if overflow:
+            self._spill_or_drop(overflow, reason="the usage event queue is full")
+
+    async def _send(self, event: _UsageEvent) -> None:
+        state = self._state
+        client = state.client if state is not None else self._exit_client
+        platform_client = self._platform_clients[event.any_llm_key]
+        access_token = await platform_client._aensure_valid_token(event.any_llm_key)
+        if client is None:
+            async with httpx.AsyncClient() as temporary_client:
+                await post_usage_event_payload(temporary_client, access_token, event.payload)
+        else:
+            await post_usage_event_payload(client, access_token, event.payload)
+        event.sent = True
+
+    def _spill_path(self, any_llm_key: str) -> Path | None:
+        if self.spill_directory is None:
+            return None
+        digest = hashlib.sha256(any_llm_key.encode()).hexdigest()[:16]
+        return self.spill_directory / f"usage-events-{digest}.jsonl"
+
+    def _spill_or_drop(self, events: list[_UsageEvent], reason: str) -> None:
+        for event in events:
+            path = self._spill_path(event.any_llm_key)
+            if path is None:
+                self.stats.dropped += 1
+                continue
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(event.payload) + "\n")
+                self.stats.spilled += 1
+            except OSError as e:
+                logger.warning("Failed to spill usage event to %s: %s", path, e)
+                self.stats.dropped += 1
+        if self.stats.dropped:
+            logger.debug("Usage events not delivered (%s), %d dropped so far", reason, self.stats.dropped)
+
+    def _replay_spilled(self, any_llm_keys: set[str]) -> None:
+        for any_llm_key in any_llm_keys:
+            path = self._spill_path(any_llm_key)
+            if path is None or not path.exists():
+                continue
+            # Claim the file first so that events spilled while replaying go to a new one.
+            claimed = path.with_suffix(f".{time.monotonic_ns()}.replay")
+            try:
+                path.rename(claimed)
+                lines = claimed.read_text(encoding="utf-8").splitlines()
+                claimed.unlink()
+            except OSError as e:
+                logger.warning("Failed to replay spilled usage events from %s: %s", path, e)
+                continue
+            events = [_UsageEvent(any_llm_key, json.loads(line)) for line in lines if line.strip()]
+            with self._lock:
+                replayed = events[: max(0, self.max_queue_size - len(self._events))]
+                self._events.extend(replayed)
+                self.stats.replayed += len(replayed)
+            if len(replayed) < len(events):
+                # Spilled again, to be replayed after the next delivery.
+                self._spill_or_drop(events[len(replayed) :], reason="the usage event queue is full")
+
+
+def _on_loop(loop: asyncio.AbstractEventLoop) -> bool:
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def _in_running_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in _RETRYABLE_STATUS_CODES
+    return isinstance(error, httpx.TransportError | OSError)
+
+
+def _backoff_delay(failures: int) -> float:
+    """Exponential back-off with full jitter."""
+    return random.uniform(0, min(BACKOFF_MAX_DELAY, BACKOFF_BASE_DELAY * 2**failures))  # noqa: S311
+
+
+usage_event_shipper = UsageEventShipper()
+"""The shipper used by every [PlatformProvider][any_llm.providers.platform.PlatformProvider] by default."""
+
+atexit.register(usage_event_shipper.close)
@@ -12,6 +12,8 @@ from any_llm_platform_client import (
 if TYPE_CHECKING:
     from any_llm.types.completion import ChatCompletion
 
+    from .usage_shipper import UsageEventShipper
+
 
 ANY_LLM_PLATFORM_URL = os.getenv("ANY_LLM_PLATFORM_URL", "https://platform-api.any-llm.ai")
 API_V1_STR = "/api/v1"
@@ -33,6 +35,7 @@ async def post_completion_usage_event(
     chunks_received: int | None = None,
     avg_chunk_size: float | None = None,
     inter_chunk_latency_variance_ms: float | None = None,
+    shipper: UsageEventShipper | None = None,
 ) -> None:
     """Posts completion usage events.
 
@@ -53,12 +56,66 @@ async def post_completion_usage_event(
         chunks_received: Number of chunks received (streaming only).
         avg_chunk_size: Average tokens per chunk (streaming only).
         inter_chunk_latency_variance_ms: Inter-chunk latency variance (streaming only).
+        shipper: If given, queue the event on this background shipper instead of posting it now.
     """
+    if shipper is not None:
+        if completion.usage is None:
+            return
+        payload = build_usage_event_payload(
+            provider=provider,
+            completion=completion,
+            provider_key_id=provider_key_id,
+            client_name=client_name,
+            time_to_first_token_ms=time_to_first_token_ms,
+            time_to_last_token_ms=time_to_last_token_ms,
+            total_duration_ms=total_duration_ms,
+            tokens_per_second=tokens_per_second,
+            chunks_received=chunks_received,
+            avg_chunk_size=avg_chunk_size,
+            inter_chunk_latency_variance_ms=inter_chunk_latency_variance_ms,
+        )
+        shipper.submit(platform_client, any_llm_key, payload)
+        return
+
     access_token = await platform_client._aensure_valid_token(any_llm_key)
 
     if completion.usage is None:
         return
 
+    payload = build_usage_event_payload(
+        provider=provider,
+        completion=completion,
+        provider_key_id=provider_key_id,
+        client_name=client_name,
+        time_to_first_token_ms=time_to_first_token_ms,
+        time_to_last_token_ms=time_to_last_token_ms,
+        total_duration_ms=total_duration_ms,
+        tokens_per_second=tokens_per_second,
+        chunks_received=chunks_received,
+        avg_chunk_size=avg_chunk_size,
+        inter_chunk_latency_variance_ms=inter_chunk_latency_variance_ms,
+    )
+    await post_usage_event_payload(client, access_token, payload)
+
+
+def build_usage_event_payload(
+    provider: str,
+    completion: ChatCompletion,
+    provider_key_id: str,
+    client_name: str | None = None,
+    time_to_first_token_ms: float | None = None,
+    time_to_last_token_ms: float | None = None,
+    total_duration_ms: float | None = None,
+    tokens_per_second: float | None = None,
+    chunks_received: int | None = None,
+    avg_chunk_size: float | None = None,
+    inter_chunk_latency_variance_ms: float | None = None,
+) -> dict[str, Any]:
+    """Build the JSON body of a usage event for a completion that has usage data."""
+    if completion.usage is None:
+        msg = "Cannot build a usage event for a completion without usage data"
+        raise ValueError(msg)
+
     event_id = str(uuid.uuid4())
 
     data: dict[str, Any] = {
@@ -94,7 +151,11 @@ async def post_completion_usage_event(
     }
     if client_name:
         payload["client_name"] = client_name
+    return payload
+
 
+async def post_usage_event_payload(client: httpx.AsyncClient, access_token: str, payload: dict[str, Any]) -> None:
+    """Post a usage event built by `build_usage_event_payload`."""
     response = await client.post(
         f"{ANY_LLM_PLATFORM_API_URL}/usage-events/",
         json=payload,
@@ -10,6 +10,7 @@ from any_llm.exceptions import MissingApiKeyError, UnsupportedParameterError
 from any_llm.logging import logger
 from any_llm.types.completion import ChatCompletion, ChatCompletionChunk, CompletionParams, CreateEmbeddingResponse
 from any_llm.types.model import Model
+from any_llm.utils.aio import iterate_in_thread
 
 MISSING_PACKAGES_ERROR = None
 try:
@@ -105,24 +106,12 @@ class SagemakerProvider(AnyLLM):
         **kwargs: Any,
     ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
         """Create a chat completion using AWS SageMaker."""
-        logger.warning("AWS SageMaker client does not support async. Calls made with this method will be blocking.")
-
-        loop = asyncio.get_event_loop()
-
-        call_sync_partial: Callable[[], ChatCompletion | Iterator[ChatCompletionChunk]] = functools.partial(
-            self._completion, params, **kwargs
-        )
-
-        result = await loop.run_in_executor(None, call_sync_partial)
+        result = await asyncio.to_thread(self._completion, params, **kwargs)
 
         if isinstance(result, ChatCompletion):
             return result
 
-        async def _stream() -> AsyncIterator[ChatCompletionChunk]:
-            for chunk in result:
-                yield chunk
-
-        return _stream()
+        return iterate_in_thread(result)
 
     def _completion(
         self,
@@ -105,6 +105,7 @@ class TogetherProvider(AnyLLM):
         raise NotImplementedError(msg)
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
+        self._add_http_client(kwargs, "http_client", api_base, together.DefaultAsyncHttpxClient)
         self.client = together.AsyncTogether(
             api_key=api_key,
             base_url=api_base,
@@ -13,11 +13,15 @@ class VertexaiProvider(GoogleProvider):
     PROVIDER_DOCUMENTATION_URL = "https://cloud.google.com/vertex-ai/docs"
     ENV_API_KEY_NAME = ""
 
+    EMBEDDING_MAX_BATCH_SIZE = 250
+    EMBEDDING_MAX_BATCH_TOKENS = 20_000
+
     def _verify_and_set_api_key(self, api_key: str | None = None) -> str | None:
         return api_key
 
     def _init_client(self, api_key: str | None = None, api_base: str | None = None, **kwargs: Any) -> None:
         """Get Vertex AI client."""
+        self._add_http_options(kwargs)
         self.client = genai.Client(
             vertexai=True,
             **kwargs,
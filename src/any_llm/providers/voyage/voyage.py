@@ -40,6 +40,9 @@ class VoyageProvider(AnyLLM):
     SUPPORTS_LIST_MODELS = False
     SUPPORTS_BATCH = False
 
+    EMBEDDING_MAX_BATCH_SIZE = 1000
+    EMBEDDING_MAX_BATCH_TOKENS = 120_000
+
     MISSING_PACKAGES_ERROR = MISSING_PACKAGES_ERROR
 
     client: AsyncClient
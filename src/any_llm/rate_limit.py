@@ -0,0 +1,438 @@
+"""Client-side rate limiting of requests and tokens per provider and model.
+
+A [RateLimiter][any_llm.rate_limit.RateLimiter] holds a requests-per-minute and a tokens-per-minute
+token bucket per (provider, model). Calls wait for budget before they are sent instead of failing
+with a rate limit error, so a batch of concurrent calls runs steadily close to the quota:
+
+```python
+from any_llm import AnyLLM
+from any_llm.rate_limit import RateLimit, RateLimiter
+
+llm = AnyLLM.create("openai")
+llm.rate_limiter = RateLimiter({"openai:gpt-4.1-mini": RateLimit(requests_per_minute=500, tokens_per_minute=200_000)})
+```
+
+Use [set_default_rate_limiter][any_llm.rate_limit.set_default_rate_limiter] to apply a limiter to
+every provider that doesn't have its own.
+
+An adaptive limiter reads the rate limit headers (`x-ratelimit-remaining-tokens`, ...) of every
+response of providers whose SDK client is built on httpx (OpenAI, Anthropic and the OpenAI-compatible
+providers), so the budgets follow the provider's quota before it rejects a request. With other
+providers, only the headers of rate limit errors are read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import email.utils
+import functools
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, TypeVar, cast
+
+from any_llm.exceptions import AnyLLMError, RateLimitError
+from any_llm.logging import logger
+from any_llm.utils.embeddings import estimate_tokens
+from any_llm.utils.exception_handler import convert_exception
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+
+    import httpx
+
+    from any_llm.types.completion import CompletionParams
+
+T = TypeVar("T")
+
+DEFAULT_RATE_LIMIT_RETRIES = 2
+"""Number of times a call that hit the provider's rate limit is queued and sent again."""
+
+DEFAULT_RATE_LIMIT_BACKOFF = 1.0
+"""Seconds to pause a (provider, model) after a rate limit error without a `Retry-After` header."""
+
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+_HEADER_NAMES = {
+    "limit_requests": ("x-ratelimit-limit-requests", "anthropic-ratelimit-requests-limit"),
+    "limit_tokens": ("x-ratelimit-limit-tokens", "anthropic-ratelimit-tokens-limit"),
+    "remaining_requests": ("x-ratelimit-remaining-requests", "anthropic-ratelimit-requests-remaining"),
+    "remaining_tokens": ("x-ratelimit-remaining-tokens", "anthropic-ratelimit-tokens-remaining"),
+}
+
+_headers_listener: contextvars.ContextVar[Callable[[Mapping[str, str]], None] | None] = contextvars.ContextVar(
+    "_headers_listener", default=None
+)
+"""Receives the headers of the responses to the call made by `RateLimiter.acall` in the current context."""
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class TokenBucket:
+    """A bucket of `capacity` tokens refilled continuously over `period` seconds.
+
+    Reservations are taken immediately and may leave the bucket in debt: `reserve` returns how long
+    the caller has to wait for its share, so waiters are served in arrival order without polling.
+    """
+
+    def __init__(self, capacity: float, period: float = 60.0) -> None:
+        """Create a full bucket."""
+        if capacity <= 0 or period <= 0:
+            msg = "capacity and period must be positive"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.period = period
+        self._level = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def level(self) -> float:
+        """Number of tokens currently available, negative while the bucket is in debt."""
+        with self._lock:
+            self._refill_locked()
+            return self._level
+
+    def _refill_locked(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.capacity / self.period)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take `amount` tokens and return the number of seconds until they are actually available."""
+        with self._lock:
+            self._refill_locked()
+            self._level -= amount
+            return max(0.0, -self._level * self.period / self.capacity)
+
+    def refund(self, amount: float) -> None:
+        """Give back tokens that were reserved but not used."""
+        with self._lock:
+            self._refill_locked()
+            self._level = min(self.capacity, self._level + amount)
+
+    def limit(self, capacity: float | None = None, remaining: float | None = None) -> None:
+        """Adjust the bucket to limits reported by the provider."""
+        with self._lock:
+            self._refill_locked()
+            if capacity is not None and capacity > 0:
+                self.capacity = capacity
+                self._level = min(self._level, capacity)
+            if remaining is not None:
+                self._level = min(self._level, remaining)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Budget of a provider or of a provider's model. `None` means unlimited."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+
+
+class _Budget:
+    def __init__(self, limit: RateLimit | None) -> None:
+        self.configured = limit or RateLimit()
+        self.requests = TokenBucket(limit.requests_per_minute) if limit and limit.requests_per_minute else None
+        self.tokens = TokenBucket(limit.tokens_per_minute) if limit and limit.tokens_per_minute else None
+        self.paused_until = 0.0
+
+
+class RateLimitReservation:
+    """Budget taken for one call, reconciled with the actual usage once it is known."""
+
+    def __init__(self, budget: _Budget, tokens: int) -> None:
+        """Record that `tokens` were reserved from `budget`."""
+        self._budget = budget
+        self.tokens = tokens
+
+    def reconcile(self, actual_tokens: int) -> None:
+        """Correct the tokens-per-minute budget with the number of tokens the call actually used."""
+        bucket = self._budget.tokens
+        if bucket is not None and actual_tokens != self.tokens:
+            if actual_tokens > self.tokens:
+                bucket.reserve(actual_tokens - self.tokens)
+            else:
+                bucket.refund(self.tokens - actual_tokens)
+        self.tokens = actual_tokens
+
+
+def estimate_completion_tokens(params: CompletionParams) -> int:
+    """Estimate the tokens a completion request counts against a tokens-per-minute budget.
+
+    Providers count the prompt plus the maximum number of tokens that may be generated.
+    """
+    tokens = (params.max_completion_tokens or params.max_tokens or 0) + estimate_messages_tokens(params.messages)
+    if params.tools:
+        tokens += estimate_tokens(json.dumps(params.tools, default=str))
+    return tokens
+
+
+def estimate_messages_tokens(messages: list[dict[str, Any]]) -> int:
+    """Estimate the prompt tokens of `messages`, including the per-message overhead."""
+    tokens = 0
+    for message in messages:
+        tokens += _MESSAGE_OVERHEAD_TOKENS
+        content = message.get("content")
+        if isinstance(content, str):
+            tokens += estimate_tokens(content)
+        elif isinstance(content, list):
+            for part in content:
+                if isinstance(part, dict) and isinstance(part.get("text"), str):
+                    tokens += estimate_tokens(part["text"])
+    return tokens
+
+
+def estimate_embedding_tokens(inputs: str | list[str]) -> int:
+    """Estimate the tokens an embedding request counts against a tokens-per-minute budget."""
+    if isinstance(inputs, str):
+        return estimate_tokens(inputs)
+    return sum(estimate_tokens(text) for text in inputs)
+
+
+def _parse_duration(value: str) -> float | None:
+    """Parse `Retry-After` style values: seconds, an HTTP date, or durations like `1m30s` / `250ms`."""
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+def _parse_number(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _error_headers(error: BaseException) -> Mapping[str, str] | None:
+    if isinstance(error, AnyLLMError) and error.original_exception is not None:
+        error = error.original_exception
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    return headers if headers is not None and hasattr(headers, "items") else None
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute budgets per (provider, model).
+
+    Limits are looked up by `"provider:model"`, then `"provider"`, then `default`. With `adaptive`,
+    limits reported by the provider in rate limit headers or `Retry-After` are applied as well,
+    including to (provider, model) pairs without a configured limit.
+
+    Args:
+        limits: Limits keyed by `"provider"` or `"provider:model"`.
+        default: Limit of every other (provider, model).
+        adaptive: Whether to adjust the budgets to the rate limit headers returned by providers.
+        max_retries: Number of times a call rejected by the provider's rate limit is queued and sent again.
+
+    """
+
+    def __init__(
+        self,
+        limits: Mapping[str, RateLimit] | None = None,
+        *,
+        default: RateLimit | None = None,
+        adaptive: bool = True,
+        max_retries: int = DEFAULT_RATE_LIMIT_RETRIES,
+    ) -> None:
+        """Create a rate limiter, see the class documentation for the arguments."""
+        self.limits = dict(limits or {})
+        self.default = default
+        self.adaptive = adaptive
+        self.max_retries = max_retries
+        self._budgets: dict[tuple[str, str], _Budget] = {}
+        self._lock = threading.Lock()
+
+    def set_limit(
+        self,
+        provider: str,
+        model: str | None = None,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ) -> None:
+        """Set the limit of a provider, or of one of its models, replacing its current budget."""
+        key = f"{provider}:{model}" if model else provider
+        with self._lock:
+            self.limits[key] = RateLimit(requests_per_minute, tokens_per_minute)
+            self._budgets = {
+                budget_key: budget
+                for budget_key, budget in self._budgets.items()
+                if budget_key[0] != provider or (model is not None and budget_key[1] != model)
+            }
+
+    def _budget(self, provider: str, model: str) -> _Budget | None:
+        key = (provider, model)
+        budget = self._budgets.get(key)
+        if budget is not None:
+            return budget
+        limit = self.limits.get(f"{provider}:{model}") or self.limits.get(provider) or self.default
+        if limit is None and not self.adaptive:
+            return None
+        with self._lock:
+            return self._budgets.setdefault(key, _Budget(limit))
+
+    async def acquire(self, provider: str, model: str, tokens: int = 0) -> RateLimitReservation | None:
+        """Wait until one request of `tokens` tokens fits in the budget of (provider, model) and reserve it."""
+        budget = self._budget(provider, model)
+        if budget is None:
+            return None
+
+        wait = budget.paused_until - time.monotonic()
+        if budget.requests is not None:
+            wait = max(wait, budget.requests.reserve(1))
+        if budget.tokens is not None:
+            wait = max(wait, budget.tokens.reserve(tokens))
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                if budget.requests is not None:
+                    budget.requests.refund(1)
+                if budget.tokens is not None:
+                    budget.tokens.refund(tokens)
+                raise
+        return RateLimitReservation(budget, tokens)
+
+    def pause(self, provider: str, model: str, seconds: float) -> None:
+        """Hold every request to (provider, model) for `seconds`."""
+        budget = self._budget(provider, model)
+        if budget is not None:
+            budget.paused_until = max(budget.paused_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, provider: str, model: str, headers: Mapping[str, str]) -> None:
+        """Adapt the budget of (provider, model) to the `Retry-After` and rate limit headers of a response."""
+        if not self.adaptive:
+            return
+        budget = self._budget(provider, model)
+        if budget is None:
+            return
+        lowered = {name.lower(): value for name, value in headers.items()}
+
+        def header(field: str) -> float | None:
+            for name in _HEADER_NAMES[field]:
+                if name in lowered:
+                    return _parse_number(lowered[name])
+            return None
+
+        milliseconds = _parse_number(lowered.get("retry-after-ms"))
+        seconds = milliseconds / 1000 if milliseconds is not None else None
+        if seconds is None and "retry-after" in lowered:
+            seconds = _parse_duration(lowered["retry-after"])
+        if seconds:
+            self.pause(provider, model, seconds)
+
+        for attribute, limit_field, remaining_field, configured in (
+            ("requests", "limit_requests", "remaining_requests", budget.configured.requests_per_minute),
+            ("tokens", "limit_tokens", "remaining_tokens", budget.configured.tokens_per_minute),
+        ):
+            capacity, remaining = header(limit_field), header(remaining_field)
+            if capacity is None and remaining is None:
+                continue
+            if capacity is not None and configured is not None:
+                capacity = min(capacity, configured)
+            bucket: TokenBucket | None = getattr(budget, attribute)
+            if bucket is None:
+                if capacity is None:
+                    continue
+                bucket = TokenBucket(capacity)
+                setattr(budget, attribute, bucket)
+            bucket.limit(capacity, remaining)
+
+    async def acall(self, provider: str, model: str, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        """Make `call` within the budget of (provider, model).
+
+        The reservation is reconciled with the `usage` of the response (for streams, with the
+        usage of the last chunk that reports it). Calls rejected by the provider's rate limit are
+        queued again up to `max_retries` times.
+        """
+        listener = _headers_listener.set(functools.partial(self.update_from_headers, provider, model))
+        try:
+            return await self._acall(provider, model, tokens, call)
+        finally:
+            _headers_listener.reset(listener)
+
+    async def _acall(self, provider: str, model: str, tokens: int, call: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            reservation = await self.acquire(provider, model, tokens)
+            try:
+                response = await call()
+            except Exception as e:
+                if reservation is not None:
+                    reservation.reconcile(0)
+                if not isinstance(convert_exception(e, provider), RateLimitError):
+                    raise
+                # Already read if the SDK client has the `observe_response_headers` hook: reading them again is harmless.
+                headers = _error_headers(e)
+                if headers is not None:
+                    self.update_from_headers(provider, model, headers)
+                if attempt >= self.max_retries:
+                    raise
+                if headers is None or not any(name.lower().startswith("retry-after") for name in headers):
+                    self.pause(provider, model, DEFAULT_RATE_LIMIT_BACKOFF * 2**attempt)
+                attempt += 1
+                logger.info("Rate limited by %s, queueing the request again (attempt %d)", provider, attempt)
+                continue
+
+            if reservation is None:
+                return response
+            if hasattr(response, "__aiter__"):
+                return cast("T", self._reconcile_stream(reservation, cast("AsyncIterator[Any]", response)))
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None) is not None:
+                reservation.reconcile(usage.total_tokens)
+            return response
+
+    @staticmethod
+    async def _reconcile_stream(reservation: RateLimitReservation, stream: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        total_tokens = None
+        try:
+            async for chunk in stream:
+                usage = getattr(chunk, "usage", None)
+                if usage is not None and getattr(usage, "total_tokens", None):
+                    total_tokens = usage.total_tokens
+                yield chunk
+        finally:
+            if total_tokens is not None:
+                reservation.reconcile(total_tokens)
+
+
+_default_rate_limiter: RateLimiter | None = None
+
+
+def set_default_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Set the rate limiter of every provider whose `rate_limiter` attribute is not set. None disables it."""
+    global _default_rate_limiter  # noqa: PLW0603
+    _default_rate_limiter = rate_limiter
+
+
+def get_default_rate_limiter() -> RateLimiter | None:
+    """Return the rate limiter set with [set_default_rate_limiter][any_llm.rate_limit.set_default_rate_limiter]."""
+    return _default_rate_limiter
+
+
+async def observe_response_headers(response: httpx.Response) -> None:
+    """Pass the headers of `response` to the rate limiter of the call that sent it, if any.
+
+    An httpx response event hook, added to the SDK clients of the providers.
+    """
+    listener = _headers_listener.get()
+    if listener is not None:
+        listener(response.headers)
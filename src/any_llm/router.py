@@ -0,0 +1,505 @@
+"""Route requests for one logical model across several providers.
+
+```python
+from any_llm.router import Router
+
+router = Router(["openai:gpt-4.1-mini", "azureopenai:gpt-4.1-mini", "openrouter:openai/gpt-4.1-mini"])
+response = await router.acompletion(messages=[{"role": "user", "content": "Hello"}])
+```
+
+Each request goes to the target with the best recent latency and error rate. Failed requests fall
+back to the next target, and targets that keep failing are skipped until their circuit breaker
+lets a trial request through again. With a [HedgePolicy][any_llm.router.HedgePolicy], requests that
+are slower than usual are duplicated to another target and the first answer wins.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import StrEnum
+from typing import TYPE_CHECKING, Any, Self
+
+from any_llm.any_llm import AnyLLM
+from any_llm.api import _acquire_cached_provider
+from any_llm.constants import INSIDE_NOTEBOOK
+from any_llm.exceptions import (
+    ContentFilterError,
+    ContextLengthExceededError,
+    InvalidRequestError,
+    ProviderError,
+    RateLimitError,
+)
+from any_llm.logging import logger
+from any_llm.types.completion import ChatCompletion, ChatCompletionChunk
+from any_llm.utils.aio import async_iter_to_sync_iter, run_async_in_sync
+from any_llm.utils.exception_handler import convert_exception
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+
+    from any_llm.constants import LLMProvider
+    from any_llm.types.completion import ChatCompletionMessage
+
+DEFAULT_WINDOW_SIZE = 100
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 30.0
+ERROR_RATE_PENALTY = 4.0
+"""How much a target's error rate inflates its latency score: 25% errors double it."""
+
+_NON_RETRYABLE_ERRORS = (InvalidRequestError, ContextLengthExceededError, ContentFilterError)
+
+
+class CircuitState(StrEnum):
+    """State of a [CircuitBreaker][any_llm.router.CircuitBreaker]."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops sending requests to a target after repeated failures.
+
+    The circuit opens after `failure_threshold` consecutive failures. Once `cooldown` seconds
+    have passed it half-opens and lets a single trial request through: success closes it,
+    failure opens it again.
+    """
+
+    def __init__(
+        self, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD, cooldown: float = DEFAULT_COOLDOWN_SECONDS
+    ) -> None:
+        """Create a closed circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        """The current state of the circuit."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self._opened_at >= self.cooldown:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now. In the half-open state, this claims the trial request."""
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.consecutive_failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit past the threshold or after a failed trial request."""
+        self.consecutive_failures += 1
+        if self._trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Give back a trial request that ended without an outcome (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+
+@dataclass
+class RouterTarget:
+    """A `provider:model` the router can send requests to."""
+
+    model: str
+    """Model in the `provider:model` format."""
+    weight: float = 1.0
+    """Preference for this target: a target with twice the weight is picked with twice the latency."""
+    api_key: str | None = None
+    api_base: str | None = None
+    client_args: dict[str, Any] | None = None
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """When to send a duplicate ("hedge") of a slow request to cut tail latency.
+
+    If the primary target hasn't answered (or sent its first chunk) after `delay` seconds, the
+    request is sent again to the next ranked target, or to the same one if there is no other.
+    Whichever answers first wins and the other request is cancelled, closing its connection.
+    """
+
+    percentile: float = 0.95
+    """Hedge once the request is slower than this percentile of the primary target's latency."""
+    delay: float | None = None
+    """Fixed hedge delay in seconds, overriding `percentile`."""
+    min_delay: float = 0.05
+    """Lower bound for the percentile-based delay."""
+    max_extra_ratio: float = 0.1
+    """Maximum hedges per request, on average: caps the extra spend at 10% by default."""
+
+
+@dataclass
+class HedgeStats:
+    """How often hedges were sent and answered first."""
+
+    requests: int = 0
+    """Requests that were eligible for hedging."""
+    fired: int = 0
+    """Hedges that were sent."""
+    won: int = 0
+    """Hedges that answered before the primary request."""
+    over_budget: int = 0
+    """Hedges that were not sent because of `max_extra_ratio`."""
+
+
+@dataclass
+class RouterTargetStats:
+    """Snapshot of the health of a router target."""
+
+    model: str
+    requests: int
+    p50_latency: float | None
+    p95_latency: float | None
+    error_rate: float
+    circuit_state: CircuitState
+
+
+@dataclass
+class _TargetState:
+    target: RouterTarget
+    provider: LLMProvider
+    model_name: str
+    breaker: CircuitBreaker
+    latencies: deque[float]
+    outcomes: deque[bool]
+    requests: int = field(default=0)
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[round(q * (len(ordered) - 1))]
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def score(self) -> float:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        if p50 is None or p95 is None:
+            # No data yet: try it first so it gets some.
+            return 0.0
+        return (p50 + p95) / 2 * (1 + ERROR_RATE_PENALTY * self.error_rate) / self.target.weight
+
+
+async def _aclose(response: ChatCompletion | AsyncIterator[ChatCompletionChunk]) -> None:
+    aclose = getattr(response, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+class _RoutedStream:
+    """Stream of a router target, whose outcome is recorded once: when it ends, fails or is closed.
+
+    A stream closed before its end counts as a success, since it was working until then.
+    """
+
+    def __init__(
+        self,
+        stream: AsyncIterator[ChatCompletionChunk],
+        first_chunk: ChatCompletionChunk | None,
+        record_outcome: Callable[[BaseException | None], None],
+    ) -> None:
+        self._stream = stream
+        self._first_chunk = first_chunk
+        self._record_outcome: Callable[[BaseException | None], None] | None = record_outcome
+        if first_chunk is None:
+            # The stream ended before its first chunk.
+            self._finish(None)
+
+    def __aiter__(self) -> Self:
+        """Return the stream itself."""
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        """Return the next chunk, recording the outcome of the stream when it ends or fails."""
+        if self._first_chunk is not None:
+            chunk, self._first_chunk = self._first_chunk, None
+            return chunk
+        if self._record_outcome is None:
+            raise StopAsyncIteration
+        try:
+            return await anext(self._stream)
+        except StopAsyncIteration:
+            self._finish(None)
+            raise
+        except BaseException as e:
+            self._finish(e)
+            raise
+
+    async def aclose(self) -> None:
+        """Close the underlying stream."""
+        self._finish(None)
+        await _aclose(self._stream)
+
+    def _finish(self, error: BaseException | None) -> None:
+        if self._record_outcome is not None:
+            record_outcome, self._record_outcome = self._record_outcome, None
+            record_outcome(error)
+
+
+class Router:
+    """Send completions to the best of several `provider:model` targets serving the same model.
+
+    Targets are ranked per request by the mean of their rolling p50 and p95 latency (time to first
+    chunk for streams), inflated by their error rate and divided by their weight. A request that
+    fails with a provider, rate limit, timeout or authentication error falls back to the next
+    target. Invalid requests are raised right away since every target would reject them.
+    Streams fall back until their first chunk has been received.
+
+    Args:
+        targets: `provider:model` strings or [RouterTarget][any_llm.router.RouterTarget]s.
+        window_size: Number of recent requests per target used for latency and error rate.
+        failure_threshold: Consecutive `ProviderError` / `RateLimitError` failures that open a target's circuit.
+        cooldown: Seconds an open circuit waits before letting a trial request through.
+        timeout: Seconds a target has to answer (or send its first chunk) before the request falls back.
+        max_attempts: Maximum number of targets tried per request. Defaults to all of them.
+        hedge: Opt in to hedged requests, see [HedgePolicy][any_llm.router.HedgePolicy].
+
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[str | RouterTarget],
+        *,
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        cooldown: float = DEFAULT_COOLDOWN_SECONDS,
+        timeout: float | None = None,
+        max_attempts: int | None = None,
+        hedge: HedgePolicy | None = None,
+    ) -> None:
+        """Create a router, see the class documentation for the arguments."""
+        if not targets:
+            msg = "Router needs at least one target"
+            raise ValueError(msg)
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.hedge = hedge
+        self.hedge_stats = HedgeStats()
+        self._states: list[_TargetState] = []
+        for target in targets:
+            router_target = RouterTarget(model=target) if isinstance(target, str) else target
+            provider, model_name = AnyLLM.split_model_provider(router_target.model)
+            self._states.append(
+                _TargetState(
+                    target=router_target,
+                    provider=provider,
+                    model_name=model_name,
+                    breaker=CircuitBreaker(failure_threshold, cooldown),
+                    latencies=deque(maxlen=window_size),
+                    outcomes=deque(maxlen=window_size),
+                )
+            )
+
+    def stats(self) -> list[RouterTargetStats]:
+        """Return the current latency, error rate and circuit state of every target."""
+        return [
+            RouterTargetStats(
+                model=state.target.model,
+                requests=state.requests,
+                p50_latency=state.percentile(0.5),
+                p95_latency=state.percentile(0.95),
+                error_rate=state.error_rate,
+                circuit_state=state.breaker.state,
+            )
+            for state in self._states
+        ]
+
+    def _ranked(self) -> list[_TargetState]:
+        # sorted() is stable: ties keep the configured order, higher weights first.
+        by_weight = sorted(self._states, key=lambda state: -state.target.weight)
+        return sorted(by_weight, key=lambda state: state.score())
+
+    def completion(
+        self, messages: list[dict[str, Any] | ChatCompletionMessage], **kwargs: Any
+    ) -> ChatCompletion | Iterator[ChatCompletionChunk]:
+        """Create a chat completion synchronously.
+
+        See [Router.acompletion][any_llm.router.Router.acompletion]
+        """
+        allow_running_loop = kwargs.pop("allow_running_loop", INSIDE_NOTEBOOK)
+        response = run_async_in_sync(self.acompletion(messages, **kwargs), allow_running_loop=allow_running_loop)
+        if isinstance(response, ChatCompletion):
+            return response
+        return async_iter_to_sync_iter(response, allow_running_loop=allow_running_loop)
+
+    async def acompletion(
+        self, messages: list[dict[str, Any] | ChatCompletionMessage], **kwargs: Any
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        """Create a chat completion with the best available target, falling back on failure.
+
+        Args:
+            messages: List of messages for the conversation.
+            **kwargs: Any other argument of [AnyLLM.acompletion][any_llm.any_llm.AnyLLM.acompletion], except `model`.
+                Pass `hedge=False` to disable hedging for this request.
+
+        Returns:
+            The completion response from the first target that succeeded.
+
+        Raises:
+            ProviderError: If every target's circuit is open.
+
+        """
+        hedge = self.hedge if kwargs.pop("hedge", True) else None
+        last_error: Exception | None = None
+        attempts = 0
+        remaining = self._ranked()
+        while remaining:
+            state = remaining.pop(0)
+            if self.max_attempts is not None and attempts >= self.max_attempts:
+                break
+            if not state.breaker.allow_request():
+                continue
+            attempts += 1
+            try:
+                if hedge is not None:
+                    return await self._hedged_attempt(hedge, state, remaining, messages, kwargs)
+                return await self._attempt(state, messages, kwargs)
+            except Exception as e:
+                if isinstance(convert_exception(e, state.provider.value), _NON_RETRYABLE_ERRORS):
+                    raise
+                logger.info("Router target %s failed, falling back: %s", state.target.model, e)
+                last_error = e
+
+        if last_error is not None:
+            raise last_error
+        msg = "All router targets are unavailable: their circuit breakers are open"
+        raise ProviderError(msg)
+
+    async def _attempt(
+        self, state: _TargetState, messages: list[dict[str, Any] | ChatCompletionMessage], kwargs: dict[str, Any]
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        target = state.target
+        state.requests += 1
+        start = time.perf_counter()
+        response: ChatCompletion | AsyncIterator[ChatCompletionChunk] | None = None
+        try:
+            with _acquire_cached_provider(state.provider, target.api_key, target.api_base, target.client_args) as lease:
+                async with asyncio.timeout(self.timeout):
+                    response = lease.hold(
+                        await lease.provider.acompletion(model=state.model_name, messages=messages, **kwargs)
+                    )
+                    if isinstance(response, ChatCompletion):
+                        first_chunk = None
+                    else:
+                        first_chunk = await anext(response, None)
+        except BaseException as e:
+            self._record_outcome(state, e)
+            if response is not None:
+                # The stream opened before the failure, e.g. a hedge cancelled while it waited for its first chunk.
+                with contextlib.suppress(Exception):
+                    await _aclose(response)
+            raise
+
+        state.latencies.append(time.perf_counter() - start)
+        if isinstance(response, ChatCompletion):
+            self._record_outcome(state, None)
+            return response
+        # The outcome of a stream is only known once it ends.
+        return _RoutedStream(response, first_chunk, functools.partial(self._record_outcome, state))
+
+    async def _hedged_attempt(
+        self,
+        hedge: HedgePolicy,
+        primary: _TargetState,
+        remaining: list[_TargetState],
+        messages: list[dict[str, Any] | ChatCompletionMessage],
+        kwargs: dict[str, Any],
+    ) -> ChatCompletion | AsyncIterator[ChatCompletionChunk]:
+        self.hedge_stats.requests += 1
+        delay = hedge.delay
+        if delay is None:
+            percentile = primary.percentile(hedge.percentile)
+            if percentile is None:
+                # Without latency data there is no way to tell a slow request from a normal one.
+                return await self._attempt(primary, messages, kwargs)
+            delay = max(percentile, hedge.min_delay)
+
+        primary_task = asyncio.create_task(self._attempt(primary, messages, kwargs))
+        pending: set[asyncio.Task[ChatCompletion | AsyncIterator[ChatCompletionChunk]]] = {primary_task}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return primary_task.result()
+            if self.hedge_stats.fired >= hedge.max_extra_ratio * self.hedge_stats.requests:
+                self.hedge_stats.over_budget += 1
+                return await primary_task
+
+            hedge_state = next((state for state in remaining if state.breaker.allow_request()), primary)
+            if hedge_state is not primary:
+                remaining.remove(hedge_state)
+            self.hedge_stats.fired += 1
+            logger.debug("Hedging request to %s after %.3fs", hedge_state.target.model, delay)
+            hedge_task = asyncio.create_task(self._attempt(hedge_state, messages, kwargs))
+            pending.add(hedge_task)
+
+            errors: list[BaseException] = []
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((task for task in done if task.exception() is None), None)
+                for task in done - {winner}:
+                    task_error = task.exception()
+                    if task_error is None:
+                        # Both answered at once: close the stream that lost.
+                        await _aclose(task.result())
+                    else:
+                        errors.append(task_error)
+                if winner is not None:
+                    if winner is hedge_task:
+                        self.hedge_stats.won += 1
+                    return winner.result()
+                last_error = errors[-1]
+                if not isinstance(last_error, Exception) or isinstance(
+                    convert_exception(last_error, primary.provider.value), _NON_RETRYABLE_ERRORS
+                ):
+                    # The other request would fail the same way.
+                    break
+            raise errors[-1]
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def _record_outcome(self, state: _TargetState, error: BaseException | None) -> None:
+        if error is None:
+            state.outcomes.append(True)
+            state.breaker.record_success()
+        elif isinstance(error, Exception):
+            self._record_failure(state, error)
+        else:
+            # Cancelled: the target is neither at fault nor proven healthy.
+            state.breaker.release()
+
+    def _record_failure(self, state: _TargetState, error: Exception) -> None:
+        converted = convert_exception(error, state.provider.value)
+        if isinstance(converted, _NON_RETRYABLE_ERRORS):
+            # The request was at fault, not the target.
+            state.breaker.release()
+            return
+        state.outcomes.append(False)
+        if isinstance(converted, ProviderError | RateLimitError):
+            state.breaker.record_failure()
+        else:
+            state.breaker.release()
@@ -2,23 +2,86 @@
 
 from __future__ import annotations
 
+import copy
 import dataclasses
 import enum
+import functools
 import inspect
 import types as _types
-from collections.abc import Callable, Mapping, Sequence
+import weakref
+from collections.abc import Callable, Iterator, Mapping, Sequence
 from datetime import date, datetime, time
 from typing import Annotated as _Annotated
-from typing import Any, get_args, get_origin, get_type_hints
+from typing import Any, NoReturn, get_args, get_origin, get_type_hints
 from typing import Literal as _Literal
 
 from pydantic import BaseModel as PydanticBaseModel
 from typing_extensions import is_typeddict as _is_typeddict
 
+TYPE_SCHEMA_CACHE_SIZE = 1024
+"""Number of type annotations whose JSON Schema is kept by `_python_type_to_json_schema`."""
+
+# Tool definitions are keyed by function identity and evicted when the function is garbage collected.
+# Bound methods are created on every attribute access, so they are keyed by their underlying function.
+_tool_cache: weakref.WeakKeyDictionary[Callable[..., Any], dict[str, Any]] = weakref.WeakKeyDictionary()
+_bound_method_tool_cache: weakref.WeakKeyDictionary[Callable[..., Any], dict[str, Any]] = weakref.WeakKeyDictionary()
+
+
+_READ_ONLY_MESSAGE = "Tool definitions shared with the tool cache can't be modified: modify a copy (copy.deepcopy)"
+
+
+class _ReadOnlyDict(dict[str, Any]):
+    """A dict of a cached tool definition, which raises on modification. Its copies are plain dicts."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class _ReadOnlyList(list[Any]):
+    """A list of a cached tool definition, which raises on modification. Its copies are plain lists."""
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(_READ_ONLY_MESSAGE)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def _read_only(value: Any) -> Any:
+    """Return a read-only copy of the dicts and lists of a JSON value."""
+    if isinstance(value, dict):
+        return _ReadOnlyDict({key: _read_only(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return _ReadOnlyList(_read_only(item) for item in value)
+    return value
+
 
 def callable_to_tool(func: Callable[..., Any]) -> dict[str, Any]:
     """Convert a Python callable to OpenAI tools format.
 
+    The conversion is cached per function, so converting the same function again is cheap.
+
     Args:
         func: A Python callable (function) to convert to a tool
 
@@ -37,6 +100,36 @@ def callable_to_tool(func: Callable[..., Any]) -> dict[str, Any]:
         >>> # Returns OpenAI tools format dict
 
     """
+    # Callers may modify the returned dict: don't hand out the cached one.
+    return copy.deepcopy(_cached_tool(func))
+
+
+def _cached_tool(func: Callable[..., Any]) -> dict[str, Any]:
+    """Return the tool definition of `func`, converting it on a cache miss.
+
+    Cached definitions are shared by every caller: they are read-only, so that a provider adapting
+    the schema in place can't change it for later requests.
+    """
+    if inspect.ismethod(func):
+        cache, key = _bound_method_tool_cache, func.__func__
+    else:
+        cache, key = _tool_cache, func
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Neither weak-referenceable nor hashable, e.g. some builtins and callable instances.
+        return _build_tool(func)
+    tool: dict[str, Any] = _read_only(_build_tool(func))
+    try:
+        cache[key] = tool
+    except TypeError:
+        pass
+    return tool
+
+
+def _build_tool(func: Callable[..., Any]) -> dict[str, Any]:
     if not func.__doc__:
         msg = f"Function {func.__name__} must have a docstring"
         raise ValueError(msg)
@@ -76,6 +169,8 @@ def callable_to_tool(func: Callable[..., Any]) -> dict[str, Any]:
 def _python_type_to_json_schema(python_type: Any) -> dict[str, Any]:
     """Convert Python type annotation to a JSON Schema for a parameter.
 
+    Schemas are cached per (hashable) type and shared: callers must not modify them.
+
     Supported mappings (subset tailored for LLM tool schemas):
     - Primitives: str/int/float/bool -> string/integer/number/boolean
     - bytes -> string with contentEncoding base64
@@ -93,6 +188,19 @@ def _python_type_to_json_schema(python_type: Any) -> dict[str, Any]:
     - TypedDict -> object with properties/required per annotations
     - dataclass/Pydantic BaseModel -> object with nested properties inferred from fields
     """
+    try:
+        return _cached_type_schema(python_type)
+    except TypeError:
+        # Unhashable annotation, e.g. Annotated with a dict as metadata.
+        return _build_type_schema(python_type)
+
+
+@functools.lru_cache(maxsize=TYPE_SCHEMA_CACHE_SIZE)
+def _cached_type_schema(python_type: Any) -> dict[str, Any]:
+    return _build_type_schema(python_type)
+
+
+def _build_type_schema(python_type: Any) -> dict[str, Any]:
     origin = get_origin(python_type)
     args = get_args(python_type)
 
@@ -241,8 +349,11 @@ def prepare_tools(
 ) -> list[dict[str, Any] | Any]:
     """Prepare tools for completion API by converting callables to OpenAI format.
 
+    Converted callables are shared with the tool cache and read-only: modifying them raises a `TypeError`.
+
     Args:
-        tools: List of tools, can be mix of callables and already formatted tool dicts
+        tools: List of tools, can be mix of callables and already formatted tool dicts,
+            or a [ToolSet][any_llm.tools.ToolSet], which is returned as a list without any conversion
         built_in_tools: Optional list of built-in tool instances to include as-is
             For example, in `gemini` provider, you can pass `types.Tool(google_search=types.GoogleSearch())`.
 
@@ -258,13 +369,16 @@ def prepare_tools(
         >>> # Returns list of OpenAI format tool dicts
 
     """
+    if isinstance(tools, ToolSet):
+        return list(tools.definitions)
+
     prepared_tools = []
 
     for tool in tools:
         if built_in_tools and any(isinstance(tool, b) for b in built_in_tools):
             prepared_tools.append(tool)
         elif callable(tool):
-            prepared_tools.append(callable_to_tool(tool))
+            prepared_tools.append(_cached_tool(tool))
         elif isinstance(tool, dict):
             prepared_tools.append(tool)
         else:
@@ -272,3 +386,46 @@ def prepare_tools(
             raise ValueError(msg)
 
     return prepared_tools
+
+
+class ToolSet(Sequence[dict[str, Any]]):
+    """A list of tools converted to OpenAI format once, to pass as `tools=` on every request.
+
+    Agent loops send the same tools on every turn: a `ToolSet` skips their conversion and
+    keeps the callables at hand to run the tool calls the model makes.
+
+    Example:
+        >>> toolset = ToolSet([get_weather, search_docs])
+        >>> response = completion(model="openai:gpt-4.1-mini", messages=messages, tools=toolset)
+        >>> call = response.choices[0].message.tool_calls[0]
+        >>> result = toolset.functions[call.function.name](**json.loads(call.function.arguments))
+
+    """
+
+    def __init__(self, tools: Sequence[dict[str, Any] | Callable[..., Any] | Any]) -> None:
+        """Convert `tools` (callables, OpenAI tool dicts or provider built-in tools, kept as-is)."""
+        self.definitions: list[dict[str, Any] | Any] = []
+        """The tools in OpenAI format. Converted callables are shared with the tool cache and read-only."""
+        self.functions: dict[str, Callable[..., Any]] = {}
+        """The callables of the tool set, by tool name."""
+        for tool in tools:
+            if isinstance(tool, dict):
+                self.definitions.append(tool)
+            elif callable(tool):
+                definition = _cached_tool(tool)
+                self.definitions.append(definition)
+                self.functions[definition["function"]["name"]] = tool
+            else:
+                self.definitions.append(tool)
+
+    def __len__(self) -> int:
+        """Return the number of tools."""
+        return len(self.definitions)
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        """Iterate over the tool definitions."""
+        return iter(self.definitions)
+
+    def __getitem__(self, index: Any) -> Any:
+        """Return the tool definition(s) at `index`."""
+        return self.definitions[index]
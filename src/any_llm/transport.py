@@ -0,0 +1,317 @@
+"""Shared HTTP transport settings for the SDK clients of the providers.
+
+Each provider SDK creates its own HTTP client with its own connection limits and timeouts, and
+each has a different argument to replace it (`http_client`, `httpx_client`, `async_client`, ...).
+A [TransportConfig][any_llm.transport.TransportConfig] describes the connection pool once, and
+every provider whose SDK uses `httpx` builds its client from it:
+
+```python
+from any_llm import AnyLLM
+from any_llm.transport import TransportConfig, set_default_transport
+
+transport = TransportConfig(max_connections=200, http2=True, read_timeout=120, dns_cache_ttl=300)
+llm = AnyLLM.create("anthropic", transport=transport)
+
+# Or for every provider created without a `transport` argument:
+set_default_transport(transport)
+```
+
+With `share_connections` (the default), providers pointing at the same host share one connection
+pool, so several providers (or several instances of one) don't open redundant sockets. Each
+provider still gets its own `httpx.AsyncClient`, because SDKs close their client when they are
+closed: closing it leaves the shared pool open for the others. Connection pools are bound to the
+event loop they are used on, so a shared pool is created for each event loop it is used from:
+requests made from `asyncio.run` calls, or from the loop running the sync API, don't share
+connections. Close the shared pools with
+[aclose_shared_transports][any_llm.transport.aclose_shared_transports].
+
+Environment proxy variables are not read by clients built from a `TransportConfig`: set `proxy`
+instead. Providers whose SDK doesn't use `httpx` (Bedrock, SageMaker, Azure, HuggingFace, Voyage,
+watsonx, xAI) ignore the transport settings.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+import sys
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self
+
+import httpcore
+import httpx
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from types import ModuleType
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """Connection pool and timeout settings of the providers' HTTP clients.
+
+    The defaults match the OpenAI and Anthropic SDKs.
+    """
+
+    max_connections: int | None = 1000
+    """Maximum number of open connections. None for no limit."""
+
+    max_keepalive_connections: int | None = 100
+    """Maximum number of idle connections kept open. None for no limit."""
+
+    keepalive_expiry: float | None = 5.0
+    """Seconds an idle connection is kept open."""
+
+    http2: bool = False
+    """Negotiate HTTP/2 with hosts that support it. Requires `pip install httpx[http2]`."""
+
+    connect_timeout: float | None = 5.0
+    """Seconds to wait for a connection to be established."""
+
+    read_timeout: float | None = 600.0
+    """Seconds to wait for data from the server. Also used for writes and to wait for a pool connection."""
+
+    dns_cache_ttl: float | None = None
+    """Seconds DNS resolutions are cached for. None resolves host names on every new connection."""
+
+    proxy: str | None = None
+    """URL of an HTTP or SOCKS proxy."""
+
+    share_connections: bool = True
+    """Share one connection pool between the providers pointing at the same host."""
+
+    def limits(self) -> httpx.Limits:
+        """Return the connection limits as `httpx.Limits`."""
+        limits: httpx.Limits = _limits(self, httpx)
+        return limits
+
+    def timeout(self) -> httpx.Timeout:
+        """Return the timeouts as `httpx.Timeout`."""
+        timeout: httpx.Timeout = _timeout(self, httpx)
+        return timeout
+
+    def create_transport(self, client_class: type[Any] = httpx.AsyncClient) -> Any:
+        """Create a new connection pool with these settings, for clients of type `client_class`."""
+        http = _http_module(client_class)
+        transport = http.AsyncHTTPTransport(limits=_limits(self, http), http2=self.http2, proxy=self.proxy)
+        if self.dns_cache_ttl is not None:
+            # httpx doesn't expose the network backend of its connection pool.
+            pool = transport._pool
+            pool._network_backend = CachingDNSBackend(self.dns_cache_ttl, pool._network_backend)
+        return transport
+
+    def client_kwargs(self, base_url: str | None = None, client_class: type[Any] = httpx.AsyncClient) -> dict[str, Any]:
+        """Return the `transport` and `timeout` arguments of a client of type `client_class` with these settings.
+
+        Args:
+            base_url: URL of the API the client sends requests to. With `share_connections`,
+                clients for the same host share a connection pool.
+            client_class: `httpx.AsyncClient`, or the client class of an SDK (some SDKs use a fork of httpx).
+
+        """
+        if self.share_connections:
+            transport = _shared_transport(self, _host(base_url), client_class)
+        else:
+            transport = self.create_transport(client_class)
+        return {"transport": transport, "timeout": _timeout(self, _http_module(client_class))}
+
+    def async_client(
+        self, base_url: str | None = None, client_class: type[Any] = httpx.AsyncClient, **kwargs: Any
+    ) -> Any:
+        """Create a client of type `client_class` with these settings.
+
+        Args:
+            base_url: URL of the API the client sends requests to, see `client_kwargs`.
+            client_class: `httpx.AsyncClient`, or the client class of an SDK (e.g. `DefaultAsyncHttpxClient`).
+            **kwargs: Additional arguments of the client, overriding these settings.
+
+        """
+        return client_class(**{**self.client_kwargs(base_url, client_class), **kwargs})
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend caching the addresses host names resolve to for `ttl` seconds."""
+
+    def __init__(self, ttl: float, backend: httpcore.AsyncNetworkBackend | None = None) -> None:
+        """Wrap `backend`, defaulting to the backend httpx uses."""
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._addresses: dict[tuple[str, int], tuple[float, list[str]]] = {}
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,  # noqa: ASYNC109
+        local_address: str | None = None,
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to the first reachable address of `host`.
+
+        TLS still verifies the certificate against the host name, which httpcore passes to `start_tls`.
+        """
+        addresses = await self._resolve(host, port)
+        error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except Exception as e:
+                error = e
+        # Resolve the host name again on the next connection in case its addresses changed.
+        self._addresses.pop((host, port), None)
+        assert error is not None
+        raise error
+
+    async def connect_unix_socket(
+        self,
+        path: str,
+        timeout: float | None = None,  # noqa: ASYNC109
+        socket_options: Iterable[httpcore.SOCKET_OPTION] | None = None,
+    ) -> httpcore.AsyncNetworkStream:
+        """Connect to a Unix socket."""
+        return await self._backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        """Sleep for `seconds`."""
+        await self._backend.sleep(seconds)
+
+    async def _resolve(self, host: str, port: int) -> list[str]:
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return [host]
+
+        cached = self._addresses.get((host, port))
+        now = time.monotonic()
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            # Let the backend resolve the host name, and raise the error httpx expects.
+            return [host]
+        addresses = list(dict.fromkeys(str(info[4][0]) for info in infos))
+        self._addresses[host, port] = (now + self.ttl, addresses)
+        return addresses
+
+
+class _SharedTransport:
+    """A connection pool used by several clients, which stays open when one of them is closed.
+
+    httpcore pools can only be used from the event loop they were first used on: one pool is
+    created for each event loop sending requests.
+    """
+
+    def __init__(self, config: TransportConfig, client_class: type[Any]) -> None:
+        self._config = config
+        self._client_class = client_class
+        self._pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def pool(self) -> Any:
+        """Return the connection pool of the running event loop, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                for closed_loop in [other for other in self._pools if other.is_closed()]:
+                    # Its connections died with the loop.
+                    del self._pools[closed_loop]
+                pool = self._pools[loop] = self._config.create_transport(self._client_class)
+            return pool
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        pass
+
+    async def handle_async_request(self, request: Any) -> Any:
+        return await self.pool().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+    async def aclose_pools(self) -> None:
+        """Close the pool of the running event loop, and schedule closing those of other running loops."""
+        with self._lock:
+            pools = list(self._pools.items())
+            self._pools.clear()
+        running_loop = asyncio.get_running_loop()
+        for loop, pool in pools:
+            if loop is running_loop:
+                await pool.aclose()
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(pool.aclose(), loop)
+
+
+_shared_transports: dict[tuple[TransportConfig, str, str], _SharedTransport] = {}
+_shared_transports_lock = threading.Lock()
+_default_transport: TransportConfig | None = None
+
+
+def _http_module(client_class: type[Any]) -> ModuleType:
+    """Return `httpx`, or the fork of httpx `client_class` is built on."""
+    for cls in client_class.__mro__:
+        if cls.__name__ == "AsyncClient":
+            return sys.modules[cls.__module__.partition(".")[0]]
+    msg = f"{client_class.__name__} is not an httpx AsyncClient"
+    raise TypeError(msg)
+
+
+def _limits(config: TransportConfig, http: ModuleType) -> Any:
+    return http.Limits(
+        max_connections=config.max_connections,
+        max_keepalive_connections=config.max_keepalive_connections,
+        keepalive_expiry=config.keepalive_expiry,
+    )
+
+
+def _timeout(config: TransportConfig, http: ModuleType) -> Any:
+    return http.Timeout(config.read_timeout, connect=config.connect_timeout)
+
+
+def _host(base_url: str | None) -> str:
+    if not base_url:
+        return ""
+    if "://" not in base_url:
+        # A provider name, for SDKs whose default URL isn't known.
+        return base_url
+    url = httpx.URL(base_url)
+    return f"{url.host}:{url.port}" if url.port else url.host
+
+
+def _shared_transport(config: TransportConfig, host: str, client_class: type[Any]) -> _SharedTransport:
+    key = (config, _http_module(client_class).__name__, host)
+    with _shared_transports_lock:
+        transport = _shared_transports.get(key)
+        if transport is None:
+            transport = _SharedTransport(config, client_class)
+            _shared_transports[key] = transport
+        return transport
+
+
+async def aclose_shared_transports() -> None:
+    """Close the connection pools shared between providers. New clients will open new pools."""
+    with _shared_transports_lock:
+        transports = list(_shared_transports.values())
+        _shared_transports.clear()
+    for transport in transports:
+        await transport.aclose_pools()
+
+
+def set_default_transport(transport: TransportConfig | None) -> None:
+    """Set the transport settings of every provider created without a `transport` argument. None disables them."""
+    global _default_transport  # noqa: PLW0603
+    _default_transport = transport
+
+
+def get_default_transport() -> TransportConfig | None:
+    """Return the settings set with [set_default_transport][any_llm.transport.set_default_transport]."""
+    return _default_transport
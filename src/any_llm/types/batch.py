@@ -1,7 +1,61 @@
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Any
+
 from openai.types import Batch as OpenAIBatch
 from openai.types.batch_request_counts import BatchRequestCounts as OpenAIBatchRequestCounts
 
+from any_llm.types.completion import ChatCompletion, CreateEmbeddingResponse
+
 # Right now it's a direct copy but I'll re-export them here,
 #  so that if we need to expand them in the future, people won't need to update their imports
 Batch = OpenAIBatch
 BatchRequestCounts = OpenAIBatchRequestCounts
+
+
+@dataclass
+class BatchResult:
+    """The result of one request of a batch, yielded by `AnyLLM.aiter_batch_results`.
+
+    The response body is kept as parsed JSON and only validated when `completion` or `embedding` is accessed.
+    """
+
+    custom_id: str
+    """The `custom_id` of the request in the batch input file"""
+
+    body: dict[str, Any] | None = None
+    """The response body, if the request succeeded"""
+
+    error: dict[str, Any] | None = None
+    """The error (`code` and `message`), if the request failed"""
+
+    status_code: int | None = None
+    """The HTTP status code of the response, if any"""
+
+    @classmethod
+    def from_line(cls, line: dict[str, Any]) -> "BatchResult":
+        """Create a result from a line of a batch output or error file."""
+        response = line.get("response") or {}
+        body = response.get("body")
+        error = line.get("error")
+        status_code = response.get("status_code")
+        if error is None and status_code is not None and status_code >= 400:
+            error = (body or {}).get("error") or {"code": str(status_code), "message": "Request failed"}
+            body = None
+        return cls(custom_id=line["custom_id"], body=body, error=error, status_code=status_code)
+
+    @cached_property
+    def completion(self) -> ChatCompletion:
+        """The response of a `/v1/chat/completions` request."""
+        if self.body is None:
+            msg = f"Request {self.custom_id} failed: {self.error}"
+            raise ValueError(msg)
+        return ChatCompletion.model_validate(self.body)
+
+    @cached_property
+    def embedding(self) -> CreateEmbeddingResponse:
+        """The response of a `/v1/embeddings` request."""
+        if self.body is None:
+            msg = f"Request {self.custom_id} failed: {self.error}"
+            raise ValueError(msg)
+        return CreateEmbeddingResponse.model_validate(self.body)
@@ -1,4 +1,5 @@
-from typing import Any, Literal
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Literal
 
 from openai.types import CreateEmbeddingResponse as OpenAICreateEmbeddingResponse
 from openai.types.chat.chat_completion import ChatCompletion as OpenAIChatCompletion
@@ -23,6 +24,10 @@ from openai.types.create_embedding_response import Usage as OpenAIUsage
 from openai.types.embedding import Embedding as OpenAIEmbedding
 from pydantic import BaseModel, ConfigDict, field_validator
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
 # See https://github.com/mozilla-ai/any-llm/issues/95:
 # OpenAI Completion API doesn't include reasoning information, so we need to extend the openai type
 
@@ -46,6 +51,12 @@ class ChatCompletion(OpenAIChatCompletion):
 
 class ChoiceDelta(OpenAIChoiceDelta):
     reasoning: Reasoning | None = None
+    parsed: Any | None = None
+    """With `stream=True` and a pydantic `response_format`, the object parsed from the content streamed so far.
+
+    A partial instance (every field optional) while streaming, then a complete `response_format` instance
+    in the chunk finishing the choice. See [any_llm.utils.structured_output][any_llm.utils.structured_output].
+    """
 
 
 class ChunkChoice(OpenAIChunkChoice):
@@ -79,6 +90,24 @@ Usage = OpenAIUsage
 ChoiceDeltaToolCall = OpenAIChoiceDeltaToolCall
 ChoiceDeltaToolCallFunction = OpenAIChoiceDeltaToolCallFunction
 
+
+@dataclass
+class EmbeddingBatch:
+    """The embeddings of one batch of inputs, yielded by `AnyLLM.aembedding_many`.
+
+    A dataclass rather than a pydantic model, so large batches are not validated float by float.
+    """
+
+    index: int
+    """Position of the first input of the batch in the inputs passed to `aembedding_many`"""
+
+    embeddings: "list[list[float]] | npt.NDArray[np.float32]"
+    """One vector per input, or a float32 matrix of shape `(batch_size, dimensions)` with `as_numpy=True`"""
+
+    usage: Usage | None = None
+    """Token usage reported by the provider for this batch"""
+
+
 ReasoningEffort = Literal["none", "minimal", "low", "medium", "high", "auto"]
 
 
@@ -1,4 +1,5 @@
 import re
+from dataclasses import dataclass
 
 from pydantic import BaseModel, field_validator
 
@@ -32,3 +33,31 @@ class PlatformKey(BaseModel):
             msg = "Invalid API key format. Must match the pattern: ANY.<version>.<kid>.<fingerprint>-<base64_key>."
             raise ValueError(msg)
         return value
+
+
+@dataclass
+class WarmupResult:
+    """Timings of the warm-up of a provider, returned by `AnyLLM.awarmup` and `any_llm.api.awarmup`."""
+
+    provider: str
+    """The name of the provider"""
+
+    create_seconds: float | None = None
+    """Time spent importing the provider and building its SDK client, if it was created for the warm-up"""
+
+    preload_seconds: float = 0.0
+    """Time spent importing the modules the SDK client only imports on first use"""
+
+    connect_seconds: float = 0.0
+    """Time spent opening the connections"""
+
+    connections: int = 0
+    """Number of warm-up requests that succeeded, each leaving a connection open in the client's pool"""
+
+    error: Exception | None = None
+    """The error that interrupted the warm-up, if any"""
+
+    @property
+    def total_seconds(self) -> float:
+        """Total time of the warm-up."""
+        return (self.create_seconds or 0.0) + self.preload_seconds + self.connect_seconds
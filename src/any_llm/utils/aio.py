@@ -3,7 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
 import concurrent.futures
+import contextlib
+import os
+import threading
 from typing import TYPE_CHECKING, Any, TypeVar
 
 T = TypeVar("T")
@@ -11,13 +15,83 @@ T = TypeVar("T")
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator, Coroutine, Iterator
 
+DEFAULT_THREAD_STREAM_BUFFER = 32
+"""Number of items a worker thread may read ahead of the consumer in `iterate_in_thread`."""
+
+_STOP_POLL_INTERVAL = 0.05
+_STREAM_DONE = object()
+
+
+class _BackgroundLoop:
+    """A long-lived event loop running in a daemon thread.
+
+    The sync API submits every coroutine to this loop, so SDK clients and open streams
+    always live on the same loop instead of a fresh one per call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        """Return the running background loop, starting it if needed (e.g. after a fork)."""
+        loop = self._loop
+        if loop is not None and self._pid == os.getpid() and loop.is_running():
+            return loop
+
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid() or not self._loop.is_running():
+                return self._start_locked()
+            return self._loop
+
+    def _start_locked(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=run, name="any-llm-event-loop", daemon=True)
+        thread.start()
+        started.wait()
+
+        self._loop = loop
+        self._thread = thread
+        self._pid = os.getpid()
+        return loop
+
+    def stop(self) -> None:
+        """Stop the loop and wait for its thread to exit."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None or self._pid != os.getpid():
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=1)
+
+
+_background_loop = _BackgroundLoop()
+atexit.register(_background_loop.stop)
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """Return the process-wide event loop used by the synchronous API."""
+    return _background_loop.get()
+
 
 def run_async_in_sync(coro: Coroutine[Any, Any, T], allow_running_loop: bool = True) -> T:
     """Run an async coroutine in a synchronous context.
 
-    Handles different event loop scenarios:
-    - If a loop is running, uses threading to avoid conflicts
-    - If no loop exists, creates one or uses the current loop
+    The coroutine is submitted to a persistent background event loop (see
+    [get_background_loop][any_llm.utils.aio.get_background_loop]) and the calling thread
+    blocks until it completes. This works whether or not the caller already has a running
+    event loop (e.g. Jupyter, Streamlit or a sync FastAPI handler), and background tasks
+    started by the coroutine keep running after it returns.
 
     Args:
         coro: The coroutine to execute
@@ -28,67 +102,128 @@ def run_async_in_sync(coro: Coroutine[Any, Any, T], allow_running_loop: bool = T
 
     """
     try:
-        # Check if there's a running event loop
-        asyncio.get_running_loop()
-        running_loop = True
+        running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
     except RuntimeError:
-        running_loop = False
-
-    if running_loop:
-        if not allow_running_loop:
-            msg = "Cannot use the `sync` API in an `async` context. Use the `async` API instead."
-            raise RuntimeError(msg)
-
-        # If we get here, there's a loop running, so we can't use run_until_complete()
-        # or asyncio.run() - must use threading approach
-        def run_in_thread() -> T:
-            async def run_with_cleanup() -> T:
-                try:
-                    result = await coro
-
-                    # Wait for any pending background tasks to complete to prevent "Event loop is closed" errors
-                    pending_tasks = [
-                        task for task in asyncio.all_tasks() if not task.done() and task is not asyncio.current_task()
-                    ]
-
-                    if pending_tasks:
-                        await asyncio.gather(*pending_tasks, return_exceptions=True)
-                except Exception:
-                    pending_tasks = [
-                        task for task in asyncio.all_tasks() if not task.done() and task is not asyncio.current_task()
-                    ]
-
-                    for task in pending_tasks:
-                        task.cancel()
-
-                    if pending_tasks:
-                        await asyncio.gather(*pending_tasks, return_exceptions=True)
-
-                    raise
-                return result
-
-            return asyncio.run(run_with_cleanup())
-
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            return executor.submit(run_in_thread).result()
-    else:
-        # No running event loop - try to get available loop
-        try:
-            loop = asyncio.get_event_loop()
-            return loop.run_until_complete(coro)
-        except RuntimeError:
-            # No event loop at all - create one
-            return asyncio.run(coro)
+        running_loop = None
 
+    if running_loop is not None and not allow_running_loop:
+        coro.close()
+        msg = "Cannot use the `sync` API in an `async` context. Use the `async` API instead."
+        raise RuntimeError(msg)
 
-def async_iter_to_sync_iter(async_iter: AsyncIterator[T]) -> Iterator[T]:
-    """Convert async iterable to sync iterable using a generator approach."""
-    while True:
-        try:
+    loop = get_background_loop()
+    if running_loop is loop:
+        # Blocking the background loop on itself would deadlock, run on a throwaway loop instead.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        # e.g. KeyboardInterrupt while waiting: don't leave the coroutine running unattended.
+        future.cancel()
+        raise
+
+
+def async_iter_to_sync_iter(async_iter: AsyncIterator[T], allow_running_loop: bool = True) -> Iterator[T]:
+    """Convert async iterable to sync iterable.
+
+    Every `__anext__` call runs on the background event loop, so the async iterator stays on
+    one loop for its whole life. If the sync iterator is closed before the stream is exhausted,
+    the async iterator is closed on that loop as well.
+
+    Args:
+        async_iter: The async iterator to consume
+        allow_running_loop: Whether to raise an error if iterated within a running event loop.
+
+    """
+    exhausted = False
+    try:
+        while True:
             awaitable = async_iter.__anext__()
             if not asyncio.iscoroutine(awaitable):
                 msg = "awaitable is not a coroutine"
                 raise ValueError(msg)
-            yield run_async_in_sync(awaitable)
-        except StopAsyncIteration:
-            break
+            try:
+                item = run_async_in_sync(awaitable, allow_running_loop=allow_running_loop)
+            except StopAsyncIteration:
+                exhausted = True
+                break
+            yield item
+    finally:
+        aclose = getattr(async_iter, "aclose", None)
+        if not exhausted and aclose is not None:
+            with contextlib.suppress(Exception):
+                run_async_in_sync(aclose())
+
+
+async def iterate_in_thread(
+    iterator: Iterator[T], max_buffered: int = DEFAULT_THREAD_STREAM_BUFFER
+) -> AsyncIterator[T]:
+    """Consume a blocking iterator in a worker thread, yielding its items on the running event loop.
+
+    This is how providers built on blocking SDKs (e.g. boto3 event streams) stream without doing
+    network I/O on the loop thread. Items are passed through a bounded `asyncio.Queue`: once
+    `max_buffered` items are waiting, the worker blocks until the consumer catches up. Exceptions
+    raised by the iterator are re-raised to the consumer. If the consumer stops early (`aclose`,
+    cancellation or garbage collection), the worker stops after the item it is reading and closes
+    the iterator.
+
+    Args:
+        iterator: The blocking iterator to consume. It is only ever advanced from the worker thread.
+        max_buffered: Maximum number of items read ahead of the consumer.
+
+    """
+    if max_buffered < 1:
+        msg = "max_buffered must be at least 1"
+        raise ValueError(msg)
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[tuple[bool, Any]] = asyncio.Queue(maxsize=max_buffered)
+    stopped = threading.Event()
+
+    def put(is_final: bool, value: Any) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put((is_final, value)), loop)
+        except RuntimeError:
+            # The loop is closed, nobody is listening anymore.
+            return False
+        while not stopped.is_set():
+            try:
+                future.result(timeout=_STOP_POLL_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                continue
+            except concurrent.futures.CancelledError:
+                return False
+            return True
+        future.cancel()
+        return False
+
+    def pump() -> None:
+        try:
+            for item in iterator:
+                if not put(False, item):
+                    return
+        except BaseException as e:
+            put(True, e)
+            return
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                with contextlib.suppress(Exception):
+                    close()
+        put(True, _STREAM_DONE)
+
+    threading.Thread(target=pump, name="any-llm-stream", daemon=True).start()
+    try:
+        while True:
+            is_final, value = await queue.get()
+            if not is_final:
+                yield value
+            elif value is _STREAM_DONE:
+                return
+            else:
+                raise value
+    finally:
+        stopped.set()
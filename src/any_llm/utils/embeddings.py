@@ -0,0 +1,165 @@
+"""Helpers for embedding large corpora in provider-sized batches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterable
+from typing import TYPE_CHECKING, Any, cast
+
+from any_llm.types.completion import EmbeddingBatch
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+
+    import numpy as np
+    import numpy.typing as npt
+
+    from any_llm.types.completion import CreateEmbeddingResponse
+
+DEFAULT_EMBEDDING_CONCURRENCY = 4
+
+CHARS_PER_TOKEN = 4
+"""Rough characters-per-token ratio used to estimate the size of a batch without a tokenizer."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of `text`."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+async def _aiter_inputs(inputs: Iterable[str] | AsyncIterable[str]) -> AsyncIterator[str]:
+    if isinstance(inputs, AsyncIterable):
+        async for text in inputs:
+            yield text
+    else:
+        for text in inputs:
+            yield text
+
+
+async def aiter_embedding_batches(
+    inputs: Iterable[str] | AsyncIterable[str],
+    max_batch_size: int,
+    max_batch_tokens: int | None = None,
+) -> AsyncIterator[tuple[int, list[str]]]:
+    """Split `inputs` into batches of at most `max_batch_size` texts and about `max_batch_tokens` tokens.
+
+    A text that is larger than `max_batch_tokens` on its own is sent in a batch of its own.
+
+    Yields:
+        Tuples of the index of the first text of the batch and the texts of the batch.
+
+    """
+    if max_batch_size < 1:
+        msg = "max_batch_size must be at least 1"
+        raise ValueError(msg)
+
+    start = 0
+    batch: list[str] = []
+    batch_tokens = 0
+    async for text in _aiter_inputs(inputs):
+        tokens = estimate_tokens(text)
+        if batch and max_batch_tokens is not None and batch_tokens + tokens > max_batch_tokens:
+            yield start, batch
+            start += len(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+        if len(batch) >= max_batch_size:
+            yield start, batch
+            start += len(batch)
+            batch, batch_tokens = [], 0
+    if batch:
+        yield start, batch
+
+
+def _to_embedding_batch(index: int, response: CreateEmbeddingResponse, as_numpy: bool) -> EmbeddingBatch:
+    vectors = [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+    embeddings: Any = vectors
+    if as_numpy:
+        numpy = _import_numpy()
+        embeddings = numpy.asarray(vectors, dtype=numpy.float32)
+    return EmbeddingBatch(index=index, embeddings=embeddings, usage=response.usage)
+
+
+async def aembed_in_batches(
+    embed: Callable[[list[str]], Awaitable[CreateEmbeddingResponse]],
+    inputs: Iterable[str] | AsyncIterable[str],
+    *,
+    max_batch_size: int,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int = DEFAULT_EMBEDDING_CONCURRENCY,
+    as_numpy: bool = False,
+) -> AsyncIterator[EmbeddingBatch]:
+    """Embed `inputs` with `embed`, running up to `max_concurrency` batches at a time.
+
+    Batches are yielded in input order as soon as they and every batch before them are done, even
+    while the next inputs are still being read.
+    At most `2 * max_concurrency` batches are read ahead of the consumer, so arbitrarily large
+    (async) iterables can be embedded in bounded memory.
+    """
+    if max_concurrency < 1:
+        msg = "max_concurrency must be at least 1"
+        raise ValueError(msg)
+    if as_numpy:
+        _import_numpy()
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(texts: list[str]) -> CreateEmbeddingResponse:
+        async with semaphore:
+            return await embed(texts)
+
+    batches = aiter_embedding_batches(inputs, max_batch_size, max_batch_tokens)
+    pending: deque[tuple[int, asyncio.Task[CreateEmbeddingResponse]]] = deque()
+    # Reading the next batch of a slow (async) iterable must not hold back the batches already done.
+    next_batch: asyncio.Future[tuple[int, list[str]]] | None = None
+    exhausted = False
+    try:
+        while pending or not exhausted:
+            if next_batch is None and not exhausted and len(pending) < 2 * max_concurrency:
+                next_batch = asyncio.ensure_future(anext(batches))
+            head = pending[0][1] if pending else None
+            waiting = [task for task in (next_batch, head) if task is not None]
+            await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if head is not None and head.done():
+                first_index, _ = pending.popleft()
+                yield _to_embedding_batch(first_index, head.result(), as_numpy)
+            if next_batch is not None and next_batch.done():
+                try:
+                    index, texts = next_batch.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending.append((index, asyncio.create_task(run(texts))))
+                next_batch = None
+    finally:
+        tasks: list[asyncio.Future[Any]] = [task for _, task in pending]
+        if next_batch is not None:
+            tasks.append(next_batch)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def stack_embeddings(batches: Iterable[EmbeddingBatch]) -> npt.NDArray[np.float32]:
+    """Collect embedding batches into one contiguous float32 matrix of shape `(n_inputs, dimensions)`.
+
+    Example:
+        >>> matrix = stack_embeddings(llm.embedding_many("text-embedding-3-small", texts, as_numpy=True))
+
+    """
+    numpy = _import_numpy()
+    arrays = [numpy.asarray(batch.embeddings, dtype=numpy.float32) for batch in batches]
+    matrix = numpy.concatenate(arrays, axis=0) if arrays else numpy.empty((0, 0), dtype=numpy.float32)
+    return cast("npt.NDArray[np.float32]", numpy.ascontiguousarray(matrix))
+
+
+def _import_numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as e:
+        msg = "numpy is required for `as_numpy=True`. Please install it with `pip install any-llm-sdk[numpy]`"
+        raise ImportError(msg) from e
+    return np
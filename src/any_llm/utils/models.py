@@ -0,0 +1,62 @@
+"""Build pydantic models on hot paths (e.g. one per streamed chunk) without validating them.
+
+Both helpers rely on one invariant: the values are already of the types the fields declare, e.g.
+objects built by a provider's SDK or by this package. Nothing is validated, converted or copied, so a
+value breaking the invariant is only noticed when the model is used or serialized.
+
+`model_construct` isn't used either: the OpenAI and Anthropic SDKs override it on their base models
+with a recursive implementation that is slower than validating.
+"""
+
+from __future__ import annotations
+
+import functools
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+_ModelT = TypeVar("_ModelT", bound=BaseModel)
+
+
+def construct_model(model_cls: type[_ModelT], **values: Any) -> _ModelT:
+    """Build a `model_cls` from `values`, with the defaults of the fields left out."""
+    instance = model_cls.__new__(model_cls)
+    object.__setattr__(instance, "__dict__", {**_field_defaults(model_cls), **values})
+    object.__setattr__(instance, "__pydantic_extra__", {})
+    object.__setattr__(instance, "__pydantic_fields_set__", set(values))
+    object.__setattr__(instance, "__pydantic_private__", None)
+    return instance
+
+
+def retype_model(source: BaseModel, model_cls: type[_ModelT]) -> _ModelT:
+    """Turn `source` into an instance of `model_cls` in place, and return it.
+
+    `model_cls` must be a subclass of the type of `source` that only adds optional fields. The added
+    fields are taken from the extra values of `source` if it has them, or set to their default.
+    """
+    values = source.__dict__
+    extra = source.__pydantic_extra__
+    for name, default in _added_field_defaults(model_cls, type(source)).items():
+        if name not in values:
+            values[name] = extra.pop(name, default) if extra else default
+    object.__setattr__(source, "__class__", model_cls)
+    return source  # type: ignore[return-value]
+
+
+@functools.cache
+def _field_defaults(model_cls: type[BaseModel]) -> dict[str, Any]:
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in model_cls.model_fields.items()
+        if not field.is_required()
+    }
+
+
+@functools.cache
+def _added_field_defaults(model_cls: type[BaseModel], source_cls: type[BaseModel]) -> dict[str, Any]:
+    """Defaults of the fields that `model_cls` declares on top of `source_cls`."""
+    return {
+        name: field.get_default(call_default_factory=True)
+        for name, field in model_cls.model_fields.items()
+        if name not in source_cls.model_fields
+    }
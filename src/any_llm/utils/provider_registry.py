@@ -0,0 +1,393 @@
+"""Process-wide cache of provider instances used by the `any_llm.api` functions."""
+
+# ruff: noqa: D107
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Self, TypeVar, cast
+
+from any_llm.logging import logger
+
+if TYPE_CHECKING:
+    import concurrent.futures
+    from collections.abc import Callable
+
+    from any_llm.any_llm import AnyLLM
+
+ANY_LLM_PROVIDER_CACHE_ENV = "ANY_LLM_PROVIDER_CACHE"
+
+DEFAULT_MAX_SIZE = 32
+DEFAULT_TTL_SECONDS = 3600.0
+
+RegistryKey = tuple[int, str, str | None, str | None, str]
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class _RegistryEntry:
+    provider: AnyLLM
+    loop: asyncio.AbstractEventLoop
+    created_at: float
+    leases: int = 0
+    evicted: bool = False
+
+
+class ProviderLease:
+    """A provider handed out by [ProviderRegistry.acquire][any_llm.utils.provider_registry.ProviderRegistry.acquire].
+
+    The registry doesn't close an evicted provider while it is leased. Use the lease as a context
+    manager around the calls made with `provider`, and pass a streamed response through
+    [hold][any_llm.utils.provider_registry.ProviderLease.hold] to keep the lease until the stream ends:
+
+    ```python
+    with provider_registry.acquire(...) as lease:
+        return lease.hold(await lease.provider.acompletion(..., stream=True))
+    ```
+    """
+
+    def __init__(self, provider: AnyLLM, release: Callable[[], None] | None = None) -> None:
+        self.provider = provider
+        self._release = release
+        self._released = False
+        self._held = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        """Release the lease. Calling it again has no effect."""
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        if self._release is not None:
+            self._release()
+
+    def hold(self, result: _T) -> _T:
+        """Keep the lease until `result` is exhausted or closed if it is a stream, and return it.
+
+        Other results are returned unchanged, and the lease is released when the context manager exits.
+        """
+        if not isinstance(result, AsyncIterator):
+            return result
+        self._held = True
+        return cast("_T", _LeasedStream(result, self))
+
+    def __enter__(self) -> Self:
+        """Return the lease."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Release the lease, unless a stream holds it."""
+        if not self._held:
+            self.release()
+
+
+class _LeasedStream:
+    """Stream releasing its lease once it is exhausted, fails or is closed."""
+
+    def __init__(self, stream: AsyncIterator[Any], lease: ProviderLease) -> None:
+        self._stream = stream
+        # A stream dropped without being consumed or closed releases the lease when collected.
+        self._release = weakref.finalize(self, lease.release)
+
+    def __aiter__(self) -> _LeasedStream:
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self._stream.__anext__()
+        except (StopAsyncIteration, Exception):
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        try:
+            close = getattr(self._stream, "aclose", None) or getattr(self._stream, "close", None)
+            if close is not None:
+                result = close()
+                if inspect.isawaitable(result):
+                    await result
+        finally:
+            self._release()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
+
+
+def _hash_api_key(api_key: str | None) -> str | None:
+    if api_key is None:
+        return None
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def _canonical_client_args(client_args: dict[str, Any] | None) -> str:
+    """Return a stable string for `client_args`.
+
+    Values that are not JSON serializable (e.g. a user supplied `http_client`) are
+    represented by their `repr`, so two calls only share a provider when they pass
+    the very same object.
+    """
+    if not client_args:
+        return ""
+    return json.dumps(client_args, sort_keys=True, default=repr)
+
+
+def _env_enabled() -> bool:
+    return os.environ.get(ANY_LLM_PROVIDER_CACHE_ENV, "1").lower() not in ("0", "false", "no", "off")
+
+
+class ProviderRegistry:
+    """LRU/TTL cache of provider instances.
+
+    SDK clients (`AsyncOpenAI`, `AsyncAnthropic`, `genai.Client`, ...) own an HTTP
+    connection pool that is bound to the event loop it was first used on. Entries
+    are therefore scoped to the running event loop: a provider is only reused by
+    calls made on the same loop, and entries belonging to closed loops are dropped.
+
+    Evicted providers are closed with [AnyLLM.aclose][any_llm.any_llm.AnyLLM.aclose]
+    on the loop that owns them. A provider handed out by `acquire` is only closed once
+    every lease on it is released, so eviction never breaks a request in flight.
+
+    The cache can be disabled globally by setting the `ANY_LLM_PROVIDER_CACHE`
+    environment variable to `0`, or with `configure(enabled=False)`.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttl_seconds: float | None = DEFAULT_TTL_SECONDS,
+        enabled: bool | None = None,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._enabled = enabled
+        self._entries: OrderedDict[RegistryKey, _RegistryEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._closing: set[asyncio.Future[None] | concurrent.futures.Future[None]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether providers are cached. Defaults to the `ANY_LLM_PROVIDER_CACHE` environment variable."""
+        if self._enabled is None:
+            return _env_enabled()
+        return self._enabled
+
+    def configure(
+        self,
+        *,
+        max_size: int | None = None,
+        ttl_seconds: float | None = None,
+        enabled: bool | None = None,
+    ) -> None:
+        """Update the cache settings. Arguments left as `None` keep their current value."""
+        with self._lock:
+            if max_size is not None:
+                self.max_size = max_size
+            if ttl_seconds is not None:
+                self.ttl_seconds = ttl_seconds
+            if enabled is not None:
+                self._enabled = enabled
+            evicted = self._evict_locked(time.monotonic())
+        self._close_entries(evicted)
+
+    def __len__(self) -> int:
+        """Return the number of cached providers."""
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        api_key: str | None,
+        api_base: str | None,
+        client_args: dict[str, Any] | None,
+        loop: asyncio.AbstractEventLoop,
+    ) -> RegistryKey:
+        """Build the cache key for a provider configuration on a given event loop."""
+        return (id(loop), provider, _hash_api_key(api_key), api_base, _canonical_client_args(client_args))
+
+    def get_or_create(
+        self,
+        provider: str,
+        api_key: str | None,
+        api_base: str | None,
+        client_args: dict[str, Any] | None,
+        factory: Callable[[], AnyLLM],
+    ) -> AnyLLM:
+        """Return the cached provider for this configuration, creating it with `factory` on a miss.
+
+        Must be called from a coroutine, since the entry is bound to the running event loop.
+        When the registry is disabled, `factory` is called every time.
+
+        The provider may be closed as soon as it is evicted: use `acquire` to keep it open while it is used.
+        """
+        return self._get(provider, api_key, api_base, client_args, factory, lease=False)[0]
+
+    def acquire(
+        self,
+        provider: str,
+        api_key: str | None,
+        api_base: str | None,
+        client_args: dict[str, Any] | None,
+        factory: Callable[[], AnyLLM],
+    ) -> ProviderLease:
+        """Lease the cached provider for this configuration, creating it with `factory` on a miss.
+
+        Same as `get_or_create`, but the provider isn't closed when it is evicted until the lease is
+        released, see [ProviderLease][any_llm.utils.provider_registry.ProviderLease].
+        """
+        provider_instance, entry = self._get(provider, api_key, api_base, client_args, factory, lease=True)
+        if entry is None:
+            return ProviderLease(provider_instance)
+        return ProviderLease(provider_instance, lambda: self._release(entry))
+
+    def _get(
+        self,
+        provider: str,
+        api_key: str | None,
+        api_base: str | None,
+        client_args: dict[str, Any] | None,
+        factory: Callable[[], AnyLLM],
+        *,
+        lease: bool,
+    ) -> tuple[AnyLLM, _RegistryEntry | None]:
+        if not self.enabled:
+            return factory(), None
+
+        loop = asyncio.get_running_loop()
+        key = self.make_key(provider, api_key, api_base, client_args, loop)
+        now = time.monotonic()
+
+        with self._lock:
+            evicted = self._evict_locked(now)
+            entry = self._entries.get(key)
+            if entry is not None and entry.loop is loop:
+                self._entries.move_to_end(key)
+                entry.leases += 1 if lease else 0
+            else:
+                entry = None
+
+        if entry is not None:
+            self._close_entries(evicted)
+            return entry.provider, entry
+
+        # Build the provider outside the lock; client construction may be slow.
+        provider_instance = factory()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.loop is loop:
+                # Another thread populated the entry concurrently, keep the first one.
+                evicted.append(_RegistryEntry(provider_instance, loop, now))
+                self._entries.move_to_end(key)
+            else:
+                if entry is not None:
+                    evicted.extend(self._retire_locked([entry]))
+                entry = self._entries[key] = _RegistryEntry(provider_instance, loop, now)
+            entry.leases += 1 if lease else 0
+            evicted.extend(self._evict_locked(now))
+
+        self._close_entries(evicted)
+        return entry.provider, entry
+
+    def _release(self, entry: _RegistryEntry) -> None:
+        with self._lock:
+            entry.leases -= 1
+            close = entry.evicted and entry.leases == 0
+        if close:
+            self._schedule_close(entry)
+
+    def _retire_locked(self, entries: list[_RegistryEntry]) -> list[_RegistryEntry]:
+        """Mark removed entries as evicted and return those that can be closed now."""
+        for entry in entries:
+            entry.evicted = True
+        return [entry for entry in entries if entry.leases == 0]
+
+    def _evict_locked(self, now: float) -> list[_RegistryEntry]:
+        evicted: list[_RegistryEntry] = []
+
+        for key, entry in list(self._entries.items()):
+            expired = self.ttl_seconds is not None and now - entry.created_at > self.ttl_seconds
+            if expired or entry.loop.is_closed():
+                evicted.append(self._entries.pop(key))
+
+        while len(self._entries) > max(self.max_size, 0):
+            _, entry = self._entries.popitem(last=False)
+            evicted.append(entry)
+
+        return self._retire_locked(evicted)
+
+    def _close_entries(self, entries: list[_RegistryEntry]) -> None:
+        for entry in entries:
+            self._schedule_close(entry)
+
+    def _schedule_close(self, entry: _RegistryEntry) -> None:
+        loop = entry.loop
+        if loop.is_closed():
+            # The connection pool died with its loop, there is nothing left to close.
+            return
+
+        try:
+            running_loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        future: asyncio.Future[None] | concurrent.futures.Future[None]
+        if running_loop is loop:
+            future = loop.create_task(entry.provider.aclose())
+        elif loop.is_running():
+            future = asyncio.run_coroutine_threadsafe(entry.provider.aclose(), loop)
+        else:
+            return
+
+        self._closing.add(future)
+        future.add_done_callback(self._on_closed)
+
+    def _on_closed(self, future: asyncio.Future[None] | concurrent.futures.Future[None]) -> None:
+        self._closing.discard(future)
+        if not future.cancelled() and (exc := future.exception()) is not None:
+            logger.debug("Failed to close evicted provider: %s", exc)
+
+    async def aclear(self) -> None:
+        """Remove every entry and close the providers owned by the current event loop.
+
+        Leased providers are closed when their last lease is released instead.
+        """
+        with self._lock:
+            entries = self._retire_locked(list(self._entries.values()))
+            self._entries.clear()
+
+        try:
+            loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        own = [entry for entry in entries if entry.loop is loop]
+        for entry in entries:
+            if entry.loop is not loop:
+                self._schedule_close(entry)
+        if own:
+            await asyncio.gather(*(entry.provider.aclose() for entry in own), return_exceptions=True)
+
+    def clear(self) -> None:
+        """Remove every entry without waiting for the providers to be closed."""
+        with self._lock:
+            entries = self._retire_locked(list(self._entries.values()))
+            self._entries.clear()
+        self._close_entries(entries)
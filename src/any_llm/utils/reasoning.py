@@ -1,8 +1,9 @@
 import re
 from collections.abc import AsyncIterator
-from typing import Any, TypeVar
+from typing import Any, ClassVar, TypeVar
 
 from any_llm.constants import REASONING_FIELD_NAMES
+from any_llm.types.completion import ChatCompletionChunk, ChoiceDelta, ChunkChoice
 
 T = TypeVar("T")
 
@@ -35,6 +36,76 @@ def is_partial_reasoning_tag(text: str, opening: bool = True) -> bool:
     return False
 
 
+class ReasoningTagScanner:
+    """Split streamed text into content and reasoning at reasoning tags (`<think>`, `<thinking>`, ...).
+
+    Text is scanned once, with a pattern matching every opening tag compiled ahead of time. Only a
+    trailing partial tag (e.g. `"<thi"`) is held back until the next delta, so feeding a delta
+    costs O(len(delta)) however long the reasoning block is.
+    """
+
+    _OPENING_TAG_PATTERN = re.compile("|".join(re.escape(f"<{name}>") for name in REASONING_FIELD_NAMES))
+    _OPENING_TAG_PREFIXES = frozenset(
+        f"<{name}>"[:i] for name in REASONING_FIELD_NAMES for i in range(1, len(name) + 2)
+    )
+    _CLOSING_TAG_PREFIXES: ClassVar[dict[str, frozenset[str]]] = {
+        name: frozenset(f"</{name}>"[:i] for i in range(1, len(name) + 3)) for name in REASONING_FIELD_NAMES
+    }
+    _MAX_TAG_LENGTH = max(len(f"</{name}>") for name in REASONING_FIELD_NAMES)
+
+    def __init__(self) -> None:
+        """Start outside of any reasoning tag."""
+        self.current_tag: str | None = None
+        """Name of the reasoning tag being read, if any."""
+        self._pending = ""
+
+    def feed(self, text: str) -> tuple[str, str]:
+        """Scan the next delta, returning the `(content, reasoning)` it completes."""
+        text = self._pending + text
+        self._pending = ""
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        position = 0
+        while True:
+            if self.current_tag is None:
+                match = self._OPENING_TAG_PATTERN.search(text, position)
+                if match is None:
+                    end = self._partial_tag_start(text, position, self._OPENING_TAG_PREFIXES)
+                    content_parts.append(text[position:end])
+                    break
+                content_parts.append(text[position : match.start()])
+                self.current_tag = match.group()[1:-1]
+                position = match.end()
+            else:
+                closing_tag = f"</{self.current_tag}>"
+                tag_start = text.find(closing_tag, position)
+                if tag_start == -1:
+                    end = self._partial_tag_start(text, position, self._CLOSING_TAG_PREFIXES[self.current_tag])
+                    reasoning_parts.append(text[position:end])
+                    break
+                reasoning_parts.append(text[position:tag_start])
+                self.current_tag = None
+                position = tag_start + len(closing_tag)
+        self._pending = text[end:]
+        return "".join(content_parts), "".join(reasoning_parts)
+
+    def flush(self) -> tuple[str, str]:
+        """Return the `(content, reasoning)` held back at the end of the stream."""
+        pending, self._pending = self._pending, ""
+        if self.current_tag is None:
+            return pending, ""
+        return "", pending
+
+    def _partial_tag_start(self, text: str, position: int, prefixes: frozenset[str]) -> int:
+        """Return where the trailing partial tag of `text` starts, or `len(text)` if there is none."""
+        start = text.find("<", max(position, len(text) - self._MAX_TAG_LENGTH + 1))
+        while start != -1:
+            if text[start:] in prefixes:
+                return start
+            start = text.find("<", start + 1)
+        return len(text)
+
+
 async def process_streaming_reasoning_chunks(
     chunks: AsyncIterator[T],
     get_content: Any,
@@ -43,8 +114,9 @@ async def process_streaming_reasoning_chunks(
 ) -> AsyncIterator[T]:
     """Process streaming chunks to extract reasoning from XML tags.
 
-    This async generator handles buffering across chunks to properly detect
-    and extract reasoning tags that may be split across multiple chunks.
+    This async generator uses a [ReasoningTagScanner][any_llm.utils.reasoning.ReasoningTagScanner]
+    to detect reasoning tags that may be split across multiple chunks. Reasoning is streamed as it
+    arrives rather than when its closing tag is received.
 
     Args:
         chunks: Async iterator of chunks to process
@@ -56,9 +128,8 @@ async def process_streaming_reasoning_chunks(
         Processed chunks with reasoning extracted and separated from content
 
     """
-    buffer = ""
-    current_tag = None
-    reasoning_buffer = ""
+    scanner = ReasoningTagScanner()
+    last_content_chunk = None
 
     async for original_chunk in chunks:
         content = get_content(original_chunk)
@@ -67,51 +138,34 @@ async def process_streaming_reasoning_chunks(
             yield original_chunk
             continue
 
-        buffer += content
-        content_parts = []
-        reasoning_parts = []
-
-        while buffer:
-            if current_tag is None:
-                tag_info = find_reasoning_tag(buffer, opening=True)
-                if tag_info:
-                    tag_start, tag_name = tag_info
-                    if tag_start > 0:
-                        content_parts.append(buffer[:tag_start])
-                    tag_full = f"<{tag_name}>"
-                    buffer = buffer[tag_start + len(tag_full) :]
-                    current_tag = tag_name
-                elif is_partial_reasoning_tag(buffer, opening=True):
-                    break
-                else:
-                    content_parts.append(buffer)
-                    buffer = ""
-            else:
-                tag_close = f"</{current_tag}>"
-                tag_end = buffer.find(tag_close)
-                if tag_end != -1:
-                    reasoning_parts.append(reasoning_buffer + buffer[:tag_end])
-                    reasoning_buffer = ""
-                    buffer = buffer[tag_end + len(tag_close) :]
-                    current_tag = None
-                elif is_partial_reasoning_tag(buffer, opening=False):
-                    reasoning_buffer += buffer
-                    buffer = ""
-                    break
-                else:
-                    reasoning_buffer += buffer
-                    buffer = ""
-
-        if content_parts or reasoning_parts:
-            modified_chunk = original_chunk.model_copy(deep=True)  # type: ignore[attr-defined]
-            modified_chunk = set_content(modified_chunk, "".join(content_parts) if content_parts else None)
-            if reasoning_parts:
-                modified_chunk = set_reasoning(modified_chunk, "".join(reasoning_parts))
-            yield modified_chunk
-        elif not buffer:
-            modified_chunk = original_chunk.model_copy(deep=True)  # type: ignore[attr-defined]
-            modified_chunk = set_content(modified_chunk, None)
-            yield modified_chunk
+        last_content_chunk = original_chunk
+        yield _with_content_and_reasoning(original_chunk, *scanner.feed(content), set_content, set_reasoning)
+
+    content, reasoning = scanner.flush()
+    if last_content_chunk is not None and (content or reasoning):
+        # The stream ended on what looked like the start of a tag: it was text after all.
+        yield _with_content_and_reasoning(
+            _without_delta(last_content_chunk), content, reasoning, set_content, set_reasoning
+        )
+
+
+def _without_delta(chunk: T) -> T:
+    """Copy of `chunk` carrying nothing else than its identity, for text flushed after the last chunk.
+
+    Its finish reason, usage and tool calls were already streamed with `chunk`.
+    """
+    if not isinstance(chunk, ChatCompletionChunk):
+        return chunk
+    choices = [ChunkChoice(index=choice.index, delta=ChoiceDelta()) for choice in chunk.choices]
+    return chunk.model_copy(update={"choices": choices, "usage": None})
+
+
+def _with_content_and_reasoning(chunk: T, content: str, reasoning: str, set_content: Any, set_reasoning: Any) -> T:
+    modified_chunk = chunk.model_copy(deep=True)  # type: ignore[attr-defined]
+    modified_chunk = set_content(modified_chunk, content or None)
+    if reasoning:
+        modified_chunk = set_reasoning(modified_chunk, reasoning)
+    return modified_chunk  # type: ignore[no-any-return]
 
 
 def normalize_reasoning_from_provider_fields_and_xml_tags(message_dict: dict[str, Any]) -> None:
@@ -0,0 +1,92 @@
+import math
+import time
+
+from any_llm.types.completion import ChatCompletionChunk, CompletionUsage
+
+
+class StreamAccumulator:
+    """Collect usage and timing metrics of a completion stream in constant memory.
+
+    Only the last chunk, the latest usage and running totals are kept, so a stream of thousands of
+    chunks costs the same as a stream of one. Inter-chunk latency mean and variance are computed
+    online with Welford's algorithm.
+    """
+
+    def __init__(self, start_time: float | None = None) -> None:
+        """Start accumulating.
+
+        Args:
+            start_time: `time.perf_counter()` value the request was sent at. Defaults to now.
+
+        """
+        self.start_time = time.perf_counter() if start_time is None else start_time
+        self.chunks_received = 0
+        self.last_chunk: ChatCompletionChunk | None = None
+        self.usage: CompletionUsage | None = None
+        """Usage of the last chunk that reported it."""
+        self.prompt_tokens = 0
+        """First non-zero prompt token count: it doesn't change during a stream."""
+        self.completion_tokens = 0
+        """Highest completion token count, for providers reporting cumulative usage on several chunks."""
+        self.total_tokens = 0
+        """Highest total token count."""
+        self.saw_finish_reason = False
+        self.time_to_first_token_ms: float | None = None
+        self.time_to_last_content_token_ms: float | None = None
+        self._previous_chunk_time: float | None = None
+        self._latency_count = 0
+        self._latency_mean = 0.0
+        self._latency_m2 = 0.0
+
+    def add(self, chunk: ChatCompletionChunk, now: float | None = None) -> None:
+        """Account for a chunk received at `now` (`time.perf_counter()`, defaults to the current time)."""
+        if now is None:
+            now = time.perf_counter()
+        self.chunks_received += 1
+        self.last_chunk = chunk
+
+        if chunk.choices and chunk.choices[0].delta.content:
+            elapsed_ms = (now - self.start_time) * 1000
+            if self.time_to_first_token_ms is None:
+                self.time_to_first_token_ms = elapsed_ms
+            self.time_to_last_content_token_ms = elapsed_ms
+        if chunk.choices and any(choice.finish_reason for choice in chunk.choices):
+            self.saw_finish_reason = True
+
+        if self._previous_chunk_time is not None:
+            latency_ms = (now - self._previous_chunk_time) * 1000
+            self._latency_count += 1
+            delta = latency_ms - self._latency_mean
+            self._latency_mean += delta / self._latency_count
+            self._latency_m2 += delta * (latency_ms - self._latency_mean)
+        self._previous_chunk_time = now
+
+        usage = chunk.usage
+        if usage:
+            self.usage = usage
+            if usage.prompt_tokens and not self.prompt_tokens:
+                self.prompt_tokens = usage.prompt_tokens
+            self.completion_tokens = max(self.completion_tokens, usage.completion_tokens or 0)
+            self.total_tokens = max(self.total_tokens, usage.total_tokens or 0)
+
+    def elapsed_ms(self, now: float | None = None) -> float:
+        """Milliseconds since the start of the request."""
+        return ((time.perf_counter() if now is None else now) - self.start_time) * 1000
+
+    @property
+    def inter_chunk_latency_mean_ms(self) -> float | None:
+        """Mean time between two chunks, `None` before the second chunk."""
+        return self._latency_mean if self._latency_count else None
+
+    @property
+    def inter_chunk_latency_variance_ms(self) -> float | None:
+        """Sample variance of the time between two chunks, `None` with fewer than two intervals."""
+        if self._latency_count < 2:
+            return None
+        return self._latency_m2 / (self._latency_count - 1)
+
+    @property
+    def inter_chunk_latency_stdev_ms(self) -> float | None:
+        """Sample standard deviation of the time between two chunks."""
+        variance = self.inter_chunk_latency_variance_ms
+        return None if variance is None else math.sqrt(variance)
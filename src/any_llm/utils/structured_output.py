@@ -0,0 +1,434 @@
+"""Stream structured outputs as partially validated objects.
+
+When `acompletion` is called with `stream=True` and a pydantic `response_format`, the JSON streamed in
+the content deltas is parsed as it arrives. Each chunk carrying content gets the object parsed so far
+in `delta.parsed`: an instance of a partial variant of the model, where every field is optional and
+nested models are partial too. The chunk finishing the choice gets a fully validated instance instead.
+
+Validating the partial object costs time proportional to its size. To keep streaming a large object
+linear in its size, once the content exceeds `EAGER_VALIDATION_SIZE` characters the partial object
+is only validated again after the content has grown by `VALIDATION_GROWTH`; the chunks in between
+carry the last partial object.
+"""
+
+import functools
+import json
+import re
+import types
+import typing
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, create_model
+
+from any_llm.types.completion import ChatCompletionChunk, ChoiceDelta, ChunkChoice
+
+EAGER_VALIDATION_SIZE = 2048
+"""Size of the content, in characters, up to which the partial object is validated on every change."""
+
+VALIDATION_GROWTH = 0.0625
+"""Fraction of its size the content must grow by before the partial object of a larger content is validated again."""
+
+_MISSING = object()
+
+# What the parser expects next.
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_AFTER_VALUE = 5
+_STRING = 6
+_NUMBER = 7
+_LITERAL = 8
+_DONE = 9
+
+_WHITESPACE = frozenset(" \t\n\r")
+_NUMBER_CHARACTERS = frozenset("0123456789+-.eE")
+_LITERALS = {"true": True, "false": False, "null": None}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class PartialJSONParser:
+    """Parse a JSON document fed in pieces, exposing the value parsed so far.
+
+    The parser keeps the containers it has built and the state of the token being read, so each call
+    to `feed` only scans the new text: parsing a document streamed in many pieces is linear in its
+    size, instead of re-parsing the growing buffer on every piece.
+
+    The partial value contains the complete members and the prefix of a string being read. Numbers
+    and `true`/`false`/`null` only appear once complete, and object keys once their value starts.
+    """
+
+    def __init__(self) -> None:
+        """Start before the first character of the document."""
+        self._root: Any = _MISSING
+        self._stack: list[dict[str, Any] | list[Any]] = []
+        self._keys: list[str | None] = []
+        self._state = _VALUE
+        self._token: list[str] = []
+        self._string = ""
+        self._flushed = 0
+        self._escape: str | None = None
+        self._high_surrogate: str | None = None
+        self._string_is_key = False
+        self._version = 0
+
+    @property
+    def value(self) -> Any:
+        """The value parsed so far, or None before its first character.
+
+        Containers are the parser's own, updated in place by later calls to `feed`.
+        """
+        return None if self._root is _MISSING else self._root
+
+    @property
+    def done(self) -> bool:
+        """Whether the document is complete."""
+        return self._state == _DONE
+
+    @property
+    def version(self) -> int:
+        """A number incremented whenever `feed` changes the value."""
+        return self._version
+
+    def feed(self, text: str) -> Any:
+        """Parse the next piece of the document and return the value parsed so far.
+
+        Raises:
+            ValueError: If the text is not valid JSON.
+
+        """
+        i = 0
+        end = len(text)
+        while i < end:
+            state = self._state
+            if state == _STRING:
+                i = self._read_string(text, i)
+                continue
+            char = text[i]
+            if state == _NUMBER:
+                if char in _NUMBER_CHARACTERS:
+                    self._token.append(char)
+                    i += 1
+                    continue
+                self._end_number()
+                continue
+            if state == _LITERAL:
+                self._read_literal(char)
+                i += 1
+                continue
+            i += 1
+            if char in _WHITESPACE:
+                continue
+            if state in (_VALUE, _VALUE_OR_END):
+                if char == "]" and state == _VALUE_OR_END:
+                    self._close(list)
+                else:
+                    self._start_value(char)
+            elif state in (_KEY, _KEY_OR_END):
+                if char == '"':
+                    self._start_string(is_key=True)
+                elif char == "}" and state == _KEY_OR_END:
+                    self._close(dict)
+                else:
+                    self._error(char)
+            elif state == _COLON:
+                if char != ":":
+                    self._error(char)
+                self._state = _VALUE
+            elif state == _AFTER_VALUE:
+                self._read_after_value(char)
+            else:
+                self._error(char)
+        self._flush_string()
+        return self.value
+
+    def _error(self, char: str) -> typing.NoReturn:
+        msg = f"Invalid JSON: unexpected {char!r}"
+        raise ValueError(msg)
+
+    def _start_value(self, char: str) -> None:
+        if char == "{":
+            self._push({})
+            self._state = _KEY_OR_END
+        elif char == "[":
+            self._push([])
+            self._state = _VALUE_OR_END
+        elif char == '"':
+            self._set("")
+            self._start_string(is_key=False)
+        elif char == "-" or char.isdigit():
+            self._token = [char]
+            self._state = _NUMBER
+        elif char in "tfn":
+            self._token = [char]
+            self._state = _LITERAL
+        else:
+            self._error(char)
+
+    def _push(self, container: dict[str, Any] | list[Any]) -> None:
+        self._set(container)
+        self._stack.append(container)
+        self._keys.append(None)
+
+    def _set(self, value: Any) -> None:
+        """Store `value` as the value being read, replacing any previous version of it."""
+        self._version += 1
+        if not self._stack:
+            self._root = value
+            return
+        container = self._stack[-1]
+        if isinstance(container, dict):
+            key = self._keys[-1]
+            assert key is not None
+            container[key] = value
+        elif self._state in (_AFTER_VALUE, _STRING):
+            # A new version of the last item (the prefix of a string).
+            container[-1] = value
+        else:
+            container.append(value)
+
+    def _complete(self, value: Any) -> None:
+        self._set(value)
+        self._state = _AFTER_VALUE if self._stack else _DONE
+
+    def _close(self, kind: type) -> None:
+        if not isinstance(self._stack[-1], kind):
+            self._error("]" if kind is list else "}")
+        self._stack.pop()
+        self._keys.pop()
+        self._state = _AFTER_VALUE if self._stack else _DONE
+
+    def _read_after_value(self, char: str) -> None:
+        if not self._stack:
+            self._error(char)
+        container = self._stack[-1]
+        if char == ",":
+            self._state = _KEY if isinstance(container, dict) else _VALUE
+        elif char == "}":
+            self._close(dict)
+        elif char == "]":
+            self._close(list)
+        else:
+            self._error(char)
+
+    def _start_string(self, is_key: bool) -> None:
+        self._string = ""
+        self._flushed = 0
+        self._escape = None
+        self._high_surrogate = None
+        self._string_is_key = is_key
+        self._state = _STRING
+
+    def _append(self, text: str) -> None:
+        if self._high_surrogate is not None:
+            # Not followed by a low surrogate.
+            self._high_surrogate = None
+            text = "\ufffd" + text
+        self._string += text
+
+    def _read_string(self, text: str, i: int) -> int:
+        """Read the string being parsed from `text[i:]`, returning the index of the next character to read."""
+        if self._escape is not None:
+            return self._read_escape(text, i)
+        match = _STRING_SPECIAL.search(text, i)
+        stop = match.start() if match else len(text)
+        if stop > i:
+            self._append(text[i:stop])
+        if match is None:
+            return stop
+        if match.group() == "\\":
+            self._escape = ""
+            return stop + 1
+        self._append("")
+        string = self._string
+        self._string = ""
+        if self._string_is_key:
+            self._keys[-1] = string
+            self._state = _COLON
+        else:
+            self._state = _AFTER_VALUE
+            self._set(string)
+            self._state = _AFTER_VALUE if self._stack else _DONE
+        return stop + 1
+
+    def _read_escape(self, text: str, i: int) -> int:
+        escape = self._escape or ""
+        char = text[i]
+        if not escape:
+            if char == "u":
+                self._escape = "u"
+                return i + 1
+            if char not in _ESCAPES:
+                self._error(char)
+            self._append(_ESCAPES[char])
+            self._escape = None
+            return i + 1
+        if char not in "0123456789abcdefABCDEF":
+            self._error(char)
+        escape += char
+        if len(escape) < 5:
+            self._escape = escape
+            return i + 1
+        self._escape = None
+        code = chr(int(escape[1:], 16))
+        if "\udc00" <= code <= "\udfff" and self._high_surrogate is not None:
+            pair = self._high_surrogate + code
+            self._high_surrogate = None
+            self._string += pair.encode("utf-16", "surrogatepass").decode("utf-16")
+        elif "\ud800" <= code <= "\udfff":
+            # A high surrogate waits for its low surrogate; a lone low surrogate is replaced.
+            self._append("" if code <= "\udbff" else "\ufffd")
+            if code <= "\udbff":
+                self._high_surrogate = code
+        else:
+            self._append(code)
+        return i + 1
+
+    def _flush_string(self) -> None:
+        """Expose the prefix of the string value being read."""
+        if self._state == _STRING and not self._string_is_key and len(self._string) > self._flushed:
+            self._flushed = len(self._string)
+            self._set(self._string)
+
+    def _end_number(self) -> None:
+        token = "".join(self._token)
+        try:
+            number = json.loads(token)
+        except ValueError:
+            msg = f"Invalid JSON: invalid number {token!r}"
+            raise ValueError(msg) from None
+        self._complete(number)
+
+    def _read_literal(self, char: str) -> None:
+        self._token.append(char)
+        token = "".join(self._token)
+        if token in _LITERALS:
+            self._complete(_LITERALS[token])
+        elif not any(literal.startswith(token) for literal in _LITERALS):
+            self._error(token)
+
+
+_partial_models_in_progress: set[type[BaseModel]] = set()
+
+
+@functools.cache
+def partial_model(model: type[BaseModel]) -> type[BaseModel]:
+    """Return a variant of `model` where every field is optional, for validating incomplete objects.
+
+    Nested models, including those in lists, dicts and unions, are made partial too. Validators and
+    field constraints are dropped, since incomplete values (e.g. the prefix of a string) may not pass them.
+    """
+    _partial_models_in_progress.add(model)
+    try:
+        fields: dict[str, Any] = {
+            name: (_partial_annotation(field.annotation) | None, Field(default=None, alias=field.alias))
+            for name, field in model.model_fields.items()
+        }
+    finally:
+        _partial_models_in_progress.discard(model)
+    config = ConfigDict(populate_by_name=True, extra=model.model_config.get("extra"))
+    return create_model(f"Partial{model.__name__}", __config__=config, **fields)
+
+
+def _partial_annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        # Recursive models keep their complete type below their first occurrence.
+        return annotation if annotation in _partial_models_in_progress else partial_model(annotation)
+    origin = get_origin(annotation)
+    if origin is None or origin is Literal:
+        return annotation
+    args = get_args(annotation)
+    if origin is Annotated:
+        return _partial_annotation(args[0])
+    partial_args = tuple(_partial_annotation(arg) for arg in args)
+    if origin is Union or origin is types.UnionType:
+        return Union[partial_args]  # noqa: UP007
+    try:
+        return origin[partial_args]
+    except TypeError:
+        return annotation
+
+
+class _StructuredOutput:
+    """The structured output of one choice of a stream."""
+
+    def __init__(self, response_format: type[BaseModel]) -> None:
+        self.response_format = response_format
+        self.partial_format = partial_model(response_format)
+        self.parser: PartialJSONParser | None = PartialJSONParser()
+        self.content: list[str] = []
+        self.size = 0
+        self.partial: BaseModel | None = None
+        self.finished = False
+        self._validated_version = -1
+        self._validated_size = 0
+
+    def feed(self, content: str) -> BaseModel | None:
+        self.content.append(content)
+        self.size += len(content)
+        if self.parser is None:
+            return self.partial
+        try:
+            value = self.parser.feed(content)
+        except ValueError:
+            # Not JSON: the final validation reports the error.
+            self.parser = None
+            return self.partial
+        if self.parser.version == self._validated_version:
+            return self.partial
+        if self.size > EAGER_VALIDATION_SIZE and self.size - self._validated_size < self.size * VALIDATION_GROWTH:
+            return self.partial
+        self._validated_version = self.parser.version
+        self._validated_size = self.size
+        if isinstance(value, dict):
+            try:
+                self.partial = self.partial_format.model_validate(value)
+            except ValidationError:
+                # E.g. the prefix of a `Literal` string: keep the last valid version.
+                pass
+        return self.partial
+
+    def finish(self) -> BaseModel:
+        self.finished = True
+        return self.response_format.model_validate_json("".join(self.content))
+
+
+async def astream_structured_output(
+    stream: AsyncIterator[ChatCompletionChunk], response_format: type[BaseModel]
+) -> AsyncIterator[ChatCompletionChunk]:
+    """Set `delta.parsed` on the chunks of `stream`, parsing their content as `response_format`.
+
+    Chunks with content get a partial instance (see `partial_model` and the throttling described in
+    the module documentation), and the chunk with the `finish_reason` of a choice gets the complete
+    `response_format` instance. For streams ending without a `finish_reason`, a last chunk carrying
+    the complete instance is added.
+
+    Raises:
+        pydantic.ValidationError: If the complete content doesn't match `response_format`.
+
+    """
+    outputs: dict[int, _StructuredOutput] = {}
+    last_chunk: ChatCompletionChunk | None = None
+    async for chunk in stream:
+        last_chunk = chunk
+        for choice in chunk.choices:
+            output = outputs.get(choice.index)
+            if output is None:
+                output = outputs[choice.index] = _StructuredOutput(response_format)
+            if choice.delta.content:
+                choice.delta.parsed = output.feed(choice.delta.content)
+            if choice.finish_reason is not None and not output.finished and output.content:
+                choice.delta.parsed = output.finish()
+        yield chunk
+
+    unfinished = [(index, output) for index, output in outputs.items() if not output.finished and output.content]
+    if last_chunk is None or not unfinished:
+        return
+    choices = [
+        ChunkChoice(index=index, delta=ChoiceDelta(parsed=output.finish()), finish_reason=None)
+        for index, output in unfinished
+    ]
+    yield last_chunk.model_copy(update={"choices": choices, "usage": None})
@@ -1,13 +1,15 @@
 from contextlib import contextmanager
 from typing import Any, Literal
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
+from anthropic.types import RawMessageStreamEvent
+from pydantic import BaseModel, TypeAdapter
 
 from any_llm.exceptions import UnsupportedParameterError
 from any_llm.providers.anthropic.anthropic import AnthropicProvider
 from any_llm.providers.anthropic.utils import DEFAULT_MAX_TOKENS, REASONING_EFFORT_TO_THINKING_BUDGETS
-from any_llm.types.completion import CompletionParams
+from any_llm.types.completion import ChatCompletionChunk, CompletionParams
 
 
 @contextmanager
@@ -405,3 +407,160 @@ async def test_response_format_raises_error() -> None:
                 response_format={"type": "json_object"},
             )
         )
+
+
+@pytest.mark.asyncio
+async def test_response_format_with_reasoning_effort_raises_error() -> None:
+    class Answer(BaseModel):
+        city: str
+
+    provider = AnthropicProvider(api_key="test-api-key")
+
+    with pytest.raises(UnsupportedParameterError, match="reasoning_effort with response_format"):
+        await provider._acompletion(
+            CompletionParams(
+                model_id="model-id",
+                messages=[{"role": "user", "content": "Hi"}],
+                response_format=Answer,
+                reasoning_effort="high",
+            )
+        )
+
+
+def _recorded_stream_events() -> list[Any]:
+    """Raw events of a streamed message with a text block followed by two tool calls."""
+    raw_events: list[dict[str, Any]] = [
+        {
+            "type": "message_start",
+            "message": {
+                "id": "msg_01",
+                "type": "message",
+                "role": "assistant",
+                "model": "model-id",
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": 12, "output_tokens": 1},
+            },
+        },
+        {"type": "content_block_start", "index": 0, "content_block": {"type": "text", "text": ""}},
+        {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": "Calling tools"}},
+        {"type": "content_block_stop", "index": 0},
+        {
+            "type": "content_block_start",
+            "index": 1,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": "first_tool", "input": {}},
+        },
+        {"type": "content_block_delta", "index": 1, "delta": {"type": "input_json_delta", "partial_json": "{}"}},
+        {"type": "content_block_stop", "index": 1},
+        {
+            "type": "content_block_start",
+            "index": 2,
+            "content_block": {"type": "tool_use", "id": "toolu_2", "name": "second_tool", "input": {}},
+        },
+        {"type": "content_block_delta", "index": 2, "delta": {"type": "input_json_delta", "partial_json": '{"q": 1}'}},
+        {"type": "content_block_stop", "index": 2},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 30}},
+        {"type": "message_stop"},
+    ]
+    adapter: TypeAdapter[Any] = TypeAdapter(RawMessageStreamEvent)
+    return [adapter.validate_python(event) for event in raw_events]
+
+
+@pytest.mark.asyncio
+async def test_stream_completion_converts_events_with_stream_state() -> None:
+    stream = MagicMock()
+    stream.__aenter__.return_value.__aiter__.return_value = _recorded_stream_events()
+
+    with mock_anthropic_provider() as mock_anthropic:
+        mock_anthropic.return_value.messages.stream = Mock(return_value=stream)
+        provider = AnthropicProvider(api_key="test-api-key")
+        result = await provider._acompletion(
+            CompletionParams(model_id="model-id", messages=[{"role": "user", "content": "Hi"}], stream=True)
+        )
+        chunks = [chunk async for chunk in result]  # type: ignore[union-attr]
+
+    assert all(isinstance(chunk, ChatCompletionChunk) for chunk in chunks)
+    assert {chunk.id for chunk in chunks} == {"msg_01"}
+    assert chunks[0].choices[0].delta.role == "assistant"
+    assert "".join(chunk.choices[0].delta.content or "" for chunk in chunks) == "Calling tools"
+
+    tool_calls = [call for chunk in chunks for call in chunk.choices[0].delta.tool_calls or []]
+    assert [call.index for call in tool_calls] == [0, 0, 1, 1]
+    assert [call.id for call in tool_calls if call.id] == ["toolu_1", "toolu_2"]
+    assert [call.function.arguments for call in tool_calls if call.function] == ["", "{}", "", '{"q": 1}']
+
+    last = chunks[-1]
+    assert last.choices[0].finish_reason == "tool_calls"
+    assert last.usage is not None
+    assert (last.usage.prompt_tokens, last.usage.completion_tokens, last.usage.total_tokens) == (12, 30, 42)
+
+    for chunk in chunks:
+        assert ChatCompletionChunk.model_validate(chunk.model_dump()) == chunk
+
+
+@pytest.mark.asyncio
+async def test_stream_structured_output_with_forced_tool() -> None:
+    class Answer(BaseModel):
+        city: str
+        population: int
+
+    raw_events: list[dict[str, Any]] = [
+        {
+            "type": "message_start",
+            "message": {
+                "id": "msg_01",
+                "type": "message",
+                "role": "assistant",
+                "model": "model-id",
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": 12, "output_tokens": 1},
+            },
+        },
+        {
+            "type": "content_block_start",
+            "index": 0,
+            "content_block": {"type": "tool_use", "id": "toolu_1", "name": "Answer", "input": {}},
+        },
+        *(
+            {"type": "content_block_delta", "index": 0, "delta": {"type": "input_json_delta", "partial_json": part}}
+            for part in ['{"city": "Par', 'is", "population": 2', "100000}"]
+        ),
+        {"type": "content_block_stop", "index": 0},
+        {"type": "message_delta", "delta": {"stop_reason": "tool_use"}, "usage": {"output_tokens": 30}},
+        {"type": "message_stop"},
+    ]
+    adapter: TypeAdapter[Any] = TypeAdapter(RawMessageStreamEvent)
+    stream = MagicMock()
+    stream.__aenter__.return_value.__aiter__.return_value = [adapter.validate_python(event) for event in raw_events]
+
+    with mock_anthropic_provider() as mock_anthropic:
+        mock_anthropic.return_value.messages.stream = Mock(return_value=stream)
+        provider = AnthropicProvider(api_key="test-api-key")
+        result = await provider.acompletion(
+            model="model-id",
+            messages=[{"role": "user", "content": "Hi"}],
+            max_tokens=100,
+            stream=True,
+            response_format=Answer,
+        )
+        chunks = [chunk async for chunk in result]  # type: ignore[union-attr]
+
+        call_kwargs = mock_anthropic.return_value.messages.stream.call_args.kwargs
+        assert call_kwargs["tool_choice"] == {"type": "tool", "name": "Answer"}
+        assert call_kwargs["tools"][0]["input_schema"] == Answer.model_json_schema()
+
+    assert (
+        "".join(chunk.choices[0].delta.content or "" for chunk in chunks) == '{"city": "Paris", "population": 2100000}'
+    )
+    assert not any(chunk.choices[0].delta.tool_calls for chunk in chunks)
+    partials = [chunk.choices[0].delta.parsed for chunk in chunks if chunk.choices[0].delta.content]
+    assert [(partial.city, partial.population) for partial in partials] == [
+        ("Par", None),
+        ("Paris", None),
+        ("Paris", 2100000),
+    ]
+    assert chunks[-1].choices[0].finish_reason == "stop"
+    assert chunks[-1].choices[0].delta.parsed == Answer(city="Paris", population=2100000)
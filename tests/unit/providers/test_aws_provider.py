@@ -1,8 +1,15 @@
+import asyncio
 import json
+import threading
+import time
+from collections.abc import Iterator
 from contextlib import contextmanager
 from typing import Any
 from unittest.mock import Mock, patch
 
+import pytest
+from botocore.exceptions import ClientError
+
 from any_llm.providers.bedrock import BedrockProvider
 from any_llm.providers.bedrock.utils import _create_openai_chunk_from_aws_chunk
 from any_llm.types.completion import CompletionParams
@@ -165,10 +172,11 @@ def test_embedding_list_of_strings() -> None:
     ]
 
     with mock_aws_embedding_provider() as (mock_boto3_client, mock_client):
-        mock_client.invoke_model.side_effect = [
-            {"body": Mock(read=Mock(return_value=json.dumps(mock_response_bodies[0])))},
-            {"body": Mock(read=Mock(return_value=json.dumps(mock_response_bodies[1])))},
-        ]
+        # Inputs are embedded concurrently, so answer based on the request rather than on the call order.
+        responses_by_text = dict(zip(input_texts, mock_response_bodies, strict=True))
+        mock_client.invoke_model.side_effect = lambda modelId, body: {  # noqa: N803
+            "body": Mock(read=Mock(return_value=json.dumps(responses_by_text[json.loads(body)["inputText"]])))
+        }
 
         provider = BedrockProvider(api_key="test_key")
         response = provider._embedding(model_id, input_texts)
@@ -176,11 +184,12 @@ def test_embedding_list_of_strings() -> None:
         mock_boto3_client.assert_called_once_with("bedrock-runtime", endpoint_url=None)
 
         assert mock_client.invoke_model.call_count == 2
-        expected_calls = [({"inputText": "Hello world"}, model_id), ({"inputText": "Goodbye world"}, model_id)]
-        for i, (expected_body, expected_model) in enumerate(expected_calls):
-            actual_call = mock_client.invoke_model.call_args_list[i]
-            assert actual_call[1]["modelId"] == expected_model
-            assert json.loads(actual_call[1]["body"]) == expected_body
+        expected_bodies = [{"inputText": "Hello world"}, {"inputText": "Goodbye world"}]
+        actual_calls = mock_client.invoke_model.call_args_list
+        assert all(call[1]["modelId"] == model_id for call in actual_calls)
+        assert sorted((json.loads(call[1]["body"]) for call in actual_calls), key=str) == sorted(
+            expected_bodies, key=str
+        )
 
         assert response.model == model_id
         assert response.object == "list"
@@ -193,6 +202,92 @@ def test_embedding_list_of_strings() -> None:
         assert response.usage.total_tokens == 11
 
 
+def test_embedding_runs_requests_concurrently_and_keeps_input_order() -> None:
+    """Per-text invoke_model calls overlap, while results keep the order of the inputs."""
+    model_id = "amazon.titan-embed-text-v2:0"
+    input_texts = [f"text {i}" for i in range(8)]
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def invoke_model(modelId: str, body: str) -> dict[str, Any]:  # noqa: N803
+        nonlocal in_flight, max_in_flight
+        index = int(json.loads(body)["inputText"].split()[1])
+        with lock:
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+        # Later inputs finish first.
+        time.sleep(0.002 * (len(input_texts) - index))
+        with lock:
+            in_flight -= 1
+        response_body = {"embedding": [float(index)], "inputTextTokenCount": index + 1}
+        return {"body": Mock(read=Mock(return_value=json.dumps(response_body)))}
+
+    with mock_aws_embedding_provider() as (_, mock_client):
+        mock_client.invoke_model.side_effect = invoke_model
+        provider = BedrockProvider(api_key="test_key")
+        response = provider._embedding(model_id, input_texts, max_concurrency=4)
+
+    assert 1 < max_in_flight <= 4
+    assert [item.embedding for item in response.data] == [[float(i)] for i in range(8)]
+    assert [item.index for item in response.data] == list(range(8))
+    assert response.usage.prompt_tokens == sum(range(1, 9))
+
+
+def test_embedding_retries_throttled_requests_with_backoff() -> None:
+    """Throttling errors are retried, other client errors are raised."""
+    model_id = "amazon.titan-embed-text-v1"
+    throttled = ClientError(  # type: ignore[no-untyped-call]
+        {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}, "InvokeModel"
+    )
+    response_body = {"embedding": [0.1], "inputTextTokenCount": 2}
+
+    with mock_aws_embedding_provider() as (_, mock_client), patch("time.sleep") as mock_sleep:
+        mock_client.invoke_model.side_effect = [
+            throttled,
+            throttled,
+            {"body": Mock(read=Mock(return_value=json.dumps(response_body)))},
+        ]
+        provider = BedrockProvider(api_key="test_key")
+        response = provider._embedding(model_id, "Hello")
+
+        assert response.data[0].embedding == [0.1]
+        assert mock_client.invoke_model.call_count == 3
+        assert mock_sleep.call_count == 2
+
+        mock_client.invoke_model.side_effect = ClientError(  # type: ignore[no-untyped-call]
+            {"Error": {"Code": "ValidationException", "Message": "bad input"}}, "InvokeModel"
+        )
+        with pytest.raises(ClientError, match="bad input"):
+            provider._embedding(model_id, "Hello")
+        assert mock_sleep.call_count == 2
+
+
+def test_embedding_uses_batch_input_for_cohere_models() -> None:
+    """Cohere embed models receive up to 96 texts per invoke_model call."""
+    model_id = "cohere.embed-english-v3"
+    input_texts = [f"text {i}" for i in range(100)]
+
+    def invoke_model(modelId: str, body: str) -> dict[str, Any]:  # noqa: N803
+        texts = json.loads(body)["texts"]
+        return {
+            "body": Mock(read=Mock(return_value=json.dumps({"embeddings": [[float(len(t))] for t in texts]}))),
+            "ResponseMetadata": {"HTTPHeaders": {"x-amzn-bedrock-input-token-count": str(2 * len(texts))}},
+        }
+
+    with mock_aws_embedding_provider() as (_, mock_client):
+        mock_client.invoke_model.side_effect = invoke_model
+        provider = BedrockProvider(api_key="test_key")
+        response = provider._embedding(model_id, input_texts, input_type="search_query")
+
+    bodies = [json.loads(call[1]["body"]) for call in mock_client.invoke_model.call_args_list]
+    assert sorted(len(body["texts"]) for body in bodies) == [4, 96]
+    assert all(body["input_type"] == "search_query" for body in bodies)
+    assert [item.index for item in response.data] == list(range(100))
+    assert [item.embedding for item in response.data] == [[float(len(text))] for text in input_texts]
+    assert response.usage.prompt_tokens == 200
+
+
 def test_streaming_chunk_with_tool_use_start() -> None:
     """Test streaming chunk with tool use in contentBlockStart."""
     chunk = {
@@ -373,3 +468,62 @@ def test_streaming_chunk_content_block_start_text() -> None:
 
     assert result is not None
     assert result.choices[0].delta.content == ""
+
+
+@pytest.mark.asyncio
+async def test_streaming_does_not_block_the_event_loop() -> None:
+    """A slow boto3 event stream must not delay other tasks on the loop."""
+    event_delay = 0.05
+
+    def slow_stream() -> Iterator[dict[str, Any]]:
+        yield {"messageStart": {"role": "assistant"}}
+        for i in range(5):
+            time.sleep(event_delay)
+            yield {"contentBlockDelta": {"contentBlockIndex": 0, "delta": {"text": f"token{i}"}}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+    with mock_aws_provider() as mock_boto3_client:
+        mock_boto3_client.return_value.converse_stream.return_value = {"stream": slow_stream()}
+        provider = BedrockProvider(api_key="test_key")
+
+        ticking = True
+        max_lag = 0.0
+
+        async def ticker() -> None:
+            nonlocal max_lag
+            while ticking:
+                start = time.perf_counter()
+                await asyncio.sleep(0.005)
+                max_lag = max(max_lag, time.perf_counter() - start - 0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        stream = await provider.acompletion(model="model-id", messages=[{"role": "user", "content": "Hi"}], stream=True)
+        contents = [chunk.choices[0].delta.content async for chunk in stream]  # type: ignore[union-attr]
+        ticking = False
+        await ticker_task
+
+    assert contents == ["", *(f"token{i}" for i in range(5)), None]
+    assert max_lag < event_delay / 2
+
+
+@pytest.mark.asyncio
+async def test_list_models_runs_off_the_event_loop() -> None:
+    """list_foundation_models is a blocking boto3 call and must run in a worker thread."""
+    calls: list[bool] = []
+
+    def list_foundation_models(**kwargs: Any) -> dict[str, Any]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            calls.append(True)  # no running loop in this thread
+        else:
+            calls.append(False)
+        return {"modelSummaries": [{"modelId": "amazon.titan-text-express-v1"}]}
+
+    with mock_aws_provider() as mock_boto3_client:
+        mock_boto3_client.return_value.list_foundation_models.side_effect = list_foundation_models
+        provider = BedrockProvider(api_key="test_key")
+        models = await provider.alist_models()
+
+    assert calls == [True]
+    assert [model.id for model in models] == ["amazon.titan-text-express-v1"]
@@ -5,11 +5,18 @@ from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from google.genai import types
+from pydantic import BaseModel
 
 from any_llm.exceptions import UnsupportedParameterError
 from any_llm.providers.gemini import GeminiProvider
 from any_llm.providers.gemini.base import REASONING_EFFORT_TO_THINKING_BUDGETS
-from any_llm.providers.gemini.utils import _convert_messages, _convert_response_to_response_dict, _convert_tool_spec
+from any_llm.providers.gemini.utils import (
+    ImagePartCache,
+    _convert_messages,
+    _convert_response_to_response_dict,
+    _convert_tool_spec,
+    image_part_cache,
+)
 from any_llm.types.completion import CompletionParams
 
 
@@ -127,22 +134,24 @@ async def test_completion_without_tool_choice() -> None:
 
 
 @pytest.mark.asyncio
-async def test_completion_with_stream_and_response_format_raises() -> None:
+async def test_completion_with_stream_and_response_format() -> None:
     api_key = "test-api-key"
     model = "gemini-pro"
     messages = [{"role": "user", "content": "Hello"}]
 
-    with mock_gemini_provider():
+    class StructuredOutput(BaseModel):
+        answer: str
+
+    with mock_gemini_provider() as mock_genai:
         provider = GeminiProvider(api_key=api_key)
-        with pytest.raises(UnsupportedParameterError):
-            await provider._acompletion(
-                CompletionParams(
-                    model_id=model,
-                    messages=messages,
-                    stream=True,
-                    response_format={"type": "json_object"},
-                )
-            )
+        mock_genai.return_value.aio.models.generate_content_stream = AsyncMock()
+        await provider._acompletion(
+            CompletionParams(model_id=model, messages=messages, stream=True, response_format=StructuredOutput)
+        )
+
+        _, call_kwargs = mock_genai.return_value.aio.models.generate_content_stream.call_args
+        assert call_kwargs["config"].response_mime_type == "application/json"
+        assert call_kwargs["config"].response_schema is StructuredOutput
 
 
 @pytest.mark.asyncio
@@ -793,3 +802,70 @@ def test_streaming_completion_with_function_call_none() -> None:
     assert chunk.choices[0].delta.content == "Just text content"
     assert chunk.choices[0].delta.tool_calls is None
     assert chunk.choices[0].finish_reason == "stop"
+
+
+def _image_message(payload: bytes) -> dict[str, Any]:
+    data_url = "data:image/png;base64," + base64.b64encode(payload).decode()
+    return {"role": "user", "content": [{"type": "image_url", "image_url": {"url": data_url}}]}
+
+
+def test_convert_messages_decodes_each_image_once() -> None:
+    image_part_cache.clear()
+    payload = b"\x89PNG" + bytes(range(256))
+    with patch("any_llm.providers.gemini.utils.base64.b64decode", wraps=base64.b64decode) as b64decode:
+        first, _ = _convert_messages([_image_message(payload)])
+        # A new conversation turn: the same image, in a new string.
+        second, _ = _convert_messages([_image_message(payload), {"role": "user", "content": "And now?"}])
+
+    b64decode.assert_called_once()
+    assert first[0].parts is not None
+    assert second[0].parts is not None
+    assert second[0].parts[0] is first[0].parts[0]
+    assert first[0].parts[0].inline_data is not None
+    assert first[0].parts[0].inline_data.data == payload
+
+
+def test_image_part_cache_evicts_least_recently_used_parts() -> None:
+    cache = ImagePartCache(max_size=10)
+    parts = [types.Part.from_text(text=str(i)) for i in range(3)]
+    cache.put(b"a", parts[0], 4)
+    cache.put(b"b", parts[1], 4)
+    assert cache.get(b"a") is parts[0]
+    cache.put(b"c", parts[2], 4)
+    cache.put(b"d", parts[2], 1, expires_at=0)
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is parts[0]
+    assert cache.get(b"c") is parts[2]
+    assert cache.get(b"d") is None
+    assert cache.size == 8
+    cache.put(b"e", parts[0], 11)
+    assert len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_completion_uploads_large_images_once() -> None:
+    large_image = _image_message(b"L" * 300)
+    small_image = _image_message(b"S" * 30)
+    uploaded = types.File(uri="https://files.example.com/image-1", mime_type="image/png")
+
+    with mock_gemini_provider() as mock_genai:
+        mock_client = mock_genai.return_value
+        mock_client.vertexai = False
+        mock_client.aio.files.upload = AsyncMock(return_value=uploaded)
+        provider = GeminiProvider(api_key="test-api-key")
+        provider.image_upload_threshold = 100
+
+        messages = [large_image, small_image]
+        await provider._acompletion(CompletionParams(model_id="gemini-pro", messages=messages))
+        messages = [*messages, {"role": "assistant", "content": "Two images."}, _image_message(b"L" * 300)]
+        await provider._acompletion(CompletionParams(model_id="gemini-pro", messages=messages))
+
+        mock_client.aio.files.upload.assert_awaited_once()
+        contents = mock_client.aio.models.generate_content.call_args.kwargs["contents"]
+
+    large_part, small_part = contents[0].parts[0], contents[1].parts[0]
+    assert large_part.file_data.file_uri == "https://files.example.com/image-1"
+    assert contents[3].parts[0] is large_part
+    assert small_part.file_data is None
+    assert small_part.inline_data.data == b"S" * 30
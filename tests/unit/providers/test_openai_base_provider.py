@@ -1,6 +1,12 @@
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import pytest
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk as OpenAIChatCompletionChunk
+
 from any_llm.providers.openai.base import BaseOpenAIProvider
+from any_llm.providers.openai.utils import _normalize_openai_dict_response
+from any_llm.types.completion import ChatCompletionChunk, ChoiceDelta, Reasoning
 from any_llm.types.model import Model
 
 
@@ -70,3 +76,58 @@ def test_list_models_passes_kwargs_to_client(mock_openai_class: MagicMock) -> No
     provider.list_models(limit=10, after="model-123")
 
     mock_client.models.list.assert_called_once_with(limit=10, after="model-123")
+
+
+def _sdk_chunk(delta: dict[str, Any], **overrides: Any) -> OpenAIChatCompletionChunk:
+    data: dict[str, Any] = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion.chunk",
+        "created": 1700000000,
+        "model": "gpt-4o",
+        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+    }
+    data.update(overrides)
+    return OpenAIChatCompletionChunk.construct(**data)
+
+
+def _validated_chunk(chunk: OpenAIChatCompletionChunk) -> ChatCompletionChunk:
+    normalized = _normalize_openai_dict_response(chunk.model_dump())
+    normalized["object"] = "chat.completion.chunk"
+    return ChatCompletionChunk.model_validate(normalized)
+
+
+@pytest.mark.parametrize(
+    "chunk",
+    [
+        _sdk_chunk({"role": "assistant", "content": "Hello"}),
+        _sdk_chunk(
+            {
+                "tool_calls": [
+                    {"index": 0, "id": "call_1", "type": "function", "function": {"name": "f", "arguments": "{}"}}
+                ]
+            }
+        ),
+        _sdk_chunk({}, choices=[], usage={"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3}),
+        _sdk_chunk({"content": "Hi"}, object="chat.completion"),
+        _sdk_chunk({"content": "Hi", "reasoning_content": None}),
+    ],
+)
+def test_convert_completion_chunk_in_place_matches_validation(chunk: OpenAIChatCompletionChunk) -> None:
+    expected = _validated_chunk(chunk)
+
+    result = BaseOpenAIProvider._convert_completion_chunk_response(chunk)
+
+    assert result is chunk
+    assert isinstance(result, ChatCompletionChunk)
+    assert all(isinstance(choice.delta, ChoiceDelta) for choice in result.choices)
+    assert result.model_dump() == expected.model_dump()
+
+
+def test_convert_completion_chunk_normalizes_reasoning_fields() -> None:
+    chunk = _sdk_chunk({"content": None, "reasoning_content": "Thinking..."})
+    expected = _validated_chunk(chunk)
+
+    result = BaseOpenAIProvider._convert_completion_chunk_response(chunk)
+
+    assert result.choices[0].delta.reasoning == Reasoning(content="Thinking...")
+    assert result.model_dump() == expected.model_dump()
@@ -1,5 +1,7 @@
-from collections.abc import AsyncIterator
+import asyncio
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
+from pathlib import Path
 from unittest.mock import AsyncMock, Mock, patch
 from uuid import UUID
 
@@ -11,7 +13,9 @@ from pydantic import ValidationError
 from any_llm.constants import LLMProvider
 from any_llm.exceptions import MissingApiKeyError
 from any_llm.providers.openai import OpenaiProvider
-from any_llm.providers.platform import PlatformProvider
+from any_llm.providers.platform import PlatformProvider, provider_key_cache
+from any_llm.providers.platform.key_cache import ProviderKeyCache
+from any_llm.providers.platform.usage_shipper import UsageEventShipper
 from any_llm.providers.platform.utils import post_completion_usage_event
 from any_llm.types.completion import (
     ChatCompletion,
@@ -27,6 +31,14 @@ from any_llm.types.provider import PlatformKey
 
 
 # Fixtures
+@pytest.fixture(autouse=True)
+def clear_provider_key_cache() -> Iterator[None]:
+    """Keep decrypted provider keys from leaking between tests."""
+    provider_key_cache.clear()
+    yield
+    provider_key_cache.clear()
+
+
 @pytest.fixture
 def any_llm_key() -> str:
     """Fixture for a valid ANY_LLM_KEY."""
@@ -1090,3 +1102,338 @@ async def test_usage_event_uses_bearer_token(
     assert headers["Authorization"] == "Bearer mock-jwt-token-12345"
     assert "encryption-key" not in headers
     assert "AnyLLM-Challenge-Response" not in headers
+
+
+@pytest.mark.asyncio
+@patch("any_llm_platform_client.AnyLLMPlatformClient.aget_decrypted_provider_key")
+@patch("any_llm_platform_client.AnyLLMPlatformClient.get_decrypted_provider_key")
+@patch("any_llm.providers.platform.platform.post_completion_usage_event")
+async def test_provider_key_is_fetched_once_without_blocking_the_event_loop(
+    mock_post_usage: AsyncMock,
+    mock_get_decrypted_provider_key: Mock,
+    mock_aget_decrypted_provider_key: AsyncMock,
+    any_llm_key: str,
+    mock_decrypted_provider_key: DecryptedProviderKey,
+    mock_completion: ChatCompletion,
+) -> None:
+    """Test that concurrent requests share one async key lookup and later providers hit the cache."""
+
+    async def slow_lookup(**kwargs: str) -> DecryptedProviderKey:
+        await asyncio.sleep(0.01)
+        return mock_decrypted_provider_key
+
+    mock_aget_decrypted_provider_key.side_effect = slow_lookup
+    params = CompletionParams(model_id="gpt-4", messages=[{"role": "user", "content": "Hello"}])
+
+    providers = []
+    for _ in range(3):
+        provider_instance = PlatformProvider(api_key=any_llm_key)
+        provider_instance.provider = OpenaiProvider
+        providers.append(provider_instance)
+
+    with patch.object(OpenaiProvider, "_acompletion", AsyncMock(return_value=mock_completion)):
+        await asyncio.gather(*(provider_instance._acompletion(params) for provider_instance in providers))
+
+        cached_provider = PlatformProvider(api_key=any_llm_key)
+        cached_provider.provider = OpenaiProvider
+        await cached_provider._acompletion(params)
+
+    mock_get_decrypted_provider_key.assert_not_called()
+    mock_aget_decrypted_provider_key.assert_awaited_once_with(any_llm_key=any_llm_key, provider="openai")
+    assert {provider_instance.provider_key_id for provider_instance in providers} == {
+        "550e8400-e29b-41d4-a716-446655440000"
+    }
+
+
+def test_provider_key_cache_expires_and_invalidates(mock_decrypted_provider_key: DecryptedProviderKey) -> None:
+    """Test TTL expiry and explicit invalidation of cached provider keys."""
+    cache = ProviderKeyCache(ttl=10)
+    platform_client = Mock()
+    platform_client.get_decrypted_provider_key.return_value = mock_decrypted_provider_key
+
+    with patch("any_llm.providers.platform.key_cache.time.monotonic", return_value=100.0):
+        assert cache.fetch(platform_client, "key", "openai") is mock_decrypted_provider_key
+        assert cache.fetch(platform_client, "key", "openai") is mock_decrypted_provider_key
+    assert platform_client.get_decrypted_provider_key.call_count == 1
+
+    with patch("any_llm.providers.platform.key_cache.time.monotonic", return_value=110.0):
+        assert cache.get("key", "openai") is None
+
+    cache.set("key", "openai", mock_decrypted_provider_key)
+    cache.set("key", "mistral", mock_decrypted_provider_key)
+    cache.invalidate(provider="openai")
+    assert cache.get("key", "openai") is None
+    assert cache.get("key", "mistral") is mock_decrypted_provider_key
+
+
+class AuthenticationError(Exception):
+    """Mimics an SDK 401 error."""
+
+
+@pytest.mark.asyncio
+@patch("any_llm_platform_client.AnyLLMPlatformClient.aget_decrypted_provider_key")
+@patch("any_llm_platform_client.AnyLLMPlatformClient.get_decrypted_provider_key")
+async def test_authentication_error_refreshes_the_provider_key_in_the_background(
+    mock_get_decrypted_provider_key: Mock,
+    mock_aget_decrypted_provider_key: AsyncMock,
+    any_llm_key: str,
+    mock_decrypted_provider_key: DecryptedProviderKey,
+) -> None:
+    """Test that a rotated provider key is picked up after an authentication error."""
+    mock_get_decrypted_provider_key.return_value = mock_decrypted_provider_key
+    rotated_key = DecryptedProviderKey(
+        api_key="rotated-provider-api-key",
+        provider_key_id=mock_decrypted_provider_key.provider_key_id,
+        project_id=mock_decrypted_provider_key.project_id,
+        provider="openai",
+        created_at=datetime.now(),
+    )
+    mock_aget_decrypted_provider_key.return_value = rotated_key
+
+    provider_instance = PlatformProvider(api_key=any_llm_key)
+    provider_instance.provider = OpenaiProvider
+    stale_provider = provider_instance.provider
+    stale_provider._acompletion = AsyncMock(side_effect=AuthenticationError("Incorrect API key provided"))  # type: ignore[method-assign]
+
+    params = CompletionParams(model_id="gpt-4", messages=[{"role": "user", "content": "Hello"}])
+    with pytest.raises(AuthenticationError):
+        await provider_instance._acompletion(params)
+
+    await asyncio.gather(*provider_key_cache._background_tasks)
+    await asyncio.sleep(0)
+
+    mock_aget_decrypted_provider_key.assert_awaited_once()
+    assert provider_key_cache.get(any_llm_key, "openai") is rotated_key
+    assert provider_instance.provider is not stale_provider
+
+
+@pytest.mark.asyncio
+@patch("any_llm_platform_client.AnyLLMPlatformClient.get_decrypted_provider_key")
+async def test_rotated_provider_is_closed_once_its_requests_are_done(
+    mock_get_decrypted_provider_key: Mock,
+    any_llm_key: str,
+    mock_decrypted_provider_key: DecryptedProviderKey,
+) -> None:
+    """Test that the provider replaced by a key rotation is closed after the streams using it end."""
+    mock_get_decrypted_provider_key.return_value = mock_decrypted_provider_key
+    rotated_key = DecryptedProviderKey(
+        api_key="rotated-provider-api-key",
+        provider_key_id=mock_decrypted_provider_key.provider_key_id,
+        project_id=mock_decrypted_provider_key.project_id,
+        provider="openai",
+        created_at=datetime.now(),
+    )
+
+    async def _stream() -> AsyncIterator[ChatCompletionChunk]:
+        yield ChatCompletionChunk(
+            id="chatcmpl-1",
+            object="chat.completion.chunk",
+            created=0,
+            model="gpt-4",
+            choices=[ChunkChoice(index=0, delta=ChoiceDelta(content="Hi"))],
+        )
+
+    provider_instance = PlatformProvider(api_key=any_llm_key)
+    provider_instance.provider = OpenaiProvider
+    provider_instance.usage_shipper = None
+    stale_provider = provider_instance.provider
+    stale_provider._acompletion = AsyncMock(return_value=_stream())  # type: ignore[method-assign]
+    stale_provider.aclose = AsyncMock()  # type: ignore[method-assign]
+
+    params = CompletionParams(
+        model_id="gpt-4", messages=[{"role": "user", "content": "Hello"}], stream=True, stream_options={}
+    )
+    with patch("any_llm.providers.platform.platform.post_completion_usage_event", AsyncMock()):
+        stream = await provider_instance._acompletion(params)
+        provider_instance._use_provider_key(rotated_key)
+        await asyncio.sleep(0)
+        stale_provider.aclose.assert_not_awaited()
+
+        assert [chunk.choices[0].delta.content async for chunk in stream] == ["Hi"]  # type: ignore[union-attr]
+    await asyncio.sleep(0)
+
+    stale_provider.aclose.assert_awaited_once()
+    # A provider without requests in flight is closed right away.
+    current_provider = provider_instance.provider
+    current_provider.aclose = AsyncMock()  # type: ignore[method-assign]
+    provider_instance._use_provider_key(mock_decrypted_provider_key)
+    await asyncio.sleep(0)
+    current_provider.aclose.assert_awaited_once()
+
+
+def _spill_files(directory: Path) -> list[Path]:
+    return list(directory.iterdir())
+
+
+def _http_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://platform-api.any-llm.ai/api/v1/usage-events/")
+    return httpx.HTTPStatusError("error", request=request, response=httpx.Response(status_code, request=request))
+
+
+@pytest.mark.asyncio
+@patch("any_llm.providers.platform.usage_shipper.post_usage_event_payload")
+async def test_usage_shipper_posts_events_in_batches(
+    mock_post_payload: AsyncMock,
+    mock_platform_client: Mock,
+    any_llm_key: str,
+) -> None:
+    """Test that a full batch is posted right away and the rest on flush."""
+    shipper = UsageEventShipper(batch_size=2, flush_interval=60)
+
+    for i in range(3):
+        shipper.submit(mock_platform_client, any_llm_key, {"id": str(i)})
+    await asyncio.sleep(0.01)
+
+    assert mock_post_payload.await_count == 2
+    assert len(shipper) == 1
+
+    await shipper.aclose()
+
+    assert [call.args[2]["id"] for call in mock_post_payload.await_args_list] == ["0", "1", "2"]
+    assert mock_post_payload.await_args_list[0].args[1] == "mock-jwt-token-12345"
+    assert shipper.stats.sent == 3
+
+
+@pytest.mark.asyncio
+@patch("any_llm.providers.platform.usage_shipper._backoff_delay", return_value=0)
+@patch("any_llm.providers.platform.usage_shipper.post_usage_event_payload")
+async def test_usage_shipper_retries_and_spills_undeliverable_events(
+    mock_post_payload: AsyncMock,
+    mock_backoff_delay: Mock,
+    mock_platform_client: Mock,
+    any_llm_key: str,
+    tmp_path: Path,
+) -> None:
+    """Test retries on transient errors, spilling once they are exhausted and replaying afterwards."""
+    shipper = UsageEventShipper(max_retries=1, spill_directory=tmp_path)
+    mock_post_payload.side_effect = [_http_error(503), None, _http_error(503), _http_error(503), _http_error(400)]
+
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "retried"})
+    await shipper.flush()
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "spilled"})
+    await shipper.flush()
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "rejected"})
+    await shipper.flush()
+
+    stats = shipper.stats
+    assert (stats.sent, stats.retried, stats.spilled, stats.dropped) == (1, 2, 1, 1)
+    (spill_file,) = _spill_files(tmp_path)
+    assert any_llm_key not in spill_file.name
+    assert any_llm_key not in spill_file.read_text()
+
+    mock_post_payload.side_effect = None
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "recovered"})
+    await shipper.flush()
+    await shipper.aclose()
+
+    posted = [call.args[2]["id"] for call in mock_post_payload.await_args_list[-2:]]
+    assert posted == ["recovered", "spilled"]
+    assert shipper.stats.replayed == 1
+    assert not _spill_files(tmp_path)
+
+
+@patch("any_llm.providers.platform.usage_shipper.post_usage_event_payload")
+def test_usage_shipper_posts_events_left_by_a_finished_loop_on_close(
+    mock_post_payload: AsyncMock,
+    mock_platform_client: Mock,
+    any_llm_key: str,
+    tmp_path: Path,
+) -> None:
+    """Test that events still queued when `asyncio.run` returns are posted, or spilled, by close()."""
+    shipper = UsageEventShipper(flush_interval=60, spill_directory=tmp_path)
+
+    async def _submit(event_id: str) -> None:
+        shipper.submit(mock_platform_client, any_llm_key, {"id": event_id})
+
+    asyncio.run(_submit("posted"))
+    shipper.close()
+
+    mock_post_payload.assert_awaited_once()
+    assert isinstance(mock_post_payload.await_args_list[0].args[0], httpx.AsyncClient)
+    assert (shipper.stats.sent, shipper.stats.dropped, shipper.stats.spilled) == (1, 0, 0)
+
+    async def _hang(*args: object) -> None:
+        await asyncio.sleep(10)
+
+    mock_post_payload.side_effect = _hang
+    asyncio.run(_submit("spilled"))
+    shipper.close(timeout=0.05)
+
+    assert (shipper.stats.sent, shipper.stats.dropped, shipper.stats.spilled) == (1, 0, 1)
+    assert len(_spill_files(tmp_path)) == 1
+
+
+def test_usage_shipper_drops_events_when_the_queue_is_full(mock_platform_client: Mock, any_llm_key: str) -> None:
+    """Test that events beyond the queue size are dropped without a spill directory."""
+    shipper = UsageEventShipper(max_queue_size=1)
+
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "queued"})
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "dropped"})
+
+    assert len(shipper) == 1
+    assert shipper.stats.dropped == 1
+
+
+@pytest.mark.asyncio
+@patch("any_llm.providers.platform.usage_shipper._backoff_delay", return_value=0)
+@patch("any_llm.providers.platform.usage_shipper.post_usage_event_payload")
+async def test_usage_shipper_drops_the_oldest_events_when_retries_overflow_the_queue(
+    mock_post_payload: AsyncMock,
+    mock_backoff_delay: Mock,
+    mock_platform_client: Mock,
+    any_llm_key: str,
+) -> None:
+    """Test that failed events queued again are subject to the queue size too."""
+    shipper = UsageEventShipper(max_queue_size=2, flush_interval=60)
+
+    async def _post(client: httpx.AsyncClient, access_token: str, payload: dict[str, str]) -> None:
+        if payload["id"] in ("old-1", "old-2"):
+            if len(shipper) == 2:
+                # Newer events fill the queue while the old ones are being posted.
+                shipper.submit(mock_platform_client, any_llm_key, {"id": "new-1"})
+                shipper.submit(mock_platform_client, any_llm_key, {"id": "new-2"})
+            raise _http_error(503)
+
+    mock_post_payload.side_effect = _post
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "old-1"})
+    shipper.submit(mock_platform_client, any_llm_key, {"id": "old-2"})
+    await shipper.flush()
+    await shipper.aclose()
+
+    posted = [call.args[2]["id"] for call in mock_post_payload.await_args_list]
+    assert posted == ["old-1", "old-2", "new-1", "new-2"]
+    assert (shipper.stats.sent, shipper.stats.dropped) == (2, 2)
+
+
+@pytest.mark.asyncio
+@patch("any_llm_platform_client.AnyLLMPlatformClient.get_decrypted_provider_key")
+@patch("any_llm.providers.platform.usage_shipper.post_usage_event_payload")
+async def test_completion_returns_before_its_usage_event_is_posted(
+    mock_post_payload: AsyncMock,
+    mock_get_decrypted_provider_key: Mock,
+    any_llm_key: str,
+    mock_decrypted_provider_key: DecryptedProviderKey,
+    mock_completion: ChatCompletion,
+) -> None:
+    """Test that usage events go through the background shipper."""
+    mock_get_decrypted_provider_key.return_value = mock_decrypted_provider_key
+    shipper = UsageEventShipper(flush_interval=60)
+
+    provider_instance = PlatformProvider(api_key=any_llm_key)
+    provider_instance.usage_shipper = shipper
+    provider_instance.provider = OpenaiProvider
+    provider_instance.platform_client._aensure_valid_token = AsyncMock(return_value="mock-jwt-token-12345")  # type: ignore[method-assign]
+    provider_instance.provider._acompletion = AsyncMock(return_value=mock_completion)  # type: ignore[method-assign]
+
+    params = CompletionParams(model_id="gpt-4", messages=[{"role": "user", "content": "Hello"}])
+    result = await provider_instance._acompletion(params)
+
+    assert result == mock_completion
+    mock_post_payload.assert_not_awaited()
+
+    await shipper.aclose()
+
+    mock_post_payload.assert_awaited_once()
+    payload = mock_post_payload.await_args_list[0].args[2]
+    assert payload["provider_key_id"] == "550e8400-e29b-41d4-a716-446655440000"
+    assert payload["data"]["input_tokens"] == str(mock_completion.usage.prompt_tokens)  # type: ignore[union-attr]
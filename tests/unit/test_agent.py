@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from openai.types.chat.chat_completion import ChatCompletion as OpenAIChatCompletion
+
+from any_llm.agent import aexecute_tool_calls
+from any_llm.providers.openai.openai import OpenaiProvider
+
+
+async def get_weather(location: str) -> str:
+    """Get the weather for a location.
+
+    Args:
+        location: The city name.
+
+    """
+    await asyncio.sleep(0.2)
+    return f"Sunny in {location}"
+
+
+def get_population(city: str) -> dict[str, Any]:
+    """Get the population of a city.
+
+    Args:
+        city: The city name.
+
+    """
+    time.sleep(0.2)
+    return {"city": city, "population": 2_100_000}
+
+
+def _response(*tool_calls: tuple[str, str], content: str | None = None) -> OpenAIChatCompletion:
+    return OpenAIChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4.1-mini",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "tool_calls" if tool_calls else "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": content,
+                        "tool_calls": [
+                            {"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": arguments}}
+                            for i, (name, arguments) in enumerate(tool_calls)
+                        ]
+                        or None,
+                    },
+                }
+            ],
+            "usage": {"prompt_tokens": 100, "completion_tokens": 10, "total_tokens": 110},
+        }
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_tools_runs_parallel_tool_calls_concurrently() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    responses = [
+        _response(
+            ("get_weather", '{"location": "Paris"}'),
+            ("get_population", '{"city": "Paris"}'),
+            ("get_weather", '{"location": "Rome"}'),
+        ),
+        _response(content="Sunny everywhere."),
+    ]
+    messages: list[dict[str, Any]] = [{"role": "user", "content": "Weather and population of Paris and Rome?"}]
+
+    with patch.object(provider.client.chat.completions, "create", AsyncMock(side_effect=responses)) as create:
+        result = await provider.arun_tools("gpt-4.1-mini", messages, [get_weather, get_population])
+
+    assert result.finished
+    assert result.content == "Sunny everywhere."
+    assert len(messages) == 1
+    step = result.steps[0]
+    assert step.tools_seconds < 0.35
+    assert [tool_result.output for tool_result in step.tool_results] == [
+        "Sunny in Paris",
+        {"city": "Paris", "population": 2_100_000},
+        "Sunny in Rome",
+    ]
+    assert (result.prompt_tokens, result.completion_tokens) == (200, 20)
+    assert [tool["function"]["name"] for tool in create.call_args.kwargs["tools"]] == ["get_weather", "get_population"]
+
+    sent = create.call_args.kwargs["messages"]
+    assert sent[1]["tool_calls"][0]["id"] == "call_0"
+    assert sent[2:] == [
+        {"role": "tool", "tool_call_id": "call_0", "name": "get_weather", "content": "Sunny in Paris"},
+        {
+            "role": "tool",
+            "tool_call_id": "call_1",
+            "name": "get_population",
+            "content": '{"city": "Paris", "population": 2100000}',
+        },
+        {"role": "tool", "tool_call_id": "call_2", "name": "get_weather", "content": "Sunny in Rome"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_tools_stops_at_step_limit() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    call = _response(("get_population", '{"city": "Rome"}'))
+
+    with patch.object(provider.client.chat.completions, "create", AsyncMock(return_value=call)) as create:
+        result = await provider.arun_tools(
+            "gpt-4.1-mini", [{"role": "user", "content": "Hi"}], [get_population], max_steps=2
+        )
+
+    assert not result.finished
+    assert len(result.steps) == 2
+    assert create.await_count == 2
+    assert result.messages[-1]["role"] == "tool"  # type: ignore[index]
+
+    with pytest.raises(ValueError, match="stream"):
+        await provider.arun_tools("gpt-4.1-mini", [{"role": "user", "content": "Hi"}], [get_population], stream=True)
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_reports_errors() -> None:
+    def fail() -> str:
+        """Fail."""
+        msg = "boom"
+        raise RuntimeError(msg)
+
+    message = (
+        _response(
+            ("get_weather", '{"location": "Paris"}'),
+            ("get_population", '{"city": '),
+            ("search", "{}"),
+            ("fail", ""),
+            ("get_population", '{"town": "Rome"}'),
+        )
+        .choices[0]
+        .message
+    )
+    assert message.tool_calls is not None
+
+    results = await aexecute_tool_calls(
+        message.tool_calls,
+        {"get_weather": get_weather, "get_population": get_population, "fail": fail},
+        tool_timeout={"get_weather": 0.05},
+    )
+
+    assert [result.tool_call_id for result in results] == [f"call_{i}" for i in range(5)]
+    assert all(result.error is not None for result in results)
+    assert results[0].content == "Error: TimeoutError: Tool 'get_weather' timed out after 0.05 seconds"
+    assert results[1].content.startswith("Error: ValueError: Invalid JSON arguments")
+    assert results[2].content == "Error: ValueError: Unknown tool 'search'"
+    assert results[3].content == "Error: RuntimeError: boom"
+    assert isinstance(results[4].error, TypeError)
+    assert results[4].arguments == {"town": "Rome"}
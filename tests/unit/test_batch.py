@@ -0,0 +1,271 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from any_llm.batch import BatchFileWriter, LocalBatchExecutor, _load_progress, await_batch, write_batch_files
+from any_llm.exceptions import ProviderError, RateLimitError
+from any_llm.providers.deepseek.deepseek import DeepseekProvider
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.types.batch import Batch
+from any_llm.types.completion import ChatCompletion
+
+
+def _completion(content: str) -> ChatCompletion:
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "deepseek-chat",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        }
+    )
+
+
+def _write_requests(path: Path, prompts: list[str]) -> str:
+    lines = [
+        json.dumps(
+            {
+                "custom_id": f"request-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {"model": "deepseek-chat", "messages": [{"role": "user", "content": prompt}]},
+            }
+        )
+        for i, prompt in enumerate(prompts)
+    ]
+    path.write_text("\n".join(lines) + "\n\n")
+    return str(path)
+
+
+async def _answer(**kwargs: Any) -> ChatCompletion:
+    prompt = kwargs["messages"][0]["content"]
+    if prompt == "fail":
+        msg = "Invalid prompt"
+        raise ValueError(msg)
+    return _completion(prompt.upper())
+
+
+def _read_results(path: str | None) -> dict[str, dict[str, Any]]:
+    records = [json.loads(line) for line in Path(str(path)).read_text().splitlines()]
+    return {record["custom_id"]: record for record in records}
+
+
+@pytest.mark.asyncio
+async def test_local_batch_writes_outputs_and_errors(tmp_path: Path) -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    provider.local_batches = LocalBatchExecutor(provider, directory=tmp_path / "batches", max_concurrency=2)
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a", "fail", "b", "c"])
+
+    with patch.object(provider, "acompletion", AsyncMock(side_effect=_answer)) as acompletion:
+        batch = await provider.acreate_batch(input_file_path=input_file_path, endpoint="/v1/chat/completions")
+        assert batch.status == "validating"
+        batch = await provider.local_batches.wait(batch.id)
+
+    assert acompletion.await_count == 4
+    assert batch.status == "completed"
+    assert batch.request_counts is not None
+    assert batch.request_counts.model_dump() == {"total": 4, "completed": 3, "failed": 1}
+    outputs = _read_results(batch.output_file_id)
+    assert outputs.keys() == {"request-0", "request-2", "request-3"}
+    assert outputs["request-2"]["response"]["body"]["choices"][0]["message"]["content"] == "B"
+    errors = _read_results(batch.error_file_id)
+    assert errors["request-1"]["error"] == {"code": "ValueError", "message": "Invalid prompt"}
+
+    retrieved = await provider.aretrieve_batch(batch.id)
+    assert retrieved == batch
+
+
+@pytest.mark.asyncio
+async def test_local_batch_resumes_after_cancel(tmp_path: Path) -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    executor = LocalBatchExecutor(provider, directory=tmp_path, max_concurrency=1)
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a", "b", "c"])
+    blocked = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _blocked_answer(**kwargs: Any) -> ChatCompletion:
+        if kwargs["messages"][0]["content"] != "a":
+            blocked.set()
+            await release.wait()
+        return await _answer(**kwargs)
+
+    with patch.object(provider, "acompletion", AsyncMock(side_effect=_blocked_answer)) as acompletion:
+        batch = await executor.acreate(input_file_path, "/v1/chat/completions")
+        await blocked.wait()
+        cancelled = await executor.acancel(batch.id)
+
+        assert cancelled.status == "cancelled"
+        assert cancelled.request_counts is not None
+        assert cancelled.request_counts.completed == 1
+
+        # A new executor, as after a restart, only sends the requests without a result.
+        acompletion.reset_mock()
+        release.set()
+        executor = LocalBatchExecutor(provider, directory=tmp_path)
+        await executor.aresume(batch.id)
+        resumed = await executor.wait(batch.id)
+
+    assert [call.kwargs["messages"][0]["content"] for call in acompletion.await_args_list] == ["b", "c"]
+    assert resumed.status == "completed"
+    assert resumed.request_counts is not None
+    assert resumed.request_counts.model_dump() == {"total": 3, "completed": 3, "failed": 0}
+    assert _read_results(resumed.output_file_id).keys() == {"request-0", "request-1", "request-2"}
+
+
+@pytest.mark.asyncio
+async def test_local_batch_retries_rate_limit_and_transient_errors(tmp_path: Path) -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    executor = LocalBatchExecutor(provider, directory=tmp_path)
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a", "b"])
+    failures: dict[str, list[Exception]] = {
+        "a": [RateLimitError("Too many requests"), TimeoutError()],
+        "b": [RateLimitError("Too many requests")],
+    }
+
+    async def _flaky_answer(**kwargs: Any) -> ChatCompletion:
+        prompt = kwargs["messages"][0]["content"]
+        if failures[prompt]:
+            raise failures[prompt].pop(0)
+        return await _answer(**kwargs)
+
+    with (
+        patch.object(provider, "acompletion", AsyncMock(side_effect=_flaky_answer)) as acompletion,
+        patch("any_llm.batch.MAX_REQUEST_RETRIES", 1),
+        patch("any_llm.batch._backoff_delay", return_value=0),
+    ):
+        batch = await executor.acreate(input_file_path, "/v1/chat/completions")
+        batch = await executor.wait(batch.id)
+
+    assert acompletion.await_count == 4
+    assert batch.request_counts is not None
+    assert batch.request_counts.model_dump() == {"total": 2, "completed": 1, "failed": 1}
+    assert _read_results(batch.output_file_id).keys() == {"request-1"}
+    # Retries are exhausted: the last error is recorded.
+    assert _read_results(batch.error_file_id)["request-0"]["error"]["code"] == "TimeoutError"
+
+
+@pytest.mark.asyncio
+async def test_local_batch_list_and_unknown_batches(tmp_path: Path) -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    executor = LocalBatchExecutor(provider, directory=tmp_path / "batches")
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a"])
+
+    with patch.object(provider, "acompletion", AsyncMock(side_effect=_answer)):
+        first = await executor.acreate(input_file_path, "/v1/chat/completions", metadata={"name": "first"})
+        second = await executor.acreate(input_file_path, "/v1/chat/completions", metadata={"name": "second"})
+        await executor.wait(first.id)
+        await executor.wait(second.id)
+
+    batches = await executor.alist()
+    assert {batch.id for batch in batches} == {first.id, second.id}
+    assert await executor.alist(after=batches[0].id) == [batches[1]]
+
+    with pytest.raises(ValueError, match="not found"):
+        await executor.aretrieve("batch_local_unknown")
+    with pytest.raises(ValueError, match="endpoints"):
+        await executor.acreate(input_file_path, "/v1/completions")
+
+
+def test_load_progress_drops_partial_lines(tmp_path: Path) -> None:
+    output_path = tmp_path / "output.jsonl"
+    error_path = tmp_path / "errors.jsonl"
+    output_path.write_text(json.dumps({"custom_id": "a"}) + "\n" + '{"custom_id": "b", "resp')
+    error_path.write_text(json.dumps({"custom_id": "c"}) + "\n")
+
+    assert _load_progress(output_path, error_path) == {"a": True, "c": False}
+    assert output_path.read_text() == json.dumps({"custom_id": "a"}) + "\n"
+
+
+def test_write_batch_files_shards_and_validates(tmp_path: Path) -> None:
+    bodies = ({"model": "gpt-4.1-mini", "messages": [{"role": "user", "content": str(i)}]} for i in range(5))
+    paths = write_batch_files(bodies, tmp_path, max_requests=2)
+
+    assert [path.name for path in paths] == ["batch-0000.jsonl", "batch-0001.jsonl", "batch-0002.jsonl"]
+    lines = [json.loads(line) for path in paths for line in path.read_text().splitlines()]
+    assert [line["custom_id"] for line in lines] == [f"request-{i}" for i in range(5)]
+    assert lines[0]["url"] == "/v1/chat/completions"
+
+    with BatchFileWriter(tmp_path / "embeddings", "/v1/embeddings", max_bytes=200) as writer:
+        writer.add({"model": "text-embedding-3-small", "input": "a"}, custom_id="a")
+        writer.add({"model": "text-embedding-3-small", "input": "b"}, custom_id="b")
+        with pytest.raises(ValueError, match="Duplicate"):
+            writer.add({"model": "text-embedding-3-small", "input": "a"}, custom_id="a")
+        with pytest.raises(ValueError, match="requires input"):
+            writer.add({"model": "text-embedding-3-small"})
+        with pytest.raises(ValueError, match="larger than"):
+            writer.add({"model": "text-embedding-3-small", "input": "x" * 200})
+    assert len(writer.paths) == 2
+
+
+@pytest.mark.asyncio
+async def test_aiter_batch_results_streams_local_batch(tmp_path: Path) -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    provider.local_batches = LocalBatchExecutor(provider, directory=tmp_path / "batches")
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a", "fail"])
+
+    with patch.object(provider, "acompletion", AsyncMock(side_effect=_answer)):
+        batch = await provider.acreate_batch(input_file_path=input_file_path, endpoint="/v1/chat/completions")
+        results = [result async for result in provider.aiter_batch_results(batch.id, poll_interval=0.01)]
+
+    assert [result.custom_id for result in results] == ["request-0", "request-1"]
+    assert results[0].completion.choices[0].message.content == "A"
+    assert results[1].error == {"code": "ValueError", "message": "Invalid prompt"}
+    with pytest.raises(ValueError, match="failed"):
+        _ = results[1].completion
+
+
+def _batch(status: str) -> Batch:
+    return Batch(
+        id="batch_1",
+        object="batch",
+        endpoint="/v1/chat/completions",
+        input_file_id="file-1",
+        completion_window="24h",
+        status=status,  # type: ignore[arg-type]
+        created_at=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_await_batch_backs_off() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    statuses = ["validating", "in_progress", "in_progress", "in_progress", "completed"]
+    retrieve = AsyncMock(side_effect=[_batch(status) for status in statuses])
+
+    with (
+        patch.object(provider, "aretrieve_batch", retrieve),
+        patch("any_llm.batch.asyncio.sleep", AsyncMock()) as sleep,
+    ):
+        batch = await await_batch(provider, "batch_1", poll_interval=1, max_poll_interval=3)
+
+    assert batch.status == "completed"
+    assert [call.args[0] for call in sleep.await_args_list] == [1, 2, 3, 3]
+
+    with (
+        patch.object(provider, "aretrieve_batch", AsyncMock(return_value=_batch("failed"))),
+        pytest.raises(ProviderError, match="batch_1 failed"),
+    ):
+        _ = [result async for result in provider.aiter_batch_results("batch_1")]
+
+
+@pytest.mark.asyncio
+async def test_openai_batch_upload_streams_file(tmp_path: Path) -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    input_file_path = _write_requests(tmp_path / "requests.jsonl", ["a"])
+    uploaded = AsyncMock(return_value=AsyncMock(id="file-1"))
+
+    with (
+        patch.object(provider.client.files, "create", uploaded),
+        patch.object(provider.client.batches, "create", AsyncMock(return_value=_batch("validating"))),
+    ):
+        await provider.acreate_batch(input_file_path=input_file_path, endpoint="/v1/chat/completions")
+
+    name, file = uploaded.call_args.kwargs["file"]
+    assert name == "requests.jsonl"
+    assert file.name == input_file_path
+    assert file.closed
@@ -0,0 +1,236 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from any_llm import AnyLLM
+from any_llm.cache import (
+    CacheBackend,
+    CompletionCache,
+    DiskCacheBackend,
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+)
+from any_llm.constants import LLMProvider
+from any_llm.types.completion import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+    Choice,
+    ChoiceDelta,
+    ChunkChoice,
+    CreateEmbeddingResponse,
+    Embedding,
+    Usage,
+)
+
+MESSAGES: list[dict[str, Any] | ChatCompletionMessage] = [{"role": "user", "content": "Hello"}]
+
+
+def _completion(content: str) -> ChatCompletion:
+    return ChatCompletion(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="gpt-4.1-mini",
+        choices=[
+            Choice(index=0, finish_reason="stop", message=ChatCompletionMessage(role="assistant", content=content))
+        ],
+    )
+
+
+def _chunk(content: str) -> ChatCompletionChunk:
+    return ChatCompletionChunk(
+        id="chatcmpl-1",
+        object="chat.completion.chunk",
+        created=0,
+        model="gpt-4.1-mini",
+        choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=content))],
+    )
+
+
+async def _stream(*contents: str) -> AsyncIterator[ChatCompletionChunk]:
+    for content in contents:
+        yield _chunk(content)
+
+
+@pytest.fixture(params=["memory", "sqlite", "disk"])
+def backend(request: pytest.FixtureRequest, tmp_path: Path) -> CacheBackend:
+    if request.param == "memory":
+        return MemoryCacheBackend()
+    if request.param == "sqlite":
+        return SQLiteCacheBackend(tmp_path / "cache.sqlite")
+    return DiskCacheBackend(tmp_path / "cache")
+
+
+def test_backend_roundtrip_and_ttl(backend: CacheBackend) -> None:
+    key = "ab" * 32
+    assert backend.get(key) is None
+
+    backend.set(key, b"value")
+    assert backend.get(key) == b"value"
+
+    with patch("any_llm.cache.time.time", return_value=1000.0):
+        backend.set(key, b"expiring", expires_at=1010.0)
+        assert backend.get(key) == b"expiring"
+    with patch("any_llm.cache.time.time", return_value=1010.0):
+        assert backend.get(key) is None
+
+    backend.set(key, b"value")
+    backend.delete(key)
+    assert backend.get(key) is None
+
+    backend.set(key, b"value")
+    backend.clear()
+    assert backend.get(key) is None
+    backend.close()
+
+
+def test_memory_backend_evicts_least_recently_used_values_by_size() -> None:
+    backend = MemoryCacheBackend(max_bytes=10)
+    backend.set("a", b"aaaa")
+    backend.set("b", b"bbbb")
+    assert backend.get("a") == b"aaaa"
+
+    backend.set("c", b"cccc")
+
+    assert backend.get("b") is None
+    assert backend.get("a") == b"aaaa"
+    assert backend.get("c") == b"cccc"
+    assert backend.size_bytes == 8
+
+    backend.set("too-large", b"x" * 11)
+    assert backend.get("too-large") is None
+    assert len(backend) == 2
+
+
+def test_disk_backend_shards_files(tmp_path: Path) -> None:
+    backend = DiskCacheBackend(tmp_path, shard_depth=2)
+    key = "0123456789abcdef"
+
+    backend.set(key, b"value")
+
+    assert (tmp_path / "01" / "23" / key).is_file()
+
+
+@pytest.mark.asyncio
+async def test_completion_is_served_from_cache(backend: CacheBackend) -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.cache = CompletionCache(backend)
+
+    with patch.object(llm, "_acompletion", AsyncMock(return_value=_completion("Hi!"))) as mock_acompletion:
+        first = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, temperature=0)
+        second = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, temperature=0)
+        other = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, temperature=0, seed=1)
+
+    assert mock_acompletion.call_count == 2
+    assert isinstance(second, ChatCompletion)
+    assert second == first
+    assert isinstance(other, ChatCompletion)
+    assert (llm.cache.stats.hits, llm.cache.stats.misses) == (1, 2)
+    assert llm.cache.stats.hit_rate == pytest.approx(1 / 3)
+
+
+@pytest.mark.asyncio
+async def test_cache_can_be_bypassed_or_passed_per_call() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.cache = CompletionCache()
+    per_call_cache = CompletionCache()
+
+    with patch.object(llm, "_acompletion", AsyncMock(return_value=_completion("Hi!"))) as mock_acompletion:
+        await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES)
+        await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, cache=False)
+        await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, cache=per_call_cache)
+
+    assert mock_acompletion.call_count == 3
+    assert "cache" not in mock_acompletion.call_args.kwargs
+    assert (llm.cache.stats.misses, llm.cache.stats.bypasses) == (1, 1)
+    assert per_call_cache.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_is_cached_once_consumed_and_replayed() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.cache = CompletionCache()
+
+    with patch.object(llm, "_acompletion", AsyncMock(side_effect=lambda *a, **k: _stream("Hel", "lo"))) as mock_call:
+        # An abandoned stream is not cached.
+        partial = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, stream=True)
+        async for _ in partial:  # type: ignore[union-attr]
+            break
+        await partial.aclose()  # type: ignore[union-attr]
+
+        first = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, stream=True)
+        first_contents = [chunk.choices[0].delta.content async for chunk in first]  # type: ignore[union-attr]
+
+        replayed = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES, stream=True)
+        replayed_chunks = [chunk async for chunk in replayed]  # type: ignore[union-attr]
+
+    assert mock_call.call_count == 2
+    assert first_contents == ["Hel", "lo"]
+    assert all(isinstance(chunk, ChatCompletionChunk) for chunk in replayed_chunks)
+    assert [chunk.choices[0].delta.content for chunk in replayed_chunks] == ["Hel", "lo"]
+
+
+@pytest.mark.asyncio
+async def test_embedding_is_served_from_cache() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.cache = CompletionCache()
+    response = CreateEmbeddingResponse(
+        data=[Embedding(embedding=[0.1, 0.2], index=0, object="embedding")],
+        model="text-embedding-3-small",
+        object="list",
+        usage=Usage(prompt_tokens=1, total_tokens=1),
+    )
+
+    with patch.object(llm, "_aembedding", AsyncMock(return_value=response)) as mock_aembedding:
+        first = await llm.aembedding("text-embedding-3-small", "Hello")
+        second = await llm.aembedding("text-embedding-3-small", "Hello")
+        await llm.aembedding("text-embedding-3-small", "Hello", dimensions=2)
+
+    assert mock_aembedding.call_count == 2
+    assert second == first
+
+
+class _BrokenBackend(MemoryCacheBackend):
+    def get(self, key: str) -> bytes | None:
+        msg = "disk on fire"
+        raise OSError(msg)
+
+    def set(self, key: str, value: bytes, expires_at: float | None = None) -> None:
+        msg = "disk on fire"
+        raise OSError(msg)
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_fall_back_to_the_provider() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.cache = CompletionCache(_BrokenBackend())
+
+    with patch.object(llm, "_acompletion", AsyncMock(return_value=_completion("Hi!"))):
+        response = await llm.acompletion(model="gpt-4.1-mini", messages=MESSAGES)
+
+    assert isinstance(response, ChatCompletion)
+    assert llm.cache.stats.errors == 2
+
+
+def test_unhashable_arguments_are_not_cached() -> None:
+    cache = CompletionCache()
+
+    assert cache._key(cache.embedding_key, "openai", "model", "text", {"client": object()}) is None
+    assert cache.stats.bypasses == 1
+
+
+def test_completion_key_is_canonical() -> None:
+    cache = CompletionCache()
+    kwargs_a: dict[str, Any] = {"extra_body": {"a": 1, "b": 2}}
+    kwargs_b: dict[str, Any] = {"extra_body": {"b": 2, "a": 1}}
+
+    key_a = cache.embedding_key("openai", "model", ["x"], kwargs_a)
+    key_b = cache.embedding_key("openai", "model", ["x"], kwargs_b)
+
+    assert key_a == key_b
+    assert key_a != cache.embedding_key("mistral", "model", ["x"], kwargs_a)
+    assert key_a != CompletionCache(namespace="staging").embedding_key("openai", "model", ["x"], kwargs_a)
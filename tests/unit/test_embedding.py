@@ -1,11 +1,15 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
 from any_llm import AnyLLM
-from any_llm.api import aembedding
+from any_llm.api import aembedding, aembedding_many, provider_registry
 from any_llm.constants import LLMProvider
-from any_llm.types.completion import CreateEmbeddingResponse, Embedding, Usage
+from any_llm.types.completion import CreateEmbeddingResponse, Embedding, EmbeddingBatch, Usage
+from any_llm.utils.embeddings import aiter_embedding_batches, stack_embeddings
 
 
 @pytest.mark.asyncio
@@ -18,7 +22,7 @@ async def test_embedding_with_api_config() -> None:
         object="list",
         usage=Usage(prompt_tokens=2, total_tokens=2),
     )
-    mock_provider._aembedding = AsyncMock(return_value=mock_embedding_response)
+    mock_provider.aembedding = AsyncMock(return_value=mock_embedding_response)
 
     with patch("any_llm.any_llm.AnyLLM.create") as mock_create:
         mock_create.return_value = mock_provider
@@ -32,7 +36,7 @@ async def test_embedding_with_api_config() -> None:
         assert call_args[1]["api_key"] == "test_key"
         assert call_args[1]["api_base"] == "https://test.example.com"
 
-        mock_provider._aembedding.assert_called_once_with("test-model", "Hello world")
+        mock_provider.aembedding.assert_called_once_with("test-model", "Hello world")
         assert result == mock_embedding_response
 
 
@@ -45,3 +49,147 @@ async def test_embedding_unsupported_provider_raises_not_implemented(provider: L
             await aembedding(f"{provider.value}/does-not-matter", inputs="Hello world", api_key="test_key")
     else:
         pytest.skip(f"{provider.value} supports embeddings, skipping")
+
+
+def _embedding_response(texts: list[str]) -> CreateEmbeddingResponse:
+    return CreateEmbeddingResponse(
+        data=[
+            Embedding(embedding=[float(len(text)), 1.0], index=i, object="embedding") for i, text in enumerate(texts)
+        ],
+        model="test-model",
+        object="list",
+        usage=Usage(prompt_tokens=len(texts), total_tokens=len(texts)),
+    )
+
+
+def _provider_with_fake_embedding(delays: dict[str, float] | None = None) -> tuple[AnyLLM, list[list[str]]]:
+    provider = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    calls: list[list[str]] = []
+
+    async def fake_aembedding(model: str, inputs: list[str], **kwargs: Any) -> CreateEmbeddingResponse:
+        calls.append(inputs)
+        await asyncio.sleep((delays or {}).get(inputs[0], 0))
+        return _embedding_response(inputs)
+
+    provider.aembedding = fake_aembedding  # type: ignore[method-assign]
+    return provider, calls
+
+
+@pytest.mark.asyncio
+async def test_aiter_embedding_batches_respects_size_and_token_limits() -> None:
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d", "e", "f"]
+
+    batches = [batch async for batch in aiter_embedding_batches(texts, max_batch_size=2, max_batch_tokens=20)]
+
+    assert batches == [(0, ["a" * 40]), (1, ["b" * 40]), (2, ["c" * 40, "d"]), (4, ["e", "f"])]
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_keeps_input_order_when_batches_finish_out_of_order() -> None:
+    provider, calls = _provider_with_fake_embedding(delays={"a": 0.05, "c": 0.01})
+
+    batches = [batch async for batch in provider.aembedding_many("test-model", ["a", "bb", "c", "dddd"], batch_size=1)]
+
+    assert [batch.index for batch in batches] == [0, 1, 2, 3]
+    assert [batch.embeddings for batch in batches] == [[[1.0, 1.0]], [[2.0, 1.0]], [[1.0, 1.0]], [[4.0, 1.0]]]
+    assert len(calls) == 4
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_bounds_concurrency() -> None:
+    provider = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    in_flight = 0
+    peak = 0
+
+    async def fake_aembedding(model: str, inputs: list[str], **kwargs: Any) -> CreateEmbeddingResponse:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return _embedding_response(inputs)
+
+    provider.aembedding = fake_aembedding  # type: ignore[method-assign]
+
+    async def texts() -> AsyncIterator[str]:
+        for i in range(20):
+            yield str(i)
+
+    batches = [
+        batch async for batch in provider.aembedding_many("test-model", texts(), batch_size=2, max_concurrency=3)
+    ]
+
+    assert len(batches) == 10
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_yields_done_batches_while_waiting_for_inputs() -> None:
+    provider, _ = _provider_with_fake_embedding()
+    first_batch_received = asyncio.Event()
+
+    async def texts() -> AsyncIterator[str]:
+        yield "a"
+        await first_batch_received.wait()
+        yield "b"
+
+    batches = provider.aembedding_many("test-model", texts(), batch_size=1)
+    first = await asyncio.wait_for(anext(batches), timeout=1)
+    first_batch_received.set()
+
+    assert first.index == 0
+    assert [batch.index async for batch in batches] == [1]
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_caps_batch_size_at_provider_limit() -> None:
+    provider, calls = _provider_with_fake_embedding()
+
+    texts = ["x"] * (provider.EMBEDDING_MAX_BATCH_SIZE + 1)
+    batches = [batch async for batch in provider.aembedding_many("test-model", texts, batch_size=10**6)]
+
+    assert [len(call) for call in calls] == [provider.EMBEDDING_MAX_BATCH_SIZE, 1]
+    assert batches[1].index == provider.EMBEDDING_MAX_BATCH_SIZE
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_propagates_errors() -> None:
+    provider = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    provider.aembedding = AsyncMock(side_effect=RuntimeError("boom"))  # type: ignore[method-assign]
+
+    with pytest.raises(RuntimeError, match="boom"):
+        _ = [batch async for batch in provider.aembedding_many("test-model", ["a", "b"], batch_size=1)]
+
+
+def test_embedding_many_as_numpy_returns_float32_matrices() -> None:
+    np = pytest.importorskip("numpy")
+    provider, _ = _provider_with_fake_embedding()
+
+    batches = list(provider.embedding_many("test-model", ["a", "bb", "ccc"], batch_size=2, as_numpy=True))
+
+    assert [batch.embeddings.shape for batch in batches] == [(2, 2), (1, 2)]  # type: ignore[union-attr]
+    matrix = stack_embeddings(batches)
+    assert matrix.dtype == np.float32
+    assert matrix.flags["C_CONTIGUOUS"]
+    assert matrix[:, 0].tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.asyncio
+async def test_aembedding_many_api_uses_provider() -> None:
+    mock_provider = Mock()
+    mock_provider.aclose = AsyncMock()
+
+    async def fake_aembedding_many(model: str, inputs: list[str], **kwargs: Any) -> AsyncIterator[EmbeddingBatch]:
+        yield EmbeddingBatch(index=0, embeddings=[[0.1]])
+
+    mock_provider.aembedding_many = Mock(side_effect=fake_aembedding_many)
+
+    with patch("any_llm.any_llm.AnyLLM.create", return_value=mock_provider) as mock_create:
+        batches = [batch async for batch in aembedding_many("openai:test-model", ["a"], api_key="test_key_many")]
+
+    mock_create.assert_called_once_with(LLMProvider.OPENAI, api_key="test_key_many", api_base=None)
+    mock_provider.aembedding_many.assert_called_once_with(
+        "test-model", ["a"], batch_size=None, max_batch_tokens=None, max_concurrency=4, as_numpy=False
+    )
+    assert batches == [EmbeddingBatch(index=0, embeddings=[[0.1]])]
+    await provider_registry.aclear()
@@ -0,0 +1,149 @@
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from any_llm.providers.anthropic.utils import _append_messages_for_anthropic, _convert_params
+from any_llm.providers.deepseek.deepseek import DeepseekProvider
+from any_llm.providers.gemini import GeminiProvider
+from any_llm.providers.gemini.base import GoogleProvider
+from any_llm.providers.openai.base import BaseOpenAIProvider
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.types.completion import ChatCompletionMessage, CompletionParams
+
+PREFIX: list[dict[str, Any]] = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Hi"},
+    {"role": "assistant", "content": "Hello! How can I help?"},
+]
+
+
+def get_weather(location: str) -> str:
+    """Get the weather of a location.
+
+    Args:
+        location: The city.
+
+    """
+    return f"Sunny in {location}"
+
+
+@pytest.mark.asyncio
+async def test_prepared_completion_converts_static_part_once() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    create = AsyncMock(return_value="response")
+
+    with (
+        patch.object(provider.client.chat.completions, "create", create),
+        patch.object(provider, "_convert_completion_response_async", side_effect=lambda response: response),
+        patch.object(
+            BaseOpenAIProvider, "_convert_completion_params", wraps=provider._convert_completion_params
+        ) as convert,
+    ):
+        prepared = provider.prepare_completion("gpt-4.1-mini", PREFIX, tools=[get_weather], temperature=0.2)
+        await prepared.acompletion([{"role": "user", "content": "Weather in Paris?"}])
+        await prepared.acompletion([ChatCompletionMessage(role="assistant", content="Let me check.")])
+        await prepared.acompletion([{"role": "user", "content": "Weather in Oslo?"}], stream=True)
+        await prepared.acompletion([{"role": "user", "content": "Weather in Lima?"}], stream=True)
+
+    # Once for the prepared request, once for the `stream=True` variant.
+    assert convert.call_count == 2
+    assert create.call_count == 4
+    first, second, third, _ = create.call_args_list
+    assert first.kwargs["messages"] == [*PREFIX, {"role": "user", "content": "Weather in Paris?"}]
+    assert second.kwargs["messages"] == [*PREFIX, {"role": "assistant", "content": "Let me check."}]
+    assert first.kwargs["temperature"] == 0.2
+    assert first.kwargs["tools"][0]["function"]["name"] == "get_weather"
+    assert "stream" not in first.kwargs
+    assert third.kwargs["stream"] is True
+    assert PREFIX[-1] == {"role": "assistant", "content": "Hello! How can I help?"}
+
+
+@pytest.mark.asyncio
+async def test_prepared_completion_matches_acompletion_request() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    create = AsyncMock(return_value="response")
+    suffix = [{"role": "user", "content": "Weather in Paris?"}]
+
+    with (
+        patch.object(provider.client.chat.completions, "create", create),
+        patch.object(provider, "_convert_completion_response_async", side_effect=lambda response: response),
+    ):
+        await provider.acompletion(model="gpt-4.1-mini", messages=[*PREFIX, *suffix], tools=[get_weather], seed=1)
+        await provider.prepare_completion("gpt-4.1-mini", PREFIX, tools=[get_weather], seed=1).acompletion(suffix)
+
+    assert create.call_args_list[0] == create.call_args_list[1]
+
+
+@pytest.mark.asyncio
+async def test_prepared_completion_falls_back_to_acompletion() -> None:
+    provider = DeepseekProvider(api_key="test_key")
+    suffix = [{"role": "user", "content": "Hello"}]
+
+    with patch.object(provider, "acompletion", AsyncMock()) as acompletion:
+        prepared = provider.prepare_completion("deepseek-chat", PREFIX, max_tokens=10)
+        await prepared.acompletion(suffix, max_tokens=20)
+
+    acompletion.assert_awaited_once_with(model="deepseek-chat", messages=[*PREFIX, *suffix], tools=None, max_tokens=20)
+
+
+@pytest.mark.asyncio
+async def test_prepared_completion_requires_messages() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    prepared = provider.prepare_completion("gpt-4.1-mini")
+
+    with pytest.raises(ValueError, match="cannot be empty"):
+        await prepared.acompletion()
+
+
+def test_append_messages_for_anthropic_matches_full_conversion() -> None:
+    prefix = [
+        *PREFIX,
+        {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                {"id": "call_1", "function": {"name": "get_weather", "arguments": '{"location": "Paris"}'}},
+                {"id": "call_2", "function": {"name": "get_weather", "arguments": '{"location": "Rome"}'}},
+            ],
+        },
+        {"role": "tool", "tool_call_id": "call_1", "content": "Sunny"},
+    ]
+    suffix = [
+        {"role": "tool", "tool_call_id": "call_2", "content": "Rainy"},
+        {"role": "system", "content": "Answer briefly."},
+        {"role": "user", "content": "Thanks!"},
+    ]
+
+    def convert(messages: list[dict[str, Any]]) -> dict[str, Any]:
+        params = CompletionParams(model_id="model-id", messages=messages, max_tokens=100)
+        return _convert_params(params, provider_name="anthropic")
+
+    request = convert(prefix)
+    prepared_messages = [dict(message) for message in request["messages"]]
+
+    assert _append_messages_for_anthropic(request, suffix) == convert([*prefix, *suffix])
+    assert request["messages"] == prepared_messages
+    assert request["system"] == "You are a helpful assistant."
+
+
+@pytest.mark.asyncio
+async def test_prepared_gemini_completion_appends_messages() -> None:
+    provider = GeminiProvider(api_key="test_key")
+    generate_content = AsyncMock(return_value="response")
+    suffix = [{"role": "system", "content": "Answer briefly."}, {"role": "user", "content": "Weather in Paris?"}]
+
+    with (
+        patch.object(provider.client.aio.models, "generate_content", generate_content),
+        patch("any_llm.providers.gemini.base._convert_response_to_response_dict", return_value={}),
+        patch.object(GoogleProvider, "_convert_completion_response", return_value="response"),
+    ):
+        prepared = provider.prepare_completion("gemini-2.5-flash", PREFIX, tools=[get_weather])
+        await prepared.acompletion(suffix)
+        await prepared.acompletion(suffix[1:])
+
+    with_system, without_system = generate_content.call_args_list
+    assert [content.role for content in with_system.kwargs["contents"]] == ["user", "model", "user"]
+    assert with_system.kwargs["config"].system_instruction == "You are a helpful assistant.\nAnswer briefly."
+    assert without_system.kwargs["config"].system_instruction == "You are a helpful assistant."
+    assert with_system.kwargs["config"].tools == without_system.kwargs["config"].tools
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+from any_llm import AnyLLM
+from any_llm.constants import LLMProvider
+from any_llm.providers.manifest import PROVIDER_MANIFEST
+
+
+def test_manifest_covers_every_provider() -> None:
+    assert set(PROVIDER_MANIFEST) == {provider.value for provider in LLMProvider}
+
+
+@pytest.mark.parametrize("provider", list(LLMProvider))
+def test_manifest_matches_provider_class(provider: LLMProvider) -> None:
+    """If this fails, regenerate the manifest with `python scripts/generate_provider_manifest.py`."""
+    expected = AnyLLM.get_provider_class(provider).get_provider_metadata()
+
+    assert AnyLLM.get_provider_metadata_for(provider) == expected
+
+
+def test_get_provider_metadata_for_accepts_string() -> None:
+    assert AnyLLM.get_provider_metadata_for("openai").class_name == "OpenaiProvider"
+
+
+def test_get_all_provider_metadata_does_not_import_providers() -> None:
+    code = (
+        "import sys\n"
+        "from any_llm import AnyLLM\n"
+        "metadata = AnyLLM.get_all_provider_metadata()\n"
+        "assert len(metadata) > 0\n"
+        "loaded = [m for m in sys.modules if m.startswith('any_llm.providers.') and m != 'any_llm.providers.manifest']\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)  # noqa: S603
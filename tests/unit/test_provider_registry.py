@@ -0,0 +1,171 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from any_llm.api import acompletion, provider_registry
+from any_llm.constants import LLMProvider
+from any_llm.utils.provider_registry import ProviderRegistry
+
+
+def _mock_provider() -> Mock:
+    provider = Mock()
+    provider.aclose = AsyncMock()
+    provider.acompletion = AsyncMock(return_value=Mock())
+    return provider
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_provider_for_same_configuration() -> None:
+    registry = ProviderRegistry(enabled=True)
+    factory = Mock(side_effect=_mock_provider)
+
+    first = registry.get_or_create("openai", "sk-1", None, {"timeout": 10}, factory)
+    second = registry.get_or_create("openai", "sk-1", None, {"timeout": 10}, factory)
+
+    assert first is second
+    factory.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_registry_key_includes_api_key_base_and_client_args() -> None:
+    registry = ProviderRegistry(enabled=True)
+    factory = Mock(side_effect=_mock_provider)
+
+    base = registry.get_or_create("openai", "sk-1", None, None, factory)
+    assert registry.get_or_create("openai", "sk-2", None, None, factory) is not base
+    assert registry.get_or_create("openai", "sk-1", "https://example.com", None, factory) is not base
+    assert registry.get_or_create("openai", "sk-1", None, {"timeout": 5}, factory) is not base
+    assert factory.call_count == 4
+
+
+def test_registry_key_does_not_contain_raw_api_key() -> None:
+    loop = asyncio.new_event_loop()
+    try:
+        key = ProviderRegistry.make_key("openai", "sk-secret", None, {"b": 1, "a": 2}, loop)
+    finally:
+        loop.close()
+
+    assert "sk-secret" not in str(key)
+    assert key[-1] == '{"a": 2, "b": 1}'
+
+
+@pytest.mark.asyncio
+async def test_registry_evicts_least_recently_used_and_closes_it() -> None:
+    registry = ProviderRegistry(max_size=2, enabled=True)
+
+    first = registry.get_or_create("openai", "sk-1", None, None, _mock_provider)
+    second = registry.get_or_create("openai", "sk-2", None, None, _mock_provider)
+    registry.get_or_create("openai", "sk-1", None, None, _mock_provider)
+    registry.get_or_create("openai", "sk-3", None, None, _mock_provider)
+    await asyncio.sleep(0)
+
+    assert len(registry) == 2
+    second.aclose.assert_awaited_once()
+    first.aclose.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_registry_expires_entries_after_ttl() -> None:
+    registry = ProviderRegistry(ttl_seconds=10, enabled=True)
+
+    with patch("any_llm.utils.provider_registry.time.monotonic", return_value=0.0):
+        first = registry.get_or_create("openai", "sk-1", None, None, _mock_provider)
+    with patch("any_llm.utils.provider_registry.time.monotonic", return_value=11.0):
+        second = registry.get_or_create("openai", "sk-1", None, None, _mock_provider)
+    await asyncio.sleep(0)
+
+    assert first is not second
+    first.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_registry_closes_evicted_provider_once_its_leases_are_released() -> None:
+    registry = ProviderRegistry(max_size=1, enabled=True)
+
+    lease = registry.acquire("openai", "sk-1", None, None, _mock_provider)
+    stream_lease = registry.acquire("openai", "sk-1", None, None, _mock_provider)
+    assert stream_lease.provider is lease.provider
+
+    async def _stream() -> AsyncIterator[int]:
+        yield 1
+        yield 2
+
+    with stream_lease:
+        stream = stream_lease.hold(_stream())
+    registry.get_or_create("openai", "sk-2", None, None, _mock_provider)
+    await registry.aclear()
+    await asyncio.sleep(0)
+
+    # Evicted and cleared while a request and a stream still use it.
+    assert len(registry) == 0
+    lease.provider.aclose.assert_not_awaited()  # type: ignore[attr-defined]
+    lease.release()
+    lease.release()
+    assert [chunk async for chunk in stream] == [1, 2]
+    await asyncio.sleep(0)
+    lease.provider.aclose.assert_awaited_once()  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_registry_disabled_always_calls_factory() -> None:
+    registry = ProviderRegistry(enabled=False)
+    factory = Mock(side_effect=_mock_provider)
+
+    registry.get_or_create("openai", "sk-1", None, None, factory)
+    registry.get_or_create("openai", "sk-1", None, None, factory)
+
+    assert factory.call_count == 2
+    assert len(registry) == 0
+
+
+def test_registry_respects_env_opt_out(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("ANY_LLM_PROVIDER_CACHE", "0")
+    assert ProviderRegistry().enabled is False
+
+    monkeypatch.setenv("ANY_LLM_PROVIDER_CACHE", "1")
+    assert ProviderRegistry().enabled is True
+
+
+def test_registry_does_not_share_providers_between_event_loops() -> None:
+    registry = ProviderRegistry(enabled=True)
+    factory = Mock(side_effect=_mock_provider)
+
+    async def get() -> Mock:
+        return registry.get_or_create("openai", "sk-1", None, None, factory)  # type: ignore[return-value]
+
+    first = asyncio.run(get())
+    second = asyncio.run(get())
+
+    assert first is not second
+    assert len(registry) == 1
+
+
+@pytest.mark.asyncio
+async def test_registry_aclear_closes_providers() -> None:
+    registry = ProviderRegistry(enabled=True)
+    provider = registry.get_or_create("openai", "sk-1", None, None, _mock_provider)
+
+    await registry.aclear()
+
+    assert len(registry) == 0
+    provider.aclose.assert_awaited_once()  # type: ignore[attr-defined]
+
+
+@pytest.mark.asyncio
+async def test_acompletion_reuses_cached_provider() -> None:
+    mock_provider = _mock_provider()
+
+    with patch("any_llm.any_llm.AnyLLM.create", return_value=mock_provider) as mock_create:
+        for _ in range(3):
+            await acompletion(
+                model="openai:gpt-4",
+                messages=[{"role": "user", "content": "Hello"}],
+                api_key="sk-cached",
+            )
+
+        mock_create.assert_called_once_with(LLMProvider.OPENAI, api_key="sk-cached", api_base=None)
+        assert mock_provider.acompletion.call_count == 3
+
+    await provider_registry.aclear()
@@ -0,0 +1,286 @@
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+from anthropic.types import Message as AnthropicMessage
+
+from any_llm import AnyLLM
+from any_llm.constants import LLMProvider
+from any_llm.rate_limit import (
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+    _parse_duration,
+    estimate_completion_tokens,
+    get_default_rate_limiter,
+    set_default_rate_limiter,
+)
+from any_llm.types.completion import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+    Choice,
+    ChoiceDelta,
+    ChunkChoice,
+    CompletionParams,
+    CompletionUsage,
+)
+
+
+def _completion(total_tokens: int) -> ChatCompletion:
+    return ChatCompletion(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model="gpt-4.1-mini",
+        choices=[Choice(index=0, finish_reason="stop", message=ChatCompletionMessage(role="assistant", content="Hi"))],
+        usage=CompletionUsage(prompt_tokens=total_tokens, completion_tokens=0, total_tokens=total_tokens),
+    )
+
+
+class RateLimitError(Exception):
+    """Mimics an SDK rate limit error carrying the HTTP response."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        super().__init__("Rate limit reached")
+        self.response = Mock(headers=headers)
+
+
+def test_token_bucket_reports_wait_for_reservations_in_debt() -> None:
+    bucket = TokenBucket(capacity=2, period=1.0)
+
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(0.5, abs=0.01)
+
+    bucket.refund(1)
+    assert bucket.level == pytest.approx(0, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_acquire_queues_requests_over_the_budget() -> None:
+    limiter = RateLimiter({"openai": RateLimit(requests_per_minute=2)})
+
+    with patch("any_llm.rate_limit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        for _ in range(3):
+            await limiter.acquire("openai", "gpt-4.1-mini")
+
+    mock_sleep.assert_awaited_once()
+    assert mock_sleep.call_args.args[0] == pytest.approx(30, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_limits_are_looked_up_by_model_then_provider_then_default() -> None:
+    limiter = RateLimiter(
+        {"openai:gpt-4.1-mini": RateLimit(tokens_per_minute=100), "openai": RateLimit(tokens_per_minute=200)},
+        default=RateLimit(tokens_per_minute=300),
+        adaptive=False,
+    )
+
+    assert limiter._budget("openai", "gpt-4.1-mini").tokens.capacity == 100  # type: ignore[union-attr]
+    assert limiter._budget("openai", "gpt-4o").tokens.capacity == 200  # type: ignore[union-attr]
+    assert limiter._budget("mistral", "mistral-small").tokens.capacity == 300  # type: ignore[union-attr]
+    assert RateLimiter(adaptive=False)._budget("openai", "gpt-4o") is None
+
+
+@pytest.mark.asyncio
+async def test_reservation_is_reconciled_with_actual_usage() -> None:
+    limiter = RateLimiter({"openai": RateLimit(tokens_per_minute=1000)})
+
+    reservation = await limiter.acquire("openai", "gpt-4.1-mini", tokens=300)
+    assert reservation is not None
+    reservation.reconcile(100)
+
+    bucket = limiter._budget("openai", "gpt-4.1-mini").tokens  # type: ignore[union-attr]
+    assert bucket is not None
+    assert bucket.level == pytest.approx(900, abs=1)
+
+
+def test_update_from_headers_adapts_limits_and_pauses() -> None:
+    limiter = RateLimiter()
+
+    limiter.update_from_headers(
+        "openai",
+        "gpt-4.1-mini",
+        {
+            "x-ratelimit-limit-requests": "60",
+            "x-ratelimit-remaining-requests": "10",
+            "x-ratelimit-limit-tokens": "1000",
+            "retry-after": "2",
+        },
+    )
+
+    budget = limiter._budget("openai", "gpt-4.1-mini")
+    assert budget is not None
+    assert budget.requests is not None
+    assert budget.requests.capacity == 60
+    assert budget.requests.level == pytest.approx(10, abs=0.1)
+    assert budget.tokens is not None
+    assert budget.tokens.capacity == 1000
+    assert budget.paused_until > 0
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("2", 2.0), ("0.5", 0.5), ("1m30s", 90.0), ("250ms", 0.25), ("6m0s", 360.0), ("soon", None)],
+)
+def test_parse_duration(value: str, expected: float | None) -> None:
+    assert _parse_duration(value) == expected
+
+
+def test_estimate_completion_tokens_counts_prompt_and_max_output() -> None:
+    params = CompletionParams(
+        model_id="gpt-4.1-mini",
+        messages=[
+            {"role": "system", "content": "a" * 40},
+            {"role": "user", "content": [{"type": "text", "text": "b" * 80}, {"type": "image_url", "image_url": {}}]},
+        ],
+        max_tokens=100,
+    )
+
+    assert estimate_completion_tokens(params) == 100 + 2 * 4 + 11 + 21
+
+
+@pytest.mark.asyncio
+async def test_acall_queues_again_after_a_rate_limit_error() -> None:
+    limiter = RateLimiter({"openai": RateLimit(requests_per_minute=1000)})
+    call = AsyncMock(side_effect=[RateLimitError({"retry-after": "3"}), _completion(10)])
+
+    with patch("any_llm.rate_limit.asyncio.sleep", new_callable=AsyncMock) as mock_sleep:
+        response = await limiter.acall("openai", "gpt-4.1-mini", 10, call)
+
+    assert isinstance(response, ChatCompletion)
+    assert call.await_count == 2
+    assert mock_sleep.call_args.args[0] == pytest.approx(3, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_acall_raises_once_retries_are_exhausted() -> None:
+    limiter = RateLimiter(max_retries=1)
+    call = AsyncMock(side_effect=RateLimitError({}))
+
+    with (
+        patch("any_llm.rate_limit.asyncio.sleep", new_callable=AsyncMock),
+        pytest.raises(RateLimitError),
+    ):
+        await limiter.acall("openai", "gpt-4.1-mini", 10, call)
+
+    assert call.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_acall_does_not_retry_other_errors() -> None:
+    limiter = RateLimiter()
+    call = AsyncMock(side_effect=ValueError("invalid request"))
+
+    with pytest.raises(ValueError, match="invalid request"):
+        await limiter.acall("openai", "gpt-4.1-mini", 10, call)
+
+    assert call.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_completion_goes_through_the_rate_limiter() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    llm.rate_limiter = RateLimiter({"openai": RateLimit(tokens_per_minute=10_000)})
+
+    with patch.object(llm, "_acompletion", AsyncMock(return_value=_completion(42))):
+        await llm.acompletion(model="gpt-4.1-mini", messages=[{"role": "user", "content": "Hello"}], max_tokens=500)
+
+    bucket = llm.rate_limiter._budget("openai", "gpt-4.1-mini").tokens  # type: ignore[union-attr]
+    assert bucket is not None
+    assert bucket.level == pytest.approx(10_000 - 42, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_headers_of_successful_responses_adapt_the_limits() -> None:
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json=_completion(42).model_dump(mode="json", exclude_none=True),
+            headers={"x-ratelimit-limit-tokens": "5000", "x-ratelimit-remaining-tokens": "1000"},
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key", http_client=http_client)
+    llm.rate_limiter = RateLimiter({"openai": RateLimit(tokens_per_minute=10_000)})
+
+    await llm.acompletion(model="gpt-4.1-mini", messages=[{"role": "user", "content": "Hello"}])
+
+    bucket = llm.rate_limiter._budget("openai", "gpt-4.1-mini").tokens  # type: ignore[union-attr]
+    assert bucket is not None
+    assert bucket.capacity == 5000
+    assert bucket.level <= 1000
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_completion_with_tools_is_sent_again_unchanged() -> None:
+    def get_weather(location: str) -> str:
+        """Get the weather for a location.
+
+        Args:
+            location: The city name.
+
+        """
+        return f"Sunny in {location}"
+
+    llm = AnyLLM.create(LLMProvider.ANTHROPIC, api_key="test_key")
+    llm.rate_limiter = RateLimiter()
+    message = AnthropicMessage.model_validate(
+        {
+            "id": "msg_1",
+            "type": "message",
+            "role": "assistant",
+            "model": "claude-sonnet-4-5",
+            "content": [{"type": "text", "text": "Hi"}],
+            "stop_reason": "end_turn",
+            "usage": {"input_tokens": 10, "output_tokens": 2},
+        }
+    )
+    create = AsyncMock(side_effect=[RateLimitError({"retry-after": "0"}), message])
+
+    with patch.object(llm.client.messages, "create", create):  # type: ignore[attr-defined]
+        response = await llm.acompletion(
+            model="claude-sonnet-4-5",
+            messages=[{"role": "user", "content": "Weather in Paris?"}],
+            tools=[get_weather],
+            tool_choice="auto",
+        )
+
+    assert isinstance(response, ChatCompletion)
+    first, second = (call.kwargs for call in create.await_args_list)
+    assert second["tools"] == first["tools"]
+    assert second["tool_choice"] == first["tool_choice"] == {"type": "auto", "disable_parallel_tool_use": False}
+
+
+@pytest.mark.asyncio
+async def test_streams_are_reconciled_with_the_usage_chunk() -> None:
+    llm = AnyLLM.create(LLMProvider.OPENAI, api_key="test_key")
+    limiter = RateLimiter({"openai": RateLimit(tokens_per_minute=10_000)})
+
+    async def stream(*args: Any, **kwargs: Any) -> AsyncIterator[ChatCompletionChunk]:
+        yield ChatCompletionChunk(
+            id="chatcmpl-1",
+            object="chat.completion.chunk",
+            created=0,
+            model="gpt-4.1-mini",
+            choices=[ChunkChoice(index=0, delta=ChoiceDelta(content="Hi"))],
+            usage=CompletionUsage(prompt_tokens=5, completion_tokens=2, total_tokens=7),
+        )
+
+    set_default_rate_limiter(limiter)
+    try:
+        assert get_default_rate_limiter() is limiter
+        with patch.object(llm, "_acompletion", AsyncMock(side_effect=stream)):
+            response = await llm.acompletion(
+                model="gpt-4.1-mini", messages=[{"role": "user", "content": "Hello"}], stream=True, max_tokens=500
+            )
+            _ = [chunk async for chunk in response]  # type: ignore[union-attr]
+    finally:
+        set_default_rate_limiter(None)
+
+    bucket = limiter._budget("openai", "gpt-4.1-mini").tokens  # type: ignore[union-attr]
+    assert bucket is not None
+    assert bucket.level == pytest.approx(10_000 - 7, abs=1)
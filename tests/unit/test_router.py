@@ -0,0 +1,374 @@
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from any_llm.constants import LLMProvider
+from any_llm.exceptions import ProviderError
+from any_llm.router import CircuitBreaker, CircuitState, HedgePolicy, Router, RouterTarget
+from any_llm.types.completion import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessage,
+    Choice,
+    ChoiceDelta,
+    ChunkChoice,
+)
+from any_llm.utils.provider_registry import ProviderLease
+
+MESSAGES: list[dict[str, Any] | ChatCompletionMessage] = [{"role": "user", "content": "Hello"}]
+
+
+class InternalServerError(Exception):
+    """Mimics an SDK 5xx error."""
+
+
+class BadRequestError(Exception):
+    """Mimics an SDK 400 error."""
+
+
+def _completion(model: str) -> ChatCompletion:
+    return ChatCompletion(
+        id="chatcmpl-1",
+        object="chat.completion",
+        created=0,
+        model=model,
+        choices=[Choice(index=0, finish_reason="stop", message=ChatCompletionMessage(role="assistant", content="Hi"))],
+    )
+
+
+def _chunk(content: str) -> ChatCompletionChunk:
+    return ChatCompletionChunk(
+        id="chatcmpl-1",
+        object="chat.completion.chunk",
+        created=0,
+        model="model",
+        choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=content))],
+    )
+
+
+def _patch_providers(providers: dict[LLMProvider, Mock]) -> Any:
+    return patch(
+        "any_llm.router._acquire_cached_provider",
+        side_effect=lambda provider, api_key, api_base, client_args: ProviderLease(providers[provider]),
+    )
+
+
+def _provider(acompletion: Any) -> Mock:
+    provider = Mock()
+    provider.acompletion = acompletion
+    return provider
+
+
+def test_circuit_breaker_opens_and_half_opens_after_cooldown() -> None:
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10)
+
+    breaker.record_failure()
+    assert breaker.consecutive_failures == 1
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert not breaker.allow_request()
+    assert breaker._opened_at is not None
+
+    with patch("any_llm.router.time.monotonic", return_value=breaker._opened_at + 10):
+        assert breaker.state.value == "half_open"
+        assert breaker.allow_request()
+        # Only one trial request at a time.
+        assert not breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.OPEN
+
+    breaker.record_success()
+    assert breaker.state.value == "closed"
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_to_next_target_on_provider_error() -> None:
+    openai = _provider(AsyncMock(side_effect=InternalServerError("internal server error")))
+    groq = _provider(AsyncMock(return_value=_completion("llama")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"])
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        response = await router.acompletion(MESSAGES, temperature=0)
+
+    assert isinstance(response, ChatCompletion)
+    assert response.model == "llama"
+    openai.acompletion.assert_awaited_once_with(model="gpt-4.1-mini", messages=MESSAGES, temperature=0)
+    stats = {stat.model: stat for stat in router.stats()}
+    assert stats["openai:gpt-4.1-mini"].error_rate == 1.0
+    assert stats["groq:llama"].error_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_router_does_not_fall_back_on_invalid_requests() -> None:
+    openai = _provider(AsyncMock(side_effect=BadRequestError("invalid parameter")))
+    groq = _provider(AsyncMock(return_value=_completion("llama")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"])
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}), pytest.raises(BadRequestError):
+        await router.acompletion(MESSAGES)
+
+    groq.acompletion.assert_not_awaited()
+    assert router.stats()[0].error_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_router_prefers_the_faster_target() -> None:
+    async def slow(**kwargs: Any) -> ChatCompletion:
+        await asyncio.sleep(0.02)
+        return _completion("slow")
+
+    async def fast(**kwargs: Any) -> ChatCompletion:
+        return _completion("fast")
+
+    slow_provider, fast_provider = _provider(AsyncMock(side_effect=slow)), _provider(AsyncMock(side_effect=fast))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"])
+
+    with _patch_providers({LLMProvider.OPENAI: slow_provider, LLMProvider.GROQ: fast_provider}):
+        # Both targets are tried once while they have no latency samples.
+        models = [(await router.acompletion(MESSAGES)).model for _ in range(4)]  # type: ignore[union-attr]
+
+    assert models == ["slow", "fast", "fast", "fast"]
+
+
+@pytest.mark.asyncio
+async def test_router_respects_weights_when_there_is_no_data() -> None:
+    openai = _provider(AsyncMock(return_value=_completion("openai")))
+    groq = _provider(AsyncMock(return_value=_completion("groq")))
+    router = Router(["openai:gpt-4.1-mini", RouterTarget("groq:llama", weight=2)])
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        response = await router.acompletion(MESSAGES)
+
+    assert response.model == "groq"  # type: ignore[union-attr]
+
+
+@pytest.mark.asyncio
+async def test_router_skips_targets_with_an_open_circuit() -> None:
+    openai = _provider(AsyncMock(side_effect=InternalServerError("internal server error")))
+    groq = _provider(AsyncMock(return_value=_completion("groq")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"], failure_threshold=2, cooldown=60)
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        for _ in range(2):
+            await router.acompletion(MESSAGES)
+        assert router.stats()[0].circuit_state is CircuitState.OPEN
+        for _ in range(3):
+            await router.acompletion(MESSAGES)
+
+    assert openai.acompletion.await_count == 2
+    assert groq.acompletion.await_count == 5
+
+
+@pytest.mark.asyncio
+async def test_router_raises_when_every_circuit_is_open() -> None:
+    openai = _provider(AsyncMock(side_effect=InternalServerError("internal server error")))
+    router = Router(["openai:gpt-4.1-mini"], failure_threshold=1)
+
+    with _patch_providers({LLMProvider.OPENAI: openai}):
+        with pytest.raises(InternalServerError):
+            await router.acompletion(MESSAGES)
+        with pytest.raises(ProviderError, match="circuit breakers are open"):
+            await router.acompletion(MESSAGES)
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_when_a_stream_fails_before_its_first_chunk() -> None:
+    async def failing_stream() -> AsyncIterator[ChatCompletionChunk]:
+        msg = "service unavailable"
+        raise InternalServerError(msg)
+        yield  # pragma: no cover
+
+    async def working_stream() -> AsyncIterator[ChatCompletionChunk]:
+        yield _chunk("Hel")
+        yield _chunk("lo")
+
+    openai = _provider(AsyncMock(return_value=failing_stream()))
+    groq = _provider(AsyncMock(return_value=working_stream()))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"])
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        stream = await router.acompletion(MESSAGES, stream=True)
+        contents = [chunk.choices[0].delta.content async for chunk in stream]  # type: ignore[union-attr]
+
+    assert contents == ["Hel", "lo"]
+    assert router.stats()[0].error_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_router_records_the_outcome_of_a_stream_once_it_ends() -> None:
+    async def stream_failing_midway() -> AsyncIterator[ChatCompletionChunk]:
+        yield _chunk("Hel")
+        msg = "connection reset"
+        raise InternalServerError(msg)
+
+    async def working_stream() -> AsyncIterator[ChatCompletionChunk]:
+        yield _chunk("Hel")
+        yield _chunk("lo")
+
+    openai = _provider(AsyncMock(side_effect=[stream_failing_midway(), working_stream()]))
+    router = Router(["openai:gpt-4.1-mini"])
+
+    with _patch_providers({LLMProvider.OPENAI: openai}):
+        stream = await router.acompletion(MESSAGES, stream=True)
+        assert router.stats()[0].error_rate == 0.0
+        with pytest.raises(InternalServerError):
+            _ = [chunk async for chunk in stream]  # type: ignore[union-attr]
+        assert router.stats()[0].error_rate == 1.0
+
+        stream = await router.acompletion(MESSAGES, stream=True)
+        _ = [chunk async for chunk in stream]  # type: ignore[union-attr]
+
+    assert router.stats()[0].error_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_router_falls_back_on_timeout() -> None:
+    async def hang(**kwargs: Any) -> ChatCompletion:
+        await asyncio.sleep(10)
+        return _completion("hang")
+
+    openai = _provider(AsyncMock(side_effect=hang))
+    groq = _provider(AsyncMock(return_value=_completion("groq")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"], timeout=0.01)
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        response = await router.acompletion(MESSAGES)
+
+    assert response.model == "groq"  # type: ignore[union-attr]
+    assert router.stats()[0].error_rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_hedge_to_an_alternate_target_wins_and_cancels_the_slow_request() -> None:
+    cancelled = asyncio.Event()
+
+    async def slow(**kwargs: Any) -> ChatCompletion:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return _completion("slow")
+
+    openai = _provider(AsyncMock(side_effect=slow))
+    groq = _provider(AsyncMock(return_value=_completion("groq")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"], hedge=HedgePolicy(delay=0.01, max_extra_ratio=1))
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        response = await router.acompletion(MESSAGES)
+
+    assert response.model == "groq"  # type: ignore[union-attr]
+    assert cancelled.is_set()
+    assert (router.hedge_stats.requests, router.hedge_stats.fired, router.hedge_stats.won) == (1, 1, 1)
+    assert router.stats()[0].circuit_state == CircuitState.CLOSED
+
+
+class _SlowStream:
+    """A stream whose first chunk never comes."""
+
+    def __init__(self) -> None:
+        self.aclose = AsyncMock()
+
+    def __aiter__(self) -> "_SlowStream":
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        await asyncio.sleep(10)
+        return _chunk("slow")
+
+
+@pytest.mark.asyncio
+async def test_hedge_closes_the_stream_of_the_cancelled_request() -> None:
+    async def fast_stream() -> AsyncIterator[ChatCompletionChunk]:
+        yield _chunk("Hi")
+
+    slow_stream = _SlowStream()
+    openai = _provider(AsyncMock(return_value=slow_stream))
+    groq = _provider(AsyncMock(return_value=fast_stream()))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"], hedge=HedgePolicy(delay=0.01, max_extra_ratio=1))
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        stream = await router.acompletion(MESSAGES, stream=True)
+        contents = [chunk.choices[0].delta.content async for chunk in stream]  # type: ignore[union-attr]
+
+    assert contents == ["Hi"]
+    assert router.hedge_stats.won == 1
+    slow_stream.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_hedge_is_not_sent_when_the_primary_answers_in_time() -> None:
+    openai = _provider(AsyncMock(return_value=_completion("openai")))
+    groq = _provider(AsyncMock(return_value=_completion("groq")))
+    router = Router(["openai:gpt-4.1-mini", "groq:llama"], hedge=HedgePolicy(delay=1))
+
+    with _patch_providers({LLMProvider.OPENAI: openai, LLMProvider.GROQ: groq}):
+        response = await router.acompletion(MESSAGES)
+
+    assert response.model == "openai"  # type: ignore[union-attr]
+    groq.acompletion.assert_not_awaited()
+    assert router.hedge_stats.fired == 0
+
+
+@pytest.mark.asyncio
+async def test_hedges_go_to_the_same_target_when_it_is_the_only_one() -> None:
+    calls = 0
+
+    async def first_call_is_slow(**kwargs: Any) -> ChatCompletion:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return _completion(f"call-{calls}")
+
+    openai = _provider(AsyncMock(side_effect=first_call_is_slow))
+    router = Router(["openai:gpt-4.1-mini"], hedge=HedgePolicy(delay=0.01, max_extra_ratio=1))
+
+    with _patch_providers({LLMProvider.OPENAI: openai}):
+        response = await router.acompletion(MESSAGES)
+
+    assert response.model == "call-2"  # type: ignore[union-attr]
+    assert router.hedge_stats.won == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_are_capped_by_the_extra_spend_ratio() -> None:
+    async def slowish(**kwargs: Any) -> ChatCompletion:
+        await asyncio.sleep(0.02)
+        return _completion("openai")
+
+    openai = _provider(AsyncMock(side_effect=slowish))
+    router = Router(["openai:gpt-4.1-mini"], hedge=HedgePolicy(delay=0.001, max_extra_ratio=0.5))
+
+    with _patch_providers({LLMProvider.OPENAI: openai}):
+        for _ in range(4):
+            await router.acompletion(MESSAGES)
+
+    assert router.hedge_stats.fired == 2
+    assert router.hedge_stats.over_budget == 2
+    assert openai.acompletion.await_count == 6
+
+
+@pytest.mark.asyncio
+async def test_hedge_delay_follows_the_latency_percentile() -> None:
+    openai = _provider(AsyncMock(return_value=_completion("openai")))
+    router = Router(["openai:gpt-4.1-mini"], hedge=HedgePolicy(percentile=0.5, min_delay=0.2))
+
+    with _patch_providers({LLMProvider.OPENAI: openai}), patch("any_llm.router.asyncio.wait") as mock_wait:
+        # No latency data yet: no hedging.
+        await router.acompletion(MESSAGES)
+        mock_wait.assert_not_called()
+
+    with _patch_providers({LLMProvider.OPENAI: openai}):
+        await router.acompletion(MESSAGES, hedge=False)
+        assert router.hedge_stats.requests == 1
+        router._states[0].latencies.clear()
+        router._states[0].latencies.extend([0.5, 0.6, 0.7])
+        with patch("any_llm.router.asyncio.wait", wraps=asyncio.wait) as mock_wait:
+            await router.acompletion(MESSAGES)
+
+    assert mock_wait.call_args.kwargs["timeout"] == 0.6
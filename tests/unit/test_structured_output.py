@@ -0,0 +1,168 @@
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk as OpenAIChatCompletionChunk
+from pydantic import BaseModel, Field, ValidationError
+
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.types.completion import ChatCompletionChunk
+from any_llm.utils.structured_output import PartialJSONParser, astream_structured_output, partial_model
+
+
+class Step(BaseModel):
+    title: str = Field(min_length=10)
+    status: Literal["todo", "done"]
+    substeps: list["Step"] = []
+
+
+class Plan(BaseModel):
+    goal: str
+    steps: list[Step]
+    priority: int
+
+
+def _chunk(content: str | None, finish_reason: str | None = None) -> OpenAIChatCompletionChunk:
+    return OpenAIChatCompletionChunk.model_validate(
+        {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "gpt-4.1-mini",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": finish_reason}],
+        }
+    )
+
+
+def test_partial_json_parser_exposes_partial_values() -> None:
+    parser = PartialJSONParser()
+    pieces = [
+        '{"goal": "Ship \\u00e9',
+        't\\u00e9", "steps": [{"title": "Wri',
+        'te"}, 1',
+        "2, tr",
+        "ue], ",
+        '"n": null}',
+    ]
+
+    values = [json.loads(json.dumps(parser.feed(piece))) for piece in pieces]
+
+    assert values == [
+        {"goal": "Ship é"},
+        {"goal": "Ship été", "steps": [{"title": "Wri"}]},
+        {"goal": "Ship été", "steps": [{"title": "Write"}]},
+        {"goal": "Ship été", "steps": [{"title": "Write"}, 12]},
+        {"goal": "Ship été", "steps": [{"title": "Write"}, 12, True]},
+        {"goal": "Ship été", "steps": [{"title": "Write"}, 12, True], "n": None},
+    ]
+    assert parser.done
+
+    # Surrogate pairs split between pieces are combined, lone surrogates replaced.
+    parser = PartialJSONParser()
+    assert parser.feed('["\\ud83d') == [""]
+    assert parser.feed('\\ude00 \\udc00"]') == ["\U0001f600 �"]
+
+    for invalid in ['{"a" 1}', "[1,]", '{"a": 1} x', "[nul1]", "{]"]:
+        with pytest.raises(ValueError, match="Invalid JSON"):
+            PartialJSONParser().feed(invalid)
+
+
+def test_partial_model_makes_nested_fields_optional() -> None:
+    partial = partial_model(Plan)
+
+    plan = partial.model_validate({"goal": "Launch", "steps": [{"title": "Wri"}]})
+
+    assert plan.goal == "Launch"  # type: ignore[attr-defined]
+    assert plan.steps[0].title == "Wri"  # type: ignore[attr-defined]
+    assert plan.steps[0].status is None  # type: ignore[attr-defined]
+    assert plan.priority is None  # type: ignore[attr-defined]
+    assert partial_model(Plan) is partial
+    with pytest.raises(ValidationError):
+        partial.model_validate({"steps": [{"status": "do"}]})
+
+
+@pytest.mark.asyncio
+async def test_openai_streams_structured_output() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+    content = '{"goal": "Launch", "steps": [{"title": "Write the docs", "status": "done"}], "priority": 2}'
+    pieces = [content[i : i + 7] for i in range(0, len(content), 7)]
+
+    async def _stream() -> AsyncIterator[OpenAIChatCompletionChunk]:
+        for piece in pieces:
+            yield _chunk(piece)
+        yield _chunk(None, finish_reason="stop")
+
+    with patch.object(provider.client.chat.completions, "create", AsyncMock(return_value=_stream())) as create:
+        result = await provider.acompletion(
+            model="gpt-4.1-mini", messages=[{"role": "user", "content": "Plan"}], stream=True, response_format=Plan
+        )
+        chunks = [chunk async for chunk in result]  # type: ignore[union-attr]
+
+    response_format = create.call_args.kwargs["response_format"]
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["name"] == "Plan"
+    assert create.call_args.kwargs["stream"] is True
+
+    partials: list[Any] = [chunk.choices[0].delta.parsed for chunk in chunks[:-1]]
+    assert partials[0].goal is None
+    assert partials[1].goal == "Laun"
+    # The title is shorter than `min_length` while it streams.
+    titles = [partial.steps[0].title for partial in partials if partial.steps]
+    assert titles[:4] == [None, "Wr", "Write the", "Write the docs"]
+    # "do" isn't a valid status yet: the previous partial object is kept.
+    assert partials[9] is partials[8]
+    assert partials[10].steps[0].status == "done"
+    assert partials[-1].priority == 2
+    assert chunks[-1].choices[0].delta.parsed == Plan.model_validate_json(content)
+
+
+@pytest.mark.asyncio
+async def test_structured_output_without_finish_reason() -> None:
+    async def _stream(*pieces: str) -> AsyncIterator[ChatCompletionChunk]:
+        for piece in pieces:
+            yield ChatCompletionChunk.model_validate(_chunk(piece).model_dump())
+
+    chunks = [
+        chunk
+        async for chunk in astream_structured_output(_stream('{"goal": "A", ', '"steps": [], "priority": 1}'), Plan)
+    ]
+    assert len(chunks) == 3
+    assert chunks[-1].choices[0].delta.content is None
+
+    with pytest.raises(ValidationError):
+        _ = [chunk async for chunk in astream_structured_output(_stream('{"goal": "A", "priority": 1}'), Plan)]
+
+
+class Item(BaseModel):
+    name: str
+    tags: list[str]
+
+
+class Catalog(BaseModel):
+    items: list[Item]
+
+
+@pytest.mark.asyncio
+async def test_structured_output_validation_scales_linearly() -> None:
+    partial = partial_model(Catalog)
+
+    async def _count_validations(items: int) -> int:
+        content = Catalog(items=[Item(name=f"Item {i}", tags=["a", "b"]) for i in range(items)]).model_dump_json()
+
+        async def _stream() -> AsyncIterator[ChatCompletionChunk]:
+            for i in range(0, len(content), 4):
+                yield ChatCompletionChunk.model_validate(_chunk(content[i : i + 4]).model_dump())
+            yield ChatCompletionChunk.model_validate(_chunk(None, finish_reason="stop").model_dump())
+
+        with patch.object(partial, "model_validate", side_effect=partial.model_validate) as validate:
+            chunks = [chunk async for chunk in astream_structured_output(_stream(), Catalog)]
+        parsed: Any = chunks[-1].choices[0].delta.parsed
+        assert len(parsed.items) == items
+        return validate.call_count
+
+    # Revalidating the growing object on every chunk would make streaming quadratic: each doubling
+    # of the content (about 2,500 more chunks) only adds a few validations of the partial object.
+    small, large = await _count_validations(500), await _count_validations(1000)
+    assert 0 < small < large < small + 20
@@ -250,3 +250,90 @@ def test_prepare_tools_with_built_in() -> None:
     assert len(tools) == 2
     assert isinstance(tools[0], BuiltInTool)
     assert tools[1]["function"]["name"] == "custom_tool"
+
+
+def test_callable_to_tool_is_cached_per_function() -> None:
+    """Test that conversions are cached, evicted with the function and not shared with callers."""
+    import gc
+    from unittest.mock import patch
+
+    from any_llm import tools as tools_module
+
+    def lookup(query: str, filters: dict[str, list[int]] | None = None) -> str:
+        """Look something up."""
+        return query
+
+    with patch.object(tools_module, "_build_tool", wraps=tools_module._build_tool) as mock_build:
+        first = callable_to_tool(lookup)
+        first["function"]["name"] = "modified"
+        second = callable_to_tool(lookup)
+        prepare_tools([lookup])
+
+    assert mock_build.call_count == 1
+    assert second["function"]["name"] == "lookup"
+    assert lookup in tools_module._tool_cache
+
+    # The mock keeps its call arguments alive.
+    del lookup, mock_build
+    gc.collect()
+    assert not any(func.__name__ == "lookup" for func in tools_module._tool_cache)
+
+
+def test_bound_methods_share_a_cached_tool() -> None:
+    """Test that bound methods are cached by their function and exclude `self`."""
+
+    class Calculator:
+        def add(self, a: int, b: int) -> int:
+            """Add two numbers."""
+            return a + b
+
+    first = prepare_tools([Calculator().add])[0]
+    second = prepare_tools([Calculator().add])[0]
+
+    assert first is second
+    assert first["function"]["parameters"]["required"] == ["a", "b"]
+
+
+def test_toolset_precomputes_definitions() -> None:
+    """Test that a ToolSet is converted once and passed through prepare_tools as-is."""
+    from any_llm.tools import ToolSet
+
+    def get_weather(location: str) -> str:
+        """Get the weather."""
+        return location
+
+    raw_tool = {"type": "function", "function": {"name": "raw", "description": "Raw.", "parameters": {}}}
+    toolset = ToolSet([get_weather, raw_tool])
+
+    assert len(toolset) == 2
+    assert toolset[0]["function"]["name"] == "get_weather"
+    assert toolset.functions == {"get_weather": get_weather}
+    assert prepare_tools(toolset) == toolset.definitions  # type: ignore[arg-type]
+    assert [tool["function"]["name"] for tool in toolset] == ["get_weather", "raw"]
+
+
+def test_cached_tools_are_read_only() -> None:
+    """Test that a provider adapting a cached schema doesn't change it for later requests."""
+    import copy
+    import json
+
+    from any_llm.providers.llama.utils import _patch_json_schema
+
+    def pick(choice: int | str) -> str:
+        """Pick one."""
+        return str(choice)
+
+    tool = prepare_tools([pick])[0]
+    patched = _patch_json_schema(tool)
+
+    assert patched["function"]["parameters"]["properties"]["choice"]["type"] == "string"
+    assert "type" not in prepare_tools([pick])[0]["function"]["parameters"]["properties"]["choice"]
+    with pytest.raises(TypeError, match="can't be modified"):
+        tool["function"]["parameters"]["properties"]["choice"]["type"] = "string"
+    with pytest.raises(TypeError, match="can't be modified"):
+        tool["function"]["parameters"]["required"].append("other")
+
+    # Copies are plain, modifiable, values.
+    copied = copy.deepcopy(tool)
+    copied["function"]["parameters"]["required"].append("other")
+    assert json.loads(json.dumps(tool)) == tool
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpcore
+import httpx
+import pytest
+
+from any_llm import AnyLLM
+from any_llm.providers.anthropic.anthropic import AnthropicProvider
+from any_llm.providers.mistral.mistral import MistralProvider
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.providers.platform.platform import PlatformProvider
+from any_llm.transport import (
+    CachingDNSBackend,
+    TransportConfig,
+    _http_module,
+    aclose_shared_transports,
+    set_default_transport,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset_default_transport() -> Iterator[None]:
+    yield
+    set_default_transport(None)
+
+
+def _transport(client: Any) -> Any:
+    return client._transport
+
+
+@pytest.mark.asyncio
+async def test_providers_share_connection_pool_per_host() -> None:
+    config = TransportConfig(max_connections=50, read_timeout=30)
+    first = OpenaiProvider(api_key="test_key", transport=config)
+    second = OpenaiProvider(api_key="test_key", transport=config)
+    other_host = OpenaiProvider(api_key="test_key", api_base="https://example.com/v1", transport=config)
+    anthropic = AnthropicProvider(api_key="test_key", transport=config)
+
+    first_client = first.client._client
+    assert first_client is not second.client._client
+    assert _transport(first_client) is _transport(second.client._client)
+    assert _transport(first_client) is not _transport(other_host.client._client)
+    assert _transport(first_client) is not _transport(anthropic.client._client)
+    # The Anthropic SDK may be built on a fork of httpx: its pool comes from the same package as its client.
+    anthropic_http = _http_module(type(anthropic.client._client))
+    assert isinstance(_transport(anthropic.client._client).pool(), anthropic_http.AsyncHTTPTransport)
+    assert first.client.timeout == httpx.Timeout(30, connect=5.0)
+
+    # Closing one SDK client leaves the shared pool open for the others.
+    pool = _transport(first_client).pool()
+    with patch.object(pool, "aclose", AsyncMock()) as aclose:
+        await first.client.close()
+        aclose.assert_not_awaited()
+        await aclose_shared_transports()
+        aclose.assert_awaited_once()
+
+    third = OpenaiProvider(api_key="test_key", transport=config)
+    assert _transport(third.client._client) is not _transport(second.client._client)
+
+
+def test_default_transport_and_explicit_client() -> None:
+    set_default_transport(TransportConfig(share_connections=False, max_connections=10))
+    http_client = httpx.AsyncClient()
+
+    llm = AnyLLM.create("openai", api_key="test_key")
+    custom = AnyLLM.create("openai", api_key="test_key", http_client=http_client)
+    mistral = MistralProvider(api_key="test_key")
+
+    assert isinstance(llm, OpenaiProvider)
+    assert isinstance(custom, OpenaiProvider)
+    assert isinstance(_transport(llm.client._client), httpx.AsyncHTTPTransport)
+    assert custom.client._client is http_client
+    assert isinstance(mistral.client.sdk_configuration.async_client, httpx.AsyncClient)
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def local_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_shared_pool_is_used_from_several_event_loops(local_url: str) -> None:
+    config = TransportConfig()
+    client = config.async_client(local_url)
+
+    async def _get(client: httpx.AsyncClient) -> int:
+        response = await client.get(local_url)
+        return response.status_code
+
+    # Each `asyncio.run` closes its loop, and the connections opened on it.
+    assert asyncio.run(_get(client)) == 200
+    assert asyncio.run(_get(client)) == 200
+    assert asyncio.run(_get(config.async_client(local_url))) == 200
+
+
+def test_transport_argument_of_sdk_clients() -> None:
+    # Providers whose SDK client takes an httpx `transport` argument still receive it.
+    transport = httpx.AsyncHTTPTransport(retries=2)
+    ollama: Any = AnyLLM.create("ollama", transport=transport)
+    platform = PlatformProvider(api_key="ANY.v1.kid123.fingerprint456-base64key", transport=transport)
+
+    assert ollama.transport is None
+    assert _transport(ollama.client._client) is transport
+    assert _transport(platform.client) is transport
+
+
+def test_dns_cache_is_used_by_transport() -> None:
+    transport = TransportConfig(dns_cache_ttl=60, share_connections=False).create_transport()
+
+    assert isinstance(transport._pool._network_backend, CachingDNSBackend)
+
+
+@pytest.mark.asyncio
+async def test_caching_dns_backend_resolves_once_per_ttl() -> None:
+    stream = MagicMock()
+    inner = MagicMock()
+    inner.connect_tcp = AsyncMock(side_effect=[httpcore.ConnectError("refused"), stream, stream, stream])
+    backend = CachingDNSBackend(ttl=60, backend=inner)
+    infos = [(2, 1, 6, "", ("10.0.0.1", 443)), (2, 1, 6, "", ("10.0.0.2", 443))]
+
+    with patch("asyncio.BaseEventLoop.getaddrinfo", AsyncMock(return_value=infos)) as getaddrinfo:
+        assert await backend.connect_tcp("api.example.com", 443) is stream
+        assert await backend.connect_tcp("api.example.com", 443) is stream
+        assert await backend.connect_tcp("127.0.0.1", 443) is stream
+
+    getaddrinfo.assert_awaited_once()
+    hosts = [call.args[0] for call in inner.connect_tcp.await_args_list]
+    assert hosts == ["10.0.0.1", "10.0.0.2", "10.0.0.1", "127.0.0.1"]
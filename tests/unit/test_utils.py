@@ -1,6 +1,18 @@
 import asyncio
+import itertools
+import statistics
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
 
-from any_llm.utils.aio import run_async_in_sync
+import pytest
+from openai.types.chat.chat_completion_chunk import ChoiceDelta as OpenAIChoiceDelta
+
+from any_llm.types.completion import ChatCompletionChunk, ChoiceDelta, ChunkChoice, CompletionUsage, Reasoning
+from any_llm.utils.aio import async_iter_to_sync_iter, get_background_loop, iterate_in_thread, run_async_in_sync
+from any_llm.utils.models import construct_model, retype_model
+from any_llm.utils.reasoning import ReasoningTagScanner, process_streaming_reasoning_chunks
+from any_llm.utils.streaming import StreamAccumulator
 
 
 def test_run_async_in_sync_fails_with_background_task_state() -> None:
@@ -26,3 +38,294 @@ def test_run_async_in_sync_fails_with_background_task_state() -> None:
         assert task_completed["value"] is True
 
     asyncio.run(test_in_streamlit_context())
+
+
+def test_run_async_in_sync_reuses_background_loop() -> None:
+    async def current_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    first = run_async_in_sync(current_loop())
+    second = run_async_in_sync(current_loop())
+
+    assert first is second
+    assert first is get_background_loop()
+
+
+def test_run_async_in_sync_uses_background_loop_inside_running_loop() -> None:
+    async def current_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    async def caller() -> None:
+        assert run_async_in_sync(current_loop()) is get_background_loop()
+
+    asyncio.run(caller())
+
+
+def test_run_async_in_sync_rejects_running_loop_when_not_allowed() -> None:
+    async def noop() -> None:
+        return None
+
+    async def caller() -> None:
+        with pytest.raises(RuntimeError, match="Cannot use the `sync` API"):
+            run_async_in_sync(noop(), allow_running_loop=False)
+
+    asyncio.run(caller())
+
+
+def test_run_async_in_sync_from_background_loop_does_not_deadlock() -> None:
+    async def inner() -> str:
+        return "inner"
+
+    async def outer() -> str:
+        return run_async_in_sync(inner())
+
+    assert run_async_in_sync(outer()) == "inner"
+
+
+def test_run_async_in_sync_propagates_exceptions() -> None:
+    async def fail() -> None:
+        msg = "boom"
+        raise ValueError(msg)
+
+    with pytest.raises(ValueError, match="boom"):
+        run_async_in_sync(fail())
+
+
+def test_async_iter_to_sync_iter_stays_on_one_loop() -> None:
+    async def stream() -> AsyncIterator[asyncio.AbstractEventLoop]:
+        for _ in range(3):
+            yield asyncio.get_running_loop()
+
+    loops = list(async_iter_to_sync_iter(stream()))
+
+    assert len(loops) == 3
+    assert all(loop is get_background_loop() for loop in loops)
+
+
+def test_async_iter_to_sync_iter_closes_stream_on_early_exit() -> None:
+    closed = {"value": False}
+
+    async def stream() -> AsyncIterator[int]:
+        try:
+            for i in range(10):
+                yield i
+        finally:
+            closed["value"] = True
+
+    iterator = async_iter_to_sync_iter(stream())
+    assert next(iterator) == 0
+    iterator.close()  # type: ignore[attr-defined]
+
+    assert closed["value"] is True
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_yields_items_and_propagates_errors() -> None:
+    def stream() -> Iterator[int]:
+        yield 1
+        yield 2
+        msg = "stream failed"
+        raise ValueError(msg)
+
+    iterator = iterate_in_thread(stream())
+    assert [await iterator.__anext__(), await iterator.__anext__()] == [1, 2]
+    with pytest.raises(ValueError, match="stream failed"):
+        await iterator.__anext__()
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_applies_backpressure_and_stops_on_close() -> None:
+    produced = []
+    closed = threading.Event()
+
+    def stream() -> Iterator[int]:
+        try:
+            for i in range(1000):
+                produced.append(i)
+                yield i
+        finally:
+            closed.set()
+
+    iterator = iterate_in_thread(stream(), max_buffered=2)
+    assert await iterator.__anext__() == 0
+    await asyncio.sleep(0.05)
+    # One item consumed, two buffered and one held by the blocked worker.
+    assert len(produced) <= 4
+
+    await iterator.aclose()  # type: ignore[attr-defined]
+
+    assert await asyncio.to_thread(closed.wait, 1)
+    assert len(produced) <= 4
+
+
+@pytest.mark.asyncio
+async def test_iterate_in_thread_never_advances_the_iterator_on_the_loop_thread() -> None:
+    threads = set()
+
+    def stream() -> Iterator[int]:
+        for i in range(3):
+            threads.add(threading.get_ident())
+            time.sleep(0.001)
+            yield i
+
+    assert [item async for item in iterate_in_thread(stream())] == [0, 1, 2]
+    assert threading.get_ident() not in threads
+
+
+def test_stream_accumulator_tracks_usage_and_latency_in_constant_memory() -> None:
+    def chunk(content: str | None, usage: CompletionUsage | None = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id="chatcmpl-1",
+            object="chat.completion.chunk",
+            created=0,
+            model="gpt-4.1-mini",
+            choices=[
+                ChunkChoice(index=0, delta=ChoiceDelta(content=content), finish_reason=None if content else "stop")
+            ],
+            usage=usage,
+        )
+
+    arrival_times = [1.1, 1.3, 1.4, 1.8]
+    accumulator = StreamAccumulator(start_time=1.0)
+    accumulator.add(chunk(None), now=arrival_times[0])
+    accumulator.add(
+        chunk("Hel", CompletionUsage(prompt_tokens=10, completion_tokens=1, total_tokens=11)), now=arrival_times[1]
+    )
+    accumulator.add(chunk("lo"), now=arrival_times[2])
+    accumulator.add(
+        chunk(None, CompletionUsage(prompt_tokens=10, completion_tokens=2, total_tokens=12)), now=arrival_times[3]
+    )
+
+    latencies = [(b - a) * 1000 for a, b in itertools.pairwise(arrival_times)]
+    assert accumulator.chunks_received == 4
+    assert accumulator.last_chunk is not None
+    assert accumulator.last_chunk.choices[0].finish_reason == "stop"
+    assert accumulator.saw_finish_reason
+    assert (accumulator.prompt_tokens, accumulator.completion_tokens, accumulator.total_tokens) == (10, 2, 12)
+    assert accumulator.time_to_first_token_ms == pytest.approx(300)
+    assert accumulator.time_to_last_content_token_ms == pytest.approx(400)
+    assert accumulator.inter_chunk_latency_mean_ms == pytest.approx(statistics.mean(latencies))
+    assert accumulator.inter_chunk_latency_variance_ms == pytest.approx(statistics.variance(latencies))
+    assert not hasattr(accumulator, "chunks")
+
+
+def test_stream_accumulator_needs_two_intervals_for_variance() -> None:
+    accumulator = StreamAccumulator()
+
+    assert accumulator.inter_chunk_latency_mean_ms is None
+    assert accumulator.inter_chunk_latency_variance_ms is None
+    assert accumulator.inter_chunk_latency_stdev_ms is None
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_reasoning_tag_scanner_handles_tags_split_across_deltas(size: int) -> None:
+    text = "Hi <b>a < b</b> <think>x < y <thin</think>ok <thinking>more</thinking> end <"
+    scanner = ReasoningTagScanner()
+    content = reasoning = ""
+    for i in range(0, len(text), size):
+        new_content, new_reasoning = scanner.feed(text[i : i + size])
+        content += new_content
+        reasoning += new_reasoning
+    assert scanner._pending == "<"
+    flushed_content, flushed_reasoning = scanner.flush()
+
+    assert content + flushed_content == "Hi <b>a < b</b> ok  end <"
+    assert reasoning + flushed_reasoning == "x < y <thinmore"
+    assert scanner.current_tag is None
+
+
+def test_reasoning_tag_scanner_flushes_unclosed_reasoning() -> None:
+    scanner = ReasoningTagScanner()
+
+    assert scanner.feed("<chain_of_thought>step 1</chain_of") == ("", "step 1")
+    assert scanner.current_tag == "chain_of_thought"
+    assert scanner.flush() == ("", "</chain_of")
+
+
+@pytest.mark.asyncio
+async def test_process_streaming_reasoning_chunks_streams_reasoning_and_flushes_partial_tags() -> None:
+    def chunk(content: str | None) -> ChatCompletionChunk:
+        return ChatCompletionChunk(
+            id="chunk",
+            created=0,
+            model="model",
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(index=0, delta=ChoiceDelta(content=content))],
+        )
+
+    async def chunks() -> AsyncIterator[ChatCompletionChunk]:
+        for content in ["<thi", "nk>Let me", " think</th", "ink>Done <", None]:
+            yield chunk(content)
+
+    def set_content(chunk: ChatCompletionChunk, content: str | None) -> ChatCompletionChunk:
+        chunk.choices[0].delta.content = content
+        return chunk
+
+    def set_reasoning(chunk: ChatCompletionChunk, reasoning: str) -> ChatCompletionChunk:
+        chunk.choices[0].delta.reasoning = Reasoning(content=reasoning)
+        return chunk
+
+    deltas = [
+        (c.choices[0].delta.content, c.choices[0].delta.reasoning.content if c.choices[0].delta.reasoning else None)
+        async for c in process_streaming_reasoning_chunks(
+            chunks(), lambda c: c.choices[0].delta.content, set_content, set_reasoning
+        )
+    ]
+
+    assert deltas == [
+        (None, None),
+        (None, "Let me"),
+        (None, " think"),
+        ("Done ", None),
+        (None, None),
+        ("<", None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_streaming_reasoning_chunks_flushes_content_only() -> None:
+    last = ChatCompletionChunk(
+        id="chunk",
+        created=0,
+        model="model",
+        object="chat.completion.chunk",
+        choices=[ChunkChoice(index=0, delta=ChoiceDelta(content="Done <", role="assistant"), finish_reason="stop")],
+        usage=CompletionUsage(prompt_tokens=10, completion_tokens=2, total_tokens=12),
+    )
+
+    async def chunks() -> AsyncIterator[ChatCompletionChunk]:
+        yield last
+
+    def set_content(chunk: ChatCompletionChunk, content: str | None) -> ChatCompletionChunk:
+        chunk.choices[0].delta.content = content
+        return chunk
+
+    def set_reasoning(chunk: ChatCompletionChunk, reasoning: str) -> ChatCompletionChunk:
+        chunk.choices[0].delta.reasoning = Reasoning(content=reasoning)
+        return chunk
+
+    processed = [
+        c
+        async for c in process_streaming_reasoning_chunks(
+            chunks(), lambda c: c.choices[0].delta.content, set_content, set_reasoning
+        )
+    ]
+
+    assert [c.choices[0].finish_reason for c in processed] == ["stop", None]
+    assert [c.usage is not None for c in processed] == [True, False]
+    assert processed[1].choices[0].delta == ChoiceDelta(content="<")
+
+
+def test_construct_and_retype_models_without_validation() -> None:
+    delta = construct_model(ChoiceDelta, content="Hi")
+    assert delta == ChoiceDelta(content="Hi")
+    assert delta.model_fields_set == {"content"}
+
+    source = OpenAIChoiceDelta(content="Hi", reasoning=Reasoning(content="Hmm"))  # type: ignore[call-arg]
+    retyped = retype_model(source, ChoiceDelta)
+    assert retyped is source
+    assert type(retyped) is ChoiceDelta
+    # The extra value of an added field is moved to the field.
+    assert retyped.reasoning == Reasoning(content="Hmm")
+    assert not retyped.model_extra
+    assert retype_model(OpenAIChoiceDelta(content="Hi"), ChoiceDelta).reasoning is None
@@ -0,0 +1,98 @@
+import warnings
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from any_llm.api import awarmup, provider_registry, warmup
+from any_llm.constants import LLMProvider
+from any_llm.exceptions import AuthenticationError, MissingApiKeyError
+from any_llm.providers.openai.openai import OpenaiProvider
+from any_llm.providers.perplexity.perplexity import PerplexityProvider
+from any_llm.transport import TransportConfig
+from any_llm.utils.aio import run_async_in_sync
+
+
+@pytest.mark.asyncio
+async def test_awarmup_opens_connections() -> None:
+    provider = OpenaiProvider(api_key="test_key")
+
+    with patch.object(provider, "_alist_models", AsyncMock(return_value=[])) as alist_models:
+        result = await provider.awarmup(connections=3)
+
+    assert alist_models.await_count == 3
+    assert result.provider == "openai"
+    assert result.connections == 3
+    assert result.error is None
+    assert result.create_seconds is None
+    assert result.total_seconds == result.preload_seconds + result.connect_seconds
+
+    error = AuthenticationError("Invalid API key")
+    with patch.object(provider, "_alist_models", AsyncMock(side_effect=[[], error])):
+        result = await provider.awarmup(connections=2)
+
+    assert result.connections == 1
+    assert result.error is error
+
+
+@pytest.mark.asyncio
+async def test_awarmup_without_models_api_only_preloads() -> None:
+    provider = PerplexityProvider(api_key="test_key")
+
+    with patch.object(provider, "_alist_models", AsyncMock()) as alist_models:
+        result = await provider.awarmup(connections=3)
+
+    alist_models.assert_not_awaited()
+    assert result.connections == 0
+    assert result.error is None
+
+
+@pytest.mark.asyncio
+async def test_api_awarmup_caches_providers(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key")
+    monkeypatch.delenv("MISTRAL_API_KEY", raising=False)
+
+    with patch.object(OpenaiProvider, "_alist_models", AsyncMock(return_value=[])):
+        results = await awarmup(["openai", LLMProvider.MISTRAL], connections=2)
+
+    try:
+        openai, mistral = results
+        assert openai.provider == "openai"
+        assert openai.connections == 2
+        assert openai.create_seconds is not None
+        assert isinstance(mistral.error, MissingApiKeyError)
+        assert mistral.connections == 0
+        # The async API functions reuse the warmed-up provider and its connections.
+        llm = provider_registry.get_or_create("openai", None, None, None, pytest.fail)
+        assert isinstance(llm, OpenaiProvider)
+    finally:
+        await provider_registry.aclear()
+
+
+@pytest.mark.asyncio
+async def test_api_awarmup_caches_providers_under_the_key_of_acompletion() -> None:
+    with patch.object(OpenaiProvider, "_alist_models", AsyncMock(return_value=[])):
+        (result,) = await awarmup(["openai"], api_key="sk-explicit", api_base="https://example.com/v1")
+
+    try:
+        assert result.error is None
+        llm = provider_registry.get_or_create("openai", "sk-explicit", "https://example.com/v1", None, pytest.fail)
+        assert isinstance(llm, OpenaiProvider)
+    finally:
+        await provider_registry.aclear()
+
+
+def test_sync_warmup_warns_without_shared_connections(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "test_key")
+
+    try:
+        with patch.object(OpenaiProvider, "_alist_models", AsyncMock(return_value=[])):
+            with pytest.warns(UserWarning, match="no effect on the sync API"):
+                warmup(["openai"])
+
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                (result,) = warmup(["openai"], client_args={"transport": TransportConfig()})
+    finally:
+        run_async_in_sync(provider_registry.aclear())
+
+    assert result.error is None